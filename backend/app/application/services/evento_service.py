@@ -1,8 +1,9 @@
+from datetime import datetime
 from typing import List, Optional
 from app.domain.models.evento import Evento, EventoCreate, EventoUpdate
-from app.domain.ports.evento_repository import EventoRepository
-from app.domain.repositories.lugar_repository import LugarRepository
-from app.domain.models.lugar import Lugar
+from app.domain.ports.evento_repository import EventoRepository, AsyncEventoRepository
+from app.domain.repositories.lugar_repository import LugarRepository, AsyncLugarRepository
+from app.domain.models.lugar import Lugar, LugarCreate
 
 class EventoService:
     def __init__(self, evento_repository: EventoRepository, lugar_repository: LugarRepository = None):
@@ -28,8 +29,8 @@ class EventoService:
     def get_evento(self, evento_id: int) -> Optional[Evento]:
         return self.evento_repository.get_by_id(evento_id)
 
-    def list_eventos_by_association(self, asociacion_id: int) -> List[Evento]:
-        return self.evento_repository.list_by_association(asociacion_id)
+    def list_eventos_by_association(self, asociacion_id: int, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Evento]:
+        return self.evento_repository.list_by_association(asociacion_id, desde, hasta)
 
     def update_evento(self, evento_id: int, evento_update: EventoUpdate) -> Optional[Evento]:
         # We need asociacion_id to save the place. EventoUpdate might not have it.
@@ -49,3 +50,36 @@ class EventoService:
 
     def delete_evento(self, evento_id: int) -> bool:
         return self.evento_repository.delete(evento_id)
+
+class AsyncEventoService:
+    def __init__(self, evento_repository: AsyncEventoRepository, lugar_repository: AsyncLugarRepository = None):
+        self.evento_repository = evento_repository
+        self.lugar_repository = lugar_repository
+
+    async def create_evento(self, evento: EventoCreate) -> Evento:
+        if self.lugar_repository and evento.lugar_nombre and evento.lugar_direccion:
+            await self.lugar_repository.save(LugarCreate(
+                nombre=evento.lugar_nombre,
+                direccion=evento.lugar_direccion,
+                asociacion_id=evento.asociacion_id
+            ))
+        return await self.evento_repository.create(evento)
+
+    async def get_evento(self, evento_id: int) -> Optional[Evento]:
+        return await self.evento_repository.get_by_id(evento_id)
+
+    async def list_eventos_by_association(self, asociacion_id: int, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Evento]:
+        return await self.evento_repository.list_by_association(asociacion_id, desde, hasta)
+
+    async def update_evento(self, evento_id: int, evento_update: EventoUpdate) -> Optional[Evento]:
+        existing_evento = await self.evento_repository.get_by_id(evento_id)
+        if existing_evento and self.lugar_repository and evento_update.lugar_nombre and evento_update.lugar_direccion:
+            await self.lugar_repository.save(LugarCreate(
+                nombre=evento_update.lugar_nombre,
+                direccion=evento_update.lugar_direccion,
+                asociacion_id=existing_evento.asociacion_id
+            ))
+        return await self.evento_repository.update(evento_id, evento_update)
+
+    async def delete_evento(self, evento_id: int) -> bool:
+        return await self.evento_repository.delete(evento_id)
@@ -0,0 +1,216 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.domain.models.geo import LugarSugerido, PuntoCercano, distance_m
+from app.domain.ports.geo_repository import GeoRepository, AsyncGeoRepository
+
+# Web Mercator tiles of TILE_SIZE px; each tile is split in GRID x GRID cells and the
+# points of a cell are returned as a single cluster until MAX_CLUSTER_ZOOM.
+TILE_SIZE = 256
+CLUSTER_CELL_PX = int(os.getenv("GEO_CLUSTER_CELL_PX", "64"))
+GRID = max(1, TILE_SIZE // CLUSTER_CELL_PX)
+MAX_CLUSTER_ZOOM = int(os.getenv("GEO_MAX_CLUSTER_ZOOM", "16"))
+MAX_ZOOM = 20
+MAX_TILE_POINTS = int(os.getenv("GEO_MAX_TILE_POINTS", "2000"))
+MAX_TILES = int(os.getenv("GEO_MAX_TILES", "64"))
+TILE_TTL = int(os.getenv("GEO_TILE_TTL", "60"))
+TILE_CACHE_SIZE = int(os.getenv("GEO_TILE_CACHE_SIZE", "4096"))
+
+# Nearest-point searches stop at this distance; "cerca" for venue suggestions
+MAX_SEARCH_RADIUS_M = float(os.getenv("GEO_MAX_SEARCH_RADIUS", "20000"))
+COVERAGE_RADIUS_M = float(os.getenv("GEO_COVERAGE_RADIUS", "1000"))
+# Candidates near the participants' centroid ranked by their mean distance
+SUGGESTION_CANDIDATES = 3
+
+MAX_LAT = 85.0511287798
+
+# (asociacion_id, layer, z, x, y) -> (stored_at, features); LRU with TTL, per process
+_tiles: "OrderedDict[tuple, Tuple[float, List[dict]]]" = OrderedDict()
+_tiles_lock = threading.Lock()
+
+
+def lon_to_tile(lon: float, zoom: int) -> int:
+    n = 2 ** zoom
+    return min(n - 1, max(0, int((lon + 180.0) / 360.0 * n)))
+
+
+def lat_to_tile(lat: float, zoom: int) -> int:
+    n = 2 ** zoom
+    lat_rad = math.radians(min(MAX_LAT, max(-MAX_LAT, lat)))
+    y = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
+    return min(n - 1, max(0, int(y)))
+
+
+def _tile_lon(x: float, zoom: int) -> float:
+    return x / 2 ** zoom * 360.0 - 180.0
+
+
+def _tile_lat(y: float, zoom: int) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2 ** zoom))))
+
+
+def cell_edges(zoom: int, x: int, y: int) -> Tuple[List[float], List[float]]:
+    """Ascending lon and lat edges of the GRID x GRID cells of a tile (exact in Mercator)"""
+    lon_edges = [_tile_lon(x + i / GRID, zoom) for i in range(GRID + 1)]
+    lat_edges = [_tile_lat(y + i / GRID, zoom) for i in range(GRID, -1, -1)]
+    return lon_edges, lat_edges
+
+
+def tiles_for_bbox(bbox: Sequence[float], zoom: int) -> List[Tuple[int, int]]:
+    west, south, east, north = bbox
+    xs = range(lon_to_tile(west, zoom), lon_to_tile(east, zoom) + 1)
+    ys = range(lat_to_tile(north, zoom), lat_to_tile(south, zoom) + 1)
+    if len(xs) * len(ys) > MAX_TILES:
+        raise ValueError("El área pedida es demasiado grande para este zoom")
+    return [(x, y) for x in xs for y in ys]
+
+
+def _feature(layer: str, lat: float, lon: float, properties: dict) -> dict:
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [round(lon, 6), round(lat, 6)]},
+        "properties": {"layer": layer, **properties},
+    }
+
+
+def cell_features(layer: str, cells: List[dict]) -> List[dict]:
+    features = []
+    for cell in cells:
+        if cell["count"] == 1:
+            properties = {"id": cell["id"], "nombre": cell["nombre"]}
+        else:
+            properties = {"cluster": True, "point_count": cell["count"]}
+        features.append(_feature(layer, cell["lat"], cell["lon"], properties))
+    return features
+
+
+def point_features(layer: str, points: List[dict]) -> List[dict]:
+    return [_feature(layer, p["lat"], p["lon"], {"id": p["id"], "nombre": p["nombre"]}) for p in points]
+
+
+def _cached_tile(key: tuple):
+    with _tiles_lock:
+        cached = _tiles.get(key)
+        if cached and time.monotonic() - cached[0] < TILE_TTL:
+            _tiles.move_to_end(key)
+            return cached[1]
+    return None
+
+
+def _store_tile(key: tuple, features: List[dict]):
+    with _tiles_lock:
+        _tiles[key] = (time.monotonic(), features)
+        _tiles.move_to_end(key)
+        while len(_tiles) > TILE_CACHE_SIZE:
+            _tiles.popitem(last=False)
+
+
+def clear_tile_cache():
+    with _tiles_lock:
+        _tiles.clear()
+
+
+def _tile_query(zoom: int, x: int, y: int) -> Dict:
+    """Arguments for the repository: grid edges while clustering, the tile bounds afterwards"""
+    if zoom < MAX_CLUSTER_ZOOM:
+        return {"grid": cell_edges(zoom, x, y)}
+    return {"bounds": (_tile_lon(x, zoom), _tile_lat(y + 1, zoom), _tile_lon(x + 1, zoom), _tile_lat(y, zoom))}
+
+
+def centroid(coordinates: List[Tuple[float, float]]) -> Tuple[float, float]:
+    return (sum(lat for lat, _ in coordinates) / len(coordinates),
+            sum(lon for _, lon in coordinates) / len(coordinates))
+
+
+def rank_lugares(candidatos: List[PuntoCercano], participantes: List[Tuple[float, float]], k: int) -> List[LugarSugerido]:
+    """Venues closest on average to the participants; ties go to the one with more of them nearby"""
+    sugeridos = []
+    for lugar in candidatos:
+        distancias = [distance_m(lugar.lat, lugar.lon, lat, lon) for lat, lon in participantes]
+        sugeridos.append(LugarSugerido(
+            **lugar.model_dump(),
+            distancia_media=round(sum(distancias) / len(distancias), 1),
+            participantes_cerca=sum(1 for d in distancias if d <= COVERAGE_RADIUS_M),
+        ))
+    sugeridos.sort(key=lambda lugar: (lugar.distancia_media, -lugar.participantes_cerca, lugar.id))
+    return sugeridos[:k]
+
+
+def _collection(features: List[dict], zoom: int) -> dict:
+    return {"type": "FeatureCollection", "zoom": zoom, "clustered": zoom < MAX_CLUSTER_ZOOM, "features": features}
+
+
+class GeoService:
+    def __init__(self, geo_repository: GeoRepository):
+        self.geo_repository = geo_repository
+
+    def tile_features(self, asociacion_id: int, layer: str, zoom: int, x: int, y: int) -> List[dict]:
+        key = (asociacion_id, layer, zoom, x, y)
+        features = _cached_tile(key)
+        if features is None:
+            query = _tile_query(zoom, x, y)
+            if "grid" in query:
+                features = cell_features(layer, self.geo_repository.grid(asociacion_id, layer, *query["grid"]))
+            else:
+                features = point_features(layer, self.geo_repository.points(asociacion_id, layer, *query["bounds"], MAX_TILE_POINTS))
+            _store_tile(key, features)
+        return features
+
+    def feature_collection(self, asociacion_id: int, bbox: Sequence[float], zoom: int, layers: Sequence[str]) -> dict:
+        features = []
+        for x, y in tiles_for_bbox(bbox, zoom):
+            for layer in layers:
+                features.extend(self.tile_features(asociacion_id, layer, zoom, x, y))
+        return _collection(features, zoom)
+
+    def nearby(self, asociacion_id: int, layer: str, lat: float, lon: float, k: int, radius_m: Optional[float] = None) -> List[PuntoCercano]:
+        if radius_m is None:
+            return self.geo_repository.nearest(asociacion_id, layer, lat, lon, k, MAX_SEARCH_RADIUS_M)
+        return self.geo_repository.within_radius(asociacion_id, layer, lat, lon, radius_m, k)
+
+    def suggest_lugares(self, asociacion_id: int, socia_ids: Sequence[int], k: int) -> List[LugarSugerido]:
+        participantes = self.geo_repository.coordinates(asociacion_id, "socias", socia_ids)
+        if not participantes:
+            return []
+        lat, lon = centroid(participantes)
+        candidatos = self.geo_repository.nearest(asociacion_id, "lugares", lat, lon, k * SUGGESTION_CANDIDATES, MAX_SEARCH_RADIUS_M)
+        return rank_lugares(candidatos, participantes, k)
+
+class AsyncGeoService:
+    def __init__(self, geo_repository: AsyncGeoRepository):
+        self.geo_repository = geo_repository
+
+    async def tile_features(self, asociacion_id: int, layer: str, zoom: int, x: int, y: int) -> List[dict]:
+        key = (asociacion_id, layer, zoom, x, y)
+        features = _cached_tile(key)
+        if features is None:
+            query = _tile_query(zoom, x, y)
+            if "grid" in query:
+                features = cell_features(layer, await self.geo_repository.grid(asociacion_id, layer, *query["grid"]))
+            else:
+                features = point_features(layer, await self.geo_repository.points(asociacion_id, layer, *query["bounds"], MAX_TILE_POINTS))
+            _store_tile(key, features)
+        return features
+
+    async def feature_collection(self, asociacion_id: int, bbox: Sequence[float], zoom: int, layers: Sequence[str]) -> dict:
+        features = []
+        for x, y in tiles_for_bbox(bbox, zoom):
+            for layer in layers:
+                features.extend(await self.tile_features(asociacion_id, layer, zoom, x, y))
+        return _collection(features, zoom)
+
+    async def nearby(self, asociacion_id: int, layer: str, lat: float, lon: float, k: int, radius_m: Optional[float] = None) -> List[PuntoCercano]:
+        if radius_m is None:
+            return await self.geo_repository.nearest(asociacion_id, layer, lat, lon, k, MAX_SEARCH_RADIUS_M)
+        return await self.geo_repository.within_radius(asociacion_id, layer, lat, lon, radius_m, k)
+
+    async def suggest_lugares(self, asociacion_id: int, socia_ids: Sequence[int], k: int) -> List[LugarSugerido]:
+        participantes = await self.geo_repository.coordinates(asociacion_id, "socias", socia_ids)
+        if not participantes:
+            return []
+        lat, lon = centroid(participantes)
+        candidatos = await self.geo_repository.nearest(asociacion_id, "lugares", lat, lon, k * SUGGESTION_CANDIDATES, MAX_SEARCH_RADIUS_M)
+        return rank_lugares(candidatos, participantes, k)
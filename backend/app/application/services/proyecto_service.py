@@ -1,6 +1,7 @@
+from datetime import date
 from typing import List, Optional
 from app.domain.models.proyecto import Proyecto, ProyectoCreate, ProyectoUpdate
-from app.domain.ports.proyecto_repository import ProyectoRepository
+from app.domain.ports.proyecto_repository import ProyectoRepository, AsyncProyectoRepository
 
 class ProyectoService:
     def __init__(self, proyecto_repository: ProyectoRepository):
@@ -12,11 +13,30 @@ class ProyectoService:
     def get_proyecto(self, proyecto_id: int) -> Optional[Proyecto]:
         return self.proyecto_repository.get_by_id(proyecto_id)
 
-    def list_proyectos_by_association(self, asociacion_id: int) -> List[Proyecto]:
-        return self.proyecto_repository.list_by_association(asociacion_id)
+    def list_proyectos_by_association(self, asociacion_id: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[Proyecto]:
+        return self.proyecto_repository.list_by_association(asociacion_id, desde, hasta)
 
     def update_proyecto(self, proyecto_id: int, proyecto_update: ProyectoUpdate) -> Optional[Proyecto]:
         return self.proyecto_repository.update(proyecto_id, proyecto_update)
 
     def delete_proyecto(self, proyecto_id: int) -> bool:
         return self.proyecto_repository.delete(proyecto_id)
+
+class AsyncProyectoService:
+    def __init__(self, proyecto_repository: AsyncProyectoRepository):
+        self.proyecto_repository = proyecto_repository
+
+    async def create_proyecto(self, proyecto: ProyectoCreate) -> Proyecto:
+        return await self.proyecto_repository.create(proyecto)
+
+    async def get_proyecto(self, proyecto_id: int) -> Optional[Proyecto]:
+        return await self.proyecto_repository.get_by_id(proyecto_id)
+
+    async def list_proyectos_by_association(self, asociacion_id: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[Proyecto]:
+        return await self.proyecto_repository.list_by_association(asociacion_id, desde, hasta)
+
+    async def update_proyecto(self, proyecto_id: int, proyecto_update: ProyectoUpdate) -> Optional[Proyecto]:
+        return await self.proyecto_repository.update(proyecto_id, proyecto_update)
+
+    async def delete_proyecto(self, proyecto_id: int) -> bool:
+        return await self.proyecto_repository.delete(proyecto_id)
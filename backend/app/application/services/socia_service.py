@@ -1,6 +1,6 @@
 from typing import List, Optional
 from app.domain.models.socia import Socia, SociaCreate, SociaUpdate
-from app.domain.ports.socia_repository import SociaRepository
+from app.domain.ports.socia_repository import SociaRepository, AsyncSociaRepository
 
 class SociaService:
     def __init__(self, socia_repository: SociaRepository):
@@ -20,3 +20,22 @@ class SociaService:
 
     def delete_socia(self, socia_id: int) -> bool:
         return self.socia_repository.delete(socia_id)
+
+class AsyncSociaService:
+    def __init__(self, socia_repository: AsyncSociaRepository):
+        self.socia_repository = socia_repository
+
+    async def create_socia(self, socia: SociaCreate) -> Socia:
+        return await self.socia_repository.create(socia)
+
+    async def get_socia(self, socia_id: int) -> Optional[Socia]:
+        return await self.socia_repository.get_by_id(socia_id)
+
+    async def list_socias_by_association(self, asociacion_id: int) -> List[Socia]:
+        return await self.socia_repository.list_by_association(asociacion_id)
+
+    async def update_socia(self, socia_id: int, socia_update: SociaUpdate) -> Optional[Socia]:
+        return await self.socia_repository.update(socia_id, socia_update)
+
+    async def delete_socia(self, socia_id: int) -> bool:
+        return await self.socia_repository.delete(socia_id)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from app.domain.models.transaccion import Transaccion, TransaccionCreate, TransaccionUpdate
-from app.domain.ports.transaccion_repository import TransaccionRepository
+from app.domain.ports.transaccion_repository import TransaccionRepository, AsyncTransaccionRepository
 
 class TransaccionService:
     def __init__(self, transaccion_repository: TransaccionRepository):
@@ -20,3 +20,22 @@ class TransaccionService:
 
     def delete_transaccion(self, transaccion_id: int) -> bool:
         return self.transaccion_repository.delete(transaccion_id)
+
+class AsyncTransaccionService:
+    def __init__(self, transaccion_repository: AsyncTransaccionRepository):
+        self.transaccion_repository = transaccion_repository
+
+    async def create_transaccion(self, transaccion: TransaccionCreate) -> Transaccion:
+        return await self.transaccion_repository.create(transaccion)
+
+    async def get_transaccion(self, transaccion_id: int) -> Optional[Transaccion]:
+        return await self.transaccion_repository.get_by_id(transaccion_id)
+
+    async def list_transacciones_by_association(self, asociacion_id: int) -> List[Transaccion]:
+        return await self.transaccion_repository.list_by_association(asociacion_id)
+
+    async def update_transaccion(self, transaccion_id: int, transaccion_update: TransaccionUpdate) -> Optional[Transaccion]:
+        return await self.transaccion_repository.update(transaccion_id, transaccion_update)
+
+    async def delete_transaccion(self, transaccion_id: int) -> bool:
+        return await self.transaccion_repository.delete(transaccion_id)
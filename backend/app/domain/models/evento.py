@@ -1,14 +1,18 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime, timedelta
+from app.domain.models.recurrence import OptionalRRule, RRule
 
 class EventoBase(BaseModel):
     nombre: str
     descripcion: Optional[str] = None
     lugar_nombre: Optional[str] = None
     lugar_direccion: Optional[str] = None
+    lugar_id: Optional[int] = None
     fecha: datetime
     duracion: Optional[timedelta] = None
+    # RRULE (RFC 5545) without DTSTART, e.g. FREQ=WEEKLY;BYDAY=TU; empty = one-off
+    recurrencia: RRule = ""
     colaboradores: Optional[str] = None
     observaciones: Optional[str] = None
 
@@ -22,8 +26,10 @@ class EventoUpdate(BaseModel):
     descripcion: Optional[str] = None
     lugar_nombre: Optional[str] = None
     lugar_direccion: Optional[str] = None
+    lugar_id: Optional[int] = None
     fecha: Optional[datetime] = None
     duracion: Optional[timedelta] = None
+    recurrencia: OptionalRRule = None
     colaboradores: Optional[str] = None
     observaciones: Optional[str] = None
     responsable_id: Optional[int] = None
@@ -32,6 +38,8 @@ class EventoUpdate(BaseModel):
 class Evento(EventoBase):
     id: int
     asociacion_id: int
+    # Read back as stored: a rule saved before validation must not break the listings
+    recurrencia: str = ""
     responsable_id: Optional[int] = None
     proyecto_id: Optional[int] = None
 
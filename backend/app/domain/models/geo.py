@@ -0,0 +1,31 @@
+import math
+from pydantic import BaseModel
+from typing import Optional, Tuple
+
+EARTH_RADIUS_M = 6371008.8
+
+def distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_box(lat: float, lon: float, radius_m: float) -> Tuple[float, float, float, float]:
+    """(west, south, east, north) containing every point within radius_m of lat/lon"""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlon = math.degrees(radius_m / (EARTH_RADIUS_M * max(math.cos(math.radians(lat)), 1e-6)))
+    return max(-180.0, lon - dlon), max(-90.0, lat - dlat), min(180.0, lon + dlon), min(90.0, lat + dlat)
+
+class PuntoCercano(BaseModel):
+    id: int
+    nombre: Optional[str] = None
+    lat: float
+    lon: float
+    distancia: float  # metres
+
+class LugarSugerido(PuntoCercano):
+    # distancia is measured from the participants' centroid
+    distancia_media: float
+    participantes_cerca: int
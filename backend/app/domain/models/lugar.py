@@ -4,6 +4,8 @@ from typing import Optional
 class LugarBase(BaseModel):
     nombre: str
     direccion: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
 
 class LugarCreate(LugarBase):
     asociacion_id: int
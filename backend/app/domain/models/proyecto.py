@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import date, datetime
+from app.domain.models.recurrence import OptionalRRule, RRule
 
 class ProyectoBase(BaseModel):
     nombre: str
@@ -13,6 +14,8 @@ class ProyectoBase(BaseModel):
     fecha_inicio: date
     fecha_final: Optional[date] = None
     recursivo: bool = False
+    # RRULE of the sessions (FREQ=WEEKLY;BYDAY=MO,WE); empty = no fixed schedule
+    recurrencia: RRule = ""
 
 class ProyectoCreate(ProyectoBase):
     asociacion_id: int
@@ -28,10 +31,13 @@ class ProyectoUpdate(BaseModel):
     fecha_inicio: Optional[date] = None
     fecha_final: Optional[date] = None
     recursivo: Optional[bool] = None
+    recurrencia: OptionalRRule = None
 
 class Proyecto(ProyectoBase):
     id: int
     asociacion_id: int
+    # Read back as stored: a rule saved before validation must not break the listings
+    recurrencia: str = ""
     fecha_creacion: datetime
     fecha_modificacion: datetime
 
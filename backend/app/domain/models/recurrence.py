@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from dateutil.rrule import rrulestr
+from pydantic import AfterValidator
+from typing import Annotated, Optional
+
+# Same checks as validate_rrule in the Django app (frontend/core/recurrence.py):
+# a bad rule would otherwise be stored and break every calendar that expands it
+FORBIDDEN_FREQUENCIES = ("SECONDLY", "MINUTELY")
+
+def check_rrule(value: Optional[str]) -> Optional[str]:
+    text = (value or "").strip()
+    if not text:
+        return value
+    upper = text.upper()
+    if "\n" in text or "DTSTART" in upper:
+        raise ValueError("Solo una regla RRULE, sin DTSTART: la primera ocurrencia es la fecha de inicio.")
+    if any(f"FREQ={freq}" in upper for freq in FORBIDDEN_FREQUENCIES):
+        raise ValueError("La repetición mínima es cada hora.")
+    if upper.startswith("RRULE:"):
+        text = text[len("RRULE:"):]
+    parts = dict(part.partition("=")[::2] for part in text.upper().split(";"))
+    try:
+        if int(parts.get("INTERVAL", "1")) < 1:
+            raise ValueError("INTERVAL debe ser 1 o más")
+        rrulestr(text, dtstart=datetime(2000, 1, 1), cache=False)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Regla de repetición no válida: {exc}")
+    return value
+
+# recurrencia fields of the request models
+RRule = Annotated[str, AfterValidator(check_rrule)]
+OptionalRRule = Annotated[Optional[str], AfterValidator(check_rrule)]
@@ -2,6 +2,9 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import date, datetime
 
+# Fields that make up the geocoded address: changing them invalidates lat/lon
+ADDRESS_FIELDS = {"direccion", "numero", "codigo_postal", "provincia", "pais"}
+
 class SociaBase(BaseModel):
     numero_socia: str
     nombre: str
@@ -15,11 +18,15 @@ class SociaBase(BaseModel):
     provincia: Optional[str] = None
     codigo_postal: Optional[str] = None
     pais: Optional[str] = "España"
+    lat: Optional[float] = None
+    lon: Optional[float] = None
     nacimiento: Optional[date] = None
     pagado: bool = False
     descripcion: Optional[str] = None
 
 class SociaCreate(SociaBase):
+    # Without a number the repository takes the next one from the association's sequence
+    numero_socia: Optional[str] = None
     asociacion_id: int
 
 class SociaUpdate(BaseModel):
@@ -35,6 +42,8 @@ class SociaUpdate(BaseModel):
     provincia: Optional[str] = None
     codigo_postal: Optional[str] = None
     pais: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
     nacimiento: Optional[date] = None
     pagado: Optional[bool] = None
     descripcion: Optional[str] = None
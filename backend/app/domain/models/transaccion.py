@@ -25,6 +25,9 @@ class TransaccionBase(BaseModel):
     drive_file_link: Optional[str] = None
     drive_file_name: Optional[str] = None
 
+    # Local attachment store (content-addressed)
+    adjunto_sha256: Optional[str] = None
+
 class TransaccionCreate(TransaccionBase):
     asociacion_id: int
 
@@ -41,6 +44,7 @@ class TransaccionUpdate(BaseModel):
     drive_file_id: Optional[str] = None
     drive_file_link: Optional[str] = None
     drive_file_name: Optional[str] = None
+    adjunto_sha256: Optional[str] = None
 
 class Transaccion(TransaccionBase):
     id: int
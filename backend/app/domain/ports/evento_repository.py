@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from app.domain.models.evento import Evento, EventoCreate, EventoUpdate
 
@@ -8,7 +9,8 @@ class EventoRepository(ABC):
         pass
 
     @abstractmethod
-    def list_by_association(self, asociacion_id: int) -> List[Evento]:
+    def list_by_association(self, asociacion_id: int, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Evento]:
+        """With desde/hasta: only what can show up in that window (recurring ones always)"""
         pass
 
     @abstractmethod
@@ -22,3 +24,24 @@ class EventoRepository(ABC):
     @abstractmethod
     def delete(self, evento_id: int) -> bool:
         pass
+
+class AsyncEventoRepository(ABC):
+    @abstractmethod
+    async def get_by_id(self, evento_id: int) -> Optional[Evento]:
+        pass
+
+    @abstractmethod
+    async def list_by_association(self, asociacion_id: int, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Evento]:
+        pass
+
+    @abstractmethod
+    async def create(self, evento: EventoCreate) -> Evento:
+        pass
+
+    @abstractmethod
+    async def update(self, evento_id: int, evento: EventoUpdate) -> Optional[Evento]:
+        pass
+
+    @abstractmethod
+    async def delete(self, evento_id: int) -> bool:
+        pass
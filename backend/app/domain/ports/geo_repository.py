@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Sequence, Tuple
+from app.domain.models.geo import PuntoCercano
+
+# Point layers of the neighbourhood map
+LAYERS = ("lugares", "socias", "eventos")
+# Layers with a spatial index (R*Tree / GiST) for nearest and radius queries
+SPATIAL_LAYERS = ("lugares", "socias")
+
+class GeoRepository(ABC):
+    @abstractmethod
+    def grid(self, asociacion_id: int, layer: str, lon_edges: Sequence[float], lat_edges: Sequence[float]) -> List[dict]:
+        """Points grouped by grid cell: col, row, count, lat/lon centroid and the id/nombre of one point"""
+        pass
+
+    @abstractmethod
+    def points(self, asociacion_id: int, layer: str, west: float, south: float, east: float, north: float, limit: int) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def within_radius(self, asociacion_id: int, layer: str, lat: float, lon: float, radius_m: float, limit: int) -> List[PuntoCercano]:
+        """Points within radius_m metres, closest first"""
+        pass
+
+    @abstractmethod
+    def nearest(self, asociacion_id: int, layer: str, lat: float, lon: float, k: int, max_radius_m: float) -> List[PuntoCercano]:
+        """The k closest points, none further than max_radius_m"""
+        pass
+
+    @abstractmethod
+    def coordinates(self, asociacion_id: int, layer: str, ids: Iterable[int]) -> List[Tuple[float, float]]:
+        """(lat, lon) of the given rows that have coordinates"""
+        pass
+
+class AsyncGeoRepository(ABC):
+    @abstractmethod
+    async def grid(self, asociacion_id: int, layer: str, lon_edges: Sequence[float], lat_edges: Sequence[float]) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def points(self, asociacion_id: int, layer: str, west: float, south: float, east: float, north: float, limit: int) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def within_radius(self, asociacion_id: int, layer: str, lat: float, lon: float, radius_m: float, limit: int) -> List[PuntoCercano]:
+        pass
+
+    @abstractmethod
+    async def nearest(self, asociacion_id: int, layer: str, lat: float, lon: float, k: int, max_radius_m: float) -> List[PuntoCercano]:
+        pass
+
+    @abstractmethod
+    async def coordinates(self, asociacion_id: int, layer: str, ids: Iterable[int]) -> List[Tuple[float, float]]:
+        pass
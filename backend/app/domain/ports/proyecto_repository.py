@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import date
 from typing import List, Optional
 from app.domain.models.proyecto import Proyecto, ProyectoCreate, ProyectoUpdate
 
@@ -8,7 +9,8 @@ class ProyectoRepository(ABC):
         pass
 
     @abstractmethod
-    def list_by_association(self, asociacion_id: int) -> List[Proyecto]:
+    def list_by_association(self, asociacion_id: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[Proyecto]:
+        """With desde/hasta: only what can show up in that window (recurring ones always)"""
         pass
 
     @abstractmethod
@@ -22,3 +24,24 @@ class ProyectoRepository(ABC):
     @abstractmethod
     def delete(self, proyecto_id: int) -> bool:
         pass
+
+class AsyncProyectoRepository(ABC):
+    @abstractmethod
+    async def get_by_id(self, proyecto_id: int) -> Optional[Proyecto]:
+        pass
+
+    @abstractmethod
+    async def list_by_association(self, asociacion_id: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[Proyecto]:
+        pass
+
+    @abstractmethod
+    async def create(self, proyecto: ProyectoCreate) -> Proyecto:
+        pass
+
+    @abstractmethod
+    async def update(self, proyecto_id: int, proyecto: ProyectoUpdate) -> Optional[Proyecto]:
+        pass
+
+    @abstractmethod
+    async def delete(self, proyecto_id: int) -> bool:
+        pass
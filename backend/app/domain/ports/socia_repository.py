@@ -22,3 +22,24 @@ class SociaRepository(ABC):
     @abstractmethod
     def delete(self, socia_id: int) -> bool:
         pass
+
+class AsyncSociaRepository(ABC):
+    @abstractmethod
+    async def get_by_id(self, socia_id: int) -> Optional[Socia]:
+        pass
+
+    @abstractmethod
+    async def list_by_association(self, asociacion_id: int) -> List[Socia]:
+        pass
+
+    @abstractmethod
+    async def create(self, socia: SociaCreate) -> Socia:
+        pass
+
+    @abstractmethod
+    async def update(self, socia_id: int, socia: SociaUpdate) -> Optional[Socia]:
+        pass
+
+    @abstractmethod
+    async def delete(self, socia_id: int) -> bool:
+        pass
@@ -22,3 +22,24 @@ class TransaccionRepository(ABC):
     @abstractmethod
     def delete(self, transaccion_id: int) -> bool:
         pass
+
+class AsyncTransaccionRepository(ABC):
+    @abstractmethod
+    async def get_by_id(self, transaccion_id: int) -> Optional[Transaccion]:
+        pass
+
+    @abstractmethod
+    async def list_by_association(self, asociacion_id: int) -> List[Transaccion]:
+        pass
+
+    @abstractmethod
+    async def create(self, transaccion: TransaccionCreate) -> Transaccion:
+        pass
+
+    @abstractmethod
+    async def update(self, transaccion_id: int, transaccion: TransaccionUpdate) -> Optional[Transaccion]:
+        pass
+
+    @abstractmethod
+    async def delete(self, transaccion_id: int) -> bool:
+        pass
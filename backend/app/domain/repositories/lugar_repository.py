@@ -11,6 +11,28 @@ class LugarRepository(ABC):
     def search_by_name(self, query: str, asociacion_id: int) -> List[Lugar]:
         pass
 
+    @abstractmethod
+    def suggest(self, query: str, asociacion_id: int, limit: int) -> List[Lugar]:
+        """Lugares whose name or address match, for address autocomplete"""
+        pass
+
     @abstractmethod
     def save(self, lugar: LugarCreate) -> Lugar:
         pass
+
+class AsyncLugarRepository(ABC):
+    @abstractmethod
+    async def find_by_name(self, nombre: str, asociacion_id: int) -> Optional[Lugar]:
+        pass
+
+    @abstractmethod
+    async def search_by_name(self, query: str, asociacion_id: int) -> List[Lugar]:
+        pass
+
+    @abstractmethod
+    async def suggest(self, query: str, asociacion_id: int, limit: int) -> List[Lugar]:
+        pass
+
+    @abstractmethod
+    async def save(self, lugar: LugarCreate) -> Lugar:
+        pass
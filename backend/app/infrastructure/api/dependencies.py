@@ -0,0 +1,13 @@
+from inspect import iscoroutinefunction
+from starlette.concurrency import run_in_threadpool
+
+
+async def call_service(method, *args, **kwargs):
+    """
+    Calls a service method from an async route.
+    Async services (ASYNC_DB=true) are awaited on the event loop; sync ones run
+    in the threadpool, exactly as FastAPI does for plain `def` routes.
+    """
+    if iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.infrastructure.external_services.attachment_store import (
+    AttachmentStore, generate_previews, get_preview_executor
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/adjuntos",
+    tags=["adjuntos"]
+)
+
+attachment_store = AttachmentStore()
+
+# Content-addressed files never change, so clients may cache them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _cached_file_response(request: Request, path: str, sha256: str, media_type: str, filename: str = None):
+    etag = f'"{sha256}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="inline",
+        headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
+
+
+@router.post("/", status_code=201)
+async def upload_adjunto(file: UploadFile = File(...)):
+    content = await file.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Archivo vacío")
+
+    stored = await run_in_threadpool(attachment_store.save, content, file.filename, file.content_type)
+
+    variants = attachment_store.available_variants(stored.sha256)
+    if attachment_store.is_image(stored.content_type) and not variants:
+        try:
+            loop = asyncio.get_running_loop()
+            generated = await loop.run_in_executor(
+                get_preview_executor(),
+                generate_previews,
+                attachment_store.original_path(stored.sha256),
+                attachment_store.directory_for(stored.sha256),
+            )
+            variants = list(generated.keys())
+        except Exception:
+            # A broken image must not make the upload fail; it just has no preview
+            logger.exception("Could not generate previews for %s", stored.sha256)
+
+    return {
+        "sha256": stored.sha256,
+        "filename": stored.filename,
+        "content_type": stored.content_type,
+        "size": stored.size,
+        "created": stored.created,
+        "variants": variants,
+    }
+
+
+@router.get("/{sha256}")
+def get_adjunto(sha256: str, request: Request):
+    if not attachment_store.exists(sha256):
+        raise HTTPException(status_code=404, detail="Adjunto no encontrado")
+
+    meta = attachment_store.metadata(sha256)
+    return _cached_file_response(
+        request,
+        attachment_store.original_path(sha256),
+        sha256,
+        meta.get("content_type", "application/octet-stream"),
+        meta.get("filename"),
+    )
+
+
+@router.get("/{sha256}/{variant}")
+def get_adjunto_variant(sha256: str, variant: str, request: Request):
+    if not attachment_store.exists(sha256):
+        raise HTTPException(status_code=404, detail="Adjunto no encontrado")
+
+    path = attachment_store.variant_path(sha256, variant)
+    if not path or variant not in attachment_store.available_variants(sha256):
+        raise HTTPException(status_code=404, detail="Vista previa no disponible")
+
+    return _cached_file_response(request, path, f"{sha256}-{variant}", "image/jpeg")
@@ -0,0 +1,92 @@
+import logging
+import os
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.domain.models.lugar import Lugar
+from app.infrastructure.persistence.async_database import USE_ASYNC_DB
+from app.infrastructure.persistence.sharding import get_tenant_db, get_tenant_async_db
+from app.infrastructure.persistence.repositories.lugar_repository_impl import SqlAlchemyLugarRepository
+from app.infrastructure.external_services.geoapify_autocomplete import (
+    AutocompleteError, GeoapifyAutocomplete, empty_collection, normalize_prefix,
+)
+from app.infrastructure.api.dependencies import call_service
+
+router = APIRouter(
+    prefix="/direcciones",
+    tags=["direcciones"]
+)
+
+# Shared by every request: the cache and the in-flight queries live here
+autocomplete = GeoapifyAutocomplete()
+
+logger = logging.getLogger(__name__)
+
+# Shorter prefixes match half the country: not worth an external call
+AUTOCOMPLETE_MIN_CHARS = int(os.getenv("AUTOCOMPLETE_MIN_CHARS", "3"))
+
+if USE_ASYNC_DB:
+    from app.infrastructure.persistence.repositories.lugar_repository_async_impl import AsyncSqlAlchemyLugarRepository
+
+    def get_lugar_repository(db = Depends(get_tenant_async_db)) -> AsyncSqlAlchemyLugarRepository:
+        return AsyncSqlAlchemyLugarRepository(db)
+else:
+    def get_lugar_repository(db: Session = Depends(get_tenant_db)) -> SqlAlchemyLugarRepository:
+        return SqlAlchemyLugarRepository(db)
+
+
+def lugar_feature(lugar: Lugar) -> dict:
+    """A lugar of the association in the shape the Geoapify widget expects"""
+    properties = {
+        "source": "asociacion",
+        "lugar_id": lugar.id,
+        "name": lugar.nombre,
+        # The forms copy `formatted` into their address field
+        "formatted": lugar.direccion or lugar.nombre,
+        "address_line1": lugar.nombre,
+        "address_line2": lugar.direccion or "",
+        "result_type": "amenity",
+        "lat": lugar.lat,
+        "lon": lugar.lon,
+    }
+    geometry = None
+    if lugar.lat is not None and lugar.lon is not None:
+        geometry = {"type": "Point", "coordinates": [lugar.lon, lugar.lat]}
+    return {"type": "Feature", "geometry": geometry, "properties": properties}
+
+
+@router.get("/autocompletar")
+async def autocompletar(
+    text: str = Query(..., min_length=1, max_length=200),
+    asociacion_id: int = Query(...),
+    limit: int = Query(5, ge=1, le=20),
+    type: Optional[str] = Query(None),
+    lang: Optional[str] = Query(None),
+    filter: Optional[str] = Query(None),
+    bias: Optional[str] = Query(None),
+    repo = Depends(get_lugar_repository)
+):
+    """
+    Address suggestions for the forms: the association's own lugares first,
+    then Geoapify (cached and coalesced) to fill up to `limit`.
+    """
+    lugares = await call_service(repo.suggest, text.strip(), asociacion_id, limit)
+    collection = empty_collection()
+    collection["features"] = [lugar_feature(lugar) for lugar in lugares]
+
+    missing = limit - len(lugares)
+    if missing <= 0 or len(normalize_prefix(text)) < AUTOCOMPLETE_MIN_CHARS or not autocomplete.available:
+        return collection
+
+    params = {"type": type, "limit": limit, "lang": lang, "filter": filter, "bias": bias}
+    try:
+        external = await autocomplete.suggest(text, params)
+    except AutocompleteError as exc:
+        # Without Geoapify the form still gets the association's lugares
+        logger.warning("Autocompletado de direcciones sin Geoapify: %s", exc)
+        return collection
+
+    collection["features"].extend(external["features"][:missing])
+    if "query" in external:
+        collection["query"] = external["query"]
+    return collection
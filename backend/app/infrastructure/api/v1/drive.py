@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+import os
+import logging
+import datetime
+import threading
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 
+from app.infrastructure.persistence import database
 from app.infrastructure.persistence.database import get_db
 from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
 from app.infrastructure.external_services.google_drive_service import GoogleDriveService
@@ -15,6 +20,15 @@ router = APIRouter(
 # Initialize service (will warn if credentials missing but won't crash app startup)
 drive_service = GoogleDriveService()
 
+logger = logging.getLogger(__name__)
+
+# Seconds the cached folder name/link is considered fresh
+DRIVE_METADATA_TTL = int(os.getenv("DRIVE_METADATA_TTL", "3600"))
+
+# Associations with a metadata refresh already in flight (avoids piling up Drive calls)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
 class DriveConfig(BaseModel):
     asociacion_id: int
     folder_id: str
@@ -27,6 +41,66 @@ class CreateFolderRequest(BaseModel):
     asociacion_id: int
     folder_name: str
 
+def _store_folder_metadata(asociacion: AsociacionVecinalModel, metadata: dict):
+    asociacion.drive_folder_name = metadata.get('name')
+    asociacion.drive_folder_link = metadata.get('webViewLink')
+    asociacion.drive_metadata_updated_at = datetime.datetime.utcnow()
+
+
+def _clear_folder_metadata(asociacion: AsociacionVecinalModel):
+    asociacion.drive_folder_name = None
+    asociacion.drive_folder_link = None
+    asociacion.drive_metadata_updated_at = None
+
+
+def _metadata_is_stale(asociacion: AsociacionVecinalModel) -> bool:
+    if not asociacion.drive_folder_id or not asociacion.drive_credentials:
+        return False
+    if asociacion.drive_metadata_updated_at is None:
+        return True
+    age = datetime.datetime.utcnow() - asociacion.drive_metadata_updated_at
+    return age.total_seconds() > DRIVE_METADATA_TTL
+
+
+def refresh_folder_metadata(asociacion_id: int):
+    """
+    Fetches the folder name/link from Drive and caches it on the association row.
+    Runs as a background task with its own session, so a slow Drive API never
+    blocks the request that triggered it.
+    """
+    with _refreshing_lock:
+        if asociacion_id in _refreshing:
+            return
+        _refreshing.add(asociacion_id)
+
+    db = database.SessionLocal()
+    try:
+        asociacion = db.query(AsociacionVecinalModel).filter(AsociacionVecinalModel.id == asociacion_id).first()
+        if not asociacion or not asociacion.drive_folder_id or not asociacion.drive_credentials:
+            return
+
+        folder_id = asociacion.drive_folder_id
+        metadata = drive_service.get_file_metadata(asociacion.drive_credentials, folder_id)
+        if not metadata:
+            # Keep the last known values; we will retry once the TTL expires again
+            logger.warning("Could not refresh Drive folder metadata for asociacion %s", asociacion_id)
+            return
+
+        db.refresh(asociacion)
+        if asociacion.drive_folder_id != folder_id:
+            # The folder changed while we were talking to Drive
+            return
+
+        _store_folder_metadata(asociacion, metadata)
+        db.commit()
+    except Exception:
+        logger.exception("Error refreshing Drive folder metadata for asociacion %s", asociacion_id)
+        db.rollback()
+    finally:
+        db.close()
+        with _refreshing_lock:
+            _refreshing.discard(asociacion_id)
+
 @router.get("/auth/url")
 def get_auth_url():
     try:
@@ -62,30 +136,38 @@ def list_folders(asociacion_id: int, parent_id: Optional[str] = None, db: Sessio
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/config")
-def configure_drive(config: DriveConfig, db: Session = Depends(get_db)):
+def configure_drive(config: DriveConfig, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     asociacion = db.query(AsociacionVecinalModel).filter(AsociacionVecinalModel.id == config.asociacion_id).first()
     if not asociacion:
         raise HTTPException(status_code=404, detail="Asociación no encontrada")
 
+    if asociacion.drive_folder_id != config.folder_id:
+        _clear_folder_metadata(asociacion)
     asociacion.drive_folder_id = config.folder_id
     db.commit()
+
+    if asociacion.drive_credentials:
+        background_tasks.add_task(refresh_folder_metadata, asociacion.id)
     return {"status": "success", "folder_id": config.folder_id}
 
 @router.get("/config/{asociacion_id}")
-def get_drive_config(asociacion_id: int, db: Session = Depends(get_db)):
+def get_drive_config(asociacion_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     asociacion = db.query(AsociacionVecinalModel).filter(AsociacionVecinalModel.id == asociacion_id).first()
     if not asociacion:
         raise HTTPException(status_code=404, detail="Asociación no encontrada")
 
-    folder_metadata = {}
-    if asociacion.drive_folder_id and asociacion.drive_credentials:
-        folder_metadata = drive_service.get_file_metadata(asociacion.drive_credentials, asociacion.drive_folder_id)
+    # Answer from the cached columns; Drive is only hit in the background
+    stale = _metadata_is_stale(asociacion)
+    if stale:
+        background_tasks.add_task(refresh_folder_metadata, asociacion.id)
 
     return {
         "drive_folder_id": asociacion.drive_folder_id,
         "is_connected": bool(asociacion.drive_credentials),
-        "folder_name": folder_metadata.get('name'),
-        "folder_link": folder_metadata.get('webViewLink')
+        "folder_name": asociacion.drive_folder_name,
+        "folder_link": asociacion.drive_folder_link,
+        "metadata_updated_at": asociacion.drive_metadata_updated_at,
+        "metadata_stale": stale
     }
 
 @router.get("/files")
@@ -143,6 +225,7 @@ def create_folder(data: CreateFolderRequest, db: Session = Depends(get_db)):
 
         # Auto-configure as base folder
         asociacion.drive_folder_id = folder['id']
+        _store_folder_metadata(asociacion, folder)
         db.commit()
 
         return {"status": "success", "folder": folder}
@@ -156,35 +239,26 @@ async def upload_transaction_file(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    print(f"DEBUG: Upload request received. Asoc: {asociacion_id}, Trans: {transaction_id}, File: {file.filename}")
+    logger.debug("Upload request: asociacion=%s transaccion=%s file=%s", asociacion_id, transaction_id, file.filename)
     asociacion = db.query(AsociacionVecinalModel).filter(AsociacionVecinalModel.id == asociacion_id).first()
     if not asociacion:
-        print("DEBUG: Asociacion not found")
         raise HTTPException(status_code=404, detail="Asociación no encontrada")
 
     if not asociacion.drive_folder_id or not asociacion.drive_credentials:
-        print("DEBUG: Drive not configured")
         raise HTTPException(status_code=400, detail="Drive no configurado")
 
     try:
         # Ensure folder structure: Transacciones / {transaction_id}
         folder_path = ['Transacciones', str(transaction_id)]
-        print(f"DEBUG: Ensuring folder path: {folder_path} in root {asociacion.drive_folder_id}")
-
         target_folder_id = drive_service.ensure_folder_path(
             asociacion.drive_credentials,
             folder_path,
             asociacion.drive_folder_id
         )
-        print(f"DEBUG: Target folder ID: {target_folder_id}")
 
-        # Upload file
-        print(f"DEBUG: Uploading file {file.filename}...")
         uploaded_file = drive_service.upload_file(asociacion.drive_credentials, file, target_folder_id)
-        print(f"DEBUG: File uploaded: {uploaded_file}")
+        logger.info("Uploaded %s to Drive folder %s (asociacion %s)", file.filename, target_folder_id, asociacion_id)
         return uploaded_file
     except Exception as e:
-        print(f"DEBUG: Error uploading file: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error uploading %s to Drive (asociacion %s)", file.filename, asociacion_id)
         raise HTTPException(status_code=500, detail=str(e))
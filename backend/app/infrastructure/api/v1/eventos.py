@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from app.infrastructure.persistence.database import get_db
+from app.infrastructure.persistence.async_database import USE_ASYNC_DB
+from app.infrastructure.persistence.sharding import get_tenant_db, get_tenant_async_db
 from app.infrastructure.persistence.repositories.evento_repository_impl import SqlAlchemyEventoRepository
 from app.infrastructure.persistence.repositories.lugar_repository_impl import SqlAlchemyLugarRepository
-from app.application.services.evento_service import EventoService
+from app.application.services.evento_service import EventoService, AsyncEventoService
+from app.infrastructure.api.dependencies import call_service
 from app.domain.models.evento import Evento, EventoCreate, EventoUpdate
 
 router = APIRouter(
@@ -13,51 +16,63 @@ router = APIRouter(
     tags=["eventos"]
 )
 
-def get_evento_service(db: Session = Depends(get_db)) -> EventoService:
-    repository = SqlAlchemyEventoRepository(db)
-    lugar_repository = SqlAlchemyLugarRepository(db)
-    return EventoService(repository, lugar_repository)
+if USE_ASYNC_DB:
+    from app.infrastructure.persistence.repositories.evento_repository_async_impl import AsyncSqlAlchemyEventoRepository
+    from app.infrastructure.persistence.repositories.lugar_repository_async_impl import AsyncSqlAlchemyLugarRepository
+
+    def get_evento_service(db = Depends(get_tenant_async_db)) -> AsyncEventoService:
+        repository = AsyncSqlAlchemyEventoRepository(db)
+        lugar_repository = AsyncSqlAlchemyLugarRepository(db)
+        return AsyncEventoService(repository, lugar_repository)
+else:
+    def get_evento_service(db: Session = Depends(get_tenant_db)) -> EventoService:
+        repository = SqlAlchemyEventoRepository(db)
+        lugar_repository = SqlAlchemyLugarRepository(db)
+        return EventoService(repository, lugar_repository)
 
 @router.post("/", response_model=Evento, status_code=status.HTTP_201_CREATED)
-def create_evento(
+async def create_evento(
     evento: EventoCreate,
     service: EventoService = Depends(get_evento_service)
 ):
-    return service.create_evento(evento)
+    return await call_service(service.create_evento, evento)
 
 @router.get("/", response_model=List[Evento])
-def list_eventos(
+async def list_eventos(
     asociacion_id: int,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
     service: EventoService = Depends(get_evento_service)
 ):
-    return service.list_eventos_by_association(asociacion_id)
+    """With desde/hasta, only the eventos of that window plus the recurring ones"""
+    return await call_service(service.list_eventos_by_association, asociacion_id, desde, hasta)
 
 @router.get("/{evento_id}", response_model=Evento)
-def get_evento(
+async def get_evento(
     evento_id: int,
     service: EventoService = Depends(get_evento_service)
 ):
-    evento = service.get_evento(evento_id)
+    evento = await call_service(service.get_evento, evento_id)
     if not evento:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evento not found")
     return evento
 
 @router.put("/{evento_id}", response_model=Evento)
-def update_evento(
+async def update_evento(
     evento_id: int,
     evento_update: EventoUpdate,
     service: EventoService = Depends(get_evento_service)
 ):
-    evento = service.update_evento(evento_id, evento_update)
+    evento = await call_service(service.update_evento, evento_id, evento_update)
     if not evento:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evento not found")
     return evento
 
 @router.delete("/{evento_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_evento(
+async def delete_evento(
     evento_id: int,
     service: EventoService = Depends(get_evento_service)
 ):
-    success = service.delete_evento(evento_id)
+    success = await call_service(service.delete_evento, evento_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evento not found")
@@ -2,9 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.infrastructure.persistence.database import get_db
+from app.infrastructure.persistence.async_database import USE_ASYNC_DB
+from app.infrastructure.persistence.sharding import get_tenant_db, get_tenant_async_db
 from app.infrastructure.persistence.repositories.transaccion_repository_impl import SqlAlchemyTransaccionRepository
-from app.application.services.transaccion_service import TransaccionService
+from app.application.services.transaccion_service import TransaccionService, AsyncTransaccionService
+from app.infrastructure.api.dependencies import call_service
 from app.domain.models.transaccion import Transaccion, TransaccionCreate, TransaccionUpdate
 
 router = APIRouter(
@@ -12,50 +14,57 @@ router = APIRouter(
     tags=["finanzas"]
 )
 
-def get_transaccion_service(db: Session = Depends(get_db)) -> TransaccionService:
-    repository = SqlAlchemyTransaccionRepository(db)
-    return TransaccionService(repository)
+if USE_ASYNC_DB:
+    from app.infrastructure.persistence.repositories.transaccion_repository_async_impl import AsyncSqlAlchemyTransaccionRepository
+
+    def get_transaccion_service(db = Depends(get_tenant_async_db)) -> AsyncTransaccionService:
+        repository = AsyncSqlAlchemyTransaccionRepository(db)
+        return AsyncTransaccionService(repository)
+else:
+    def get_transaccion_service(db: Session = Depends(get_tenant_db)) -> TransaccionService:
+        repository = SqlAlchemyTransaccionRepository(db)
+        return TransaccionService(repository)
 
 @router.post("/", response_model=Transaccion, status_code=status.HTTP_201_CREATED)
-def create_transaccion(
+async def create_transaccion(
     transaccion: TransaccionCreate,
     service: TransaccionService = Depends(get_transaccion_service)
 ):
-    return service.create_transaccion(transaccion)
+    return await call_service(service.create_transaccion, transaccion)
 
 @router.get("/", response_model=List[Transaccion])
-def list_transacciones(
+async def list_transacciones(
     asociacion_id: int,
     service: TransaccionService = Depends(get_transaccion_service)
 ):
-    return service.list_transacciones_by_association(asociacion_id)
+    return await call_service(service.list_transacciones_by_association, asociacion_id)
 
 @router.get("/{transaccion_id}", response_model=Transaccion)
-def get_transaccion(
+async def get_transaccion(
     transaccion_id: int,
     service: TransaccionService = Depends(get_transaccion_service)
 ):
-    transaccion = service.get_transaccion(transaccion_id)
+    transaccion = await call_service(service.get_transaccion, transaccion_id)
     if not transaccion:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaccion not found")
     return transaccion
 
 @router.put("/{transaccion_id}", response_model=Transaccion)
-def update_transaccion(
+async def update_transaccion(
     transaccion_id: int,
     transaccion_update: TransaccionUpdate,
     service: TransaccionService = Depends(get_transaccion_service)
 ):
-    transaccion = service.update_transaccion(transaccion_id, transaccion_update)
+    transaccion = await call_service(service.update_transaccion, transaccion_id, transaccion_update)
     if not transaccion:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaccion not found")
     return transaccion
 
 @router.delete("/{transaccion_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_transaccion(
+async def delete_transaccion(
     transaccion_id: int,
     service: TransaccionService = Depends(get_transaccion_service)
 ):
-    success = service.delete_transaccion(transaccion_id)
+    success = await call_service(service.delete_transaccion, transaccion_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaccion not found")
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+
+from app.infrastructure.persistence.async_database import USE_ASYNC_DB
+from app.infrastructure.persistence.sharding import get_tenant_db, get_tenant_async_db
+from app.infrastructure.persistence.repositories.geo_repository_impl import SqlAlchemyGeoRepository
+from app.application.services.geo_service import GeoService, AsyncGeoService, MAX_ZOOM, TILE_TTL
+from app.infrastructure.api.dependencies import call_service
+from app.domain.models.geo import LugarSugerido, PuntoCercano
+from app.domain.ports.geo_repository import LAYERS
+
+router = APIRouter(
+    prefix="/geo",
+    tags=["geo"]
+)
+
+if USE_ASYNC_DB:
+    from app.infrastructure.persistence.repositories.geo_repository_async_impl import AsyncSqlAlchemyGeoRepository
+
+    def get_geo_service(db = Depends(get_tenant_async_db)) -> AsyncGeoService:
+        return AsyncGeoService(AsyncSqlAlchemyGeoRepository(db))
+else:
+    def get_geo_service(db: Session = Depends(get_tenant_db)) -> GeoService:
+        return GeoService(SqlAlchemyGeoRepository(db))
+
+
+def _parse_bbox(bbox: str):
+    try:
+        west, south, east, north = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="bbox debe ser minLon,minLat,maxLon,maxLat")
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="bbox fuera de rango")
+    return west, south, east, north
+
+
+def _parse_layers(layers: str):
+    requested = [layer for layer in layers.split(",") if layer]
+    unknown = set(requested) - set(LAYERS)
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Capas desconocidas: {', '.join(sorted(unknown))}")
+    return requested
+
+
+@router.get("")
+async def geojson(
+    response: Response,
+    asociacion_id: int = Query(...),
+    bbox: str = Query(..., description="minLon,minLat,maxLon,maxLat"),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM),
+    layers: str = Query(",".join(LAYERS)),
+    service: GeoService = Depends(get_geo_service)
+):
+    """
+    GeoJSON FeatureCollection of the association's points in the tiles covering bbox.
+    Below GEO_MAX_CLUSTER_ZOOM nearby points come as one feature with cluster/point_count.
+    """
+    try:
+        collection = await call_service(service.feature_collection, asociacion_id, _parse_bbox(bbox), zoom, _parse_layers(layers))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response.headers["Cache-Control"] = f"private, max-age={TILE_TTL}"
+    return collection
+
+
+@router.get("/cercanos", response_model=List[PuntoCercano])
+async def cercanos(
+    asociacion_id: int = Query(...),
+    layer: Literal["lugares", "socias"] = Query(...),
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=1000),
+    radio: Optional[float] = Query(None, gt=0, le=100000, description="metros"),
+    service: GeoService = Depends(get_geo_service)
+):
+    """The k closest lugares/socias to a point, or all those within `radio` metres (up to k), closest first"""
+    return await call_service(service.nearby, asociacion_id, layer, lat, lon, k, radio)
+
+
+@router.get("/lugares-sugeridos", response_model=List[LugarSugerido])
+async def lugares_sugeridos(
+    asociacion_id: int = Query(...),
+    socias: List[int] = Query(...),
+    k: int = Query(5, ge=1, le=50),
+    service: GeoService = Depends(get_geo_service)
+):
+    """Venues closest on average to the given socias (the participants of an event)"""
+    return await call_service(service.suggest_lugares, asociacion_id, socias, k)
@@ -1,20 +1,30 @@
 from fastapi import APIRouter, Depends, Query
 from typing import List
 from sqlalchemy.orm import Session
-from app.infrastructure.persistence.database import get_db
+from app.infrastructure.persistence.async_database import USE_ASYNC_DB
+from app.infrastructure.persistence.sharding import get_tenant_db, get_tenant_async_db
 from app.infrastructure.persistence.repositories.lugar_repository_impl import SqlAlchemyLugarRepository
 from app.domain.models.lugar import Lugar
+from app.infrastructure.api.dependencies import call_service
 
 router = APIRouter(
     prefix="/lugares",
     tags=["lugares"]
 )
 
+if USE_ASYNC_DB:
+    from app.infrastructure.persistence.repositories.lugar_repository_async_impl import AsyncSqlAlchemyLugarRepository
+
+    def get_lugar_repository(db = Depends(get_tenant_async_db)) -> AsyncSqlAlchemyLugarRepository:
+        return AsyncSqlAlchemyLugarRepository(db)
+else:
+    def get_lugar_repository(db: Session = Depends(get_tenant_db)) -> SqlAlchemyLugarRepository:
+        return SqlAlchemyLugarRepository(db)
+
 @router.get("/buscar", response_model=List[Lugar])
-def buscar_lugares(
+async def buscar_lugares(
     q: str = Query(..., min_length=1),
     asociacion_id: int = Query(...),
-    db: Session = Depends(get_db)
+    repo = Depends(get_lugar_repository)
 ):
-    repo = SqlAlchemyLugarRepository(db)
-    return repo.search_by_name(q, asociacion_id)
+    return await call_service(repo.search_by_name, q, asociacion_id)
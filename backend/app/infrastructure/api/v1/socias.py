@@ -2,9 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.infrastructure.persistence.database import get_db
+from app.infrastructure.persistence.async_database import USE_ASYNC_DB
+from app.infrastructure.persistence.sharding import get_tenant_db, get_tenant_async_db
 from app.infrastructure.persistence.repositories.socia_repository_impl import SqlAlchemySociaRepository
-from app.application.services.socia_service import SociaService
+from app.application.services.socia_service import SociaService, AsyncSociaService
+from app.infrastructure.api.dependencies import call_service
 from app.domain.models.socia import Socia, SociaCreate, SociaUpdate
 
 router = APIRouter(
@@ -12,50 +14,57 @@ router = APIRouter(
     tags=["socias"]
 )
 
-def get_socia_service(db: Session = Depends(get_db)) -> SociaService:
-    repository = SqlAlchemySociaRepository(db)
-    return SociaService(repository)
+if USE_ASYNC_DB:
+    from app.infrastructure.persistence.repositories.socia_repository_async_impl import AsyncSqlAlchemySociaRepository
+
+    def get_socia_service(db = Depends(get_tenant_async_db)) -> AsyncSociaService:
+        repository = AsyncSqlAlchemySociaRepository(db)
+        return AsyncSociaService(repository)
+else:
+    def get_socia_service(db: Session = Depends(get_tenant_db)) -> SociaService:
+        repository = SqlAlchemySociaRepository(db)
+        return SociaService(repository)
 
 @router.post("/", response_model=Socia, status_code=status.HTTP_201_CREATED)
-def create_socia(
+async def create_socia(
     socia: SociaCreate,
     service: SociaService = Depends(get_socia_service)
 ):
-    return service.create_socia(socia)
+    return await call_service(service.create_socia, socia)
 
 @router.get("/", response_model=List[Socia])
-def list_socias(
+async def list_socias(
     asociacion_id: int,
     service: SociaService = Depends(get_socia_service)
 ):
-    return service.list_socias_by_association(asociacion_id)
+    return await call_service(service.list_socias_by_association, asociacion_id)
 
 @router.get("/{socia_id}", response_model=Socia)
-def get_socia(
+async def get_socia(
     socia_id: int,
     service: SociaService = Depends(get_socia_service)
 ):
-    socia = service.get_socia(socia_id)
+    socia = await call_service(service.get_socia, socia_id)
     if not socia:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Socia not found")
     return socia
 
 @router.put("/{socia_id}", response_model=Socia)
-def update_socia(
+async def update_socia(
     socia_id: int,
     socia_update: SociaUpdate,
     service: SociaService = Depends(get_socia_service)
 ):
-    socia = service.update_socia(socia_id, socia_update)
+    socia = await call_service(service.update_socia, socia_id, socia_update)
     if not socia:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Socia not found")
     return socia
 
 @router.delete("/{socia_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_socia(
+async def delete_socia(
     socia_id: int,
     service: SociaService = Depends(get_socia_service)
 ):
-    success = service.delete_socia(socia_id)
+    success = await call_service(service.delete_socia, socia_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Socia not found")
@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+# Attachments live next to the backend unless ATTACHMENTS_DIR says otherwise
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+DEFAULT_ATTACHMENTS_DIR = os.path.join(BASE_DIR, "data", "adjuntos")
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Variant name -> max size (px) of the longest side
+PREVIEW_SIZES = {
+    "thumbnail": 256,
+    "preview": 1024,
+}
+
+IMAGE_CONTENT_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp", "image/bmp", "image/tiff"}
+
+
+@dataclass
+class StoredAttachment:
+    sha256: str
+    size: int
+    content_type: str
+    filename: str
+    created: bool
+
+
+def generate_previews(original_path: str, target_dir: str) -> Dict[str, str]:
+    """
+    Builds the thumbnail/preview JPEGs for an image.
+    Top-level function so it can run inside a ProcessPoolExecutor.
+    """
+    from PIL import Image, ImageOps
+
+    generated = {}
+    with Image.open(original_path) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        for variant, size in PREVIEW_SIZES.items():
+            copy = img.copy()
+            copy.thumbnail((size, size))
+            target = os.path.join(target_dir, f"{variant}.jpg")
+            fd, tmp_path = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp:
+                copy.save(tmp, format="JPEG", quality=85, optimize=True)
+            os.replace(tmp_path, target)
+            generated[variant] = target
+
+    return generated
+
+
+class AttachmentStore:
+    """
+    Content-addressed store for uploaded files (receipts, photos...).
+    Files are keyed by their SHA-256, so uploading the same file twice
+    only stores it once.
+
+    Layout: <root>/<sha[:2]>/<sha>/{original, meta.json, thumbnail.jpg, preview.jpg}
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("ATTACHMENTS_DIR", DEFAULT_ATTACHMENTS_DIR)
+
+    def is_valid_key(self, sha256: str) -> bool:
+        return bool(SHA256_RE.match(sha256 or ""))
+
+    def directory_for(self, sha256: str) -> str:
+        if not self.is_valid_key(sha256):
+            raise ValueError(f"Invalid attachment key: {sha256}")
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def original_path(self, sha256: str) -> str:
+        return os.path.join(self.directory_for(sha256), "original")
+
+    def variant_path(self, sha256: str, variant: str) -> Optional[str]:
+        if variant not in PREVIEW_SIZES:
+            return None
+        return os.path.join(self.directory_for(sha256), f"{variant}.jpg")
+
+    def exists(self, sha256: str) -> bool:
+        return self.is_valid_key(sha256) and os.path.exists(self.original_path(sha256))
+
+    def metadata(self, sha256: str) -> Dict[str, Any]:
+        meta_path = os.path.join(self.directory_for(sha256), "meta.json")
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def is_image(self, content_type: Optional[str]) -> bool:
+        return (content_type or "").lower() in IMAGE_CONTENT_TYPES
+
+    def save(self, content: bytes, filename: str, content_type: Optional[str]) -> StoredAttachment:
+        sha256 = hashlib.sha256(content).hexdigest()
+        content_type = content_type or "application/octet-stream"
+        target_dir = self.directory_for(sha256)
+        original = self.original_path(sha256)
+
+        if os.path.exists(original):
+            meta = self.metadata(sha256)
+            return StoredAttachment(
+                sha256=sha256,
+                size=len(content),
+                content_type=meta.get("content_type", content_type),
+                filename=meta.get("filename", filename),
+                created=False,
+            )
+
+        os.makedirs(target_dir, exist_ok=True)
+
+        # Write to a temp file and rename, so concurrent uploads of the same
+        # file never expose a half-written original
+        fd, tmp_path = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, original)
+
+        meta = {"filename": filename, "content_type": content_type, "size": len(content)}
+        fd, tmp_meta = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            json.dump(meta, tmp)
+        os.replace(tmp_meta, os.path.join(target_dir, "meta.json"))
+
+        return StoredAttachment(
+            sha256=sha256,
+            size=len(content),
+            content_type=content_type,
+            filename=filename,
+            created=True,
+        )
+
+    def available_variants(self, sha256: str) -> list:
+        return [v for v in PREVIEW_SIZES if os.path.exists(self.variant_path(sha256, v))]
+
+
+_preview_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_preview_executor() -> ProcessPoolExecutor:
+    """Shared process pool for thumbnail generation (created on first use)"""
+    global _preview_executor
+    if _preview_executor is None:
+        workers = int(os.getenv("ATTACHMENT_PREVIEW_WORKERS", "2"))
+        _preview_executor = ProcessPoolExecutor(max_workers=workers)
+    return _preview_executor
@@ -0,0 +1,137 @@
+"""
+Geoapify address autocomplete behind a shared cache.
+
+The browser widget used to call Geoapify on every keystroke with the API key
+in the page. Requests now go through the backend: the same normalized prefix
+(with the same lang/filter/bias/limit) is answered from an in-process LRU/TTL
+cache for every user, and identical queries arriving while the first one is
+still in flight wait for its answer instead of issuing their own request.
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GEOAPIFY_AUTOCOMPLETE_URL = "https://api.geoapify.com/v1/geocode/autocomplete"
+
+# Seconds a cached suggestion list is served; streets don't move
+AUTOCOMPLETE_CACHE_TTL = int(os.getenv("AUTOCOMPLETE_CACHE_TTL", "86400"))
+AUTOCOMPLETE_CACHE_SIZE = int(os.getenv("AUTOCOMPLETE_CACHE_SIZE", "5000"))
+AUTOCOMPLETE_TIMEOUT = float(os.getenv("AUTOCOMPLETE_TIMEOUT", "5"))
+
+# Widget parameters forwarded to Geoapify; the key is never taken from the client
+FORWARDED_PARAMS = ("type", "limit", "lang", "filter", "bias")
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+class AutocompleteError(Exception):
+    """Geoapify didn't answer (network, quota, key). Never cached"""
+
+
+def normalize_prefix(text: str) -> str:
+    """'  Calle  MAYOR ' and 'calle mayor' share the cache entry"""
+    return _SPACES_RE.sub(" ", text or "").strip().lower()
+
+
+def empty_collection() -> dict:
+    return {"type": "FeatureCollection", "features": []}
+
+
+class GeoapifyAutocomplete:
+
+    def __init__(self, api_key: Optional[str] = None, url: str = GEOAPIFY_AUTOCOMPLETE_URL,
+                 ttl: int = AUTOCOMPLETE_CACHE_TTL, max_entries: int = AUTOCOMPLETE_CACHE_SIZE,
+                 timeout: float = AUTOCOMPLETE_TIMEOUT, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.api_key = os.getenv("GEOAPIFY_API_KEY", "") if api_key is None else api_key
+        self.url = url
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.transport = transport
+        # key -> (expires, collection), least recently used first
+        self._cache: "OrderedDict[Tuple, Tuple[float, dict]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def cache_key(self, text: str, params: dict) -> Tuple:
+        return (normalize_prefix(text),) + tuple(str(params.get(name) or "") for name in FORWARDED_PARAMS)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    async def suggest(self, text: str, params: dict) -> dict:
+        """GeoJSON FeatureCollection as returned by Geoapify. Raises AutocompleteError"""
+        key = self.cache_key(text, params)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(key))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        # shield: a client that disconnects doesn't cancel the request others are waiting for
+        return await asyncio.shield(future)
+
+    def _cached(self, key: Tuple) -> Optional[dict]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, collection = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return collection
+
+    def _store(self, key: Tuple, collection: dict):
+        self._cache[key] = (time.monotonic() + self.ttl, collection)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _finished(self, key: Tuple, future: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self._store(key, future.result())
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # The connection pool belongs to the event loop that created it
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+            self._client_loop = loop
+        return self._client
+
+    async def _fetch(self, key: Tuple) -> dict:
+        text, *values = key
+        params = {"text": text, "apiKey": self.api_key}
+        params.update({name: value for name, value in zip(FORWARDED_PARAMS, values) if value})
+        try:
+            response = await self._get_client().get(self.url, params=params)
+        except httpx.HTTPError as exc:
+            raise AutocompleteError(f"Geoapify no responde: {exc}") from exc
+        if response.status_code != 200:
+            raise AutocompleteError(f"Geoapify respondió {response.status_code}")
+
+        data = response.json()
+        collection = empty_collection()
+        collection["features"] = data.get("features") or []
+        # The widget uses the parsed query to offer non-verified house numbers
+        if "query" in data:
+            collection["query"] = data["query"]
+        return collection
@@ -1,6 +1,7 @@
 import os
 import io
 import json
+import logging
 from typing import List, Optional, Dict, Any
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
@@ -8,6 +9,10 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 from fastapi import UploadFile
 
+from app.infrastructure.observability.metrics import observe_drive
+
+logger = logging.getLogger(__name__)
+
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
 class GoogleDriveService:
@@ -35,6 +40,7 @@ class GoogleDriveService:
         auth_url, _ = flow.authorization_url(prompt='consent')
         return auth_url
 
+    @observe_drive("exchange_code")
     def exchange_code(self, code: str) -> str:
         flow = Flow.from_client_secrets_file(
             self.client_secrets_path,
@@ -53,6 +59,7 @@ class GoogleDriveService:
         creds = Credentials.from_authorized_user_info(creds_dict, SCOPES)
         return build('drive', 'v3', credentials=creds)
 
+    @observe_drive("list_folders")
     def list_folders(self, credentials_json: str, parent_id: Optional[str] = None) -> List[Dict[str, Any]]:
         service = self.get_service(credentials_json)
         if not service:
@@ -70,6 +77,7 @@ class GoogleDriveService:
 
         return results.get('files', [])
 
+    @observe_drive("upload_file")
     def upload_file(self, credentials_json: str, file: UploadFile, parent_id: str) -> Dict[str, Any]:
         service = self.get_service(credentials_json)
         if not service:
@@ -92,6 +100,7 @@ class GoogleDriveService:
 
         return file_drive
 
+    @observe_drive("delete_file")
     def delete_file(self, credentials_json: str, file_id: str):
         service = self.get_service(credentials_json)
         if not service:
@@ -99,6 +108,7 @@ class GoogleDriveService:
 
         service.files().delete(fileId=file_id).execute()
 
+    @observe_drive("list_files_in_folder")
     def list_files_in_folder(self, credentials_json: str, folder_id: str) -> List[Dict[str, Any]]:
         service = self.get_service(credentials_json)
         if not service:
@@ -114,6 +124,7 @@ class GoogleDriveService:
 
         return results.get('files', [])
 
+    @observe_drive("create_folder")
     def create_folder(self, credentials_json: str, folder_name: str, parent_id: Optional[str] = None) -> Dict[str, Any]:
         service = self.get_service(credentials_json)
         if not service:
@@ -134,6 +145,7 @@ class GoogleDriveService:
 
         return file
 
+    @observe_drive("get_file_metadata")
     def get_file_metadata(self, credentials_json: str, file_id: str) -> Dict[str, Any]:
         service = self.get_service(credentials_json)
         if not service:
@@ -145,12 +157,13 @@ class GoogleDriveService:
         except Exception:
             return {}
 
+    @observe_drive("ensure_folder_path")
     def ensure_folder_path(self, credentials_json: str, path_parts: List[str], root_id: str) -> str:
         """
         Ensures a folder path exists starting from root_id.
         Returns the ID of the final folder.
         """
-        print(f"DEBUG: ensure_folder_path called with root_id={root_id}, parts={path_parts}")
+        logger.debug("ensure_folder_path root_id=%s parts=%s", root_id, path_parts)
         service = self.get_service(credentials_json)
         if not service:
             raise Exception("Google Drive service not initialized")
@@ -160,17 +173,15 @@ class GoogleDriveService:
         for folder_name in path_parts:
             # Check if folder exists in current parent
             query = f"mimeType = 'application/vnd.google-apps.folder' and '{current_parent_id}' in parents and name = '{folder_name}' and trashed = false"
-            print(f"DEBUG: Searching folder with query: {query}")
             results = service.files().list(q=query, fields="files(id)").execute()
             files = results.get('files', [])
 
             if files:
                 # Folder exists, use it
                 current_parent_id = files[0]['id']
-                print(f"DEBUG: Found existing folder '{folder_name}' with ID {current_parent_id}")
+                logger.debug("Found existing folder %r with ID %s", folder_name, current_parent_id)
             else:
                 # Create folder
-                print(f"DEBUG: Creating folder '{folder_name}' in parent {current_parent_id}")
                 file_metadata = {
                     'name': folder_name,
                     'mimeType': 'application/vnd.google-apps.folder',
@@ -178,7 +189,7 @@ class GoogleDriveService:
                 }
                 folder = service.files().create(body=file_metadata, fields='id').execute()
                 current_parent_id = folder['id']
-                print(f"DEBUG: Created folder '{folder_name}' with ID {current_parent_id}")
+                logger.info("Created folder %r with ID %s", folder_name, current_parent_id)
 
         return current_parent_id
 
@@ -0,0 +1,143 @@
+import os
+import time
+from functools import wraps
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+
+from app.infrastructure.observability.tracing import start_span
+
+# Protects /metrics when set (Authorization: Bearer <token>). Shared with Django.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Database queries are much faster than requests: finer buckets
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUESTS = Counter(
+    "asonet_backend_http_requests_total",
+    "HTTP requests served",
+    ["method", "route", "status"],
+)
+
+HTTP_LATENCY = Histogram(
+    "asonet_backend_http_request_duration_seconds",
+    "HTTP request latency per route",
+    ["method", "route"],
+)
+
+HTTP_IN_FLIGHT = Gauge(
+    "asonet_backend_http_requests_in_progress",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_QUERIES = Counter(
+    "asonet_backend_db_queries_total",
+    "SQL statements executed",
+    ["operation"],
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "asonet_backend_db_query_duration_seconds",
+    "SQL statement latency",
+    ["operation"],
+    buckets=QUERY_BUCKETS,
+)
+
+DRIVE_CALLS = Counter(
+    "asonet_backend_drive_calls_total",
+    "Google Drive API calls",
+    ["operation", "outcome"],
+)
+
+DRIVE_LATENCY = Histogram(
+    "asonet_backend_drive_call_duration_seconds",
+    "Google Drive API call latency",
+    ["operation"],
+)
+
+
+def route_template(scope) -> str:
+    """
+    /v1/socias/12 -> /v1/socias/{socia_id}. Built from the path parameters
+    because route.path is relative to its router on recent FastAPI versions.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    names = {str(value): name for name, value in (scope.get("path_params") or {}).items()}
+    return "/".join(f"{{{names[segment]}}}" if segment in names else segment for segment in path.split("/"))
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: latency, status and in-flight requests per route
+    template (/v1/socias/{socia_id}), so the label set stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.labels(method=method).inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.labels(method=method).dec()
+            route_label = route_template(scope)
+            HTTP_REQUESTS.labels(method=method, route=route_label, status=str(status["code"])).inc()
+            HTTP_LATENCY.labels(method=method, route=route_label).observe(elapsed)
+
+
+def statement_operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+def observe_drive(operation: str):
+    """Counts, times and traces a GoogleDriveService method (outcome ok/error)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                with start_span(f"drive.{operation}", kind="client"):
+                    result = func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                DRIVE_CALLS.labels(operation=operation, outcome=outcome).inc()
+                DRIVE_LATENCY.labels(operation=operation).observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def exposition() -> tuple:
+    """Body and content type for /metrics (all gunicorn/uvicorn workers in multiprocess mode)"""
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,124 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.infrastructure.observability.metrics import (
+    DB_QUERIES, DB_QUERY_LATENCY, route_template, statement_operation
+)
+from app.infrastructure.observability.tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged with their route (same setting as Django)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Max statements per request; 0 disables the budget
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+# Dev/test: fail the request instead of only logging it
+QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "false").lower() in ("1", "true", "yes")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class RequestQueries:
+    """Statements run while serving one request"""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+        self.over_budget = False
+
+    @property
+    def route(self) -> str:
+        return f"{self.scope['method']} {route_template(self.scope)}"
+
+
+# Set by QueryLogMiddleware. FastAPI copies the context into the threadpool,
+# so sync routes and repositories update the same object.
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    if queries is not None and QUERY_BUDGET and queries.count >= QUERY_BUDGET:
+        if QUERY_BUDGET_ENFORCE:
+            raise QueryBudgetExceeded(
+                f"{queries.route} exceeded its query budget ({QUERY_BUDGET} statements)"
+            )
+        if not queries.over_budget:
+            logger.warning("%s exceeded its query budget (%s statements)", queries.route, QUERY_BUDGET)
+        queries.over_budget = True
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    operation = statement_operation(statement)
+    DB_QUERIES.labels(operation=operation).inc()
+    DB_QUERY_LATENCY.labels(operation=operation).observe(elapsed)
+
+    queries = _current.get()
+    if queries is not None:
+        queries.count += 1
+        queries.duration += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        span = current_span()
+        logger.warning(
+            "Slow query (%.1f ms) in %s [request %s]: %s",
+            elapsed * 1000, queries.route if queries is not None else "background",
+            span.request_id if span is not None else "-", statement,
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute is not called for failing statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+class QueryLogMiddleware:
+    """
+    Tracks the statements of each request and reports them to the browser
+    devtools with `Server-Timing: db;dur=<ms>;desc="<n> queries"`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current.set(queries)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = (
+                    f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries", '
+                    f'app;dur={(time.perf_counter() - started) * 1000:.1f}'
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,242 @@
+import atexit
+import inspect
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+from app.infrastructure.persistence.database import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+# Where finished spans go: none, jsonl (same file as Django, so one trace can be
+# read end to end with `manage.py show_trace`) or otlp (OTLP/HTTP JSON)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+TRACING_FILE = os.getenv("TRACING_FILE", os.path.join(PROJECT_ROOT, "frontend", "traces.jsonl"))
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+
+SERVICE_NAME = "asonet-backend"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class Span:
+
+    def __init__(self, name, trace_id, parent_id=None, request_id=None, kind="internal", attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.request_id = request_id or trace_id
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "service": SERVICE_NAME,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "request_id": self.request_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+# FastAPI copies the context into the threadpool, so spans opened by sync
+# routes and repositories are children of the request span
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def parse_traceparent(header: Optional[str]):
+    match = TRACEPARENT_RE.match((header or "").strip().lower())
+    return match.groups() if match else (None, None)
+
+
+@contextmanager
+def start_span(name: str, kind: str = "internal", traceparent: Optional[str] = None,
+               request_id: Optional[str] = None, **attributes):
+    """Child of the current span; without one, continues `traceparent` or starts a new trace"""
+    parent = _current.get()
+    if parent is not None:
+        span = Span(name, parent.trace_id, parent.span_id, parent.request_id, kind, attributes)
+    else:
+        trace_id, parent_id = parse_traceparent(traceparent)
+        span = Span(name, trace_id or secrets.token_hex(16), parent_id, request_id, kind, attributes)
+
+    token = _current.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        span.end_ns = time.time_ns()
+        exporter.export(span)
+
+
+def traced(name: str):
+    """Runs a function (sync or async) inside a span"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_repository(cls):
+    """Class decorator: one span per public repository method (SqlAlchemySociaRepository.get_by_id)"""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.isfunction(value):
+            setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+class SpanExporter:
+    """Finished spans are queued and written by a background thread every second (or per batch)"""
+
+    def __init__(self, batch_size: int = 100, interval: float = 1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def export(self, span: Span):
+        if TRACING_EXPORTER == "none":
+            return
+        with self._lock:
+            self._pending.append(span.to_dict())
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="span-exporter")
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            if TRACING_EXPORTER == "otlp":
+                import httpx
+
+                httpx.post(TRACING_OTLP_ENDPOINT, json=otlp_payload(batch), timeout=5).raise_for_status()
+            else:
+                with open(TRACING_FILE, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(span, default=str) + "\n" for span in batch))
+        except Exception as e:
+            logger.warning("Could not export %s spans: %s", len(batch), e)
+
+
+def _otlp_attributes(attributes: dict) -> list:
+    return [{"key": key, "value": {"stringValue": str(value)}} for key, value in attributes.items()]
+
+
+def otlp_payload(batch: list) -> dict:
+    """OTLP/HTTP JSON ExportTraceServiceRequest"""
+    spans = []
+    for span in batch:
+        end_ns = span["start_ns"] + int(span["duration_ms"] * 1e6)
+        spans.append({
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "parentSpanId": span["parent_id"] or "",
+            "name": span["name"],
+            "kind": OTLP_KINDS[span["kind"]],
+            "startTimeUnixNano": str(span["start_ns"]),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": _otlp_attributes({**span["attributes"], "request_id": span["request_id"]}),
+            "status": {"code": 2, "message": span["error"]} if span["error"] else {"code": 1},
+        })
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+        "scopeSpans": [{"scope": {"name": "asonet"}, "spans": spans}],
+    }]}
+
+
+exporter = SpanExporter()
+atexit.register(exporter.flush)
+
+
+class TracingMiddleware:
+    """
+    Server span per request. Continues the Django trace (`traceparent` sent by
+    ApiClient) and echoes X-Request-ID in the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        from app.infrastructure.observability.metrics import route_template
+
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        with start_span(
+            f"{scope['method']} {scope['path']}",
+            kind="server",
+            traceparent=headers.get("traceparent"),
+            request_id=headers.get(REQUEST_ID_HEADER.lower()),
+        ) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set(status=message["status"])
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (REQUEST_ID_HEADER.lower().encode(), span.request_id.encode())
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                span.name = f"{scope['method']} {route_template(scope)}"
@@ -0,0 +1,57 @@
+import os
+
+from app.infrastructure.persistence.database import SQLALCHEMY_DATABASE_URL, engine_options
+
+# ASYNC_DB=true switches the API routers to the async persistence stack
+USE_ASYNC_DB = os.getenv("ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+# Same database as the sync engine, through an async driver
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+}
+
+
+def to_async_url(url: str) -> str:
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(SQLALCHEMY_DATABASE_URL))
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    """
+    Created on first use, so sqlalchemy[asyncio] and the async driver
+    (aiosqlite/asyncpg) are only required when the async stack is enabled.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    global _async_engine
+    if _async_engine is None:
+        options = engine_options(SQLALCHEMY_DATABASE_URL)
+        # check_same_thread is a sqlite3 (sync driver) argument
+        options.pop("connect_args", None)
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **options)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        # expire_on_commit=False: objects stay readable after commit without lazy IO
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), expire_on_commit=False)
+    return _async_sessionmaker()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
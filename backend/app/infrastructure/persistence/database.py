@@ -11,11 +11,41 @@ PROJECT_ROOT = os.path.dirname(BASE_DIR)
 # DB_PATH apunta a frontend/db.sqlite3
 DB_PATH = os.path.join(PROJECT_ROOT, "frontend", "db.sqlite3")
 
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+# Same .env as the Django settings, so both stacks see the same DATABASE_URL
+try:
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+except ImportError:
+    pass
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+def normalize_url(url: str) -> str:
+    # Heroku/Render style postgres:// is not accepted by SQLAlchemy 2
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def engine_options(url: str) -> dict:
+    """
+    Pool tuning per engine. SQLite connections are local files, so the
+    defaults are fine; Postgres gets a bounded pool that survives restarts.
+    """
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+
+# DATABASE_URL is shared with Django (frontend/asonet_django/db_url.py)
+SQLALCHEMY_DATABASE_URL = normalize_url(os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}"))
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
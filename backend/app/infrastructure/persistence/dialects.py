@@ -0,0 +1,38 @@
+import os
+import re
+from typing import Iterable
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Text search configuration; must match the GIN indexes created by the Django migrations
+SEARCH_CONFIG = os.getenv("DB_SEARCH_CONFIG", "spanish")
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def dialect_of(db) -> str:
+    """Dialect name for a Session or AsyncSession"""
+    return db.bind.dialect.name if db.bind is not None else db.get_bind().dialect.name
+
+
+def prefix_tsquery(query: str) -> str:
+    # "plaza may" -> "plaza:* & may:*", so partial words still match while typing
+    return " & ".join(f"{word}:*" for word in _WORD_RE.findall(query))
+
+
+def text_search(dialect: str, column, query: str):
+    """
+    Case-insensitive match of `query` against `column`.
+    Postgres uses the tsvector index; other databases fall back to ILIKE.
+    """
+    tsquery = prefix_tsquery(query)
+    if dialect == "postgresql" and tsquery:
+        return func.to_tsvector(SEARCH_CONFIG, column).op("@@")(func.to_tsquery(SEARCH_CONFIG, tsquery))
+    return column.ilike(f"%{query}%")
+
+
+def insert_ignore(dialect: str, model, values: dict, index_elements: Iterable[str]):
+    """INSERT ... ON CONFLICT DO NOTHING on the given unique columns"""
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    return insert(model).values(**values).on_conflict_do_nothing(index_elements=list(index_elements))
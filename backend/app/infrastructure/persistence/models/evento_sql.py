@@ -3,6 +3,7 @@ from sqlalchemy.orm import relationship
 from app.infrastructure.persistence.database import Base
 import datetime
 from app.infrastructure.persistence.models.proyecto_sql import ProyectoModel  # Importar para registrar tabla
+from app.infrastructure.persistence.models.lugar_sql import LugarModel  # lugar_id
 
 class EventoModel(Base):
     __tablename__ = "eventos_evento"
@@ -15,10 +16,14 @@ class EventoModel(Base):
     descripcion = Column(Text, nullable=True)
     lugar_nombre = Column(String(300), nullable=True)
     lugar_direccion = Column(String(500), nullable=True)
+    lugar_id = Column(Integer, ForeignKey("lugares.id"), nullable=True)
     fecha = Column(DateTime, nullable=False)
     duracion = Column(BigInteger, nullable=True) # Stored as microseconds in Django SQLite
+    recurrencia = Column(String(500), nullable=False, default="")
     colaboradores = Column(Text, nullable=True)
     observaciones = Column(Text, nullable=True)
+    # UTC, like Django's auto_now: the .ics feed derives its ETag from it
+    fecha_modificacion = Column(DateTime, nullable=False, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     asociacion = relationship("AsociacionVecinalModel")
     responsable = relationship("SociaModel")
@@ -1,13 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Float, Integer, String, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.infrastructure.persistence.database import Base
 
 class LugarModel(Base):
     __tablename__ = "lugares"
+    # Mirrors unique_together in the Django model; lets save() use ON CONFLICT
+    __table_args__ = (
+        UniqueConstraint("asociacion_id", "nombre"),
+        Index("lugares_asoc_latlon_idx", "asociacion_id", "lat", "lon"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     asociacion_id = Column(Integer, ForeignKey("core_asociacionvecinal.id"), nullable=False)
     nombre = Column(String, index=True)
     direccion = Column(String, nullable=True)
+    lat = Column(Float, nullable=True)
+    lon = Column(Float, nullable=True)
 
     asociacion = relationship("AsociacionVecinalModel")
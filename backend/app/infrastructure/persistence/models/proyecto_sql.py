@@ -22,6 +22,7 @@ class ProyectoModel(Base):
     fecha_inicio = Column(Date, nullable=False)
     fecha_final = Column(Date, nullable=True)
     recursivo = Column(Boolean, default=False)
+    recurrencia = Column(String(500), nullable=False, default="")
     fecha_creacion = Column(DateTime, default=datetime.utcnow)
     fecha_modificacion = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,10 +1,11 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text, Date
+from sqlalchemy import Boolean, Column, Float, Integer, String, DateTime, ForeignKey, Text, Date, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.infrastructure.persistence.database import Base
 import datetime
 
 class SociaModel(Base):
     __tablename__ = "socias_socia"
+    __table_args__ = (Index("socias_asoc_latlon_idx", "asociacion_id", "lat", "lon"),)
 
     id = Column(Integer, primary_key=True, index=True)
     asociacion_id = Column(Integer, ForeignKey("core_asociacionvecinal.id"), nullable=False)
@@ -20,6 +21,8 @@ class SociaModel(Base):
     provincia = Column(String(100), nullable=True)
     codigo_postal = Column(String(10), nullable=True)
     pais = Column(String(100), default='España')
+    lat = Column(Float, nullable=True)
+    lon = Column(Float, nullable=True)
     nacimiento = Column(Date, nullable=True)
     fecha_inscripcion = Column(Date, default=datetime.date.today)
     pagado = Column(Boolean, default=False)
@@ -28,3 +31,22 @@ class SociaModel(Base):
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     asociacion = relationship("AsociacionVecinalModel")
+
+
+class SociaSequenceModel(Base):
+    # Next numero_socia per association (socias.SociaSequence in Django)
+    __tablename__ = "socias_sociasequence"
+
+    id = Column(Integer, primary_key=True)
+    asociacion_id = Column(Integer, ForeignKey("core_asociacionvecinal.id"), nullable=False, unique=True)
+    siguiente = Column(Integer, nullable=False, default=1)
+
+
+class NumeroSociaLibreModel(Base):
+    # Numbers freed by deleted socias, reused when SOCIA_REUSE_NUMBERS is on
+    __tablename__ = "socias_numerosocialibre"
+    __table_args__ = (UniqueConstraint("asociacion_id", "numero"),)
+
+    id = Column(Integer, primary_key=True)
+    asociacion_id = Column(Integer, ForeignKey("core_asociacionvecinal.id"), nullable=False)
+    numero = Column(Integer, nullable=False)
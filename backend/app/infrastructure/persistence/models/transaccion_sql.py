@@ -25,5 +25,7 @@ class TransaccionModel(Base):
     drive_file_link = Column(String(200), nullable=True)
     drive_file_name = Column(String(255), nullable=True)
 
+    adjunto_sha256 = Column(String(64), nullable=True)
+
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
@@ -31,6 +31,12 @@ class AsociacionVecinalModel(Base):
     numero_registro = Column(String(50), unique=True)
     drive_folder_id = Column(String(100), nullable=True)
     drive_credentials = Column(Text, nullable=True)  # Store JSON credentials
+    # Cached Drive folder metadata (refreshed in the background)
+    drive_folder_name = Column(String(255), nullable=True)
+    drive_folder_link = Column(String(500), nullable=True)
+    drive_metadata_updated_at = Column(DateTime, nullable=True)
+    # Tenant shard holding this association's data ('' = catalog database)
+    db_shard = Column(String(63), default="")
     distrito = Column(String(100), nullable=True)
     provincia = Column(String(100), nullable=True)
     codigo_postal = Column(String(10), nullable=True)
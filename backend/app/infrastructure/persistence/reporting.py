@@ -0,0 +1,50 @@
+import os
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.infrastructure.persistence.database import PROJECT_ROOT, engine_options, normalize_url
+
+# Report/export reads (Django sends X-Reporting inside reporting_reads()) go to a
+# read replica or to the SQLite snapshot Django refreshes. Same settings as Django.
+REPORTING_DATABASE_URL = os.getenv("REPORTING_DATABASE_URL")
+REPORTING_SNAPSHOT = os.getenv("REPORTING_SNAPSHOT", "false").lower() in ("1", "true", "yes")
+REPORTING_SNAPSHOT_PATH = os.getenv(
+    "REPORTING_SNAPSHOT_PATH", os.path.join(PROJECT_ROOT, "frontend", "db.reporting.sqlite3")
+)
+
+REPORTING_HEADER = "X-Reporting"
+
+_session_factory: Optional[sessionmaker] = None
+
+
+def reporting_url() -> Optional[str]:
+    if REPORTING_DATABASE_URL:
+        return normalize_url(REPORTING_DATABASE_URL)
+    if REPORTING_SNAPSHOT and os.path.exists(REPORTING_SNAPSHOT_PATH):
+        return f"sqlite:///{REPORTING_SNAPSHOT_PATH}"
+    return None
+
+
+def wants_reporting(request: Request) -> bool:
+    # Only reads: a write with the header still goes to the primary
+    return request.method in ("GET", "HEAD") and request.headers.get(REPORTING_HEADER) == "1"
+
+
+def reporting_session_factory() -> Optional[sessionmaker]:
+    """Sessions on the reporting database, or None if there is none (reads stay on the primary)"""
+    global _session_factory
+    if _session_factory is None:
+        url = reporting_url()
+        if url is None:
+            return None
+        options = engine_options(url)
+        if not REPORTING_DATABASE_URL:
+            # The snapshot file is replaced on every refresh: no pooled handles to the old one
+            options["poolclass"] = NullPool
+        reporting_engine = create_engine(url, **options)
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=reporting_engine)
+    return _session_factory
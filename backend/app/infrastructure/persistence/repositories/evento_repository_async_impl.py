@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.ports.evento_repository import AsyncEventoRepository
+from app.domain.models.evento import Evento, EventoCreate, EventoUpdate
+from app.infrastructure.persistence.models.evento_sql import EventoModel
+from app.infrastructure.persistence.repositories.evento_repository_impl import (
+    evento_to_domain, evento_to_model, apply_evento_update, evento_window_filter
+)
+from app.infrastructure.observability.tracing import traced_repository
+
+@traced_repository
+class AsyncSqlAlchemyEventoRepository(AsyncEventoRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, evento_id: int) -> Optional[Evento]:
+        db_evento = await self.db.get(EventoModel, evento_id)
+        if db_evento:
+            return evento_to_domain(db_evento)
+        return None
+
+    async def list_by_association(self, asociacion_id: int, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Evento]:
+        result = await self.db.execute(select(EventoModel).where(
+            EventoModel.asociacion_id == asociacion_id, *evento_window_filter(desde, hasta)
+        ))
+        return [evento_to_domain(evento) for evento in result.scalars().all()]
+
+    async def create(self, evento: EventoCreate) -> Evento:
+        try:
+            db_evento = evento_to_model(evento)
+            self.db.add(db_evento)
+            await self.db.commit()
+            await self.db.refresh(db_evento)
+            return evento_to_domain(db_evento)
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    async def update(self, evento_id: int, evento_update: EventoUpdate) -> Optional[Evento]:
+        db_evento = await self.db.get(EventoModel, evento_id)
+        if not db_evento:
+            return None
+
+        try:
+            apply_evento_update(db_evento, evento_update)
+            await self.db.commit()
+            await self.db.refresh(db_evento)
+            return evento_to_domain(db_evento)
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    async def delete(self, evento_id: int) -> bool:
+        db_evento = await self.db.get(EventoModel, evento_id)
+        if db_evento:
+            try:
+                await self.db.delete(db_evento)
+                await self.db.commit()
+                return True
+            except Exception:
+                await self.db.rollback()
+                return False
+        return False
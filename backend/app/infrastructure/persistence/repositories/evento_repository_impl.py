@@ -1,34 +1,97 @@
 from typing import List, Optional
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime, timedelta
 from app.domain.ports.evento_repository import EventoRepository
 from app.domain.models.evento import Evento, EventoCreate, EventoUpdate
 from app.infrastructure.persistence.models.evento_sql import EventoModel
+from app.infrastructure.observability.tracing import traced_repository
 
+def evento_to_domain(db_evento: EventoModel) -> Evento:
+    # Convert BigInt microseconds to timedelta for domain
+    duracion_td = None
+    if db_evento.duracion is not None:
+        duracion_td = timedelta(microseconds=db_evento.duracion)
+
+    return Evento(
+        id=db_evento.id,
+        asociacion_id=db_evento.asociacion_id,
+        responsable_id=db_evento.responsable_id,
+        proyecto_id=db_evento.proyecto_id,
+        nombre=db_evento.nombre,
+        descripcion=db_evento.descripcion,
+        lugar_nombre=db_evento.lugar_nombre,
+        lugar_direccion=db_evento.lugar_direccion,
+        lugar_id=db_evento.lugar_id,
+        fecha=db_evento.fecha,
+        duracion=duracion_td,
+        recurrencia=db_evento.recurrencia or "",
+        colaboradores=db_evento.colaboradores,
+        observaciones=db_evento.observaciones
+    )
+
+
+def evento_to_model(evento: EventoCreate) -> EventoModel:
+    # Convert timedelta to microseconds for DB
+    duracion_us = None
+    if evento.duracion:
+        duracion_us = int(evento.duracion.total_seconds() * 1_000_000)
+
+    return EventoModel(
+        asociacion_id=evento.asociacion_id,
+        responsable_id=evento.responsable_id,
+        proyecto_id=evento.proyecto_id,
+        nombre=evento.nombre,
+        descripcion=evento.descripcion,
+        lugar_nombre=evento.lugar_nombre,
+        lugar_direccion=evento.lugar_direccion,
+        lugar_id=evento.lugar_id,
+        fecha=evento.fecha,
+        duracion=duracion_us,
+        recurrencia=evento.recurrencia or "",
+        colaboradores=evento.colaboradores,
+        observaciones=evento.observaciones
+    )
+
+
+def apply_evento_update(db_evento: EventoModel, evento_update: EventoUpdate):
+    update_data = evento_update.model_dump(exclude_unset=True)
+
+    # Handle duration conversion
+    if 'duracion' in update_data:
+        duracion = update_data.pop('duracion')
+        if duracion is not None:
+            db_evento.duracion = int(duracion.total_seconds() * 1_000_000)
+        else:
+            db_evento.duracion = None
+    if 'recurrencia' in update_data:
+        update_data['recurrencia'] = update_data['recurrencia'] or ""
+
+    for key, value in update_data.items():
+        setattr(db_evento, key, value)
+
+
+def evento_window_filter(desde: Optional[datetime], hasta: Optional[datetime]) -> list:
+    """
+    Eventos that can show up in [desde, hasta): one-offs starting inside it and
+    recurring ones that started before hasta (their occurrences are expanded by
+    the caller). Callers widen desde to catch long one-offs that began earlier.
+    """
+    conditions = []
+    if hasta is not None:
+        conditions.append(EventoModel.fecha < hasta)
+    if desde is not None:
+        conditions.append(or_(EventoModel.fecha >= desde, EventoModel.recurrencia != ""))
+    return conditions
+
+
+@traced_repository
 class SqlAlchemyEventoRepository(EventoRepository):
     def __init__(self, db: Session):
         self.db = db
 
     def _to_domain(self, db_evento: EventoModel) -> Evento:
-        # Convert BigInt microseconds to timedelta for domain
-        duracion_td = None
-        if db_evento.duracion is not None:
-            duracion_td = timedelta(microseconds=db_evento.duracion)
-
-        return Evento(
-            id=db_evento.id,
-            asociacion_id=db_evento.asociacion_id,
-            responsable_id=db_evento.responsable_id,
-            proyecto_id=db_evento.proyecto_id,
-            nombre=db_evento.nombre,
-            descripcion=db_evento.descripcion,
-            lugar_nombre=db_evento.lugar_nombre,
-            lugar_direccion=db_evento.lugar_direccion,
-            fecha=db_evento.fecha,
-            duracion=duracion_td,
-            colaboradores=db_evento.colaboradores,
-            observaciones=db_evento.observaciones
-        )
+        return evento_to_domain(db_evento)
 
     def get_by_id(self, evento_id: int) -> Optional[Evento]:
         db_evento = self.db.query(EventoModel).filter(EventoModel.id == evento_id).first()
@@ -36,30 +99,15 @@ class SqlAlchemyEventoRepository(EventoRepository):
             return self._to_domain(db_evento)
         return None
 
-    def list_by_association(self, asociacion_id: int) -> List[Evento]:
-        eventos = self.db.query(EventoModel).filter(EventoModel.asociacion_id == asociacion_id).all()
+    def list_by_association(self, asociacion_id: int, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Evento]:
+        eventos = self.db.query(EventoModel).filter(
+            EventoModel.asociacion_id == asociacion_id, *evento_window_filter(desde, hasta)
+        ).all()
         return [self._to_domain(evento) for evento in eventos]
 
     def create(self, evento: EventoCreate) -> Evento:
         try:
-            # Convert timedelta to microseconds for DB
-            duracion_us = None
-            if evento.duracion:
-                duracion_us = int(evento.duracion.total_seconds() * 1_000_000)
-
-            db_evento = EventoModel(
-                asociacion_id=evento.asociacion_id,
-                responsable_id=evento.responsable_id,
-                proyecto_id=evento.proyecto_id,
-                nombre=evento.nombre,
-                descripcion=evento.descripcion,
-                lugar_nombre=evento.lugar_nombre,
-                lugar_direccion=evento.lugar_direccion,
-                fecha=evento.fecha,
-                duracion=duracion_us,
-                colaboradores=evento.colaboradores,
-                observaciones=evento.observaciones
-            )
+            db_evento = evento_to_model(evento)
             self.db.add(db_evento)
             self.db.commit()
             self.db.refresh(db_evento)
@@ -74,19 +122,7 @@ class SqlAlchemyEventoRepository(EventoRepository):
             return None
 
         try:
-            update_data = evento_update.model_dump(exclude_unset=True)
-
-            # Handle duration conversion
-            if 'duracion' in update_data:
-                duracion = update_data.pop('duracion')
-                if duracion is not None:
-                    db_evento.duracion = int(duracion.total_seconds() * 1_000_000)
-                else:
-                    db_evento.duracion = None
-
-            for key, value in update_data.items():
-                setattr(db_evento, key, value)
-
+            apply_evento_update(db_evento, evento_update)
             self.db.commit()
             self.db.refresh(db_evento)
             return self._to_domain(db_evento)
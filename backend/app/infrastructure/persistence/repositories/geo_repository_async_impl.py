@@ -0,0 +1,45 @@
+from typing import Iterable, List, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.models.geo import PuntoCercano, bounding_box
+from app.domain.ports.geo_repository import AsyncGeoRepository
+from app.infrastructure.persistence.dialects import dialect_of
+from app.infrastructure.persistence.repositories.geo_repository_impl import (
+    NEAREST_START_RADIUS_M, bbox_statement, closest, coordinates_statement, grid_statement, next_radius,
+    points_statement, rtree_exists_statement,
+)
+from app.infrastructure.observability.tracing import traced_repository
+
+@traced_repository
+class AsyncSqlAlchemyGeoRepository(AsyncGeoRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def grid(self, asociacion_id: int, layer: str, lon_edges: Sequence[float], lat_edges: Sequence[float]) -> List[dict]:
+        result = await self.db.execute(grid_statement(asociacion_id, layer, lon_edges, lat_edges))
+        return [dict(row) for row in result.mappings()]
+
+    async def points(self, asociacion_id: int, layer: str, west: float, south: float, east: float, north: float, limit: int) -> List[dict]:
+        result = await self.db.execute(points_statement(asociacion_id, layer, west, south, east, north, limit))
+        return [dict(row) for row in result.mappings()]
+
+    async def within_radius(self, asociacion_id: int, layer: str, lat: float, lon: float, radius_m: float, limit: int) -> List[PuntoCercano]:
+        dialect = dialect_of(self.db)
+        use_rtree = dialect == "sqlite" and await self._has_rtree(layer)
+        result = await self.db.execute(bbox_statement(dialect, asociacion_id, layer, bounding_box(lat, lon, radius_m), use_rtree))
+        return closest(result.mappings(), lat, lon, radius_m, limit)
+
+    async def nearest(self, asociacion_id: int, layer: str, lat: float, lon: float, k: int, max_radius_m: float) -> List[PuntoCercano]:
+        radius = min(NEAREST_START_RADIUS_M, max_radius_m)
+        while True:
+            found = await self.within_radius(asociacion_id, layer, lat, lon, radius, k)
+            if len(found) >= k or radius >= max_radius_m:
+                return found
+            radius = next_radius(radius, max_radius_m)
+
+    async def coordinates(self, asociacion_id: int, layer: str, ids: Iterable[int]) -> List[Tuple[float, float]]:
+        result = await self.db.execute(coordinates_statement(asociacion_id, layer, ids))
+        return [tuple(row) for row in result]
+
+    async def _has_rtree(self, layer: str) -> bool:
+        result = await self.db.execute(rtree_exists_statement(layer))
+        return result.first() is not None
@@ -0,0 +1,164 @@
+import datetime
+import os
+from typing import Iterable, List, Sequence, Tuple
+from sqlalchemy import case, column, func, literal_column, select, table, text
+from sqlalchemy.orm import Session
+from app.domain.models.geo import PuntoCercano, bounding_box, distance_m
+from app.domain.ports.geo_repository import GeoRepository, SPATIAL_LAYERS
+from app.infrastructure.persistence.models.evento_sql import EventoModel
+from app.infrastructure.persistence.models.lugar_sql import LugarModel
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.dialects import dialect_of
+from app.infrastructure.observability.tracing import traced_repository
+
+# nearest() starts with this radius and widens it (x4) until it has k points
+NEAREST_START_RADIUS_M = float(os.getenv("GEO_NEAREST_START_RADIUS", "250"))
+
+
+def _source(layer: str, asociacion_id: int):
+    """id, label, lat, lon, FROM and WHERE of a layer. Events are placed at their lugar, upcoming ones only"""
+    if layer == "lugares":
+        return (LugarModel.id, LugarModel.nombre, LugarModel.lat, LugarModel.lon, LugarModel,
+                [LugarModel.asociacion_id == asociacion_id])
+    if layer == "socias":
+        return (SociaModel.id, SociaModel.nombre + " " + SociaModel.apellidos, SociaModel.lat, SociaModel.lon,
+                SociaModel, [SociaModel.asociacion_id == asociacion_id])
+    if layer == "eventos":
+        return (EventoModel.id, EventoModel.nombre, LugarModel.lat, LugarModel.lon,
+                EventoModel.__table__.join(LugarModel, EventoModel.lugar_id == LugarModel.id),
+                [EventoModel.asociacion_id == asociacion_id, EventoModel.fecha >= datetime.datetime.utcnow()])
+    raise ValueError(f"Unknown layer {layer!r}")
+
+
+def _bucket(value, edges: Sequence[float]):
+    # Index of the cell between consecutive edges; CASE works the same on SQLite and PostgreSQL
+    return case(*[(value < edge, i) for i, edge in enumerate(edges[1:-1])], else_=len(edges) - 2)
+
+
+def grid_statement(asociacion_id: int, layer: str, lon_edges: Sequence[float], lat_edges: Sequence[float]):
+    id_, label, lat, lon, source, where = _source(layer, asociacion_id)
+    return (
+        select(
+            _bucket(lon, lon_edges).label("cell_x"),
+            _bucket(lat, lat_edges).label("cell_y"),
+            func.count().label("count"),
+            func.avg(lat).label("lat"),
+            func.avg(lon).label("lon"),
+            func.min(id_).label("id"),
+            func.min(label).label("nombre"),
+        )
+        .select_from(source)
+        .where(*where, lon >= lon_edges[0], lon < lon_edges[-1], lat >= lat_edges[0], lat < lat_edges[-1])
+        # By alias: PostgreSQL would not match the repeated CASE with its own bind parameters
+        .group_by(literal_column("cell_x"), literal_column("cell_y"))
+    )
+
+
+def points_statement(asociacion_id: int, layer: str, west: float, south: float, east: float, north: float, limit: int):
+    id_, label, lat, lon, source, where = _source(layer, asociacion_id)
+    return (
+        select(id_.label("id"), label.label("nombre"), lat.label("lat"), lon.label("lon"))
+        .select_from(source)
+        .where(*where, lon >= west, lon < east, lat >= south, lat < north)
+        .order_by(id_)
+        .limit(limit)
+    )
+
+
+def _spatial_source(layer: str, asociacion_id: int):
+    if layer not in SPATIAL_LAYERS:
+        raise ValueError(f"La capa {layer} no admite búsquedas por distancia")
+    return _source(layer, asociacion_id)
+
+
+def rtree_table(layer: str) -> str:
+    # Created and kept up to date by triggers from the Django migrations (core/spatial.py)
+    model = LugarModel if layer == "lugares" else SociaModel
+    return f"{model.__tablename__}_rtree"
+
+
+def rtree_exists_statement(layer: str):
+    return text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name").bindparams(name=rtree_table(layer))
+
+
+def bbox_statement(dialect: str, asociacion_id: int, layer: str, bbox: Sequence[float], use_rtree: bool):
+    """Rows with coordinates inside bbox, through the spatial index of each database"""
+    west, south, east, north = bbox
+    id_, label, lat, lon, source, where = _spatial_source(layer, asociacion_id)
+    if dialect == "postgresql":
+        # GiST index on point(lon, lat)
+        inside = [func.point(lon, lat).op("<@")(func.box(func.point(west, south), func.point(east, north)))]
+    else:
+        inside = [lat >= south, lat <= north, lon >= west, lon <= east]
+        if use_rtree:
+            # The R*Tree keeps 32-bit floats rounded outwards: a superset, refined by the exact bounds
+            rtree = table(rtree_table(layer), column("id"), column("min_lat"), column("max_lat"), column("min_lon"), column("max_lon"))
+            inside.append(id_.in_(
+                select(rtree.c.id).where(
+                    rtree.c.max_lat >= south, rtree.c.min_lat <= north,
+                    rtree.c.max_lon >= west, rtree.c.min_lon <= east,
+                )
+            ))
+    return (
+        select(id_.label("id"), label.label("nombre"), lat.label("lat"), lon.label("lon"))
+        .select_from(source)
+        .where(*where, *inside)
+    )
+
+
+def coordinates_statement(asociacion_id: int, layer: str, ids: Iterable[int]):
+    id_, label, lat, lon, source, where = _spatial_source(layer, asociacion_id)
+    return select(lat, lon).select_from(source).where(*where, id_.in_(list(ids)), lat.isnot(None), lon.isnot(None))
+
+
+def closest(rows, lat: float, lon: float, radius_m: float, limit: int) -> List[PuntoCercano]:
+    """Exact distance filter and order of the bounding-box candidates"""
+    found = []
+    for row in rows:
+        distancia = distance_m(lat, lon, row["lat"], row["lon"])
+        if distancia <= radius_m:
+            found.append((distancia, row["id"], row))
+    found.sort(key=lambda item: item[:2])
+    return [
+        PuntoCercano(id=row["id"], nombre=row["nombre"], lat=row["lat"], lon=row["lon"], distancia=round(distancia, 1))
+        for distancia, _, row in found[:limit]
+    ]
+
+
+def next_radius(radius_m: float, max_radius_m: float) -> float:
+    return min(radius_m * 4, max_radius_m)
+
+
+@traced_repository
+class SqlAlchemyGeoRepository(GeoRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def grid(self, asociacion_id: int, layer: str, lon_edges: Sequence[float], lat_edges: Sequence[float]) -> List[dict]:
+        result = self.db.execute(grid_statement(asociacion_id, layer, lon_edges, lat_edges))
+        return [dict(row) for row in result.mappings()]
+
+    def points(self, asociacion_id: int, layer: str, west: float, south: float, east: float, north: float, limit: int) -> List[dict]:
+        result = self.db.execute(points_statement(asociacion_id, layer, west, south, east, north, limit))
+        return [dict(row) for row in result.mappings()]
+
+    def within_radius(self, asociacion_id: int, layer: str, lat: float, lon: float, radius_m: float, limit: int) -> List[PuntoCercano]:
+        dialect = dialect_of(self.db)
+        use_rtree = dialect == "sqlite" and self._has_rtree(layer)
+        result = self.db.execute(bbox_statement(dialect, asociacion_id, layer, bounding_box(lat, lon, radius_m), use_rtree))
+        return closest(result.mappings(), lat, lon, radius_m, limit)
+
+    def nearest(self, asociacion_id: int, layer: str, lat: float, lon: float, k: int, max_radius_m: float) -> List[PuntoCercano]:
+        radius = min(NEAREST_START_RADIUS_M, max_radius_m)
+        while True:
+            found = self.within_radius(asociacion_id, layer, lat, lon, radius, k)
+            if len(found) >= k or radius >= max_radius_m:
+                return found
+            radius = next_radius(radius, max_radius_m)
+
+    def coordinates(self, asociacion_id: int, layer: str, ids: Iterable[int]) -> List[Tuple[float, float]]:
+        return [tuple(row) for row in self.db.execute(coordinates_statement(asociacion_id, layer, ids))]
+
+    def _has_rtree(self, layer: str) -> bool:
+        # Missing when the schema was not created by the Django migrations (e.g. tests)
+        return self.db.execute(rtree_exists_statement(layer)).first() is not None
@@ -0,0 +1,54 @@
+from typing import List, Optional
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.models.lugar import Lugar, LugarCreate
+from app.domain.repositories.lugar_repository import AsyncLugarRepository
+from app.infrastructure.persistence.models.lugar_sql import LugarModel
+from app.infrastructure.persistence.dialects import dialect_of, text_search, insert_ignore
+from app.infrastructure.observability.tracing import traced_repository
+
+@traced_repository
+class AsyncSqlAlchemyLugarRepository(AsyncLugarRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find_by_name(self, nombre: str, asociacion_id: int) -> Optional[Lugar]:
+        result = await self.db.execute(
+            select(LugarModel).where(
+                LugarModel.nombre == nombre,
+                LugarModel.asociacion_id == asociacion_id
+            ).limit(1)
+        )
+        db_lugar = result.scalars().first()
+        if db_lugar:
+            return Lugar.model_validate(db_lugar)
+        return None
+
+    async def search_by_name(self, query: str, asociacion_id: int) -> List[Lugar]:
+        result = await self.db.execute(
+            select(LugarModel).where(
+                text_search(dialect_of(self.db), LugarModel.nombre, query),
+                LugarModel.asociacion_id == asociacion_id
+            )
+        )
+        return [Lugar.model_validate(l) for l in result.scalars().all()]
+
+    async def suggest(self, query: str, asociacion_id: int, limit: int) -> List[Lugar]:
+        dialect = dialect_of(self.db)
+        result = await self.db.execute(
+            select(LugarModel).where(
+                LugarModel.asociacion_id == asociacion_id,
+                or_(text_search(dialect, LugarModel.nombre, query), text_search(dialect, LugarModel.direccion, query))
+            ).order_by(LugarModel.nombre).limit(limit)
+        )
+        return [Lugar.model_validate(l) for l in result.scalars().all()]
+
+    async def save(self, lugar: LugarCreate) -> Lugar:
+        await self.db.execute(insert_ignore(
+            dialect_of(self.db),
+            LugarModel,
+            {"nombre": lugar.nombre, "direccion": lugar.direccion, "asociacion_id": lugar.asociacion_id},
+            ["asociacion_id", "nombre"],
+        ))
+        await self.db.commit()
+        return await self.find_by_name(lugar.nombre, lugar.asociacion_id)
@@ -1,9 +1,13 @@
 from typing import List, Optional
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from app.domain.models.lugar import Lugar, LugarCreate
 from app.domain.repositories.lugar_repository import LugarRepository
 from app.infrastructure.persistence.models.lugar_sql import LugarModel
+from app.infrastructure.persistence.dialects import dialect_of, text_search, insert_ignore
+from app.infrastructure.observability.tracing import traced_repository
 
+@traced_repository
 class SqlAlchemyLugarRepository(LugarRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -19,23 +23,26 @@ class SqlAlchemyLugarRepository(LugarRepository):
 
     def search_by_name(self, query: str, asociacion_id: int) -> List[Lugar]:
         db_lugares = self.db.query(LugarModel).filter(
-            LugarModel.nombre.ilike(f"%{query}%"),
+            text_search(dialect_of(self.db), LugarModel.nombre, query),
             LugarModel.asociacion_id == asociacion_id
         ).all()
         return [Lugar.model_validate(l) for l in db_lugares]
 
-    def save(self, lugar: LugarCreate) -> Lugar:
-        # Check if exists first to avoid unique constraint error if logic fails elsewhere
-        existing = self.find_by_name(lugar.nombre, lugar.asociacion_id)
-        if existing:
-            return existing
+    def suggest(self, query: str, asociacion_id: int, limit: int) -> List[Lugar]:
+        dialect = dialect_of(self.db)
+        db_lugares = self.db.query(LugarModel).filter(
+            LugarModel.asociacion_id == asociacion_id,
+            or_(text_search(dialect, LugarModel.nombre, query), text_search(dialect, LugarModel.direccion, query))
+        ).order_by(LugarModel.nombre).limit(limit).all()
+        return [Lugar.model_validate(l) for l in db_lugares]
 
-        db_lugar = LugarModel(
-            nombre=lugar.nombre,
-            direccion=lugar.direccion,
-            asociacion_id=lugar.asociacion_id
-        )
-        self.db.add(db_lugar)
+    def save(self, lugar: LugarCreate) -> Lugar:
+        # ON CONFLICT DO NOTHING: two requests creating the same place can't both fail
+        self.db.execute(insert_ignore(
+            dialect_of(self.db),
+            LugarModel,
+            {"nombre": lugar.nombre, "direccion": lugar.direccion, "asociacion_id": lugar.asociacion_id},
+            ["asociacion_id", "nombre"],
+        ))
         self.db.commit()
-        self.db.refresh(db_lugar)
-        return Lugar.model_validate(db_lugar)
+        return self.find_by_name(lugar.nombre, lugar.asociacion_id)
@@ -0,0 +1,56 @@
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.ports.proyecto_repository import AsyncProyectoRepository
+from app.domain.models.proyecto import Proyecto, ProyectoCreate, ProyectoUpdate
+from app.infrastructure.persistence.models.proyecto_sql import ProyectoModel
+from app.infrastructure.persistence.repositories.proyecto_repository_impl import proyecto_window_filter
+from app.infrastructure.observability.tracing import traced_repository
+
+@traced_repository
+class AsyncSqlAlchemyProyectoRepository(AsyncProyectoRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, proyecto_id: int) -> Optional[Proyecto]:
+        db_proyecto = await self.db.get(ProyectoModel, proyecto_id)
+        if db_proyecto:
+            return Proyecto.model_validate(db_proyecto)
+        return None
+
+    async def list_by_association(self, asociacion_id: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[Proyecto]:
+        result = await self.db.execute(
+            select(ProyectoModel).where(
+                ProyectoModel.asociacion_id == asociacion_id, *proyecto_window_filter(desde, hasta)
+            ).order_by(ProyectoModel.fecha_inicio.desc())
+        )
+        return [Proyecto.model_validate(item) for item in result.scalars().all()]
+
+    async def create(self, proyecto: ProyectoCreate) -> Proyecto:
+        db_proyecto = ProyectoModel(**proyecto.model_dump())
+        self.db.add(db_proyecto)
+        await self.db.commit()
+        await self.db.refresh(db_proyecto)
+        return Proyecto.model_validate(db_proyecto)
+
+    async def update(self, proyecto_id: int, proyecto_update: ProyectoUpdate) -> Optional[Proyecto]:
+        db_proyecto = await self.db.get(ProyectoModel, proyecto_id)
+        if not db_proyecto:
+            return None
+
+        update_data = proyecto_update.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_proyecto, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_proyecto)
+        return Proyecto.model_validate(db_proyecto)
+
+    async def delete(self, proyecto_id: int) -> bool:
+        db_proyecto = await self.db.get(ProyectoModel, proyecto_id)
+        if db_proyecto:
+            await self.db.delete(db_proyecto)
+            await self.db.commit()
+            return True
+        return False
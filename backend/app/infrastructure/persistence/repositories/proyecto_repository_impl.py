@@ -1,9 +1,23 @@
+from datetime import date
 from typing import List, Optional
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from app.domain.ports.proyecto_repository import ProyectoRepository
 from app.domain.models.proyecto import Proyecto, ProyectoCreate, ProyectoUpdate
 from app.infrastructure.persistence.models.proyecto_sql import ProyectoModel
+from app.infrastructure.observability.tracing import traced_repository
 
+def proyecto_window_filter(desde: Optional[date], hasta: Optional[date]) -> list:
+    """Proyectos running at some point of [desde, hasta)"""
+    conditions = []
+    if hasta is not None:
+        conditions.append(ProyectoModel.fecha_inicio < hasta)
+    if desde is not None:
+        conditions.append(or_(ProyectoModel.fecha_final.is_(None), ProyectoModel.fecha_final >= desde))
+    return conditions
+
+
+@traced_repository
 class SqlAlchemyProyectoRepository(ProyectoRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -14,8 +28,10 @@ class SqlAlchemyProyectoRepository(ProyectoRepository):
             return Proyecto.model_validate(db_proyecto)
         return None
 
-    def list_by_association(self, asociacion_id: int) -> List[Proyecto]:
-        proyectos = self.db.query(ProyectoModel).filter(ProyectoModel.asociacion_id == asociacion_id).order_by(ProyectoModel.fecha_inicio.desc()).all()
+    def list_by_association(self, asociacion_id: int, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[Proyecto]:
+        proyectos = self.db.query(ProyectoModel).filter(
+            ProyectoModel.asociacion_id == asociacion_id, *proyecto_window_filter(desde, hasta)
+        ).order_by(ProyectoModel.fecha_inicio.desc()).all()
         return [Proyecto.model_validate(p) for p in proyectos]
 
     def create(self, proyecto: ProyectoCreate) -> Proyecto:
@@ -0,0 +1,71 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.ports.socia_repository import AsyncSociaRepository
+from app.domain.models.socia import ADDRESS_FIELDS, Socia, SociaCreate, SociaUpdate
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.socia_numbering import async_advance_past, async_next_numero, async_release_numero
+from app.infrastructure.observability.tracing import traced_repository
+
+@traced_repository
+class AsyncSqlAlchemySociaRepository(AsyncSociaRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, socia_id: int) -> Optional[Socia]:
+        db_socia = await self.db.get(SociaModel, socia_id)
+        if db_socia:
+            return Socia.model_validate(db_socia)
+        return None
+
+    async def list_by_association(self, asociacion_id: int) -> List[Socia]:
+        result = await self.db.execute(
+            select(SociaModel).where(SociaModel.asociacion_id == asociacion_id)
+        )
+        return [Socia.model_validate(item) for item in result.scalars().all()]
+
+    async def create(self, socia: SociaCreate) -> Socia:
+        data = socia.model_dump()
+        if not data["numero_socia"]:
+            data["numero_socia"] = await async_next_numero(self.db, socia.asociacion_id)
+        else:
+            # Explicit number: later automatic ones must not collide with it
+            await async_advance_past(self.db, socia.asociacion_id, data["numero_socia"])
+        db_socia = SociaModel(**data)
+        self.db.add(db_socia)
+        await self.db.commit()
+        await self.db.refresh(db_socia)
+        return Socia.model_validate(db_socia)
+
+    async def update(self, socia_id: int, socia_update: SociaUpdate) -> Optional[Socia]:
+        db_socia = await self.db.get(SociaModel, socia_id)
+        if not db_socia:
+            return None
+
+        update_data = socia_update.model_dump(exclude_unset=True)
+        if "lat" not in update_data and any(
+            getattr(db_socia, field) != update_data[field] for field in ADDRESS_FIELDS & update_data.keys()
+        ):
+            # Moved: the map waits for the next geocoding run instead of showing the old address
+            update_data.update(lat=None, lon=None)
+        numero_anterior = db_socia.numero_socia
+        for key, value in update_data.items():
+            setattr(db_socia, key, value)
+        if update_data.get("numero_socia"):
+            await async_advance_past(self.db, db_socia.asociacion_id, update_data["numero_socia"])
+            if update_data["numero_socia"] != numero_anterior:
+                # Renumbered: the old number is free again, as after a delete
+                await async_release_numero(self.db, db_socia.asociacion_id, numero_anterior)
+
+        await self.db.commit()
+        await self.db.refresh(db_socia)
+        return Socia.model_validate(db_socia)
+
+    async def delete(self, socia_id: int) -> bool:
+        db_socia = await self.db.get(SociaModel, socia_id)
+        if db_socia:
+            await async_release_numero(self.db, db_socia.asociacion_id, db_socia.numero_socia)
+            await self.db.delete(db_socia)
+            await self.db.commit()
+            return True
+        return False
@@ -1,9 +1,12 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.domain.ports.socia_repository import SociaRepository
-from app.domain.models.socia import Socia, SociaCreate, SociaUpdate
+from app.domain.models.socia import ADDRESS_FIELDS, Socia, SociaCreate, SociaUpdate
 from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.socia_numbering import advance_past, next_numero, release_numero
+from app.infrastructure.observability.tracing import traced_repository
 
+@traced_repository
 class SqlAlchemySociaRepository(SociaRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -19,7 +22,13 @@ class SqlAlchemySociaRepository(SociaRepository):
         return [Socia.model_validate(socia) for socia in socias]
 
     def create(self, socia: SociaCreate) -> Socia:
-        db_socia = SociaModel(**socia.model_dump())
+        data = socia.model_dump()
+        if not data["numero_socia"]:
+            data["numero_socia"] = next_numero(self.db, socia.asociacion_id)
+        else:
+            # Explicit number: later automatic ones must not collide with it
+            advance_past(self.db, socia.asociacion_id, data["numero_socia"])
+        db_socia = SociaModel(**data)
         self.db.add(db_socia)
         self.db.commit()
         self.db.refresh(db_socia)
@@ -31,8 +40,19 @@ class SqlAlchemySociaRepository(SociaRepository):
             return None
 
         update_data = socia_update.model_dump(exclude_unset=True)
+        if "lat" not in update_data and any(
+            getattr(db_socia, field) != update_data[field] for field in ADDRESS_FIELDS & update_data.keys()
+        ):
+            # Moved: the map waits for the next geocoding run instead of showing the old address
+            update_data.update(lat=None, lon=None)
+        numero_anterior = db_socia.numero_socia
         for key, value in update_data.items():
             setattr(db_socia, key, value)
+        if update_data.get("numero_socia"):
+            advance_past(self.db, db_socia.asociacion_id, update_data["numero_socia"])
+            if update_data["numero_socia"] != numero_anterior:
+                # Renumbered: the old number is free again, as after a delete
+                release_numero(self.db, db_socia.asociacion_id, numero_anterior)
 
         self.db.commit()
         self.db.refresh(db_socia)
@@ -41,6 +61,7 @@ class SqlAlchemySociaRepository(SociaRepository):
     def delete(self, socia_id: int) -> bool:
         db_socia = self.db.query(SociaModel).filter(SociaModel.id == socia_id).first()
         if db_socia:
+            release_numero(self.db, db_socia.asociacion_id, db_socia.numero_socia)
             self.db.delete(db_socia)
             self.db.commit()
             return True
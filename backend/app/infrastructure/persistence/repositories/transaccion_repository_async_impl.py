@@ -0,0 +1,52 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.ports.transaccion_repository import AsyncTransaccionRepository
+from app.domain.models.transaccion import Transaccion, TransaccionCreate, TransaccionUpdate
+from app.infrastructure.persistence.models.transaccion_sql import TransaccionModel
+from app.infrastructure.observability.tracing import traced_repository
+
+@traced_repository
+class AsyncSqlAlchemyTransaccionRepository(AsyncTransaccionRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, transaccion_id: int) -> Optional[Transaccion]:
+        db_transaccion = await self.db.get(TransaccionModel, transaccion_id)
+        if db_transaccion:
+            return Transaccion.model_validate(db_transaccion)
+        return None
+
+    async def list_by_association(self, asociacion_id: int) -> List[Transaccion]:
+        result = await self.db.execute(
+            select(TransaccionModel).where(TransaccionModel.asociacion_id == asociacion_id).order_by(TransaccionModel.fecha_transaccion.desc())
+        )
+        return [Transaccion.model_validate(item) for item in result.scalars().all()]
+
+    async def create(self, transaccion: TransaccionCreate) -> Transaccion:
+        db_transaccion = TransaccionModel(**transaccion.model_dump())
+        self.db.add(db_transaccion)
+        await self.db.commit()
+        await self.db.refresh(db_transaccion)
+        return Transaccion.model_validate(db_transaccion)
+
+    async def update(self, transaccion_id: int, transaccion_update: TransaccionUpdate) -> Optional[Transaccion]:
+        db_transaccion = await self.db.get(TransaccionModel, transaccion_id)
+        if not db_transaccion:
+            return None
+
+        update_data = transaccion_update.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_transaccion, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_transaccion)
+        return Transaccion.model_validate(db_transaccion)
+
+    async def delete(self, transaccion_id: int) -> bool:
+        db_transaccion = await self.db.get(TransaccionModel, transaccion_id)
+        if db_transaccion:
+            await self.db.delete(db_transaccion)
+            await self.db.commit()
+            return True
+        return False
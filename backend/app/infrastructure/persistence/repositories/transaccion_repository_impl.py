@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from app.domain.ports.transaccion_repository import TransaccionRepository
 from app.domain.models.transaccion import Transaccion, TransaccionCreate, TransaccionUpdate
 from app.infrastructure.persistence.models.transaccion_sql import TransaccionModel
+from app.infrastructure.observability.tracing import traced_repository
 
+@traced_repository
 class SqlAlchemyTransaccionRepository(TransaccionRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -6,9 +6,11 @@ from app.domain.ports.user_repository import UserRepository
 from app.domain.models.user import User, UserCreate, UserUpdate
 from app.infrastructure.persistence.models.user_sql import UserModel, UserProfileModel
 from passlib.context import CryptContext
+from app.infrastructure.observability.tracing import traced_repository
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+@traced_repository
 class SqlAlchemyUserRepository(UserRepository):
     def __init__(self, db: Session):
         self.db = db
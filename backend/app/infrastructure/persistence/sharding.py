@@ -0,0 +1,131 @@
+import os
+import time
+import threading
+from typing import Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.infrastructure.persistence.database import (
+    PROJECT_ROOT, SQLALCHEMY_DATABASE_URL, engine, engine_options, get_db
+)
+from app.infrastructure.persistence.async_database import get_async_db, to_async_url
+from app.infrastructure.persistence.reporting import reporting_session_factory, wants_reporting
+
+# TENANT_SHARDING=true: associations moved with `manage.py split_tenant` keep their
+# data in their own SQLite file (or Postgres schema). The catalog database (auth,
+# profiles, associations) is always the main one. Must match the Django settings.
+SHARDING_ENABLED = os.getenv("TENANT_SHARDING", "false").lower() in ("1", "true", "yes")
+SHARD_DIR = os.getenv("TENANT_SHARD_DIR", os.path.join(PROJECT_ROOT, "frontend", "shards"))
+# How long a catalog lookup (association -> shard) is trusted
+CATALOG_TTL = int(os.getenv("TENANT_CATALOG_TTL", "30"))
+
+# Sent by the Django ApiClient on every call
+TENANT_HEADER = "X-Asociacion-Id"
+
+_catalog = {}
+_factories = {}
+_async_factories = {}
+_lock = threading.Lock()
+
+
+def shard_url(alias: str) -> str:
+    if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        return f"sqlite:///{os.path.join(SHARD_DIR, alias + '.sqlite3')}"
+    # Postgres: same database, one schema per association
+    return SQLALCHEMY_DATABASE_URL
+
+
+def shard_engine_options(alias: str) -> dict:
+    options = engine_options(SQLALCHEMY_DATABASE_URL)
+    if not SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        options["connect_args"] = {"options": f"-csearch_path={alias}"}
+    return options
+
+
+def tenant_id(request: Request) -> Optional[int]:
+    raw = request.headers.get(TENANT_HEADER) or request.query_params.get("asociacion_id")
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def shard_for(asociacion_id: int) -> Optional[str]:
+    """Shard alias of an association, or None if it lives in the catalog database"""
+    cached = _catalog.get(asociacion_id)
+    if cached and time.monotonic() - cached[1] < CATALOG_TTL:
+        return cached[0]
+
+    with engine.connect() as conn:
+        alias = conn.execute(
+            text("SELECT db_shard FROM core_asociacionvecinal WHERE id = :id"), {"id": asociacion_id}
+        ).scalar()
+    alias = alias or None
+    _catalog[asociacion_id] = (alias, time.monotonic())
+    return alias
+
+
+def session_factory_for(alias: str) -> sessionmaker:
+    with _lock:
+        if alias not in _factories:
+            shard_engine = create_engine(shard_url(alias), **shard_engine_options(alias))
+            _factories[alias] = sessionmaker(autocommit=False, autoflush=False, bind=shard_engine)
+        return _factories[alias]
+
+
+def async_session_factory_for(alias: str):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    with _lock:
+        if alias not in _async_factories:
+            options = shard_engine_options(alias)
+            if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+                options.pop("connect_args", None)
+            else:
+                # asyncpg takes server settings instead of libpq options
+                options["connect_args"] = {"server_settings": {"search_path": alias}}
+            shard_engine = create_async_engine(to_async_url(shard_url(alias)), **options)
+            _async_factories[alias] = async_sessionmaker(shard_engine, expire_on_commit=False)
+        return _async_factories[alias]
+
+
+def _request_shard(request: Request) -> Optional[str]:
+    if not SHARDING_ENABLED:
+        return None
+    asociacion_id = tenant_id(request)
+    return shard_for(asociacion_id) if asociacion_id is not None else None
+
+
+def get_tenant_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Session for the association of the request. Unsharded associations
+    (and every request when sharding is off) use the regular get_db session,
+    or the reporting database for report/export reads.
+    """
+    alias = _request_shard(request)
+    factory = session_factory_for(alias) if alias is not None else None
+    if factory is None and wants_reporting(request):
+        factory = reporting_session_factory()
+    if factory is None:
+        yield db
+        return
+
+    shard_db = factory()
+    try:
+        yield shard_db
+    finally:
+        shard_db.close()
+
+
+async def get_tenant_async_db(request: Request, db=Depends(get_async_db)):
+    from starlette.concurrency import run_in_threadpool
+
+    alias = await run_in_threadpool(_request_shard, request) if SHARDING_ENABLED else None
+    if alias is None:
+        yield db
+        return
+
+    async with async_session_factory_for(alias)() as shard_db:
+        yield shard_db
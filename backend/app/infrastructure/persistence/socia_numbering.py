@@ -0,0 +1,152 @@
+import os
+from typing import Optional
+
+from sqlalchemy import case, delete, select, update
+
+from app.infrastructure.persistence.dialects import dialect_of, insert_ignore
+from app.infrastructure.persistence.models.socia_sql import NumeroSociaLibreModel, SociaModel, SociaSequenceModel
+
+# Same setting as Django (frontend/socias/numbering.py works on the same tables)
+SOCIA_REUSE_NUMBERS = os.getenv("SOCIA_REUSE_NUMBERS", "false").lower() in ("1", "true", "yes")
+
+# numero_socia is allocated with a single UPDATE ... RETURNING on the association's
+# sequence row, so concurrent creates never read the same "max + 1". Nothing here
+# commits: the number is taken in the same transaction as the INSERT of the socia.
+
+
+def _last_number(numeros) -> int:
+    return max((int(numero) for numero in numeros if numero and numero.isdigit()), default=0)
+
+
+def _numbers_stmt(asociacion_id: int):
+    return select(SociaModel.numero_socia).where(SociaModel.asociacion_id == asociacion_id)
+
+
+def _has_sequence_stmt(asociacion_id: int):
+    return select(SociaSequenceModel.id).where(SociaSequenceModel.asociacion_id == asociacion_id)
+
+
+def _create_sequence_stmt(dialect: str, asociacion_id: int, siguiente: int):
+    # If another request creates the row first, keep theirs
+    return insert_ignore(
+        dialect, SociaSequenceModel, {"asociacion_id": asociacion_id, "siguiente": siguiente}, ["asociacion_id"]
+    )
+
+
+def _reserve_stmt(asociacion_id: int, count: int):
+    return (
+        update(SociaSequenceModel)
+        .where(SociaSequenceModel.asociacion_id == asociacion_id)
+        .values(siguiente=SociaSequenceModel.siguiente + count)
+        .returning(SociaSequenceModel.siguiente)
+    )
+
+
+def _advance_stmt(asociacion_id: int, numero: int):
+    # GREATEST is not portable (SQLite): CASE keeps the sequence from moving backwards
+    return (
+        update(SociaSequenceModel)
+        .where(SociaSequenceModel.asociacion_id == asociacion_id)
+        .values(siguiente=case(
+            (SociaSequenceModel.siguiente <= numero, numero + 1), else_=SociaSequenceModel.siguiente
+        ))
+    )
+
+
+def _unfree_stmt(asociacion_id: int, numero: int):
+    return delete(NumeroSociaLibreModel).where(
+        NumeroSociaLibreModel.asociacion_id == asociacion_id, NumeroSociaLibreModel.numero == numero
+    )
+
+
+def _pop_free_stmt(asociacion_id: int):
+    # Lowest free number; if a concurrent request takes it first nothing is returned
+    lowest = (
+        select(NumeroSociaLibreModel.id)
+        .where(NumeroSociaLibreModel.asociacion_id == asociacion_id)
+        .order_by(NumeroSociaLibreModel.numero)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return delete(NumeroSociaLibreModel).where(NumeroSociaLibreModel.id == lowest).returning(NumeroSociaLibreModel.numero)
+
+
+def _release_stmt(dialect: str, asociacion_id: int, numero: str):
+    return insert_ignore(
+        dialect, NumeroSociaLibreModel, {"asociacion_id": asociacion_id, "numero": int(numero)},
+        ["asociacion_id", "numero"],
+    )
+
+
+def _releasable(numero: Optional[str]) -> bool:
+    return SOCIA_REUSE_NUMBERS and bool(numero) and numero.isdigit()
+
+
+def _ensure_sequence(db, asociacion_id: int) -> None:
+    if db.execute(_has_sequence_stmt(asociacion_id)).first() is None:
+        siguiente = _last_number(db.execute(_numbers_stmt(asociacion_id)).scalars()) + 1
+        db.execute(_create_sequence_stmt(dialect_of(db), asociacion_id, siguiente))
+
+
+def reserve_numbers(db, asociacion_id: int, count: int = 1) -> range:
+    """Reserve `count` consecutive numbers for the association"""
+    _ensure_sequence(db, asociacion_id)
+    siguiente = db.execute(_reserve_stmt(asociacion_id, count)).scalar_one()
+    return range(siguiente - count, siguiente)
+
+
+def next_numero(db, asociacion_id: int) -> str:
+    """numero_socia for a new socia: a freed number when reuse is on, otherwise the next one"""
+    if SOCIA_REUSE_NUMBERS:
+        numero = db.execute(_pop_free_stmt(asociacion_id)).scalar()
+        if numero is not None:
+            return str(numero)
+    return str(reserve_numbers(db, asociacion_id)[0])
+
+
+def advance_past(db, asociacion_id: int, numero: Optional[str]) -> None:
+    """After writing an explicit numero_socia, keep the sequence (and the free list) clear of it"""
+    if not numero or not numero.isdigit():
+        return
+    _ensure_sequence(db, asociacion_id)
+    db.execute(_advance_stmt(asociacion_id, int(numero)))
+    db.execute(_unfree_stmt(asociacion_id, int(numero)))
+
+
+def release_numero(db, asociacion_id: int, numero: Optional[str]) -> None:
+    """Keep the number of a deleted socia for reuse (only with SOCIA_REUSE_NUMBERS)"""
+    if _releasable(numero):
+        db.execute(_release_stmt(dialect_of(db), asociacion_id, numero))
+
+
+async def _async_ensure_sequence(db, asociacion_id: int) -> None:
+    if (await db.execute(_has_sequence_stmt(asociacion_id))).first() is None:
+        siguiente = _last_number((await db.execute(_numbers_stmt(asociacion_id))).scalars()) + 1
+        await db.execute(_create_sequence_stmt(dialect_of(db), asociacion_id, siguiente))
+
+
+async def async_reserve_numbers(db, asociacion_id: int, count: int = 1) -> range:
+    await _async_ensure_sequence(db, asociacion_id)
+    siguiente = (await db.execute(_reserve_stmt(asociacion_id, count))).scalar_one()
+    return range(siguiente - count, siguiente)
+
+
+async def async_next_numero(db, asociacion_id: int) -> str:
+    if SOCIA_REUSE_NUMBERS:
+        numero = (await db.execute(_pop_free_stmt(asociacion_id))).scalar()
+        if numero is not None:
+            return str(numero)
+    return str((await async_reserve_numbers(db, asociacion_id))[0])
+
+
+async def async_advance_past(db, asociacion_id: int, numero: Optional[str]) -> None:
+    if not numero or not numero.isdigit():
+        return
+    await _async_ensure_sequence(db, asociacion_id)
+    await db.execute(_advance_stmt(asociacion_id, int(numero)))
+    await db.execute(_unfree_stmt(asociacion_id, int(numero)))
+
+
+async def async_release_numero(db, asociacion_id: int, numero: Optional[str]) -> None:
+    if _releasable(numero):
+        await db.execute(_release_stmt(dialect_of(db), asociacion_id, numero))
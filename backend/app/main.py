@@ -1,6 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.infrastructure.api.v1 import users, socias, eventos, drive, lugares, finanzas, proyectos
+from fastapi.responses import JSONResponse
+from app.infrastructure.observability import metrics, query_log, tracing
+from app.infrastructure.api.v1 import users, socias, eventos, drive, lugares, finanzas, proyectos, adjuntos, geo, direcciones
 
 app = FastAPI(
     title="Gestor Asociaciones API",
@@ -17,10 +19,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(query_log.QueryLogMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(tracing.TracingMiddleware)
+
+@app.exception_handler(query_log.QueryBudgetExceeded)
+async def query_budget_exceeded(request: Request, exc: query_log.QueryBudgetExceeded):
+    # Only raised with QUERY_BUDGET_ENFORCE (dev/test): usually an N+1
+    return JSONResponse(status_code=500, content={"detail": f"Presupuesto de consultas superado: {exc}"})
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "architecture": "hexagonal"}
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics(request: Request):
+    if metrics.METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {metrics.METRICS_TOKEN}":
+        return Response(status_code=401)
+    body, content_type = metrics.exposition()
+    return Response(content=body, media_type=content_type)
+
 app.include_router(users.router, prefix="/v1")
 app.include_router(socias.router, prefix="/v1")
 app.include_router(eventos.router, prefix="/v1")
@@ -28,6 +46,9 @@ app.include_router(drive.router, prefix="/v1")
 app.include_router(lugares.router, prefix="/v1")
 app.include_router(finanzas.router, prefix="/v1")
 app.include_router(proyectos.router, prefix="/v1")
+app.include_router(adjuntos.router, prefix="/v1")
+app.include_router(geo.router, prefix="/v1")
+app.include_router(direcciones.router, prefix="/v1")
 
 
 
@@ -0,0 +1,124 @@
+"""
+Throughput comparison of the sync and async persistence stacks.
+
+Seeds a temporary SQLite database and fires concurrent GET /v1/socias/
+requests at the app in each mode (ASYNC_DB=false / true). Each mode runs
+in its own subprocess because the stack is chosen at import time.
+
+    cd backend
+    python -m benchmarks.db_stacks --requests 2000 --concurrency 100 --socias 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {"sync": "false", "async": "true"}
+
+
+def seed(database_url: str, socias: int):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.infrastructure.persistence.database import Base
+    from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+    from app.infrastructure.persistence.models.socia_sql import SociaModel
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(AsociacionVecinalModel(id=1, nombre="AV Benchmark", numero_registro="BENCH-1"))
+    db.add_all(
+        SociaModel(asociacion_id=1, numero_socia=str(i), nombre=f"Socia {i}", apellidos="Benchmark")
+        for i in range(1, socias + 1)
+    )
+    db.commit()
+    db.close()
+    engine.dispose()
+
+
+async def fire(total: int, concurrency: int):
+    import httpx
+    from app.main import app
+
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker(client):
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get("/v1/socias/", params={"asociacion_id": 1})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm-up: engine creation, first connection, route compilation
+        await client.get("/v1/socias/", params={"asociacion_id": 1})
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "req_per_s": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def run_mode(args):
+    """Child process: the env already selects the stack"""
+    print(json.dumps(asyncio.run(fire(args.requests, args.concurrency))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--socias", type=int, default=300, help="rows returned by each request")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        return run_mode(args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}"
+        seed(database_url, args.socias)
+
+        results = {}
+        for mode, flag in MODES.items():
+            env = dict(os.environ, ASYNC_DB=flag, DATABASE_URL=database_url)
+            env.pop("ASYNC_DATABASE_URL", None)
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.db_stacks", "--mode", mode,
+                 "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    columns = ["req_per_s", "p50_ms", "p95_ms", "p99_ms", "errors"]
+    print(f"{'stack':<8}" + "".join(f"{c:>12}" for c in columns))
+    for mode, result in results.items():
+        print(f"{mode:<8}" + "".join(f"{result[c]:>12}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.api.v1 import direcciones
+from app.infrastructure.external_services.geoapify_autocomplete import GeoapifyAutocomplete
+from app.infrastructure.persistence.models.lugar_sql import LugarModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+
+
+@pytest.fixture
+def geoapify(monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(dict(request.url.params))
+        if "error" in request.url.params["text"]:
+            return httpx.Response(503)
+        features = [{"type": "Feature", "properties": {"formatted": f"Calle Geoapify {i}", "source": "geoapify"}}
+                    for i in range(int(request.url.params["limit"]))]
+        return httpx.Response(200, json={"type": "FeatureCollection", "features": features})
+
+    provider = GeoapifyAutocomplete(api_key="test-key", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(direcciones, "autocomplete", provider)
+    return calls
+
+
+def _asociacion(db_session):
+    asociacion = AsociacionVecinalModel(nombre="AV Direcciones", numero_registro="REG-DIR")
+    db_session.add(asociacion)
+    db_session.commit()
+    db_session.add_all([
+        LugarModel(asociacion_id=asociacion.id, nombre="Centro Cívico", direccion="Calle Mayor 10", lat=40.41, lon=-3.70),
+        LugarModel(asociacion_id=asociacion.id, nombre="Local de la asociación", direccion="Calle Mayor 22"),
+        LugarModel(asociacion_id=asociacion.id, nombre="Parque", direccion="Avenida del Sol 1"),
+    ])
+    db_session.commit()
+    return asociacion.id
+
+
+def _features(client, **params):
+    response = client.get("/v1/direcciones/autocompletar", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()["features"]
+
+
+def test_lugares_of_the_association_come_first(client: TestClient, db_session, geoapify):
+    asociacion_id = _asociacion(db_session)
+
+    features = _features(client, text="calle mayor", asociacion_id=asociacion_id, limit=4, lang="es")
+
+    assert [f["properties"]["formatted"] for f in features] == [
+        "Calle Mayor 10", "Calle Mayor 22", "Calle Geoapify 0", "Calle Geoapify 1",
+    ]
+    assert features[0]["properties"]["lugar_id"] and features[0]["geometry"]["coordinates"] == [-3.70, 40.41]
+    assert features[1]["geometry"] is None
+    assert len(geoapify) == 1 and geoapify[0]["lang"] == "es"
+
+    # Same prefix again: answered from the cache
+    _features(client, text="Calle  Mayor", asociacion_id=asociacion_id, limit=4, lang="es")
+    assert len(geoapify) == 1
+
+
+def test_geoapify_is_skipped_when_lugares_fill_the_limit_or_text_is_short(client: TestClient, db_session, geoapify):
+    asociacion_id = _asociacion(db_session)
+
+    assert len(_features(client, text="calle mayor", asociacion_id=asociacion_id, limit=2)) == 2
+    # Short prefixes only look at the association's lugares
+    short = _features(client, text="ca", asociacion_id=asociacion_id, limit=5)
+    assert short and all(f["properties"]["source"] == "asociacion" for f in short)
+    assert geoapify == []
+
+
+def test_geoapify_errors_fall_back_to_lugares(client: TestClient, db_session, geoapify):
+    asociacion_id = _asociacion(db_session)
+
+    features = _features(client, text="parque error", asociacion_id=asociacion_id)
+
+    assert features == []
+    features = _features(client, text="Parque", asociacion_id=asociacion_id)
+    assert [f["properties"]["source"] for f in features] == ["asociacion"] + ["geoapify"] * 4
@@ -0,0 +1,87 @@
+import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.api.v1 import drive
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+
+
+class FakeDriveService:
+    def __init__(self, metadata=None):
+        self.metadata = metadata or {}
+        self.calls = 0
+
+    def get_file_metadata(self, credentials_json, file_id):
+        self.calls += 1
+        return self.metadata
+
+
+def _asociacion(db_session, **kwargs):
+    asociacion = AsociacionVecinalModel(
+        nombre="AV Test",
+        numero_registro="REG-1",
+        drive_folder_id="folder-1",
+        drive_credentials="{}",
+        **kwargs
+    )
+    db_session.add(asociacion)
+    db_session.commit()
+    return asociacion
+
+
+def test_config_answers_from_cache_without_calling_drive(client: TestClient, db_session, monkeypatch):
+    fake = FakeDriveService()
+    monkeypatch.setattr(drive, "drive_service", fake)
+    asociacion = _asociacion(
+        db_session,
+        drive_folder_name="Gestor",
+        drive_folder_link="https://drive.example/folder-1",
+        drive_metadata_updated_at=datetime.datetime.utcnow(),
+    )
+
+    response = client.get(f"/v1/drive/config/{asociacion.id}")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["folder_name"] == "Gestor"
+    assert data["folder_link"] == "https://drive.example/folder-1"
+    assert data["metadata_stale"] is False
+    assert fake.calls == 0
+
+
+def test_stale_metadata_is_refreshed_in_background(client: TestClient, db_session, monkeypatch):
+    fake = FakeDriveService({"name": "Nueva", "webViewLink": "https://drive.example/nueva"})
+    monkeypatch.setattr(drive, "drive_service", fake)
+    monkeypatch.setattr(drive.database, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    asociacion = _asociacion(db_session)
+
+    response = client.get(f"/v1/drive/config/{asociacion.id}")
+
+    # The first answer comes from the (empty) cache, the refresh runs afterwards
+    assert response.json()["folder_name"] is None
+    assert response.json()["metadata_stale"] is True
+    assert fake.calls == 1
+
+    db_session.expire_all()
+    data = client.get(f"/v1/drive/config/{asociacion.id}").json()
+    assert data["folder_name"] == "Nueva"
+    assert data["metadata_stale"] is False
+    assert fake.calls == 1
+
+
+def test_failed_refresh_keeps_last_known_values(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(drive, "drive_service", FakeDriveService({}))
+    monkeypatch.setattr(drive.database, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    asociacion = _asociacion(
+        db_session,
+        drive_folder_name="Antigua",
+        drive_folder_link="https://drive.example/antigua",
+        drive_metadata_updated_at=datetime.datetime.utcnow() - datetime.timedelta(days=2),
+    )
+
+    client.get(f"/v1/drive/config/{asociacion.id}")
+
+    db_session.expire_all()
+    data = client.get(f"/v1/drive/config/{asociacion.id}").json()
+    assert data["folder_name"] == "Antigua"
+    assert data["folder_link"] == "https://drive.example/antigua"
@@ -77,3 +77,89 @@ def test_list_eventos(client: TestClient, db_session):
     data = response.json()
     assert len(data) == 1
     assert data[0]["nombre"] == "Taller"
+
+
+def test_evento_keeps_its_lugar(client: TestClient, db_session):
+    from app.infrastructure.persistence.models.lugar_sql import LugarModel
+
+    asociacion = AsociacionVecinalModel(nombre="Asoc Evt Lugar", numero_registro="REG-EVT-LUG")
+    db_session.add(asociacion)
+    db_session.commit()
+    socia = SociaModel(numero_socia="S010", nombre="Marta", apellidos="Gil", asociacion_id=asociacion.id)
+    sala = LugarModel(nombre="Sala 1", asociacion_id=asociacion.id)
+    patio = LugarModel(nombre="Patio", asociacion_id=asociacion.id)
+    db_session.add_all([socia, sala, patio])
+    db_session.commit()
+
+    response = client.post("/v1/eventos/", json={
+        "nombre": "Asamblea",
+        "fecha": datetime(2030, 5, 1, 18, 0).isoformat(),
+        "asociacion_id": asociacion.id,
+        "responsable_id": socia.id,
+        "lugar_id": sala.id,
+    })
+    assert response.status_code == 201, response.text
+    evento_id = response.json()["id"]
+    assert response.json()["lugar_id"] == sala.id
+
+    response = client.put(f"/v1/eventos/{evento_id}", json={"lugar_id": patio.id})
+    assert response.status_code == 200, response.text
+    assert client.get(f"/v1/eventos/{evento_id}").json()["lugar_id"] == patio.id
+
+
+def test_list_eventos_in_a_window_keeps_recurring_ones(client: TestClient, db_session):
+    asociacion = AsociacionVecinalModel(nombre="Asoc Evt Ventana", numero_registro="REG-EVT-VEN")
+    db_session.add(asociacion)
+    db_session.commit()
+    socia = SociaModel(numero_socia="S011", nombre="Rosa", apellidos="Vidal", asociacion_id=asociacion.id)
+    db_session.add(socia)
+    db_session.commit()
+
+    for nombre, fecha, recurrencia in (
+        ("Antes", datetime(2030, 1, 10, 18, 0), ""),
+        ("Dentro", datetime(2030, 3, 10, 18, 0), ""),
+        ("Después", datetime(2030, 6, 10, 18, 0), ""),
+        ("Taller semanal", datetime(2029, 9, 3, 18, 0), "FREQ=WEEKLY;BYDAY=TU"),
+    ):
+        response = client.post("/v1/eventos/", json={
+            "nombre": nombre,
+            "fecha": fecha.isoformat(),
+            "asociacion_id": asociacion.id,
+            "responsable_id": socia.id,
+            "recurrencia": recurrencia,
+        })
+        assert response.status_code == 201, response.text
+
+    response = client.get("/v1/eventos/", params={
+        "asociacion_id": asociacion.id,
+        "desde": datetime(2030, 3, 1).isoformat(),
+        "hasta": datetime(2030, 4, 1).isoformat(),
+    })
+    assert response.status_code == 200
+    data = {e["nombre"]: e for e in response.json()}
+    # The recurring one started before the window: its occurrences are expanded by the client
+    assert set(data) == {"Dentro", "Taller semanal"}
+    assert data["Taller semanal"]["recurrencia"] == "FREQ=WEEKLY;BYDAY=TU"
+
+    response = client.get("/v1/eventos/", params={"asociacion_id": asociacion.id})
+    assert len(response.json()) == 4
+
+
+def test_invalid_recurrence_rules_are_rejected(client: TestClient, db_session):
+    asociacion = AsociacionVecinalModel(nombre="Asoc Evt Regla", numero_registro="REG-EVT-RRULE")
+    db_session.add(asociacion)
+    db_session.commit()
+    socia = SociaModel(numero_socia="S012", nombre="Lola", apellidos="Gil", asociacion_id=asociacion.id)
+    db_session.add(socia)
+    db_session.commit()
+    payload = {
+        "nombre": "Taller", "fecha": datetime(2030, 3, 4, 18, 0).isoformat(),
+        "asociacion_id": asociacion.id, "responsable_id": socia.id,
+    }
+
+    for recurrencia in ("FREQ=WEEKLY;BYDAY=XX", "FREQ=DAILY;INTERVAL=0", "FREQ=MINUTELY"):
+        response = client.post("/v1/eventos/", json={**payload, "recurrencia": recurrencia})
+        assert response.status_code == 422, recurrencia
+
+    evento_id = client.post("/v1/eventos/", json={**payload, "recurrencia": "FREQ=WEEKLY"}).json()["id"]
+    assert client.put(f"/v1/eventos/{evento_id}", json={"recurrencia": "FREQ=WEEKLY;BYDAY=XX"}).status_code == 422
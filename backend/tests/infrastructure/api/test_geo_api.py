@@ -0,0 +1,147 @@
+import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.services import geo_service
+from app.application.services.geo_service import cell_edges, lat_to_tile, lon_to_tile
+from app.infrastructure.persistence.models.evento_sql import EventoModel
+from app.infrastructure.persistence.models.lugar_sql import LugarModel
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+
+# Around Puerta del Sol; the whole bbox fits in a couple of tiles at zoom 12
+BBOX = "-3.75,40.38,-3.65,40.45"
+
+
+@pytest.fixture(autouse=True)
+def empty_tile_cache():
+    geo_service.clear_tile_cache()
+    yield
+    geo_service.clear_tile_cache()
+
+
+def _asociacion(db_session, registro="REG-GEO"):
+    asociacion = AsociacionVecinalModel(nombre="AV Mapa", numero_registro=registro)
+    db_session.add(asociacion)
+    db_session.commit()
+    return asociacion.id
+
+
+def _socias(db_session, asociacion_id, points):
+    for i, (lat, lon) in enumerate(points):
+        db_session.add(SociaModel(asociacion_id=asociacion_id, numero_socia=str(i + 1), nombre="Socia",
+                                  apellidos=str(i + 1), lat=lat, lon=lon))
+    db_session.commit()
+
+
+def _features(client, asociacion_id, zoom, layers="socias", bbox=BBOX):
+    response = client.get("/v1/geo", params={"asociacion_id": asociacion_id, "bbox": bbox, "zoom": zoom, "layers": layers})
+    assert response.status_code == 200, response.text
+    return response.json()["features"]
+
+
+def test_cell_edges_follow_mercator():
+    lon_edges, lat_edges = cell_edges(12, lon_to_tile(-3.70, 12), lat_to_tile(40.41, 12))
+
+    assert lon_edges == sorted(lon_edges) and lat_edges == sorted(lat_edges)
+    assert lon_edges[0] <= -3.70 < lon_edges[-1]
+    assert lat_edges[0] <= 40.41 < lat_edges[-1]
+    # Mercator: cells of equal pixel height span fewer degrees towards the north
+    heights = [b - a for a, b in zip(lat_edges, lat_edges[1:])]
+    assert heights == sorted(heights, reverse=True)
+
+
+def test_low_zoom_groups_nearby_points_into_clusters(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    otra_id = _asociacion(db_session, registro="REG-OTRA")
+    _socias(db_session, asociacion_id, [(40.4168 + i * 1e-5, -3.7038) for i in range(50)] + [(40.40, -3.68)])
+    _socias(db_session, otra_id, [(40.4168, -3.7038)] * 5)
+    db_session.add(SociaModel(asociacion_id=asociacion_id, numero_socia="99", nombre="Sin", apellidos="Coordenadas"))
+    db_session.commit()
+
+    features = _features(client, asociacion_id, zoom=12)
+
+    clusters = [f for f in features if f["properties"].get("cluster")]
+    points = [f for f in features if not f["properties"].get("cluster")]
+    assert [c["properties"]["point_count"] for c in clusters] == [50]
+    assert [p["properties"]["nombre"] for p in points] == ["Socia 51"]
+    assert points[0]["geometry"]["coordinates"] == [-3.68, 40.4]
+
+
+def test_high_zoom_returns_individual_points(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    _socias(db_session, asociacion_id, [(40.4168 + i * 1e-4, -3.7038) for i in range(5)])
+
+    features = _features(client, asociacion_id, zoom=geo_service.MAX_CLUSTER_ZOOM, bbox="-3.705,40.416,-3.702,40.418")
+
+    assert len(features) == 5
+    assert not any(f["properties"].get("cluster") for f in features)
+
+
+def test_events_use_their_lugar_and_only_upcoming_ones(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    lugar = LugarModel(asociacion_id=asociacion_id, nombre="Centro Cívico", lat=40.41, lon=-3.70)
+    db_session.add(lugar)
+    db_session.commit()
+    now = datetime.datetime.utcnow()
+    for nombre, fecha in (("Asamblea", now + datetime.timedelta(days=3)), ("Fiesta", now - datetime.timedelta(days=3))):
+        db_session.add(EventoModel(asociacion_id=asociacion_id, nombre=nombre, fecha=fecha, lugar_id=lugar.id))
+    db_session.commit()
+
+    features = _features(client, asociacion_id, zoom=12, layers="lugares,eventos")
+
+    assert sorted((f["properties"]["layer"], f["properties"]["nombre"]) for f in features) == [
+        ("eventos", "Asamblea"), ("lugares", "Centro Cívico"),
+    ]
+
+
+def test_tiles_are_cached(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    _socias(db_session, asociacion_id, [(40.4168, -3.7038)])
+    assert len(_features(client, asociacion_id, zoom=12)) == 1
+
+    _socias(db_session, asociacion_id, [(40.41, -3.69)])
+
+    assert len(_features(client, asociacion_id, zoom=12)) == 1
+    geo_service.clear_tile_cache()
+    assert len(_features(client, asociacion_id, zoom=12)) == 2
+
+
+def test_rejects_invalid_requests(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    params = {"asociacion_id": asociacion_id, "bbox": BBOX, "zoom": 12}
+
+    assert client.get("/v1/geo", params={**params, "bbox": "1,2,3"}).status_code == 400
+    assert client.get("/v1/geo", params={**params, "layers": "socias,tesoros"}).status_code == 400
+    # The whole world at zoom 12 would be millions of tiles
+    assert client.get("/v1/geo", params={**params, "bbox": "-180,-85,180,85"}).status_code == 400
+
+
+def test_suggests_venues_closest_to_participants(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    # Two participants in the north, one in the south; the "Norte" venue is between the first two
+    _socias(db_session, asociacion_id, [(40.430, -3.700), (40.432, -3.700), (40.400, -3.700)])
+    for nombre, lat in (("Norte", 40.431), ("Centro", 40.415), ("Sur", 40.400), ("Lejos", 41.5)):
+        db_session.add(LugarModel(asociacion_id=asociacion_id, nombre=nombre, lat=lat, lon=-3.700))
+    db_session.commit()
+    socia_ids = [s.id for s in db_session.query(SociaModel).filter_by(asociacion_id=asociacion_id)]
+
+    response = client.get("/v1/geo/lugares-sugeridos", params={"asociacion_id": asociacion_id, "socias": socia_ids, "k": 2})
+
+    assert response.status_code == 200
+    sugeridos = response.json()
+    assert [lugar["nombre"] for lugar in sugeridos] == ["Norte", "Centro"]
+    assert sugeridos[0]["participantes_cerca"] == 2
+
+
+def test_cercanos_with_radius(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    _socias(db_session, asociacion_id, [(40.4168, -3.7038), (40.4178, -3.7038), (40.4268, -3.7038)])
+
+    response = client.get("/v1/geo/cercanos", params={
+        "asociacion_id": asociacion_id, "layer": "socias", "lat": 40.4168, "lon": -3.7038, "radio": 500, "k": 100,
+    })
+
+    assert [p["nombre"] for p in response.json()] == ["Socia 1", "Socia 2"]
+    assert response.json()[1]["distancia"] == pytest.approx(111, abs=1)
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.infrastructure.observability import metrics
+
+
+def test_metrics_exposes_route_latency_and_query_counts(client: TestClient):
+    client.get("/v1/socias/", params={"asociacion_id": 1})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'asonet_backend_http_request_duration_seconds_count{method="GET",route="/v1/socias/"}' in body
+    assert 'asonet_backend_http_requests_total{method="GET",route="/v1/socias/",status="200"}' in body
+    assert 'asonet_backend_db_queries_total{operation="SELECT"}' in body
+
+
+def test_metrics_requires_token_when_configured(client: TestClient, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "secreto")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secreto"}).status_code == 200
+
+
+def test_observe_drive_counts_failures():
+    @metrics.observe_drive("test_operation")
+    def failing():
+        raise RuntimeError("Drive caído")
+
+    before = metrics.DRIVE_CALLS.labels(operation="test_operation", outcome="error")._value.get()
+    try:
+        failing()
+    except RuntimeError:
+        pass
+
+    assert metrics.DRIVE_CALLS.labels(operation="test_operation", outcome="error")._value.get() == before + 1
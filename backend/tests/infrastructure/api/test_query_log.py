@@ -0,0 +1,51 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.infrastructure.observability import query_log
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+
+
+def _seed(db_session):
+    db_session.add(AsociacionVecinalModel(id=1, nombre="AV", numero_registro="REG-1"))
+    db_session.add(SociaModel(asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"))
+    db_session.commit()
+
+
+def test_server_timing_reports_request_queries(client: TestClient, db_session):
+    _seed(db_session)
+
+    response = client.get("/v1/socias/", params={"asociacion_id": 1})
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in timing
+    assert "app;dur=" in timing
+
+
+def test_query_budget_fails_the_request_when_enforced(client: TestClient, db_session, monkeypatch):
+    _seed(db_session)
+    monkeypatch.setattr(query_log, "QUERY_BUDGET", 1)
+    monkeypatch.setattr(query_log, "QUERY_BUDGET_ENFORCE", True)
+
+    within_budget = client.get("/v1/socias/", params={"asociacion_id": 1})
+    # Create = INSERT + SELECT of the refreshed row
+    over_budget = client.post(
+        "/v1/socias/", json={"asociacion_id": 1, "numero_socia": "2", "nombre": "Eva", "apellidos": "López"}
+    )
+
+    assert within_budget.status_code == 200
+    assert over_budget.status_code == 500
+    assert "Presupuesto de consultas superado" in over_budget.json()["detail"]
+
+
+def test_slow_queries_are_logged_with_their_route(client: TestClient, db_session, monkeypatch, caplog):
+    _seed(db_session)
+    monkeypatch.setattr(query_log, "SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger=query_log.__name__):
+        client.get("/v1/socias/", params={"asociacion_id": 1})
+
+    assert any("Slow query" in r.message and "GET /v1/socias/" in r.message for r in caplog.records)
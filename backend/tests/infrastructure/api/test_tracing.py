@@ -0,0 +1,53 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.infrastructure.observability import tracing
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+DJANGO_SPAN_ID = "00f067aa0ba902b7"
+
+
+def test_request_continues_django_trace_and_records_repository_spans(client: TestClient, db_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACING_EXPORTER", "jsonl")
+    monkeypatch.setattr(tracing, "TRACING_FILE", str(tmp_path / "traces.jsonl"))
+    db_session.add(AsociacionVecinalModel(id=1, nombre="AV", numero_registro="REG-1"))
+    db_session.commit()
+
+    response = client.get(
+        "/v1/socias/",
+        params={"asociacion_id": 1},
+        headers={"traceparent": f"00-{TRACE_ID}-{DJANGO_SPAN_ID}-01", "X-Request-ID": "req-123"},
+    )
+    tracing.exporter.flush()
+
+    assert response.headers["x-request-id"] == "req-123"
+    spans = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    server = next(s for s in spans if s["kind"] == "server")
+    repository = next(s for s in spans if s["name"] == "SqlAlchemySociaRepository.list_by_association")
+    assert server["name"] == "GET /v1/socias/"
+    assert server["trace_id"] == TRACE_ID
+    assert server["parent_id"] == DJANGO_SPAN_ID
+    assert server["request_id"] == "req-123"
+    assert repository["trace_id"] == TRACE_ID
+    assert repository["parent_id"] == server["span_id"]
+
+
+def test_request_without_context_starts_a_new_trace(client: TestClient):
+    response = client.get("/health")
+
+    assert len(response.headers["x-request-id"]) == 32
+
+
+def test_otlp_payload_uses_hex_ids_and_span_kinds():
+    with tracing.start_span("GET /v1/socias/", kind="server", traceparent=f"00-{TRACE_ID}-{DJANGO_SPAN_ID}-01") as span:
+        pass
+
+    payload = tracing.otlp_payload([span.to_dict()])
+
+    otlp_span = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp_span["traceId"] == TRACE_ID
+    assert otlp_span["parentSpanId"] == DJANGO_SPAN_ID
+    assert otlp_span["kind"] == 2
+    assert otlp_span["status"] == {"code": 1}
@@ -0,0 +1,70 @@
+import io
+import hashlib
+from PIL import Image
+from fastapi.testclient import TestClient
+
+from app.infrastructure.api.v1 import adjuntos
+from app.infrastructure.external_services.attachment_store import AttachmentStore, generate_previews
+
+
+def _png_bytes(size=(600, 400), color=(200, 30, 30)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_save_deduplicates_by_content(tmp_path):
+    store = AttachmentStore(root=str(tmp_path))
+    content = b"%PDF-1.4 recibo"
+
+    first = store.save(content, "recibo.pdf", "application/pdf")
+    second = store.save(content, "recibo_copia.pdf", "application/pdf")
+
+    assert first.sha256 == hashlib.sha256(content).hexdigest()
+    assert first.created is True
+    assert second.created is False
+    assert second.sha256 == first.sha256
+    # The first upload's metadata is kept
+    assert second.filename == "recibo.pdf"
+    assert store.exists(first.sha256)
+
+
+def test_generate_previews_respects_sizes(tmp_path):
+    store = AttachmentStore(root=str(tmp_path))
+    stored = store.save(_png_bytes(), "foto.png", "image/png")
+
+    generate_previews(store.original_path(stored.sha256), store.directory_for(stored.sha256))
+
+    assert store.available_variants(stored.sha256) == ["thumbnail", "preview"]
+    with Image.open(store.variant_path(stored.sha256, "thumbnail")) as thumb:
+        assert max(thumb.size) == 256
+
+
+def test_invalid_keys_are_rejected(tmp_path):
+    store = AttachmentStore(root=str(tmp_path))
+    assert not store.exists("../../etc/passwd")
+    assert not store.is_valid_key("ABC")
+
+
+def test_upload_and_serve_with_cache_headers(client: TestClient, tmp_path, monkeypatch):
+    monkeypatch.setattr(adjuntos, "attachment_store", AttachmentStore(root=str(tmp_path)))
+    content = _png_bytes()
+
+    response = client.post("/v1/adjuntos/", files={"file": ("foto.png", content, "image/png")})
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created"] is True
+    assert "thumbnail" in data["variants"]
+
+    again = client.post("/v1/adjuntos/", files={"file": ("foto.png", content, "image/png")})
+    assert again.json()["created"] is False
+
+    thumb = client.get(f"/v1/adjuntos/{data['sha256']}/thumbnail")
+    assert thumb.status_code == 200
+    assert "immutable" in thumb.headers["cache-control"]
+
+    not_modified = client.get(
+        f"/v1/adjuntos/{data['sha256']}",
+        headers={"If-None-Match": f'"{data["sha256"]}"'}
+    )
+    assert not_modified.status_code == 304
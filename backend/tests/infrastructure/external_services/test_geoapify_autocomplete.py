@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.external_services.geoapify_autocomplete import AutocompleteError, GeoapifyAutocomplete
+
+PARAMS = {"lang": "es", "limit": 5, "filter": "countrycode:es"}
+
+
+def _provider(calls, status=200, delay=0.0, **options):
+    async def handler(request: httpx.Request):
+        calls.append(dict(request.url.params))
+        await asyncio.sleep(delay)
+        if status != 200:
+            return httpx.Response(status, json={"message": "error"})
+        text = request.url.params["text"]
+        return httpx.Response(200, json={
+            "type": "FeatureCollection",
+            "features": [{"type": "Feature", "properties": {"formatted": f"{text} 1, Madrid"}}],
+            "query": {"text": text},
+        })
+
+    return GeoapifyAutocomplete(api_key="test-key", transport=httpx.MockTransport(handler), **options)
+
+
+def test_same_prefix_is_served_from_cache():
+    calls = []
+    provider = _provider(calls)
+
+    async def scenario():
+        first = await provider.suggest("Calle  Mayor", PARAMS)
+        second = await provider.suggest(" calle mayor ", PARAMS)
+        await provider.suggest("calle mayor", {**PARAMS, "lang": "en"})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    assert first["features"][0]["properties"]["formatted"] == "calle mayor 1, Madrid"
+    # One call per distinct (prefix, parameters); the key is added server side
+    assert [call["lang"] for call in calls] == ["es", "en"]
+    assert all(call["apiKey"] == "test-key" for call in calls)
+
+
+def test_identical_in_flight_queries_share_one_request():
+    calls = []
+    provider = _provider(calls, delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*(provider.suggest("calle ma", PARAMS) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_errors_are_not_cached():
+    calls = []
+    provider = _provider(calls, status=429)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(AutocompleteError):
+                await provider.suggest("calle mayor", PARAMS)
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 2
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    calls = []
+    provider = _provider(calls, max_entries=2)
+
+    async def scenario():
+        for text in ("calle uno", "calle dos", "calle uno", "calle tres", "calle uno", "calle dos"):
+            await provider.suggest(text, PARAMS)
+
+    asyncio.run(scenario())
+
+    # "calle dos" was the least recently used when "calle tres" arrived
+    assert [call["text"] for call in calls] == ["calle uno", "calle dos", "calle tres", "calle dos"]
+
+    calls.clear()
+    provider.ttl = -1
+    asyncio.run(provider.suggest("calle nueva", PARAMS))
+    asyncio.run(provider.suggest("calle nueva", PARAMS))
+    assert len(calls) == 2
@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+
+# The async stack is optional (ASYNC_DB=true)
+pytest.importorskip("greenlet")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.infrastructure.persistence.database import Base
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+from app.infrastructure.persistence.repositories.socia_repository_async_impl import AsyncSqlAlchemySociaRepository
+from app.infrastructure.persistence.repositories.evento_repository_async_impl import AsyncSqlAlchemyEventoRepository
+from app.infrastructure.persistence.repositories.lugar_repository_async_impl import AsyncSqlAlchemyLugarRepository
+from app.application.services.evento_service import AsyncEventoService
+from app.domain.models.socia import SociaCreate, SociaUpdate
+from app.domain.models.evento import EventoCreate, EventoUpdate
+
+
+async def _session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as db:
+        db.add(AsociacionVecinalModel(id=1, nombre="AV Test", numero_registro="REG-1"))
+        await db.commit()
+    return engine, factory
+
+
+def test_async_socia_repository_crud():
+    async def scenario():
+        engine, factory = await _session_factory()
+        async with factory() as db:
+            repo = AsyncSqlAlchemySociaRepository(db)
+            created = await repo.create(SociaCreate(
+                asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"
+            ))
+            assert created.id is not None
+
+            updated = await repo.update(created.id, SociaUpdate(pagado=True))
+            listed = await repo.list_by_association(1)
+            deleted = await repo.delete(created.id)
+            missing = await repo.get_by_id(created.id)
+        await engine.dispose()
+        return updated, listed, deleted, missing
+
+    updated, listed, deleted, missing = asyncio.run(scenario())
+    assert updated.pagado is True
+    assert [s.nombre for s in listed] == ["Ana"]
+    assert deleted is True
+    assert missing is None
+
+
+def test_async_socia_renumber_frees_the_old_number(monkeypatch):
+    from app.infrastructure.persistence import socia_numbering
+    monkeypatch.setattr(socia_numbering, "SOCIA_REUSE_NUMBERS", True)
+
+    async def scenario():
+        engine, factory = await _session_factory()
+        async with factory() as db:
+            repo = AsyncSqlAlchemySociaRepository(db)
+            created = await repo.create(SociaCreate(asociacion_id=1, nombre="Ana", apellidos="García"))
+            await repo.update(created.id, SociaUpdate(numero_socia="5"))
+            nueva = await repo.create(SociaCreate(asociacion_id=1, nombre="Rosa", apellidos="Pérez"))
+        await engine.dispose()
+        return created, nueva
+
+    created, nueva = asyncio.run(scenario())
+    assert created.numero_socia == "1"
+    assert nueva.numero_socia == "1"
+
+
+def test_async_evento_service_saves_lugar_and_duration():
+    async def scenario():
+        engine, factory = await _session_factory()
+        async with factory() as db:
+            responsable = await AsyncSqlAlchemySociaRepository(db).create(SociaCreate(
+                asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"
+            ))
+            service = AsyncEventoService(AsyncSqlAlchemyEventoRepository(db), AsyncSqlAlchemyLugarRepository(db))
+            evento = await service.create_evento(EventoCreate(
+                asociacion_id=1,
+                responsable_id=responsable.id,
+                nombre="Asamblea",
+                fecha=datetime(2025, 3, 1, 18, 0),
+                duracion=timedelta(hours=2),
+                lugar_nombre="Centro Cívico",
+                lugar_direccion="Calle Mayor 1",
+            ))
+            updated = await service.update_evento(evento.id, EventoUpdate(duracion=timedelta(minutes=90)))
+            lugares = await AsyncSqlAlchemyLugarRepository(db).search_by_name("cívico", 1)
+        await engine.dispose()
+        return evento, updated, lugares
+
+    evento, updated, lugares = asyncio.run(scenario())
+    assert evento.duracion == timedelta(hours=2)
+    assert updated.duracion == timedelta(minutes=90)
+    assert len(lugares) == 1
+
+
+def test_async_evento_update_stamps_modification_time():
+    from app.infrastructure.persistence.models.evento_sql import EventoModel
+
+    async def scenario():
+        engine, factory = await _session_factory()
+        async with factory() as db:
+            responsable = await AsyncSqlAlchemySociaRepository(db).create(SociaCreate(
+                asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"
+            ))
+            repo = AsyncSqlAlchemyEventoRepository(db)
+            evento = await repo.create(EventoCreate(
+                asociacion_id=1, responsable_id=responsable.id, nombre="Asamblea",
+                fecha=datetime(2025, 3, 1, 18, 0),
+            ))
+            created_at = (await db.get(EventoModel, evento.id)).fecha_modificacion
+            await asyncio.sleep(0.01)
+            await repo.update(evento.id, EventoUpdate(nombre="Asamblea general"))
+            updated_at = (await db.get(EventoModel, evento.id)).fecha_modificacion
+        await engine.dispose()
+        return created_at, updated_at
+
+    created_at, updated_at = asyncio.run(scenario())
+    # UTC like Django's auto_now: the .ics feed derives its ETag from it
+    assert abs(created_at - datetime.utcnow()) < timedelta(minutes=1)
+    assert updated_at > created_at
@@ -0,0 +1,41 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.domain.models.lugar import LugarCreate
+from app.infrastructure.persistence.dialects import prefix_tsquery, text_search, insert_ignore
+from app.infrastructure.persistence.models.lugar_sql import LugarModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+from app.infrastructure.persistence.repositories.lugar_repository_impl import SqlAlchemyLugarRepository
+
+
+def test_prefix_tsquery_matches_partial_words():
+    assert prefix_tsquery("Plaza  may") == "Plaza:* & may:*"
+    assert prefix_tsquery("'; DROP") == "DROP:*"
+    assert prefix_tsquery("  ") == ""
+
+
+def test_text_search_uses_tsvector_only_on_postgres():
+    pg = str(text_search("postgresql", LugarModel.nombre, "plaza").compile(dialect=postgresql.dialect()))
+    lite = str(text_search("sqlite", LugarModel.nombre, "plaza").compile(dialect=sqlite.dialect()))
+
+    assert "to_tsvector" in pg and "@@" in pg
+    assert "LIKE" in lite.upper()
+
+
+def test_insert_ignore_renders_on_conflict():
+    values = {"nombre": "Plaza", "asociacion_id": 1}
+    for dialect in (postgresql.dialect(), sqlite.dialect()):
+        stmt = insert_ignore(dialect.name, LugarModel, values, ["asociacion_id", "nombre"])
+        assert "ON CONFLICT (asociacion_id, nombre) DO NOTHING" in str(stmt.compile(dialect=dialect))
+
+
+def test_lugar_save_is_idempotent(db_session):
+    db_session.add(AsociacionVecinalModel(id=1, nombre="AV Test", numero_registro="REG-1"))
+    db_session.commit()
+    repo = SqlAlchemyLugarRepository(db_session)
+
+    first = repo.save(LugarCreate(nombre="Plaza Mayor", direccion="C/ Mayor 1", asociacion_id=1))
+    second = repo.save(LugarCreate(nombre="Plaza Mayor", direccion="Otra", asociacion_id=1))
+
+    assert first.id == second.id
+    assert second.direccion == "C/ Mayor 1"
+    assert [l.nombre for l in repo.search_by_name("mayor", 1)] == ["Plaza Mayor"]
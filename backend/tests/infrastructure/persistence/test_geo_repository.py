@@ -0,0 +1,69 @@
+import random
+
+import pytest
+from sqlalchemy import text
+
+from app.domain.models.geo import distance_m
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+from app.infrastructure.persistence.repositories.geo_repository_impl import SqlAlchemyGeoRepository
+
+CENTER = (40.4168, -3.7038)
+
+
+@pytest.fixture
+def socias(db_session):
+    asociacion = AsociacionVecinalModel(nombre="AV Cercanas", numero_registro="REG-KNN")
+    db_session.add(asociacion)
+    db_session.commit()
+    rng = random.Random(7)
+    points = [(CENTER[0] + rng.gauss(0, 0.02), CENTER[1] + rng.gauss(0, 0.02)) for _ in range(300)]
+    for i, (lat, lon) in enumerate(points):
+        db_session.add(SociaModel(asociacion_id=asociacion.id, numero_socia=str(i), nombre="Socia", apellidos=str(i), lat=lat, lon=lon))
+    db_session.add(SociaModel(asociacion_id=asociacion.id, numero_socia="x", nombre="Sin", apellidos="Coordenadas"))
+    db_session.commit()
+    rows = db_session.query(SociaModel.id, SociaModel.lat, SociaModel.lon).filter(SociaModel.lat.isnot(None)).all()
+    return asociacion.id, sorted((distance_m(*CENTER, lat, lon), id_) for id_, lat, lon in rows)
+
+
+@pytest.fixture(params=[False, True], ids=["btree", "rtree"])
+def repository(request, db_session, socias):
+    if request.param:
+        # What the Django migration creates (core/spatial.py), filled once
+        db_session.execute(text("CREATE VIRTUAL TABLE socias_socia_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)"))
+        db_session.execute(text("INSERT INTO socias_socia_rtree SELECT id, lat, lat, lon, lon FROM socias_socia WHERE lat IS NOT NULL"))
+        db_session.commit()
+    yield SqlAlchemyGeoRepository(db_session)
+    db_session.execute(text("DROP TABLE IF EXISTS socias_socia_rtree"))
+    db_session.commit()
+
+
+def test_nearest_matches_brute_force(repository, socias):
+    asociacion_id, by_distance = socias
+
+    found = repository.nearest(asociacion_id, "socias", *CENTER, 15, 20000)
+
+    assert [p.id for p in found] == [id_ for _, id_ in by_distance[:15]]
+    assert [p.distancia for p in found] == sorted(p.distancia for p in found)
+
+
+def test_nearest_stops_at_max_radius(repository, socias):
+    asociacion_id, by_distance = socias
+
+    found = repository.nearest(asociacion_id, "socias", *CENTER, 1000, 1500)
+
+    assert [p.id for p in found] == [id_ for d, id_ in by_distance if d <= 1500]
+
+
+def test_within_radius_returns_only_points_inside(repository, socias):
+    asociacion_id, by_distance = socias
+
+    found = repository.within_radius(asociacion_id, "socias", *CENTER, 500, 1000)
+
+    assert {p.id for p in found} == {id_ for d, id_ in by_distance if d <= 500}
+    assert repository.within_radius(asociacion_id + 1, "socias", *CENTER, 500, 1000) == []
+
+
+def test_distance_queries_reject_layers_without_index(repository, socias):
+    with pytest.raises(ValueError):
+        repository.nearest(socias[0], "eventos", *CENTER, 5, 1000)
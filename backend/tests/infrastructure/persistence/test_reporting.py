@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.persistence import sharding
+from app.infrastructure.persistence.database import Base
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+from app.infrastructure.persistence.reporting import REPORTING_HEADER
+
+
+def test_reporting_reads_use_the_replica_and_writes_stay_on_primary(client: TestClient, db_session, monkeypatch, tmp_path):
+    db_session.add(AsociacionVecinalModel(id=1, nombre="AV", numero_registro="REG-1"))
+    db_session.add(SociaModel(asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"))
+    db_session.commit()
+
+    # Snapshot taken before "Eva" is created on the primary
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'reporting.sqlite3'}")
+    Base.metadata.create_all(bind=replica_engine)
+    replica = sessionmaker(bind=replica_engine)
+    with replica() as db:
+        db.add(SociaModel(asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"))
+        db.commit()
+    monkeypatch.setattr(sharding, "reporting_session_factory", lambda: replica)
+
+    created = client.post(
+        "/v1/socias/",
+        json={"asociacion_id": 1, "numero_socia": "2", "nombre": "Eva", "apellidos": "López"},
+        headers={REPORTING_HEADER: "1"},
+    )
+    interactive = client.get("/v1/socias/", params={"asociacion_id": 1})
+    report = client.get("/v1/socias/", params={"asociacion_id": 1}, headers={REPORTING_HEADER: "1"})
+
+    assert created.status_code == 201
+    assert [s["nombre"] for s in interactive.json()] == ["Ana", "Eva"]
+    assert [s["nombre"] for s in report.json()] == ["Ana"]
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+
+from app.infrastructure.persistence import sharding
+from app.infrastructure.persistence.database import Base
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+
+
+def _enable_sharding(monkeypatch, db_session, tmp_path):
+    monkeypatch.setattr(sharding, "SHARDING_ENABLED", True)
+    monkeypatch.setattr(sharding, "SHARD_DIR", str(tmp_path))
+    monkeypatch.setattr(sharding, "SQLALCHEMY_DATABASE_URL", "sqlite://")
+    # Catalog lookups go to the test database
+    monkeypatch.setattr(sharding, "engine", db_session.get_bind())
+    monkeypatch.setattr(sharding, "_catalog", {})
+    monkeypatch.setattr(sharding, "_factories", {})
+
+
+def test_sharded_association_reads_from_its_own_database(client: TestClient, db_session, monkeypatch, tmp_path):
+    _enable_sharding(monkeypatch, db_session, tmp_path)
+    db_session.add_all([
+        AsociacionVecinalModel(id=1, nombre="AV Catálogo", numero_registro="REG-1"),
+        AsociacionVecinalModel(id=2, nombre="AV Shard", numero_registro="REG-2", db_shard="asociacion_2"),
+        SociaModel(asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"),
+    ])
+    db_session.commit()
+
+    shard_factory = sharding.session_factory_for("asociacion_2")
+    Base.metadata.create_all(bind=shard_factory.kw["bind"])
+    shard_db = shard_factory()
+    shard_db.add(SociaModel(asociacion_id=2, numero_socia="1", nombre="Eva", apellidos="López"))
+    shard_db.commit()
+    shard_db.close()
+
+    catalog = client.get("/v1/socias/", params={"asociacion_id": 1})
+    sharded = client.get("/v1/socias/", params={"asociacion_id": 2})
+    by_header = client.get("/v1/socias/1", headers={sharding.TENANT_HEADER: "2"})
+
+    assert [s["nombre"] for s in catalog.json()] == ["Ana"]
+    assert [s["nombre"] for s in sharded.json()] == ["Eva"]
+    assert by_header.json()["nombre"] == "Eva"
+    assert (tmp_path / "asociacion_2.sqlite3").exists()
+
+
+def test_sharding_disabled_uses_the_regular_session(client: TestClient, db_session):
+    db_session.add(AsociacionVecinalModel(id=1, nombre="AV", numero_registro="REG-1"))
+    db_session.add(SociaModel(asociacion_id=1, numero_socia="1", nombre="Ana", apellidos="García"))
+    db_session.commit()
+
+    response = client.get("/v1/socias/", params={"asociacion_id": 1}, headers={sharding.TENANT_HEADER: "1"})
+    assert [s["nombre"] for s in response.json()] == ["Ana"]
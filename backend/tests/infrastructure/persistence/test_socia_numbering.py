@@ -0,0 +1,107 @@
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.persistence import socia_numbering
+from app.infrastructure.persistence.database import Base
+from app.infrastructure.persistence.models.socia_sql import SociaModel
+from app.infrastructure.persistence.models.user_sql import AsociacionVecinalModel
+from app.infrastructure.persistence.socia_numbering import next_numero, reserve_numbers
+
+
+def _asociacion(db_session, registro="REG-NUM"):
+    asociacion = AsociacionVecinalModel(nombre="AV Números", numero_registro=registro)
+    db_session.add(asociacion)
+    db_session.commit()
+    return asociacion.id
+
+
+def test_sequence_starts_after_highest_numeric_number(db_session):
+    asociacion_id = _asociacion(db_session)
+    # "9" > "10" as strings: the sequence must compare numbers, and skip "S001"
+    for numero in ("9", "10", "S001"):
+        db_session.add(SociaModel(asociacion_id=asociacion_id, numero_socia=numero, nombre="Ana", apellidos="Ruiz"))
+    db_session.commit()
+
+    assert next_numero(db_session, asociacion_id) == "11"
+    assert list(reserve_numbers(db_session, asociacion_id, 3)) == [12, 13, 14]
+    assert next_numero(db_session, asociacion_id) == "15"
+
+
+def test_create_without_numero_takes_next_number(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    payload = {"nombre": "Maria", "apellidos": "Garcia", "asociacion_id": asociacion_id}
+
+    numeros = [client.post("/v1/socias/", json=payload).json()["numero_socia"] for _ in range(3)]
+
+    assert numeros == ["1", "2", "3"]
+
+
+def test_explicit_numbers_move_the_sequence_past_them(client: TestClient, db_session):
+    asociacion_id = _asociacion(db_session)
+    payload = {"nombre": "Maria", "apellidos": "Garcia", "asociacion_id": asociacion_id}
+    first = client.post("/v1/socias/", json=payload).json()
+
+    assert client.post("/v1/socias/", json={**payload, "numero_socia": "5"}).status_code == 201
+    assert client.put(f"/v1/socias/{first['id']}", json={"numero_socia": "7"}).status_code == 200
+
+    assert client.post("/v1/socias/", json=payload).json()["numero_socia"] == "8"
+
+
+def test_deleted_numbers_are_reused_when_enabled(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(socia_numbering, "SOCIA_REUSE_NUMBERS", True)
+    asociacion_id = _asociacion(db_session)
+    payload = {"nombre": "Maria", "apellidos": "Garcia", "asociacion_id": asociacion_id}
+    created = [client.post("/v1/socias/", json=payload).json() for _ in range(3)]
+
+    assert client.delete(f"/v1/socias/{created[1]['id']}").status_code == 204
+
+    assert client.post("/v1/socias/", json=payload).json()["numero_socia"] == "2"
+    assert client.post("/v1/socias/", json=payload).json()["numero_socia"] == "4"
+
+
+def test_renumbered_socia_frees_the_old_number(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(socia_numbering, "SOCIA_REUSE_NUMBERS", True)
+    asociacion_id = _asociacion(db_session)
+    payload = {"nombre": "Maria", "apellidos": "Garcia", "asociacion_id": asociacion_id}
+    created = [client.post("/v1/socias/", json=payload).json() for _ in range(2)]
+
+    assert client.put(f"/v1/socias/{created[0]['id']}", json={"numero_socia": "9"}).status_code == 200
+    # Same number again: nothing to free
+    assert client.put(f"/v1/socias/{created[1]['id']}", json={"numero_socia": "2"}).status_code == 200
+
+    assert client.post("/v1/socias/", json=payload).json()["numero_socia"] == "1"
+    assert client.post("/v1/socias/", json=payload).json()["numero_socia"] == "10"
+
+
+def test_concurrent_allocations_get_distinct_numbers(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'numeros.sqlite3'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        asociacion_id = _asociacion(db)
+        reserve_numbers(db, asociacion_id, 0)
+        db.commit()
+
+    numeros, errors = [], []
+
+    def allocate():
+        try:
+            for _ in range(10):
+                with Session() as db:
+                    numeros.append(next_numero(db, asociacion_id))
+                    db.commit()
+        except Exception as exc:  # pragma: no cover - reported by the assert below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=allocate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    assert errors == []
+    assert sorted(numeros, key=int) == [str(n) for n in range(1, 81)]
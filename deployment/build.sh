@@ -12,6 +12,8 @@ python frontend/manage.py collectstatic --no-input
 
 echo "🗄️ Aplicando migraciones..."
 python frontend/manage.py migrate
+python frontend/manage.py createcachetable
+python frontend/manage.py migrate_shards
 
 echo "👤 Verificando/Creando Superusuario..."
 python scripts/create_superuser.py
@@ -4,6 +4,9 @@ set -e
 # 1. Aplicar migraciones
 echo "🔵 Applying database migrations..."
 python frontend/manage.py migrate --noinput
+# Tabla de caché (solo se usa con CACHE_BACKEND=db; es idempotente)
+python frontend/manage.py createcachetable
+python frontend/manage.py migrate_shards
 
 # 2. Crear superusuario si no existe
 echo "🔵 Checking superuser..."
@@ -36,7 +36,14 @@ async def app(scope: Scope, receive: Receive, send: Send):
         path = scope["path"]
 
         # 1. API & Docs -> FastAPI
-        if path.startswith("/api") or path.startswith("/health") or path.startswith("/docs") or path.startswith("/openapi.json"):
+        if path.startswith("/api/"):
+            # Routes are declared under /v1: mark /api as the mount point so
+            # /api/v1/socias/ matches, like the WSGI DispatcherMiddleware does
+            scope_copy = dict(scope)
+            scope_copy["root_path"] = scope.get("root_path", "") + "/api"
+            await fastapi_app(scope_copy, receive, send)
+            return
+        if path.startswith("/health") or path.startswith("/docs") or path.startswith("/openapi.json"):
             await fastapi_app(scope, receive, send)
             return
 
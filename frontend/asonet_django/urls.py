@@ -18,11 +18,16 @@ from django.contrib import admin
 from django.urls import path, include
 from django.shortcuts import redirect
 from users.views_auth import user_login, user_logout
+from core.autocomplete import autocomplete_view
+from core.views import direcciones_autocompletar, metrics_view
 
 urlpatterns = [
     path('admin/login/', user_login),
     path('admin/logout/', user_logout),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
+    path('autocomplete/<str:resource>/', autocomplete_view, name='autocomplete'),
+    path('direcciones/autocompletar/', direcciones_autocompletar, name='direcciones_autocompletar'),
     path('', lambda request: redirect('users:home')),
     path('users/', include('users.urls')),
     path('socias/', include('socias.urls')),
@@ -0,0 +1,22 @@
+"""
+Datos deterministas para los benchmarks
+
+`seed_asociacion(rows, seed)` crea una asociación con `rows` filas de cada
+entidad (socias, lugares, personas, materiales, transacciones, actividades y
+proyectos) usando el generador de core.synthetic. Con la misma semilla y
+tamaño los datos son idénticos entre ejecuciones, así que los resultados se
+pueden comparar con una referencia.
+"""
+from core.synthetic import RATIOS, generate
+
+
+def seed_asociacion(rows, seed=0, numero_registro=None):
+    """Crea la asociación y `rows` filas por entidad; devuelve la asociación"""
+    from core.models import AsociacionVecinal
+
+    asociacion = AsociacionVecinal.objects.create(
+        nombre=f'AV Benchmark {rows}',
+        numero_registro=numero_registro or f'BENCH-{rows}-{seed}',
+    )
+    generate(asociacion, {entity: rows for entity in RATIOS}, seed=seed)
+    return asociacion
@@ -0,0 +1,262 @@
+"""
+Benchmarks de los caminos calientes: listados, gráficas, importación y exportación
+
+Para cada tamaño crea una asociación con N filas por entidad (datos
+deterministas, ver benchmarks.datasets) en una base de datos SQLite temporal
+y mide:
+
+- api.<recurso>.list     GET /v1/<recurso>/ del backend FastAPI
+- finanzas.charts        parseo, filtros y gráficas de list_transacciones
+- export.global_excel    la vista export_global_excel completa
+- import.<hoja>          cada _process_*_import con la hoja exportada
+
+Los resultados se guardan en JSON. Con --baseline se comparan con una
+ejecución anterior y el proceso termina con código 1 si algún caso es más
+lento que la referencia multiplicada por --threshold:
+
+    cd frontend
+    python -m benchmarks.hot_paths --sizes 1000,10000 --output bench.json
+    python -m benchmarks.hot_paths --sizes 1000,10000 --baseline bench.json
+    python -m benchmarks.hot_paths --sizes 100000 --repeat 1   # lento
+"""
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+FRONTEND_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = FRONTEND_DIR.parent / 'backend'
+
+API_RESOURCES = ['socias', 'finanzas', 'eventos', 'proyectos']
+
+# Mismo orden que import_global_excel (las actividades dependen de las socias)
+IMPORT_SHEETS = [
+    ('socias', 'Socias'),
+    ('lugares', 'Lugares'),
+    ('personas', 'Personas'),
+    ('materiales', 'Materiales'),
+    ('finanzas', 'Contabilidad'),
+    ('proyectos', 'Proyectos'),
+    ('eventos', 'Actividades'),
+]
+
+
+def setup_django(tmp):
+    # El backend lee la misma DATABASE_URL al importarse
+    os.environ['DATABASE_URL'] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+    for var in ('REPORTING_DATABASE_URL', 'REPORTING_SNAPSHOT', 'TENANT_SHARDING'):
+        os.environ.pop(var, None)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asonet_django.settings')
+    sys.path.insert(0, str(FRONTEND_DIR))
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.append(str(BACKEND_DIR))
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def measure(func, repeat, before=None):
+    """Ejecuta func `repeat` veces; `before` prepara cada ejecución sin medirse"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        args = before() if before else ()
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return {
+        'median_ms': round(statistics.median(timings) * 1000, 2),
+        'min_ms': round(min(timings) * 1000, 2),
+        'max_ms': round(max(timings) * 1000, 2),
+    }, result
+
+
+def create_user(asociacion):
+    from django.contrib.auth.models import User
+
+    user = User.objects.create_user(username=f'bench-{asociacion.pk}', password='bench')
+    # El perfil lo crea la señal post_save; se modifica el mismo objeto porque
+    # la señal lo vuelve a guardar en cada user.save() (p. ej. en el login)
+    user.profile.asociacion = asociacion
+    user.profile.role = 'admin'
+    user.profile.save()
+    return user
+
+
+def bench_api(client, asociacion, repeat):
+    results = {}
+    payloads = {}
+    for resource in API_RESOURCES:
+        def list_resource():
+            response = client.get(f'/v1/{resource}/', params={'asociacion_id': asociacion.pk})
+            response.raise_for_status()
+            return response.json()
+
+        # Primera petición sin medir (arranque del pool y de los validadores)
+        list_resource()
+        results[f'api.{resource}.list'], payloads[resource] = measure(list_resource, repeat)
+    return results, payloads
+
+
+def bench_charts(transacciones_data, repeat):
+    from finanzas.charts import build_chart_data, filter_transacciones, parse_transacciones
+
+    def charts(data):
+        # Lo mismo que hace list_transacciones con la respuesta de la API
+        filtered = filter_transacciones(parse_transacciones(data))
+        return json.dumps(build_chart_data(filtered))
+
+    # parse_transacciones modifica los diccionarios: copia nueva en cada vuelta
+    timing, _ = measure(charts, repeat, before=lambda: (copy.deepcopy(transacciones_data),))
+    return {'finanzas.charts': timing}
+
+
+def bench_export(user, repeat):
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client()
+    client.force_login(user)
+
+    def export():
+        response = client.get(reverse('users:export_global_excel'))
+        if response.status_code != 200:
+            raise RuntimeError(f"export_global_excel devolvió {response.status_code}")
+        return response.content
+
+    timing, content = measure(export, repeat)
+    timing['bytes'] = len(content)
+    return {'export.global_excel': timing}, content
+
+
+def bench_imports(workbook, rows, repeat):
+    import pandas as pd
+    from core.models import AsociacionVecinal
+    from users import views_dashboard
+
+    sheets = pd.read_excel(io.BytesIO(workbook), sheet_name=None)
+    # La importación de actividades guarda fechas sin zona horaria (un aviso por fila)
+    warnings.filterwarnings('ignore', message=r'DateTimeField .* received a naive datetime')
+    results = {}
+    targets = []
+    # Cada repetición importa en una asociación vacía distinta
+    for i in range(repeat):
+        targets.append(AsociacionVecinal.objects.create(
+            nombre=f'AV Importación {rows}-{i}', numero_registro=f'IMPORT-{rows}-{i}'))
+
+    for kind, sheet in IMPORT_SHEETS:
+        process = getattr(views_dashboard, f'_process_{kind}_import')
+        remaining = iter(targets)
+        timing, _ = measure(
+            process, repeat,
+            # La función cambia los nombres de las columnas del DataFrame
+            before=lambda: (sheets[sheet].copy(), next(remaining)),
+        )
+        results[f'import.{kind}'] = timing
+    return results
+
+
+def run(rows, repeat, seed):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from benchmarks.datasets import seed_asociacion
+
+    started = time.perf_counter()
+    asociacion = seed_asociacion(rows, seed)
+    print(f"[{rows}] datos generados en {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    results = {}
+    with TestClient(app) as client:
+        api_results, payloads = bench_api(client, asociacion, repeat)
+    results.update(api_results)
+    results.update(bench_charts(payloads['finanzas'], repeat))
+
+    export_results, workbook = bench_export(create_user(asociacion), repeat)
+    results.update(export_results)
+    results.update(bench_imports(workbook, rows, repeat))
+    return [{'case': case, 'rows': rows, **timing} for case, timing in results.items()]
+
+
+def compare(results, baseline, threshold):
+    """Añade ratio frente a la referencia; devuelve los casos que empeoran"""
+    reference = {(r['case'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        previous = reference.get((result['case'], result['rows']))
+        if not previous or not previous['median_ms']:
+            continue
+        result['baseline_ms'] = previous['median_ms']
+        result['ratio'] = round(result['median_ms'] / previous['median_ms'], 2)
+        if result['ratio'] > threshold:
+            regressions.append(result)
+    return regressions
+
+
+def print_table(results):
+    print(f"{'caso':<24}{'filas':>9}{'mediana_ms':>14}{'min_ms':>12}{'ref_ms':>12}{'ratio':>8}")
+    for r in results:
+        print(f"{r['case']:<24}{r['rows']:>9}{r['median_ms']:>14}{r['min_ms']:>12}"
+              f"{r.get('baseline_ms', '-'):>12}{r.get('ratio', '-'):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000', help="filas por entidad, separadas por comas")
+    parser.add_argument('--repeat', type=int, default=3, help="repeticiones por caso (se guarda la mediana)")
+    parser.add_argument('--seed', type=int, default=0, help="semilla de los datos")
+    parser.add_argument('--output', help="fichero JSON donde guardar los resultados")
+    parser.add_argument('--baseline', help="JSON de una ejecución anterior con la que comparar")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="ratio frente a la referencia a partir del cual se considera regresión")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(tmp)
+        from django.conf import settings
+        import django
+
+        for rows in sizes:
+            results.extend(run(rows, args.repeat, args.seed))
+
+        meta = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': settings.DATABASES['default']['ENGINE'],
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} casos más lentos que la referencia (x{args.threshold}):", file=sys.stderr)
+        for r in regressions:
+            print(f"  {r['case']} ({r['rows']} filas): {r['baseline_ms']} -> {r['median_ms']} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""
+Prueba de carga local de la aplicación unificada (deployment/main.py)
+
+Crea una base de datos SQLite temporal con datos sintéticos (core.synthetic),
+levanta deployment/main.py con uvicorn en un puerto local y lanza un enjambre
+de usuarias virtuales (httpx asíncrono) que repiten recorridos reales:
+
+- entrar (formulario de login con CSRF)
+- listar socias con búsqueda, filtros, orden y paginación
+- abrir el panel de contabilidad con filtros
+- exportar (CSV de socias o de contabilidad)
+- importar un CSV pequeño de socias
+
+Al terminar muestra, por ruta, peticiones, errores, p50/p95/p99 y
+peticiones por segundo. Las llamadas del frontend al backend van por HTTP
+al mismo servidor, como en producción. No necesita red:
+
+    cd frontend
+    python -m benchmarks.load_test --users 20 --duration 60 --socias 5000
+    python -m benchmarks.load_test --users 50 --workers 4 --output carga.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+FRONTEND_DIR = Path(__file__).resolve().parents[1]
+DEPLOYMENT_DIR = FRONTEND_DIR.parent / 'deployment'
+
+PASSWORD = 'carga-local'
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+# Peso de cada recorrido tras el login
+JOURNEYS = {
+    'socias': 5,
+    'finanzas': 3,
+    'exportar': 1,
+    'importar': 1,
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(tmp, socias, users, seed):
+    """Migra y siembra la base de datos; devuelve los nombres de usuario"""
+    os.environ['DATABASE_URL'] = f"sqlite:///{Path(tmp) / 'carga.sqlite3'}"
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asonet_django.settings')
+    sys.path.insert(0, str(FRONTEND_DIR))
+
+    import django
+    django.setup()
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from core.models import AsociacionVecinal
+    from core.synthetic import generate, sizes_for
+
+    call_command('migrate', verbosity=0)
+    asociacion = AsociacionVecinal.objects.create(nombre='AV Carga', numero_registro='CARGA-1')
+    generator = generate(asociacion, sizes_for(socias), seed=seed)
+    print(f"{sum(generator.loaded.values())} filas generadas en {generator.elapsed:.1f} s", file=sys.stderr)
+
+    usernames = []
+    for i in range(users):
+        user = User.objects.create_user(username=f'carga{i}', password=PASSWORD)
+        user.profile.asociacion = asociacion
+        user.profile.role = 'admin'
+        user.profile.save()
+        usernames.append(user.username)
+    return usernames
+
+
+def start_server(port, workers):
+    env = dict(os.environ)
+    # Las llamadas de Django al backend van al mismo servidor
+    env['API_BASE_URL'] = f"http://127.0.0.1:{port}/api/v1"
+    env.setdefault('TRACING_EXPORTER', 'none')
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--app-dir', str(DEPLOYMENT_DIR),
+         '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers), '--log-level', 'warning'],
+        env=env,
+    )
+
+
+async def wait_until_ready(base_url, server, timeout=60):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"El servidor terminó con código {server.returncode}")
+            try:
+                if (await client.get('/health')).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError("El servidor no arrancó a tiempo")
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route, elapsed, ok):
+        self.latencies[route].append(elapsed)
+        if not ok:
+            self.errors[route] += 1
+
+    def summary(self, duration):
+        rows = []
+        routes = sorted(self.latencies, key=lambda r: -len(self.latencies[r]))
+        for route in routes + ['TOTAL']:
+            samples = sorted(self.latencies[route] if route != 'TOTAL'
+                             else [t for values in self.latencies.values() for t in values])
+            if not samples:
+                continue
+            errors = self.errors[route] if route != 'TOTAL' else sum(self.errors.values())
+            rows.append({
+                'route': route,
+                'requests': len(samples),
+                'errors': errors,
+                'p50_ms': round(_percentile(samples, 50) * 1000, 1),
+                'p95_ms': round(_percentile(samples, 95) * 1000, 1),
+                'p99_ms': round(_percentile(samples, 99) * 1000, 1),
+                'mean_ms': round(statistics.fmean(samples) * 1000, 1),
+                'rps': round(len(samples) / duration, 2),
+            })
+        return rows
+
+
+def _percentile(samples, percent):
+    """Percentil por el método del rango más cercano sobre una lista ordenada"""
+    index = max(0, int(round(percent / 100 * len(samples) + 0.5)) - 1)
+    return samples[min(index, len(samples) - 1)]
+
+
+class VirtualUser:
+    """Una usuaria con su propia sesión (cookies) que repite recorridos"""
+
+    def __init__(self, client, username, stats, rng, think_time):
+        self.client = client
+        self.username = username
+        self.stats = stats
+        self.rng = rng
+        self.think_time = think_time
+
+    async def request(self, route, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            # Los POST (login, importar) redirigen al terminar; un GET redirigido
+            # es que la sesión no vale (vuelta al login)
+            ok = response.status_code < 300 or (method == 'POST' and response.status_code < 400)
+        except Exception:
+            response, ok = None, False
+        self.stats.record(route, time.perf_counter() - started, ok)
+        return response
+
+    @property
+    def csrf_headers(self):
+        return {'X-CSRFToken': self.client.cookies.get('csrftoken', '')}
+
+    async def login(self):
+        page = await self.request('GET /users/login/', 'GET', '/users/login/')
+        match = CSRF_INPUT_RE.search(page.text) if page is not None else None
+        await self.request('POST /users/login/', 'POST', '/users/login/', data={
+            'csrfmiddlewaretoken': match.group(1) if match else '',
+            'username': self.username,
+            'password': PASSWORD,
+        })
+
+    async def socias(self):
+        await self.request('GET /socias/', 'GET', '/socias/')
+        await self.request('GET /socias/ (filtros)', 'GET', '/socias/', params={
+            'search': self.rng.choice(['Ana', 'García', 'María', 'López', '12']),
+            'pagado': self.rng.choice(['', 'si', 'no']),
+            'sort': self.rng.choice(['numero_socia', 'apellidos', '-nombre']),
+        })
+        await self.request('GET /socias/ (página)', 'GET', '/socias/', params={'page': self.rng.randint(2, 20)})
+
+    async def finanzas(self):
+        await self.request('GET /finanzas/dashboard/', 'GET', '/finanzas/dashboard/')
+        await self.request('GET /finanzas/dashboard/ (filtros)', 'GET', '/finanzas/dashboard/', params={
+            'year': self.rng.choice(['', '2023', '2024', '2025']),
+            'tipo': self.rng.choice(['', 'gasto', 'ingreso']),
+        })
+
+    async def exportar(self):
+        if self.rng.random() < 0.5:
+            await self.request('GET exportar socias', 'GET', '/users/dashboard/data/socias/export/')
+        else:
+            await self.request('GET exportar finanzas', 'GET', '/users/dashboard/data/finanzas/export/')
+
+    async def importar(self):
+        # Números de socia propios de cada usuaria: las importaciones repetidas actualizan, no duplican
+        first = 10**6 + int(self.username.removeprefix('carga')) * 1000
+        lines = ['numero_socia,nombre,apellidos,email,pagado']
+        lines += [f"{first + i},Carga,Importada {i},carga{first + i}@example.org,true" for i in range(20)]
+        await self.request('POST importar socias', 'POST', '/users/dashboard/data/socias/import/',
+                           files={'file': ('socias.csv', '\n'.join(lines).encode(), 'text/csv')},
+                           headers=self.csrf_headers)
+
+    async def run(self, deadline):
+        await self.login()
+        journeys = list(JOURNEYS)
+        weights = list(JOURNEYS.values())
+        while time.monotonic() < deadline:
+            journey = self.rng.choices(journeys, weights)[0]
+            await getattr(self, journey)()
+            if self.think_time:
+                await asyncio.sleep(self.rng.uniform(0, 2 * self.think_time))
+
+
+async def swarm(base_url, usernames, duration, think_time, seed, timeout):
+    import httpx
+
+    stats = Stats()
+    deadline = time.monotonic() + duration
+    clients = [httpx.AsyncClient(base_url=base_url, timeout=timeout) for _ in usernames]
+    try:
+        users = [
+            VirtualUser(client, username, stats, random.Random(seed + i), think_time)
+            for i, (client, username) in enumerate(zip(clients, usernames))
+        ]
+        started = time.monotonic()
+        await asyncio.gather(*(user.run(deadline) for user in users))
+        elapsed = time.monotonic() - started
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients))
+    return stats.summary(elapsed), elapsed
+
+
+def print_table(rows):
+    columns = ['requests', 'errors', 'p50_ms', 'p95_ms', 'p99_ms', 'rps']
+    print(f"{'ruta':<36}" + "".join(f"{c:>10}" for c in columns))
+    for row in rows:
+        print(f"{row['route']:<36}" + "".join(f"{row[c]:>10}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10, help="usuarias virtuales concurrentes")
+    parser.add_argument('--duration', type=float, default=30, help="segundos de carga")
+    parser.add_argument('--think-time', type=float, default=0.5, help="pausa media entre recorridos (s)")
+    parser.add_argument('--socias', type=int, default=2000, help="tamaño de la asociación sembrada")
+    parser.add_argument('--workers', type=int, default=1, help="procesos de uvicorn")
+    parser.add_argument('--timeout', type=float, default=60, help="timeout por petición (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="fichero JSON donde guardar los resultados")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        usernames = prepare_database(tmp, args.socias, args.users, args.seed)
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(port, args.workers)
+        try:
+            asyncio.run(wait_until_ready(base_url, server))
+            rows, elapsed = asyncio.run(
+                swarm(base_url, usernames, args.duration, args.think_time, args.seed, args.timeout))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print_table(rows)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'elapsed_s': round(elapsed, 2), 'routes': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Latencia de escrituras interactivas mientras se ejecutan exportaciones
+
+Crea una base de datos SQLite temporal con muchas transacciones y mide la
+latencia de altas/ediciones de socias en tres escenarios:
+
+- sin exportaciones (referencia)
+- exportaciones leyendo de la base de datos principal
+- exportaciones leyendo de la copia de informes (reporting_reads)
+
+    cd frontend
+    python -m benchmarks.reporting_split --rows 50000 --writes 200 --exporters 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import multiprocessing
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+FRONTEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def setup_django(tmp):
+    os.environ['DATABASE_URL'] = f"sqlite:///{Path(tmp) / 'primary.sqlite3'}"
+    os.environ['REPORTING_SNAPSHOT'] = 'True'
+    os.environ['REPORTING_SNAPSHOT_PATH'] = str(Path(tmp) / 'reporting.sqlite3')
+    # Sin refrescos en segundo plano durante la medición
+    os.environ['REPORTING_SNAPSHOT_MAX_AGE'] = '86400'
+    os.environ.pop('REPORTING_DATABASE_URL', None)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asonet_django.settings')
+    sys.path.insert(0, str(FRONTEND_DIR))
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def seed(rows):
+    from core.models import AsociacionVecinal
+    from finanzas.models import Transaccion
+
+    asociacion = AsociacionVecinal.objects.create(nombre='AV Benchmark', numero_registro='BENCH-1')
+    start = date(2020, 1, 1)
+    Transaccion.objects.bulk_create(
+        (Transaccion(
+            asociacion=asociacion,
+            fecha_transaccion=start + timedelta(days=i % 1500),
+            cantidad=(i % 200) - 100,
+            concepto=f"Movimiento {i}",
+            descripcion="Generado para el benchmark " * 4,
+            entidad=f"Entidad {i % 37}",
+        ) for i in range(rows)),
+        batch_size=2000,
+    )
+    return asociacion
+
+
+def export_loop(asociacion_id, use_replica, stop, exports_done):
+    """Proceso aparte, como otro worker de gunicorn atendiendo una exportación"""
+    from django.db import connections
+    from core.reporting import reporting_reads
+    from finanzas.models import Transaccion
+
+    try:
+        while not stop.is_set():
+            with reporting_reads() if use_replica else _nullcontext():
+                for row in Transaccion.objects.filter(asociacion_id=asociacion_id).values_list(
+                        'fecha_transaccion', 'concepto', 'cantidad', 'entidad').iterator(chunk_size=500):
+                    # Simula el trabajo de escribir la fila en el Excel
+                    str(row)
+            with exports_done.get_lock():
+                exports_done.value += 1
+    finally:
+        connections.close_all()
+
+
+class _nullcontext:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+def interactive_writes(asociacion, writes, offset):
+    from socias.models import Socia
+
+    latencies = []
+    for i in range(writes):
+        started = time.perf_counter()
+        socia = Socia.objects.create(asociacion=asociacion, numero_socia=str(offset + i), nombre='Ana', apellidos='Benchmark')
+        socia.pagado = True
+        socia.save(update_fields=['pagado'])
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run_scenario(name, asociacion, writes, exporters, use_replica, offset):
+    from django.db import connections
+
+    # fork: los procesos heredan Django ya configurado (sin conexiones abiertas)
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    stop = context.Event()
+    exports_done = context.Value('i', 0)
+    workers = [
+        context.Process(target=export_loop, args=(asociacion.pk, use_replica, stop, exports_done), daemon=True)
+        for _ in range(exporters)
+    ]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.5 if exporters else 0)
+
+    try:
+        latencies = sorted(interactive_writes(asociacion, writes, offset))
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+        connections.close_all()
+
+    return {
+        'escenario': name,
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2),
+        'exportaciones': exports_done.value,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help="transacciones en la base de datos")
+    parser.add_argument('--writes', type=int, default=200, help="escrituras interactivas por escenario")
+    parser.add_argument('--exporters', type=int, default=2, help="exportaciones concurrentes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(tmp)
+        from core.reporting import refresh_snapshot
+
+        asociacion = seed(args.rows)
+        refresh_snapshot()
+
+        results = [
+            run_scenario('sin exportaciones', asociacion, args.writes, 0, False, 0),
+            run_scenario('exportando (principal)', asociacion, args.writes, args.exporters, False, args.writes),
+            run_scenario('exportando (copia)', asociacion, args.writes, args.exporters, True, args.writes * 2),
+        ]
+
+    columns = ['p50_ms', 'p95_ms', 'max_ms', 'exportaciones']
+    print(f"{'escenario':<26}" + "".join(f"{c:>15}" for c in columns))
+    for result in results:
+        print(f"{result['escenario']:<26}" + "".join(f"{result[c]:>15}" for c in columns))
+
+
+if __name__ == '__main__':
+    main()
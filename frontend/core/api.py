@@ -1,22 +1,68 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+
 import requests
 from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.db import connections
+from core import cache as api_cache
+from core import metrics
+from core import reporting
+from core import tracing
+from core.resilience import CircuitBreaker, CircuitOpenError, is_backend_failure
+
+logger = logging.getLogger(__name__)
 
 # Idealmente esto vendría de settings
 API_BASE_URL = getattr(settings, 'API_BASE_URL', "http://localhost:8000/api/v1")
 
+# Un único circuito por proceso para todo el backend
+backend_circuit = CircuitBreaker(
+    'backend',
+    failure_threshold=getattr(settings, 'API_CIRCUIT_FAILURES', 5),
+    reset_timeout=getattr(settings, 'API_CIRCUIT_RESET', 30),
+)
+
+
+def _call_outcome(response):
+    if response.status_code >= 500:
+        return 'server_error'
+    if response.status_code >= 400:
+        return 'client_error'
+    return 'ok'
+
+
+def _resource_for(endpoint):
+    segment = endpoint.strip('/').split('/', 1)[0].split('?', 1)[0]
+    return api_cache.ENDPOINT_RESOURCES.get(segment)
+
+
 class ApiClient:
     """Cliente para consumir la API del backend"""
 
     def __init__(self, request=None):
         self.request = request
         self.base_url = API_BASE_URL
-        self.timeout = 10
+        self.timeout = getattr(settings, 'API_TIMEOUT', 10)
+        self.circuit = backend_circuit
 
     def _get_headers(self):
         headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json',
         }
+        # El backend elige con ella el shard de la asociación (TENANT_SHARDING)
+        asociacion_id = self._asociacion_id()
+        if asociacion_id is not None:
+            headers['X-Asociacion-Id'] = str(asociacion_id)
+        # Dentro de reporting_reads() el backend lee de su base de datos de informes
+        if reporting.is_active():
+            headers['X-Reporting'] = '1'
+        # traceparent + X-Request-ID: el backend continúa la traza de esta petición
+        headers.update(tracing.propagation_headers())
         # Futuro: Añadir token de autenticación del usuario
         return headers
 
@@ -38,33 +84,189 @@ class ApiClient:
                     pass
             raise e
 
-    def get(self, endpoint, params=None):
+    def _send(self, method, url, **kwargs):
+        """Envía la petición pasando por el circuit breaker"""
+        path = url[len(self.base_url):]
+        endpoint = metrics.endpoint_label(path)
+        try:
+            self.circuit.before_request()
+        except CircuitOpenError:
+            metrics.API_CALLS.labels(method=method, endpoint=endpoint, outcome='circuit_open').inc()
+            raise
+
+        started = time.perf_counter()
+        try:
+            with tracing.start_span(f"{method} {endpoint}", kind='client', url=url) as span:
+                # El span del backend cuelga de esta llamada, no del de la petición
+                kwargs['headers'] = {**kwargs.get('headers', {}), **tracing.propagation_headers()}
+                try:
+                    response = requests.request(method, url, timeout=self.timeout, **kwargs)
+                except requests.RequestException as e:
+                    metrics.API_CALLS.labels(method=method, endpoint=endpoint, outcome='connection_error').inc()
+                    if is_backend_failure(exc=e):
+                        self.circuit.record_failure()
+                    raise
+                finally:
+                    metrics.API_CALL_LATENCY.labels(method=method, endpoint=endpoint).observe(time.perf_counter() - started)
+                span.set(status=response.status_code)
+
+            metrics.API_CALLS.labels(method=method, endpoint=endpoint, outcome=_call_outcome(response)).inc()
+            if is_backend_failure(response=response, endpoint=path):
+                self.circuit.record_failure()
+            else:
+                self.circuit.record_success()
+            return response
+        finally:
+            # record_success/record_failure ya la liberan; esto cubre las demás salidas
+            self.circuit.release_trial()
+
+    def _asociacion_id(self):
+        """Asociación del usuario de la petición (para namespacing de la caché)"""
+        authz = getattr(self.request, 'authz', None)
+        return authz.asociacion_id if authz is not None else None
+
+    def _invalidate(self, endpoint):
+        api_cache.invalidate_endpoint(self._asociacion_id(), endpoint)
+        reporting.mark_write(self.request)
+
+    def _last_good_key(self, endpoint, params):
+        raw = json.dumps([endpoint.strip('/'), params], sort_keys=True, default=str)
+        return f"lastgood:{self._asociacion_id()}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+    def get(self, endpoint, params=None, fallback=False):
+        """
+        GET con circuit breaker. Con fallback=True, si el backend está caído (o
+        el circuito abierto) y tenemos una respuesta buena anterior, se devuelve
+        esa. Guardarla cuesta una escritura en la caché por GET: solo para
+        listados que se repiten, no para el mapa o el autocompletado (cada
+        petición con parámetros nuevos). get_cached() ya la guarda.
+        """
+        return self._get(endpoint, params, allow_fallback=fallback)
+
+    def _get(self, endpoint, params, allow_fallback):
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.get(url, params=params, headers=self._get_headers(), timeout=self.timeout)
-        return self._handle_response(response)
+        last_good_key = self._last_good_key(endpoint, params)
+        try:
+            response = self._send('GET', url, params=params, headers=self._get_headers())
+        except requests.RequestException as e:
+            fallback = self._fallback(last_good_key, endpoint, e) if allow_fallback else None
+            if fallback is None:
+                raise
+            return fallback['data']
+
+        if allow_fallback and is_backend_failure(response=response, endpoint=endpoint):
+            fallback = self._fallback(last_good_key, endpoint, f"HTTP {response.status_code}")
+            if fallback is not None:
+                return fallback['data']
+
+        data = self._handle_response(response)
+        if allow_fallback:
+            self._store_last_good(last_good_key, data)
+        return data
+
+    def _store_last_good(self, last_good_key, data):
+        django_cache.set(last_good_key, {'data': data}, getattr(settings, 'API_STALE_TTL', 86400))
+
+    def _fallback(self, last_good_key, endpoint, error):
+        fallback = django_cache.get(last_good_key)
+        if fallback is not None:
+            metrics.API_CACHE_EVENTS.labels(resource=_resource_for(endpoint) or 'other', state='fallback').inc()
+            logger.warning("Backend no disponible, sirviendo la última respuesta buena de %s: %s", endpoint, error)
+        return fallback
+
+    def get_cached(self, endpoint, params=None, timeout=None):
+        """
+        GET cacheado por asociación y recurso con stale-while-revalidate:
+        - copia fresca (menos de `timeout` segundos): se devuelve tal cual
+        - copia caducada: se devuelve y se refresca en segundo plano
+        - sin copia: se pide al backend (con la última copia buena como respaldo)
+        Cualquier escritura sobre el mismo recurso la invalida.
+        """
+        resource = _resource_for(endpoint)
+        asociacion_id = self._asociacion_id()
+        if resource is None or asociacion_id is None:
+            return self.get(endpoint, params=params, fallback=True)
+
+        fresh_for = timeout if timeout is not None else settings.CACHE_TIMEOUT
+        key = api_cache.make_key(asociacion_id, resource, f"api:{endpoint.strip('/')}", params)
+        entry = django_cache.get(key)
+
+        if entry is not None:
+            if time.time() - entry['fetched_at'] < fresh_for:
+                metrics.API_CACHE_EVENTS.labels(resource=resource, state='hit').inc()
+            else:
+                metrics.API_CACHE_EVENTS.labels(resource=resource, state='stale').inc()
+                self._refresh_in_background(key, endpoint, params)
+            return entry['data']
+
+        metrics.API_CACHE_EVENTS.labels(resource=resource, state='miss').inc()
+        try:
+            data = self._get(endpoint, params, allow_fallback=False)
+        except requests.RequestException as e:
+            # La copia de respaldo no se guarda como fresca
+            fallback = self._fallback(self._last_good_key(endpoint, params), endpoint, e)
+            if fallback is None:
+                raise
+            return fallback['data']
+        self._store(key, data, endpoint, params)
+        return data
+
+    def _store(self, key, data, endpoint, params):
+        """Copia fresca y, aparte, la última buena (sobrevive a las invalidaciones)"""
+        entry = {'data': data, 'fetched_at': time.time()}
+        django_cache.set(key, entry, getattr(settings, 'API_STALE_TTL', 86400))
+        self._store_last_good(self._last_good_key(endpoint, params), data)
+
+    def _refresh_in_background(self, key, endpoint, params):
+        # Solo un refresco a la vez por clave (también entre procesos si la caché es compartida)
+        lock_key = f"{key}:refreshing"
+        if not django_cache.add(lock_key, 1, timeout=max(int(self.timeout) * 2, 10)):
+            return
+
+        def refresh():
+            try:
+                self._store(key, self._get(endpoint, params, allow_fallback=False), endpoint, params)
+            except requests.RequestException as e:
+                logger.warning("No se pudo refrescar %s en segundo plano: %s", endpoint, e)
+            finally:
+                django_cache.delete(lock_key)
+                # El hilo puede haber abierto conexión a la BD (caché 'db')
+                connections.close_all()
+
+        threading.Thread(target=refresh, daemon=True, name=f"api-refresh-{endpoint.strip('/')}").start()
 
     def post(self, endpoint, data=None, files=None):
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         headers = self._get_headers()
 
-        if files:
-            # Si hay archivos, requests se encarga del Content-Type multipart
-            if 'Content-Type' in headers:
-                del headers['Content-Type']
-            response = requests.post(url, data=data, files=files, headers=headers, timeout=self.timeout)
-        else:
-            response = requests.post(url, json=data, headers=headers, timeout=self.timeout)
+        try:
+            if files:
+                # Si hay archivos, requests se encarga del Content-Type multipart
+                if 'Content-Type' in headers:
+                    del headers['Content-Type']
+                response = self._send('POST', url, data=data, files=files, headers=headers)
+            else:
+                response = self._send('POST', url, json=data, headers=headers)
+        finally:
+            # Aunque falle, la escritura puede haberse aplicado en el backend
+            self._invalidate(endpoint)
 
         return self._handle_response(response)
 
     def put(self, endpoint, data=None):
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.put(url, json=data, headers=self._get_headers(), timeout=self.timeout)
+        try:
+            response = self._send('PUT', url, json=data, headers=self._get_headers())
+        finally:
+            self._invalidate(endpoint)
         return self._handle_response(response)
 
     def delete(self, endpoint):
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.delete(url, headers=self._get_headers(), timeout=self.timeout)
+        try:
+            response = self._send('DELETE', url, headers=self._get_headers())
+        finally:
+            self._invalidate(endpoint)
         return self._handle_response(response)
 
 def get_client(request=None):
@@ -0,0 +1,207 @@
+"""
+Cliente asíncrono de la API del backend (httpx.AsyncClient).
+
+Permite lanzar en paralelo llamadas independientes al backend:
+
+    # en una vista async
+    api = AsyncApiClient(request)
+    socias, eventos = await gather(api.get('/socias/'), api.get('/eventos/'))
+
+    # en una vista síncrona
+    config, files = run_concurrently(
+        request,
+        lambda api: api.get(f'drive/config/{asociacion_id}'),
+        lambda api: api.get('drive/files', params={'asociacion_id': asociacion_id}),
+    )
+
+Los errores se traducen a excepciones de `requests` y pasan por el mismo
+circuit breaker que ApiClient, así que las vistas los tratan igual.
+"""
+import asyncio
+import time
+import weakref
+
+import httpx
+import requests
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache as django_cache
+
+from core import metrics, tracing
+from core.api import ApiClient, _call_outcome
+from core.resilience import CircuitOpenError, is_backend_failure
+
+# Un AsyncClient (y su pool de conexiones) por event loop: con ASGI hay un
+# único loop, así que todas las peticiones comparten las conexiones
+_clients = weakref.WeakKeyDictionary()
+
+
+def _pool_limits():
+    return httpx.Limits(
+        max_connections=getattr(settings, 'API_POOL_MAX_CONNECTIONS', 20),
+        max_keepalive_connections=getattr(settings, 'API_POOL_MAX_KEEPALIVE', 10),
+    )
+
+
+def get_shared_client():
+    """AsyncClient compartido del event loop actual (se crea la primera vez)"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=getattr(settings, 'API_TIMEOUT', 10),
+            limits=_pool_limits(),
+        )
+        _clients[loop] = client
+    return client
+
+
+def _as_requests_error(exc):
+    """Convierte errores de httpx en los equivalentes de requests"""
+    if isinstance(exc, httpx.TimeoutException):
+        return requests.Timeout(str(exc))
+    if isinstance(exc, (httpx.InvalidURL, httpx.UnsupportedProtocol)):
+        return requests.exceptions.InvalidURL(str(exc))
+    if isinstance(exc, httpx.TransportError):
+        return requests.ConnectionError(str(exc))
+    return requests.RequestException(str(exc))
+
+
+class AsyncApiClient(ApiClient):
+    """
+    Variante asíncrona de ApiClient: mismos endpoints, cabeceras, invalidación
+    de caché y circuit breaker, pero los métodos son corrutinas.
+    """
+
+    def __init__(self, request=None, client=None):
+        super().__init__(request)
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or get_shared_client()
+
+    def _handle_async_response(self, response):
+        if response.status_code >= 400:
+            error = requests.HTTPError(
+                f"{response.status_code} Error: {response.reason_phrase} for url: {response.url}"
+            )
+            try:
+                error.api_error = response.json()
+            except ValueError:
+                pass
+            raise error
+        if not response.content:
+            return None
+        return response.json()
+
+    async def _asend(self, method, endpoint, **kwargs):
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = self._get_headers()
+        if kwargs.get('files'):
+            # httpx genera el Content-Type multipart
+            headers.pop('Content-Type', None)
+
+        endpoint_label = metrics.endpoint_label(endpoint)
+        try:
+            self.circuit.before_request()
+        except CircuitOpenError:
+            metrics.API_CALLS.labels(method=method, endpoint=endpoint_label, outcome='circuit_open').inc()
+            raise
+
+        started = time.perf_counter()
+        try:
+            with tracing.start_span(f"{method} {endpoint_label}", kind='client', url=url) as span:
+                headers.update(tracing.propagation_headers())
+                try:
+                    response = await self.client.request(method, url, headers=headers, **kwargs)
+                except (httpx.HTTPError, httpx.InvalidURL) as e:
+                    metrics.API_CALLS.labels(method=method, endpoint=endpoint_label, outcome='connection_error').inc()
+                    error = _as_requests_error(e)
+                    if is_backend_failure(exc=error):
+                        self.circuit.record_failure()
+                    raise error from e
+                finally:
+                    metrics.API_CALL_LATENCY.labels(method=method, endpoint=endpoint_label).observe(time.perf_counter() - started)
+                span.set(status=response.status_code)
+
+            metrics.API_CALLS.labels(method=method, endpoint=endpoint_label, outcome=_call_outcome(response)).inc()
+
+            if is_backend_failure(response=response, endpoint=endpoint):
+                self.circuit.record_failure()
+            else:
+                self.circuit.record_success()
+            return response
+        finally:
+            # record_success/record_failure ya la liberan; esto cubre las demás salidas
+            self.circuit.release_trial()
+
+    async def get(self, endpoint, params=None, fallback=False):
+        """GET; con fallback=True, con la última respuesta buena como respaldo (igual que ApiClient.get)"""
+        if not fallback:
+            return self._handle_async_response(await self._asend('GET', endpoint, params=params))
+
+        last_good_key = await sync_to_async(self._last_good_key)(endpoint, params)
+        try:
+            response = await self._asend('GET', endpoint, params=params)
+        except requests.RequestException as e:
+            last_good = await sync_to_async(self._fallback)(last_good_key, endpoint, e)
+            if last_good is None:
+                raise
+            return last_good['data']
+
+        if is_backend_failure(response=response, endpoint=endpoint):
+            last_good = await sync_to_async(self._fallback)(last_good_key, endpoint, f"HTTP {response.status_code}")
+            if last_good is not None:
+                return last_good['data']
+
+        data = self._handle_async_response(response)
+        await django_cache.aset(last_good_key, {'data': data}, getattr(settings, 'API_STALE_TTL', 86400))
+        return data
+
+    async def post(self, endpoint, data=None, files=None):
+        try:
+            if files:
+                response = await self._asend('POST', endpoint, data=data, files=files)
+            else:
+                response = await self._asend('POST', endpoint, json=data)
+        finally:
+            await sync_to_async(self._invalidate)(endpoint)
+        return self._handle_async_response(response)
+
+    async def put(self, endpoint, data=None):
+        try:
+            response = await self._asend('PUT', endpoint, json=data)
+        finally:
+            await sync_to_async(self._invalidate)(endpoint)
+        return self._handle_async_response(response)
+
+    async def delete(self, endpoint):
+        try:
+            response = await self._asend('DELETE', endpoint)
+        finally:
+            await sync_to_async(self._invalidate)(endpoint)
+        return self._handle_async_response(response)
+
+
+async def gather(*aws):
+    """
+    Ejecuta las llamadas en paralelo. Devuelve los resultados en orden; las
+    llamadas que fallan devuelven su excepción en lugar de cancelar el resto.
+    """
+    return await asyncio.gather(*aws, return_exceptions=True)
+
+
+def run_concurrently(request, *calls):
+    """
+    Versión para vistas síncronas: cada `call` recibe un AsyncApiClient y
+    devuelve la corrutina a ejecutar. Usa un AsyncClient propio que se
+    cierra al terminar (fuera de ASGI cada llamada tiene su propio loop).
+    """
+    async def _run():
+        async with httpx.AsyncClient(timeout=getattr(settings, 'API_TIMEOUT', 10), limits=_pool_limits()) as client:
+            api = AsyncApiClient(request, client=client)
+            return await gather(*(call(api) for call in calls))
+
+    return async_to_sync(_run)()
+
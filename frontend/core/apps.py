@@ -1,6 +1,29 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate, post_save, post_delete
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from .cache import RESOURCES, invalidate_instance
+        from .query_log import install_query_log
+        from .spatial import ensure_spatial_indexes
+
+        # Número, duración y consultas lentas de todas las conexiones (/metrics, Server-Timing)
+        connection_created.connect(install_query_log, dispatch_uid='core_query_log')
+
+        # Triggers del R*Tree de lugares y socias (core.spatial)
+        post_migrate.connect(ensure_spatial_indexes, sender=self, dispatch_uid='core_spatial_indexes')
+
+        # Cualquier escritura por ORM en un modelo con asociación invalida su recurso
+        for model in apps.get_models():
+            if model._meta.app_label not in RESOURCES:
+                continue
+            field_names = {f.name for f in model._meta.get_fields()}
+            if 'asociacion' not in field_names:
+                continue
+            post_save.connect(invalidate_instance, sender=model, dispatch_uid=f'cache_{model._meta.label}_save')
+            post_delete.connect(invalidate_instance, sender=model, dispatch_uid=f'cache_{model._meta.label}_delete')
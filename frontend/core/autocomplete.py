@@ -0,0 +1,165 @@
+"""
+Autocompletado para los selectores de los formularios
+
+Los campos que apuntan a socias, personas, materiales, lugares... ya no
+vuelcan toda la tabla de la asociación en el <select>:
+
+- AutocompleteSelect / AutocompleteSelectMultiple solo pintan las opciones
+  seleccionadas. Tom Select (static/js/autocomplete.js) pide el resto a
+  /autocomplete/<recurso>/?q=...&page=N según se escribe.
+- La vista devuelve páginas de PAGE_SIZE resultados de la asociación del
+  usuario. En PostgreSQL busca con los índices GIN de to_tsvector que crean
+  las migraciones *_search_index (to_tsvector sobre los campos de búsqueda
+  unidos con ' ', en ese orden); en SQLite, LIKE.
+- La validación sigue siendo la de ModelChoiceField: solo consulta los IDs
+  enviados, dentro del queryset de la asociación que fija cada formulario.
+"""
+import re
+
+from django import forms
+from django.apps import apps
+from django.contrib.auth.decorators import login_required
+from django.db import connections, router
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+
+from users.utils import association_required
+
+PAGE_SIZE = 20
+
+# Igual que DB_SEARCH_CONFIG del backend y que los índices de las migraciones
+SEARCH_CONFIG = 'spanish'
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# recurso -> modelo, campos de búsqueda, orden y relaciones que usa su __str__
+RESOURCES = {
+    'socias': {
+        'model': 'socias.Socia',
+        'fields': ('nombre', 'apellidos'),
+        'exact': 'numero_socia',
+        'order': ('nombre', 'apellidos'),
+    },
+    'personas': {
+        'model': 'entidades.Persona',
+        'fields': ('nombre', 'apellidos'),
+        'order': ('nombre', 'apellidos'),
+    },
+    'entidades': {'model': 'entidades.Entidad', 'fields': ('nombre',), 'order': ('nombre',)},
+    'materiales': {'model': 'entidades.Material', 'fields': ('nombre',), 'order': ('nombre',)},
+    'lugares': {'model': 'eventos.Lugar', 'fields': ('nombre',), 'order': ('nombre',)},
+    'eventos': {'model': 'eventos.Evento', 'fields': ('nombre',), 'order': ('-fecha',)},
+    'proyectos': {
+        'model': 'proyectos.Proyecto',
+        'fields': ('nombre',),
+        'order': ('-fecha_inicio',),
+        'related': ('responsable',),
+    },
+    'transacciones': {
+        'model': 'finanzas.Transaccion',
+        'fields': ('concepto',),
+        'order': ('-fecha_transaccion',),
+    },
+}
+
+
+def prefix_tsquery(query):
+    """'plaza may' -> 'plaza:* & may:*' para que valgan las palabras a medio escribir"""
+    return " & ".join(f"{word}:*" for word in _WORD_RE.findall(query))
+
+
+def search_queryset(resource, asociacion, query=''):
+    """Queryset de la asociación filtrado por `query` y ordenado como se muestra"""
+    config = RESOURCES[resource]
+    model = apps.get_model(config['model'])
+    queryset = model.objects.filter(asociacion=asociacion).select_related(*config.get('related', ()))
+    query = query.strip()
+    if query:
+        queryset = queryset.filter(_search_filter(resource, model, query))
+    return queryset.order_by(*config['order'], 'pk')
+
+
+def _search_filter(resource, model, query):
+    config = RESOURCES[resource]
+    connection = connections[router.db_for_read(model)]
+    tsquery = prefix_tsquery(query)
+    if connection.vendor == 'postgresql' and tsquery:
+        table = connection.ops.quote_name(model._meta.db_table)
+        expression = " || ' ' || ".join(f"{table}.{field}" for field in config['fields'])
+        condition = Q(RawSQL(
+            f"to_tsvector('{SEARCH_CONFIG}', {expression}) @@ to_tsquery('{SEARCH_CONFIG}', %s)",
+            [tsquery], output_field=BooleanField(),
+        ))
+    else:
+        condition = Q()
+        for word in _WORD_RE.findall(query) or [query]:
+            any_field = Q()
+            for field in config['fields']:
+                any_field |= Q(**{f'{field}__icontains': word})
+            condition &= any_field
+    if config.get('exact'):
+        condition |= Q(**{config['exact']: query})
+    return condition
+
+
+@login_required
+@association_required
+def autocomplete_view(request, resource):
+    """Una página de opciones en el formato de Tom Select: {results: [{value, text}], more}"""
+    if resource not in RESOURCES:
+        raise Http404
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+    queryset = search_queryset(resource, request.user.profile.asociacion, request.GET.get('q', ''))
+    offset = (page - 1) * PAGE_SIZE
+    # Uno de más para saber si hay otra página sin hacer un COUNT
+    rows = list(queryset[offset:offset + PAGE_SIZE + 1])
+    return JsonResponse({
+        'results': [{'value': obj.pk, 'text': str(obj)} for obj in rows[:PAGE_SIZE]],
+        'more': len(rows) > PAGE_SIZE,
+    })
+
+
+class AutocompleteMixin:
+    """Pinta solo las opciones seleccionadas y la URL de búsqueda en data-autocomplete"""
+
+    class Media:
+        css = {'all': ('https://cdn.jsdelivr.net/npm/tom-select@2.2.2/dist/css/tom-select.bootstrap5.min.css',)}
+        js = (
+            'https://cdn.jsdelivr.net/npm/tom-select@2.2.2/dist/js/tom-select.complete.min.js',
+            'js/autocomplete.js',
+        )
+
+    def __init__(self, resource, attrs=None):
+        super().__init__(attrs)
+        self.resource = resource
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete'] = reverse('autocomplete', args=[self.resource])
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        selected = [v for v in value if str(v).isdigit()]
+        options = []
+        if not self.allow_multiple_selected and choices.field.empty_label is not None:
+            options.append(self.create_option(name, '', choices.field.empty_label, not selected, 0))
+        if selected:
+            related = RESOURCES[self.resource].get('related', ())
+            for obj in choices.queryset.select_related(*related).filter(pk__in=selected):
+                option_value, label = choices.choice(obj)
+                options.append(self.create_option(name, option_value, label, True, len(options)))
+        return [(None, options, 0)]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
@@ -0,0 +1,158 @@
+"""
+Caché compartida con invalidación por asociación y recurso.
+
+Las claves llevan un contador de generación por (asociación, recurso):
+invalidar es incrementar ese contador, con lo que todas las entradas
+anteriores dejan de usarse y caducan solas. Así no hace falta listar ni
+borrar claves, y funciona igual con locmem, ficheros o la tabla SQLite.
+
+Los recursos coinciden con el app_label de cada app ('socias', 'finanzas',
+'eventos', 'proyectos', 'entidades').
+"""
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from core import reporting
+
+RESOURCES = ('socias', 'finanzas', 'eventos', 'proyectos', 'entidades')
+
+# Primer segmento del endpoint de la API -> recurso de caché
+ENDPOINT_RESOURCES = {
+    'socias': 'socias',
+    'finanzas': 'finanzas',
+    'adjuntos': 'finanzas',
+    'eventos': 'eventos',
+    'lugares': 'eventos',
+    'proyectos': 'proyectos',
+}
+
+_deferred = threading.local()
+
+
+def _as_tuple(resources):
+    if isinstance(resources, str):
+        return (resources,)
+    return tuple(resources)
+
+
+def _generation_key(asociacion_id, resource):
+    return f"gen:{asociacion_id}:{resource}"
+
+
+def _new_generation():
+    # Se parte de un valor basado en el reloj: si el contador se pierde (expulsión
+    # del backend, reinicio) nunca vuelve a coincidir con una generación anterior
+    return time.time_ns() // 1000
+
+
+def get_generation(asociacion_id, resource):
+    return cache.get_or_set(_generation_key(asociacion_id, resource), _new_generation, timeout=None)
+
+
+def make_key(asociacion_id, resources, name, params=None):
+    """Clave namespaced por asociación y recurso(s), con la generación actual"""
+    resources = _as_tuple(resources)
+    generations = ".".join(str(get_generation(asociacion_id, r)) for r in resources)
+    key = f"{asociacion_id}:{'+'.join(resources)}:{generations}:{name}"
+    if params:
+        digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        key = f"{key}:{digest}"
+    return key
+
+
+def get_or_set(asociacion_id, resources, name, default, params=None, timeout=None):
+    """
+    Devuelve el valor cacheado o lo calcula con `default()` y lo guarda.
+    `resources` puede ser un recurso o varios (el valor se invalida si cambia cualquiera).
+    """
+    if asociacion_id is None:
+        return default()
+
+    key = make_key(asociacion_id, resources, name, params)
+    value = cache.get(key)
+    if value is None:
+        value = default()
+        cache.set(key, value, timeout if timeout is not None else settings.CACHE_TIMEOUT)
+    return value
+
+
+def invalidate(asociacion_id, *resources):
+    """Invalida todas las entradas de esos recursos para la asociación"""
+    if asociacion_id is None:
+        return
+
+    pending = getattr(_deferred, 'pending', None)
+    if pending is not None:
+        pending.update((asociacion_id, r) for r in resources)
+        return
+
+    for resource in resources:
+        key = _generation_key(asociacion_id, resource)
+        if not cache.add(key, _new_generation(), timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                # La clave desapareció entre add() e incr()
+                cache.set(key, _new_generation(), timeout=None)
+
+
+def invalidate_endpoint(asociacion_id, endpoint):
+    """Invalida el recurso asociado a un endpoint de la API ('/socias/12' -> socias)"""
+    segment = endpoint.strip('/').split('/', 1)[0].split('?', 1)[0]
+    resource = ENDPOINT_RESOURCES.get(segment)
+    if resource:
+        invalidate(asociacion_id, resource)
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    Agrupa las invalidaciones (p. ej. las señales de cada fila en una
+    importación) y las aplica una sola vez al salir del bloque.
+    """
+    outer = getattr(_deferred, 'pending', None)
+    if outer is not None:
+        # Anidado: ya lo aplicará el bloque exterior
+        yield
+        return
+
+    _deferred.pending = set()
+    try:
+        yield
+    finally:
+        pending = _deferred.pending
+        _deferred.pending = None
+        for asociacion_id, resource in pending:
+            invalidate(asociacion_id, resource)
+
+
+def invalidate_instance(sender, instance, **kwargs):
+    """Receptor de post_save/post_delete para modelos con asociación"""
+    invalidate(getattr(instance, 'asociacion_id', None), sender._meta.app_label)
+
+
+def invalidates(*resources):
+    """
+    Decorador para vistas de escritura masiva (importaciones, borrar todo...).
+    Agrupa las invalidaciones de las señales y, tras un POST, invalida
+    explícitamente los recursos indicados para la asociación del usuario
+    (las escrituras en bloque no siempre disparan señales).
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            with deferred_invalidation():
+                response = view_func(request, *args, **kwargs)
+            if request.method == 'POST':
+                authz = getattr(request, 'authz', None)
+                invalidate(authz.asociacion_id if authz is not None else None, *resources)
+                reporting.mark_write(request)
+            return response
+        return wrapper
+    return decorator
@@ -11,8 +11,20 @@ def global_settings(request):
         key = os.getenv('GEOAPIFY_API_KEY', '')
 
     return {
-        'GEOAPIFY_API_KEY': key,
+        # Solo si hay autocompletado: la clave no llega al navegador, el
+        # widget pide las sugerencias a core.views.direcciones_autocompletar
+        'GEOAPIFY_AUTOCOMPLETE': bool(key),
         'GEOAPIFY_BIAS_LAT': getattr(settings, 'GEOAPIFY_BIAS_LAT', '40.416775'),
         'GEOAPIFY_BIAS_LON': getattr(settings, 'GEOAPIFY_BIAS_LON', '-3.703790'),
         'GEOAPIFY_COUNTRY_CODE': getattr(settings, 'GEOAPIFY_COUNTRY_CODE', 'es'),
+        'API_PUBLIC_URL': getattr(settings, 'API_PUBLIC_URL', '/api/v1').rstrip('/'),
     }
+
+
+def authorization(request):
+    """
+    Expone a los templates el contexto de autorización memoizado por la petición
+    (perfil, asociación, rol y permisos) como `authz`.
+    """
+    authz = getattr(request, 'authz', None)
+    return {'authz': authz} if authz is not None else {}
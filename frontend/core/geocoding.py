@@ -0,0 +1,332 @@
+"""
+Geocodificación de direcciones con caché persistente
+
+- normalize_address(): clave de la caché (minúsculas, sin tildes ni signos,
+  espacios simples), de modo que "C/ Mayor, 5" y "c/ mayor 5" comparten
+  resultado.
+- Proveedores intercambiables (GEOCODING_PROVIDER): GeoapifyProvider llama a
+  la API de Geoapify; LocalProvider no usa la red y devuelve coordenadas
+  deterministas alrededor de GEOAPIFY_BIAS_LAT/LON (tests y desarrollo).
+- BatchGeocoder: mira primero GeocodeCache (una consulta por lote), pide lo
+  que falta en paralelo con httpx asíncrono, como mucho GEOCODING_CONCURRENCY
+  peticiones a la vez y GEOCODING_RATE_LIMIT por segundo, reintenta los
+  errores transitorios y guarda los resultados, también los no encontrados.
+  Los errores (red, cuota) no se guardan: se vuelven a intentar la próxima vez.
+
+    from core.geocoding import address_query, geocode, geocode_many
+    resultado = geocode(address_query(lugar.direccion, lugar.numero, lugar.cp, lugar.ciudad))
+    resultados = geocode_many(direcciones)   # {direccion: resultado o None}
+
+- geocode_pending(): rellena las coordenadas que faltan en socias o lugares
+  (`manage.py geocodificar`). Las importaciones no esperan al proveedor:
+  guardan las filas sin coordenadas y lanzan geocode_pending_in_background().
+
+Un resultado es un dict con lat, lon, direccion, numero, codigo_postal,
+ciudad y confidence.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ('lat', 'lon', 'direccion', 'numero', 'codigo_postal', 'ciudad', 'confidence')
+
+CACHE_BATCH_SIZE = 500
+
+# Filas por lote en geocode_pending: una consulta a la caché y una tanda de peticiones concurrentes
+PENDING_BATCH_SIZE = 1000
+
+_NON_WORD_RE = re.compile(r"[^\w]+", re.UNICODE)
+_POSTCODE_RE = re.compile(r"\b\d{5}\b")
+
+# Marca de "no se pudo consultar" (distinto de None, "no existe")
+_FAILED = object()
+
+
+class GeocodingError(Exception):
+    """El proveedor no respondió bien (red, cuota, clave). No se guarda en caché"""
+
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
+
+def normalize_address(text):
+    text = unicodedata.normalize('NFKD', str(text or '')).encode('ascii', 'ignore').decode()
+    return _NON_WORD_RE.sub(' ', text.lower()).strip()[:500]
+
+
+def address_query(*parts):
+    """Texto de búsqueda a partir de las partes no vacías: 'Calle Mayor, 5, 28013, Madrid'"""
+    return ', '.join(str(part).strip() for part in parts if part and str(part).strip())
+
+
+def _result(lat, lon, direccion='', numero='', codigo_postal='', ciudad='', confidence=None):
+    return {
+        'lat': lat,
+        'lon': lon,
+        'direccion': (direccion or '')[:500],
+        'numero': (numero or '')[:20],
+        'codigo_postal': (codigo_postal or '')[:10],
+        'ciudad': (ciudad or '')[:100],
+        'confidence': confidence,
+    }
+
+
+class GeoapifyProvider:
+    name = 'geoapify'
+    url = 'https://api.geoapify.com/v1/geocode/search'
+
+    def __init__(self, api_key=None, min_confidence=None):
+        self.api_key = api_key or settings.GEOAPIFY_API_KEY
+        self.min_confidence = settings.GEOCODING_MIN_CONFIDENCE if min_confidence is None else min_confidence
+
+    @property
+    def available(self):
+        return bool(self.api_key)
+
+    async def geocode(self, client, query):
+        import httpx
+
+        params = {
+            'text': query,
+            'apiKey': self.api_key,
+            'limit': 1,
+            'filter': f'countrycode:{settings.GEOAPIFY_COUNTRY_CODE}',
+            'bias': f'proximity:{settings.GEOAPIFY_BIAS_LON},{settings.GEOAPIFY_BIAS_LAT}',
+        }
+        try:
+            response = await client.get(self.url, params=params)
+        except httpx.HTTPError as exc:
+            raise GeocodingError(f"Geoapify no responde: {exc}") from exc
+        if response.status_code != 200:
+            # 429 (cuota por segundo) y 5xx se reintentan; 401/403 (clave) no
+            retry = response.status_code == 429 or response.status_code >= 500
+            raise GeocodingError(f"Geoapify respondió {response.status_code}", retry=retry)
+
+        features = response.json().get('features') or []
+        if not features:
+            return None
+        props = features[0]['properties']
+        confidence = props.get('rank', {}).get('confidence', 0)
+        if confidence < self.min_confidence:
+            return None
+        return _result(
+            props.get('lat'), props.get('lon'),
+            direccion=props.get('street') or props.get('name'),
+            numero=props.get('housenumber'),
+            codigo_postal=props.get('postcode'),
+            ciudad=props.get('city') or props.get('state'),
+            confidence=confidence,
+        )
+
+
+class LocalProvider:
+    """
+    Sin red: la misma dirección da siempre el mismo punto, a unos pocos km del
+    centro configurado. `known` permite fijar resultados concretos en tests.
+    """
+    name = 'local'
+    available = True
+
+    def __init__(self, known=None):
+        self.known = {normalize_address(query): result for query, result in (known or {}).items()}
+
+    async def geocode(self, client, query):
+        key = normalize_address(query)
+        if not key:
+            return None
+        if key in self.known:
+            return self.known[key] and _result(**self.known[key])
+
+        digest = hashlib.sha256(key.encode()).digest()
+        lat = float(settings.GEOAPIFY_BIAS_LAT) + (int.from_bytes(digest[:4], 'big') / 2**32 - 0.5) * 0.09
+        lon = float(settings.GEOAPIFY_BIAS_LON) + (int.from_bytes(digest[4:8], 'big') / 2**32 - 0.5) * 0.12
+        parts = [part.strip() for part in query.split(',') if part.strip()]
+        postcode = _POSTCODE_RE.search(query)
+        ciudad = _POSTCODE_RE.sub('', parts[-1]).strip() if len(parts) > 1 else ''
+        return _result(
+            round(lat, 6), round(lon, 6),
+            direccion=parts[0],
+            numero=parts[1] if len(parts) > 1 and parts[1].isdigit() else '',
+            codigo_postal=postcode.group(0) if postcode else '',
+            ciudad=ciudad,
+            confidence=1.0,
+        )
+
+
+PROVIDERS = {
+    'geoapify': GeoapifyProvider,
+    'local': LocalProvider,
+}
+
+
+def get_provider(name=None):
+    return PROVIDERS[name or settings.GEOCODING_PROVIDER]()
+
+
+class RateLimiter:
+    """Espacia el inicio de las peticiones: como mucho `rate` por segundo"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate and rate > 0 else 0
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class BatchGeocoder:
+
+    def __init__(self, provider=None, concurrency=None, rate_limit=None, retries=2, timeout=None):
+        self.provider = provider or get_provider()
+        self.concurrency = concurrency or settings.GEOCODING_CONCURRENCY
+        self.rate_limit = settings.GEOCODING_RATE_LIMIT if rate_limit is None else rate_limit
+        self.retries = retries
+        self.timeout = timeout or settings.GEOCODING_TIMEOUT
+
+    def geocode_many(self, queries):
+        """{consulta: resultado o None}. Cada dirección normalizada se pide una sola vez"""
+        pending = {}
+        for query in queries:
+            key = normalize_address(query)
+            if key:
+                pending.setdefault(key, query)
+
+        results = self._cached(pending)
+        missing = {key: query for key, query in pending.items() if key not in results}
+        if missing and self.provider.available:
+            fetched = asyncio.run(self._fetch_all(missing))
+            self._store(fetched, missing)
+            results.update(fetched)
+        return {query: results.get(normalize_address(query)) for query in queries}
+
+    def _cached(self, pending):
+        from core.models import GeocodeCache
+
+        results = {}
+        keys = list(pending)
+        for start in range(0, len(keys), CACHE_BATCH_SIZE):
+            rows = GeocodeCache.objects.filter(
+                provider=self.provider.name, key__in=keys[start:start + CACHE_BATCH_SIZE]
+            )
+            for row in rows:
+                results[row.key] = {field: getattr(row, field) for field in RESULT_FIELDS} if row.found else None
+        return results
+
+    def _store(self, fetched, missing):
+        from core.models import GeocodeCache
+
+        GeocodeCache.objects.bulk_create(
+            [
+                GeocodeCache(provider=self.provider.name, key=key, query=missing[key],
+                             found=result is not None, **(result or {}))
+                for key, result in fetched.items()
+            ],
+            batch_size=CACHE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    async def _fetch_all(self, missing):
+        import httpx
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = RateLimiter(self.rate_limit)
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async def fetch(key, query):
+                async with semaphore:
+                    return key, await self._fetch(client, limiter, query)
+
+            pairs = await asyncio.gather(*(fetch(key, query) for key, query in missing.items()))
+        return {key: result for key, result in pairs if result is not _FAILED}
+
+    async def _fetch(self, client, limiter, query):
+        for attempt in range(self.retries + 1):
+            await limiter.wait()
+            try:
+                return await self.provider.geocode(client, query)
+            except GeocodingError as exc:
+                if not exc.retry or attempt == self.retries:
+                    logger.warning("No se pudo geocodificar %r: %s", query, exc)
+                    return _FAILED
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+
+def geocode_many(queries, provider=None, **options):
+    return BatchGeocoder(get_provider(provider), **options).geocode_many(queries)
+
+
+def geocode(query, provider=None, retries=0):
+    """Una dirección (p. ej. al guardar un formulario): sin reintentos para no bloquear la vista"""
+    return geocode_many([query], provider, retries=retries).get(query)
+
+
+def geocode_pending(model, asociacion, geocoder=None, batch_size=PENDING_BATCH_SIZE):
+    """
+    Coordenadas de las filas de `model` (Socia o Lugar) de la asociación que
+    tienen dirección y no tienen lat/lon. En los lugares también se completan
+    número, código postal y ciudad vacíos. Devuelve (encontradas, total).
+    """
+    geocoder = geocoder or BatchGeocoder()
+    completar = hasattr(model, 'completar_direccion')
+    fields = ['lat', 'lon', 'numero', 'cp', 'ciudad'] if completar else ['lat', 'lon']
+    pendientes = model.objects.filter(asociacion=asociacion, lat__isnull=True).exclude(direccion='')
+    found = total = 0
+    last_pk = 0
+    while True:
+        lote = list(pendientes.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+        if not lote:
+            return found, total
+        last_pk = lote[-1].pk
+        resultados = geocoder.geocode_many([obj.direccion_completa for obj in lote])
+        geocodificados = []
+        for obj in lote:
+            resultado = resultados[obj.direccion_completa]
+            if resultado:
+                if completar:
+                    obj.completar_direccion(resultado)
+                else:
+                    obj.lat, obj.lon = resultado['lat'], resultado['lon']
+                geocodificados.append(obj)
+        model.objects.bulk_update(geocodificados, fields, batch_size=batch_size)
+        found += len(geocodificados)
+        total += len(lote)
+
+
+def geocode_pending_in_background(asociacion, *models):
+    """
+    geocode_pending() en un hilo aparte, para no retener la petición mientras
+    se respeta GEOCODING_RATE_LIMIT (mil direcciones a 5/s son más de 3 minutos).
+    Lo que no termine (reinicio, errores del proveedor) lo recoge `manage.py geocodificar`.
+    """
+    from core.tenancy import use_asociacion
+
+    def run():
+        try:
+            with use_asociacion(asociacion):
+                for model in models:
+                    geocode_pending(model, asociacion)
+        except Exception:
+            logger.exception("No se pudieron geocodificar las direcciones de %s", asociacion)
+        finally:
+            # Conexiones abiertas por este hilo
+            connections.close_all()
+
+    threading.Thread(target=run, daemon=True, name='geocodificar').start()
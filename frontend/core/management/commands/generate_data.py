@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import AsociacionVecinal
+from core.synthetic import RATIOS, generate, sizes_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos coherentes (socias, lugares, personas, materiales, transacciones, "
+        "actividades con participantes y proyectos) y los carga con SQL directo. "
+        "Pensado para benchmarks y pruebas de carga: no lo ejecutes con la aplicación escribiendo en la base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socias', type=int, default=10000,
+                            help="Socias a generar; el resto de entidades se escala en proporción")
+        parser.add_argument('--asociacion-id', type=int,
+                            help="Añadir los datos a esta asociación en lugar de crear una nueva")
+        parser.add_argument('--seed', type=int, default=0, help="Semilla (mismos datos con la misma semilla)")
+        parser.add_argument('--participantes', type=float, default=8,
+                            help="Socias participantes por actividad (media)")
+        for entity in RATIOS:
+            if entity != 'socias':
+                parser.add_argument(f'--{entity}', type=int, help=f"Filas de {entity} (por defecto, proporcional)")
+
+    def handle(self, socias, asociacion_id, seed, participantes, **options):
+        sizes = sizes_for(socias)
+        sizes.update({entity: options[entity] for entity in RATIOS if options.get(entity) is not None})
+        negativos = [entity for entity, size in sizes.items() if size < 0]
+        if negativos:
+            raise CommandError(f"El número de filas no puede ser negativo: {', '.join(negativos)}")
+        if participantes < 0:
+            raise CommandError("--participantes no puede ser negativo")
+
+        if asociacion_id:
+            try:
+                asociacion = AsociacionVecinal.objects.get(pk=asociacion_id)
+            except AsociacionVecinal.DoesNotExist:
+                raise CommandError(f"No existe la asociación {asociacion_id}")
+            generator = generate(asociacion, sizes, seed=seed, participantes=participantes)
+        else:
+            # La asociación nueva se deshace con los datos si la generación falla
+            with transaction.atomic():
+                numero = AsociacionVecinal.objects.filter(numero_registro__startswith='SINT-').count() + 1
+                asociacion = AsociacionVecinal.objects.create(
+                    nombre=f"AV Sintética {numero}", numero_registro=f"SINT-{seed}-{numero}")
+                generator = generate(asociacion, sizes, seed=seed, participantes=participantes)
+
+        for label, count in generator.loaded.items():
+            self.stdout.write(f"  {label}: {count}")
+        total = sum(generator.loaded.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} filas generadas para {asociacion} (id {asociacion.pk}) en {generator.elapsed:.1f} s"
+        ))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.geocoding import geocode_pending
+from core.models import AsociacionVecinal
+from core.tenancy import use_asociacion
+from eventos.models import Lugar
+from socias.models import Socia
+
+MODELS = {'socias': Socia, 'lugares': Lugar}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rellena las coordenadas (lat/lon) de socias y lugares que tienen dirección y aún no las tienen, "
+        "para el mapa del barrio. Usa la caché de geocodificación: se puede lanzar desde cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--asociacion-id', type=int, help="Solo esta asociación (por defecto, todas)")
+        parser.add_argument('--solo', choices=list(MODELS), help="Solo socias o solo lugares")
+
+    def handle(self, asociacion_id, solo, **options):
+        asociaciones = AsociacionVecinal.objects.order_by('pk')
+        if asociacion_id:
+            asociaciones = asociaciones.filter(pk=asociacion_id)
+            if not asociaciones.exists():
+                raise CommandError(f"No existe la asociación {asociacion_id}")
+
+        models = {solo: MODELS[solo]} if solo else MODELS
+        for asociacion in asociaciones:
+            with use_asociacion(asociacion):
+                for label, model in models.items():
+                    found, total = geocode_pending(model, asociacion)
+                    if total:
+                        self.stdout.write(f"  {asociacion}: {found}/{total} {label} con coordenadas")
+        self.stdout.write(self.style.SUCCESS("Coordenadas actualizadas"))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from core.models import AsociacionVecinal
+from core.tenancy import (
+    copy_tenant_data, drop_shard_storage, register_shard, sharding_enabled,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Devuelve los datos de una asociación desde su shard a la base de datos principal. "
+        "Los registros reciben claves nuevas, ya que las del shard pueden chocar con las de otras asociaciones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('asociacion_id', type=int)
+        parser.add_argument('--keep-shard', action='store_true',
+                            help="No borrar el fichero/esquema del shard tras la copia")
+
+    def handle(self, asociacion_id, keep_shard=False, **options):
+        if not sharding_enabled():
+            raise CommandError("Activa TENANT_SHARDING=True para usar shards")
+
+        try:
+            asociacion = AsociacionVecinal.objects.using(DEFAULT_DB_ALIAS).get(pk=asociacion_id)
+        except AsociacionVecinal.DoesNotExist:
+            raise CommandError(f"No existe la asociación {asociacion_id}")
+        if not asociacion.db_shard:
+            raise CommandError(f"{asociacion} no está en ningún shard")
+
+        alias = register_shard(asociacion.db_shard)
+
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            copied = copy_tenant_data(asociacion, alias, DEFAULT_DB_ALIAS, keep_pks=False)
+            AsociacionVecinal.objects.using(DEFAULT_DB_ALIAS).filter(pk=asociacion.pk).update(db_shard='')
+
+        if not keep_shard:
+            drop_shard_storage(alias)
+
+        for label, count in copied.items():
+            if count:
+                self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"{asociacion} devuelta a la base de datos principal"))
@@ -0,0 +1,21 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from core.models import AsociacionVecinal
+from core.tenancy import register_shard, sharding_enabled
+
+
+class Command(BaseCommand):
+    help = "Aplica las migraciones pendientes en todos los shards de asociación (tras `migrate`)"
+
+    def handle(self, verbosity=1, **options):
+        if not sharding_enabled():
+            self.stdout.write("TENANT_SHARDING desactivado: no hay shards que migrar")
+            return
+
+        aliases = (AsociacionVecinal.objects.using(DEFAULT_DB_ALIAS)
+                   .exclude(db_shard='').values_list('db_shard', flat=True).distinct())
+        for alias in aliases:
+            self.stdout.write(f"Migrando {alias}...")
+            call_command('migrate', database=register_shard(alias), verbosity=max(verbosity - 1, 0), interactive=False)
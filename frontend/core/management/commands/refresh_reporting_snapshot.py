@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.reporting import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = "Refresca la copia SQLite para informes (REPORTING_SNAPSHOT). Pensado para ejecutarse desde cron."
+
+    def handle(self, **options):
+        if not settings.REPORTING_SNAPSHOT:
+            raise CommandError("Activa REPORTING_SNAPSHOT=True para usar la copia de informes")
+        try:
+            refresh_snapshot()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Copia de informes actualizada: {settings.REPORTING_SNAPSHOT_PATH}"))
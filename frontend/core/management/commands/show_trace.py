@@ -0,0 +1,45 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ("Muestra el árbol de spans (Django y backend) de una petición a partir de TRACING_FILE. "
+            "Acepta el X-Request-ID de la respuesta o el trace_id.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('id', help="X-Request-ID o trace_id")
+        parser.add_argument('--file', default=settings.TRACING_FILE, help="Fichero JSONL de trazas")
+
+    def handle(self, id, file, **options):
+        try:
+            with open(file, encoding='utf-8') as f:
+                spans = [span for span in map(json.loads, f) if id in (span['request_id'], span['trace_id'])]
+        except FileNotFoundError:
+            raise CommandError(f"No existe {file}: ¿TRACING_EXPORTER=jsonl?")
+        if not spans:
+            raise CommandError(f"No hay spans para {id}")
+
+        children = defaultdict(list)
+        span_ids = {span['span_id'] for span in spans}
+        for span in sorted(spans, key=lambda s: s['start_ns']):
+            # Las raíces (o hijos de un span que no está en el fichero) cuelgan de None
+            parent = span['parent_id'] if span['parent_id'] in span_ids else None
+            children[parent].append(span)
+
+        start = min(span['start_ns'] for span in spans)
+
+        def show(parent, depth):
+            for span in children[parent]:
+                offset = (span['start_ns'] - start) / 1e6
+                error = f"  [{span['error']}]" if span['error'] else ''
+                self.stdout.write(
+                    f"{offset:>9.1f} ms {span['duration_ms']:>9.1f} ms  "
+                    f"{'  ' * depth}{span['name']}  ({span['service']}){error}"
+                )
+                show(span['span_id'], depth + 1)
+
+        self.stdout.write(f"{'inicio':>12} {'duración':>12}  span")
+        show(None, 0)
@@ -0,0 +1,53 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from core.models import AsociacionVecinal
+from core.tenancy import (
+    copy_tenant_data, create_shard_storage, delete_tenant_data, register_shard,
+    shard_alias, sharding_enabled,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve los datos de una asociación de la base de datos principal a su propio shard. "
+        "Las escrituras de esa asociación durante la copia se pierden: ejecútalo en una ventana de mantenimiento."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('asociacion_id', type=int)
+        parser.add_argument('--keep-source', action='store_true',
+                            help="No borrar los datos de la base de datos principal tras la copia")
+
+    def handle(self, asociacion_id, keep_source=False, verbosity=1, **options):
+        if not sharding_enabled():
+            raise CommandError("Activa TENANT_SHARDING=True para usar shards")
+
+        try:
+            asociacion = AsociacionVecinal.objects.using(DEFAULT_DB_ALIAS).get(pk=asociacion_id)
+        except AsociacionVecinal.DoesNotExist:
+            raise CommandError(f"No existe la asociación {asociacion_id}")
+        if asociacion.db_shard:
+            raise CommandError(f"{asociacion} ya está en el shard '{asociacion.db_shard}'")
+
+        alias = shard_alias(asociacion.pk)
+        create_shard_storage(alias)
+        register_shard(alias)
+        call_command('migrate', database=alias, verbosity=max(verbosity - 1, 0), interactive=False)
+
+        with transaction.atomic(using=alias):
+            # Copia de la asociación en el shard para que las FK del shard sean válidas
+            if not AsociacionVecinal.objects.using(alias).filter(pk=asociacion.pk).exists():
+                asociacion.save_base(raw=True, using=alias, force_insert=True)
+            copied = copy_tenant_data(asociacion, DEFAULT_DB_ALIAS, alias, keep_pks=True)
+
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            AsociacionVecinal.objects.using(DEFAULT_DB_ALIAS).filter(pk=asociacion.pk).update(db_shard=alias)
+            if not keep_source:
+                delete_tenant_data(asociacion, DEFAULT_DB_ALIAS)
+
+        for label, count in copied.items():
+            if count:
+                self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"{asociacion} movida al shard '{alias}'"))
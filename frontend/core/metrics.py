@@ -0,0 +1,143 @@
+"""
+Métricas Prometheus del frontend, expuestas en /metrics
+"""
+import os
+from functools import wraps
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+
+# Lecturas de la API: hit (caché fresca), miss (llamada al backend),
+# stale (copia caducada mientras se refresca), fallback (última copia buena
+# servida porque el backend ha fallado)
+API_CACHE_EVENTS = Counter(
+    'asonet_frontend_api_cache_events_total',
+    'Resultados de las lecturas cacheadas de la API',
+    ['resource', 'state'],
+)
+
+API_CIRCUIT_STATE = Gauge(
+    'asonet_frontend_api_circuit_state',
+    'Estado del circuit breaker (0=cerrado, 1=semiabierto, 2=abierto)',
+    ['circuit'],
+)
+
+API_CIRCUIT_OPENED = Counter(
+    'asonet_frontend_api_circuit_opened_total',
+    'Veces que se ha abierto el circuit breaker',
+    ['circuit'],
+)
+
+API_CIRCUIT_REJECTED = Counter(
+    'asonet_frontend_api_circuit_rejected_total',
+    'Peticiones rechazadas al instante con el circuito abierto',
+    ['circuit'],
+)
+
+# --- Peticiones HTTP (MetricsMiddleware) ---
+
+HTTP_REQUESTS = Counter(
+    'asonet_frontend_http_requests_total',
+    'Peticiones HTTP atendidas',
+    ['method', 'route', 'status'],
+)
+
+HTTP_LATENCY = Histogram(
+    'asonet_frontend_http_request_duration_seconds',
+    'Latencia de las peticiones HTTP por ruta',
+    ['method', 'route'],
+)
+
+HTTP_IN_FLIGHT = Gauge(
+    'asonet_frontend_http_requests_in_progress',
+    'Peticiones HTTP en curso',
+    ['method'],
+    multiprocess_mode='livesum',
+)
+
+# --- Llamadas al backend (ApiClient) ---
+
+API_CALLS = Counter(
+    'asonet_frontend_api_calls_total',
+    'Llamadas del ApiClient al backend por resultado',
+    ['method', 'endpoint', 'outcome'],
+)
+
+API_CALL_LATENCY = Histogram(
+    'asonet_frontend_api_call_duration_seconds',
+    'Duración de las llamadas del ApiClient al backend',
+    ['method', 'endpoint'],
+)
+
+# --- Consultas a la base de datos (core.query_log) ---
+
+# Las consultas son mucho más rápidas que las peticiones: buckets más finos
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+DB_QUERIES = Counter(
+    'asonet_frontend_db_queries_total',
+    'Sentencias SQL ejecutadas',
+    ['database', 'operation'],
+)
+
+DB_QUERY_LATENCY = Histogram(
+    'asonet_frontend_db_query_duration_seconds',
+    'Duración de las sentencias SQL',
+    ['database', 'operation'],
+    buckets=QUERY_BUCKETS,
+)
+
+# --- Importaciones y exportaciones ---
+
+DATA_ROWS = Counter(
+    'asonet_frontend_data_rows_total',
+    'Filas importadas o exportadas',
+    ['direction', 'kind'],
+)
+
+
+def endpoint_label(endpoint):
+    """socias/12/?x=1 -> socias/{id} (etiquetas acotadas)"""
+    path = endpoint.split('?', 1)[0].strip('/')
+    return '/'.join('{id}' if segment.isdigit() else segment for segment in path.split('/'))
+
+
+def statement_operation(sql):
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+    return keyword if keyword in ('SELECT', 'INSERT', 'UPDATE', 'DELETE') else 'OTHER'
+
+
+def exported_rows(kind, rows):
+    """Recorre `rows` contando las filas exportadas"""
+    count = 0
+    try:
+        for row in rows:
+            count += 1
+            yield row
+    finally:
+        DATA_ROWS.labels(direction='export', kind=kind).inc(count)
+
+
+def counts_import(kind):
+    """Decorador para los _process_*_import: cuenta las filas que devuelven"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            count = result[0] if isinstance(result, tuple) else result
+            DATA_ROWS.labels(direction='import', kind=kind).inc(count)
+            return result
+        return wrapper
+    return decorator
+
+
+def exposition():
+    """Cuerpo y content type de /metrics (todos los workers en modo multiproceso)"""
+    registry = REGISTRY
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
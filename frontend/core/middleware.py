@@ -0,0 +1,140 @@
+"""
+Middlewares propios del proyecto
+"""
+import time
+
+from django.utils.functional import SimpleLazyObject
+from core import metrics, query_log, reporting, tracing
+from users.utils import get_authorization
+from core.tenancy import sharding_enabled, use_asociacion
+
+
+class TracingMiddleware:
+    """
+    Span raíz de la petición (ver core.tracing). Continúa la traza de
+    `traceparent` si llega una, reutiliza el `X-Request-ID` del proxy y lo
+    devuelve en la respuesta. Debe ir el primero de MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with tracing.start_span(
+            f"{request.method} {request.path}",
+            kind='server',
+            traceparent=request.headers.get('traceparent'),
+            request_id=request.headers.get('X-Request-ID'),
+        ) as span:
+            request.request_id = span.request_id
+            response = self.get_response(request)
+            match = getattr(request, 'resolver_match', None)
+            if match is not None and match.route:
+                span.name = f"{request.method} /{match.route}"
+            span.set(status=response.status_code)
+            response['X-Request-ID'] = span.request_id
+            return response
+
+
+class MetricsMiddleware:
+    """
+    Latencia, código de respuesta y peticiones en curso por ruta (el patrón
+    de la URL, no la ruta concreta). Debe ir justo después de TracingMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        method = request.method
+        metrics.HTTP_IN_FLIGHT.labels(method=method).inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.HTTP_IN_FLIGHT.labels(method=method).dec()
+            match = getattr(request, 'resolver_match', None)
+            route = '/' + match.route if match is not None and match.route else 'unmatched'
+            metrics.HTTP_REQUESTS.labels(method=method, route=route, status=str(status)).inc()
+            metrics.HTTP_LATENCY.labels(method=method, route=route).observe(elapsed)
+
+
+class QueryLogMiddleware:
+    """
+    Cuenta las consultas SQL de la petición (ver core.query_log) y las
+    publica en `Server-Timing` para verlas en las herramientas del navegador.
+    Debe ir justo después de MetricsMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = query_log.start(request)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            queries = query_log.current_queries()
+            response['Server-Timing'] = (
+                f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} consultas", '
+                f'app;dur={(time.perf_counter() - started) * 1000:.1f}'
+            )
+            return response
+        finally:
+            query_log.finish(token)
+
+
+class AuthorizationMiddleware:
+    """
+    Añade `request.authz` con el perfil, la asociación y los permisos del
+    usuario. Se calcula de forma perezosa la primera vez que se usa y se
+    reutiliza en decoradores, mixins, vistas y templates.
+    Debe ir después de AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.authz = SimpleLazyObject(lambda: get_authorization(request.user))
+        return self.get_response(request)
+
+
+class ReportingMiddleware:
+    """
+    Fija la petición en curso para que las escrituras del ORM marquen la
+    sesión (ver core.reporting, "lectura de lo propio").
+    Debe ir después de SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = reporting.start_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            reporting.finish_request(token)
+
+
+class TenantMiddleware:
+    """
+    Con TENANT_SHARDING activo, fija el shard de la asociación del usuario
+    para todas las consultas ORM de la petición (ver core.tenancy).
+    Debe ir después de AuthorizationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not sharding_enabled():
+            return self.get_response(request)
+
+        with use_asociacion(request.authz.asociacion):
+            return self.get_response(request)
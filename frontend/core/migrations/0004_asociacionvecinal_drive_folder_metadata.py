@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_asociacionvecinal_drive_credentials'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asociacionvecinal',
+            name='drive_folder_link',
+            field=models.URLField(blank=True, max_length=500, null=True, verbose_name='Enlace Carpeta Google Drive'),
+        ),
+        migrations.AddField(
+            model_name='asociacionvecinal',
+            name='drive_folder_name',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Nombre Carpeta Google Drive'),
+        ),
+        migrations.AddField(
+            model_name='asociacionvecinal',
+            name='drive_metadata_updated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Metadatos Drive actualizados'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_asociacionvecinal_drive_folder_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asociacionvecinal',
+            name='db_shard',
+            field=models.CharField(blank=True, default='', editable=False, max_length=63, verbose_name='Shard de datos'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_asociacionvecinal_db_shard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=20)),
+                ('key', models.CharField(max_length=500, verbose_name='Dirección normalizada')),
+                ('query', models.TextField(blank=True, verbose_name='Texto consultado')),
+                ('found', models.BooleanField(default=False)),
+                ('lat', models.FloatField(blank=True, null=True)),
+                ('lon', models.FloatField(blank=True, null=True)),
+                ('direccion', models.CharField(blank=True, max_length=500)),
+                ('numero', models.CharField(blank=True, max_length=20)),
+                ('codigo_postal', models.CharField(blank=True, max_length=10)),
+                ('ciudad', models.CharField(blank=True, max_length=100)),
+                ('confidence', models.FloatField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Geocodificación en caché',
+                'verbose_name_plural': 'Geocodificaciones en caché',
+                'unique_together': {('provider', 'key')},
+            },
+        ),
+    ]
@@ -3,7 +3,7 @@ Mixins para vistas con filtrado por asociación
 """
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.mixins import LoginRequiredMixin
-from users.utils import has_association, is_association_admin
+from users.utils import has_association, is_association_admin, get_authorization
 
 
 class AssociationFilterMixin:
@@ -13,7 +13,7 @@ class AssociationFilterMixin:
         queryset = super().get_queryset()
         if not has_association(self.request.user):
             return queryset.none()
-        return queryset.filter(asociacion=self.request.user.profile.asociacion)
+        return queryset.filter(asociacion=get_authorization(self.request.user).asociacion)
 
 
 class AssociationRequiredMixin(LoginRequiredMixin):
@@ -40,5 +40,5 @@ class AutoAssignAssociationMixin:
     def form_valid(self, form):
         if not has_association(self.request.user):
             raise PermissionDenied("Usuario sin asociación no puede crear objetos")
-        form.instance.asociacion = self.request.user.profile.asociacion
+        form.instance.asociacion = get_authorization(self.request.user).asociacion
         return super().form_valid(form)
\ No newline at end of file
@@ -17,6 +17,12 @@ class AsociacionVecinal(models.Model):
     numero_registro = models.CharField(max_length=50, unique=True, verbose_name="Número de Registro")
     drive_folder_id = models.CharField(max_length=100, blank=True, null=True, verbose_name="ID Carpeta Google Drive")
     drive_credentials = models.TextField(blank=True, null=True, verbose_name="Credenciales Drive (JSON)")
+    # Metadatos de la carpeta de Drive cacheados (los refresca el backend en segundo plano)
+    drive_folder_name = models.CharField(max_length=255, blank=True, null=True, verbose_name="Nombre Carpeta Google Drive")
+    drive_folder_link = models.URLField(max_length=500, blank=True, null=True, verbose_name="Enlace Carpeta Google Drive")
+    drive_metadata_updated_at = models.DateTimeField(blank=True, null=True, verbose_name="Metadatos Drive actualizados")
+    # Base de datos propia de la asociación (TENANT_SHARDING); vacío = base de datos principal
+    db_shard = models.CharField(max_length=63, blank=True, default='', editable=False, verbose_name="Shard de datos")
     distrito = models.CharField(max_length=100, blank=True, verbose_name="Distrito")
     provincia = models.CharField(max_length=100, blank=True, verbose_name="Provincia")
     codigo_postal = models.CharField(max_length=10, blank=True, verbose_name="Código Postal")
@@ -36,3 +42,31 @@ class AsociacionVecinal(models.Model):
     def get_total_members(self):
         """Devuelve el número total de miembros de la asociación"""
         return self.userprofile_set.count()
+
+
+class GeocodeCache(models.Model):
+    """
+    Resultado de geocodificar una dirección (core.geocoding), por proveedor y
+    dirección normalizada. También guarda las que no se encontraron, para no
+    volver a preguntarlas.
+    """
+    provider = models.CharField(max_length=20)
+    key = models.CharField(max_length=500, verbose_name="Dirección normalizada")
+    query = models.TextField(blank=True, verbose_name="Texto consultado")
+    found = models.BooleanField(default=False)
+    lat = models.FloatField(null=True, blank=True)
+    lon = models.FloatField(null=True, blank=True)
+    direccion = models.CharField(max_length=500, blank=True)
+    numero = models.CharField(max_length=20, blank=True)
+    codigo_postal = models.CharField(max_length=10, blank=True)
+    ciudad = models.CharField(max_length=100, blank=True)
+    confidence = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Geocodificación en caché"
+        verbose_name_plural = "Geocodificaciones en caché"
+        unique_together = ['provider', 'key']
+
+    def __str__(self):
+        return f"{self.provider}: {self.key}"
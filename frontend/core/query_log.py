@@ -0,0 +1,105 @@
+"""
+Registro de consultas SQL por petición
+
+Un execute_wrapper en cada conexión (lo instala CoreConfig.ready()) cuenta
+y cronometra las sentencias de la petición en curso:
+
+- las que superan SLOW_QUERY_MS se registran en el log junto con su ruta
+- QueryLogMiddleware añade `Server-Timing` con el número y tiempo de consultas
+- con QUERY_BUDGET, las peticiones que lo superan se registran o, con
+  QUERY_BUDGET_ENFORCE (desarrollo/tests), fallan: así se detectan los N+1
+"""
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from core import metrics
+from core.tenancy import is_shard
+from core.tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class RequestQueries:
+    """Sentencias ejecutadas al atender una petición"""
+
+    def __init__(self, request):
+        self.request = request
+        self.count = 0
+        self.duration = 0.0
+        self.over_budget = False
+
+    @property
+    def route(self):
+        match = getattr(self.request, 'resolver_match', None)
+        path = '/' + match.route if match is not None and match.route else self.request.path
+        return f"{self.request.method} {path}"
+
+
+_current = ContextVar('request_queries', default=None)
+
+
+def current_queries():
+    return _current.get()
+
+
+def start(request):
+    return _current.set(RequestQueries(request))
+
+
+def finish(token):
+    _current.reset(token)
+
+
+def _check_budget(queries):
+    budget = settings.QUERY_BUDGET
+    if not budget or queries.count < budget:
+        return
+    if settings.QUERY_BUDGET_ENFORCE:
+        raise QueryBudgetExceeded(f"{queries.route} ha superado el presupuesto de {budget} consultas")
+    if not queries.over_budget:
+        logger.warning("%s ha superado el presupuesto de %s consultas", queries.route, budget)
+    queries.over_budget = True
+
+
+def observe_query(execute, sql, params, many, context):
+    """execute_wrapper: métricas, log de consultas lentas y presupuesto por petición"""
+    queries = _current.get()
+    if queries is not None:
+        _check_budget(queries)
+
+    alias = context['connection'].alias
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        # Todos los shards comparten etiqueta: una serie por asociación sería demasiado
+        database = 'shard' if is_shard(alias) else alias
+        operation = metrics.statement_operation(sql)
+        metrics.DB_QUERIES.labels(database=database, operation=operation).inc()
+        metrics.DB_QUERY_LATENCY.labels(database=database, operation=operation).observe(elapsed)
+
+        if queries is not None:
+            queries.count += 1
+            queries.duration += elapsed
+        # executemany (cargas masivas) son muchas sentencias: el umbral no aplica
+        if not many and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            span = current_span()
+            logger.warning(
+                "Consulta lenta (%.1f ms) en %s [%s, petición %s]: %s",
+                elapsed * 1000, queries.route if queries is not None else 'segundo plano', alias,
+                span.request_id if span is not None else '-', sql,
+            )
+
+
+def install_query_log(sender, connection, **kwargs):
+    # Receptor de connection_created: la lista sobrevive a las reconexiones
+    if observe_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(observe_query)
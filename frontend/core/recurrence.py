@@ -0,0 +1,140 @@
+"""
+Recurrencias (RRULE, RFC 5545) de eventos y proyectos
+
+El campo `recurrencia` guarda solo la regla, sin DTSTART:
+"FREQ=WEEKLY;BYDAY=TU" o "FREQ=MONTHLY;BYDAY=1SA;COUNT=10". La primera
+ocurrencia es la fecha del evento (o fecha_inicio del proyecto); en los
+proyectos, fecha_final hace de UNTIL si la regla no tiene fin.
+
+- occurrences(): generador sobre dateutil.rrule. Avanza hasta la ventana sin
+  guardar nada (xafter) y se detiene al pasar su final, así que una serie sin
+  fin nunca se materializa entera. En las reglas horarias, diarias y semanales
+  sin COUNT, el ancla se adelanta un número entero de periodos hasta la
+  ventana: una regla horaria de hace años no se recorre desde el principio.
+  Como en RFC 5545, la fecha de inicio siempre es la primera ocurrencia,
+  aunque no cumpla los BYxxx de la regla.
+- expand(): las ocurrencias de una ventana, en una caché LRU por (regla,
+  inicio, ventana). La regla forma parte de la clave: al editarla, la entrada
+  antigua simplemente deja de usarse.
+- validate_rrule: validador de los campos `recurrencia`.
+
+    from core.recurrence import expand
+    for inicio in expand(evento.recurrencia, evento.fecha, desde, hasta, evento.duracion):
+        ...
+"""
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+from dateutil.rrule import rruleset, rrulestr
+from django.core.exceptions import ValidationError
+
+# Tope de ocurrencias por ventana (una regla diaria en una vista de un año da 366)
+MAX_OCURRENCIAS = 1000
+EXPAND_CACHE_SIZE = 4096
+
+# Más finas que una hora no tienen sentido en una agenda y disparan el número de ocurrencias
+_FRECUENCIAS_NO_PERMITIDAS = ('SECONDLY', 'MINUTELY')
+
+# Frecuencias de periodo fijo: adelantar el ancla periodos enteros no cambia la serie
+# (los BYxxx por defecto salen de la hora y el día de la semana del ancla, que se conservan)
+_PERIODOS = {'HOURLY': timedelta(hours=1), 'DAILY': timedelta(days=1), 'WEEKLY': timedelta(weeks=1)}
+
+
+def _as_datetime(value):
+    return datetime.combine(value, time.min) if isinstance(value, date) and not isinstance(value, datetime) else value
+
+
+def _partes(text):
+    """{'FREQ': 'WEEKLY', 'BYDAY': 'TU', ...}"""
+    partes = {}
+    for parte in text.upper().split(';'):
+        key, _, value = parte.partition('=')
+        partes[key.strip()] = value.strip()
+    return partes
+
+
+def parse_rule(text, dtstart, until=None, desde=None):
+    """
+    rrule de dateutil anclada en dtstart; `until` solo se aplica si la regla no
+    tiene fin. Con `desde`, las reglas que lo permiten se anclan en el último
+    periodo de la serie anterior a esa fecha (ver _PERIODOS).
+    """
+    text = text.strip()
+    if text.upper().startswith('RRULE:'):
+        text = text[len('RRULE:'):]
+    partes = _partes(text)
+    try:
+        interval = int(partes.get('INTERVAL', '1'))
+    except ValueError:
+        raise ValueError(f"INTERVAL no válido: {partes['INTERVAL']}")
+    if interval < 1:
+        raise ValueError("INTERVAL debe ser 1 o más")
+
+    ancla = _as_datetime(dtstart)
+    periodo = _PERIODOS.get(partes.get('FREQ'))
+    if desde is not None and periodo is not None and 'COUNT' not in partes:
+        periodos = (_as_datetime(desde) - ancla) // (periodo * interval) - 1
+        if periodos > 0:
+            ancla += periodos * periodo * interval
+    rule = rrulestr(text, dtstart=ancla, cache=False)
+    if until is not None and 'COUNT' not in partes and 'UNTIL' not in partes:
+        if not isinstance(until, datetime):
+            until = datetime.combine(until, time.max)
+        rule = rule.replace(until=until)
+    return rule
+
+
+def validate_rrule(value):
+    text = (value or '').strip()
+    if not text:
+        return
+    upper = text.upper()
+    if '\n' in text or 'DTSTART' in upper:
+        raise ValidationError(
+            "Solo una regla RRULE, sin DTSTART: la primera ocurrencia es la fecha de inicio."
+        )
+    if any(f'FREQ={freq}' in upper for freq in _FRECUENCIAS_NO_PERMITIDAS):
+        raise ValidationError("La repetición mínima es cada hora.")
+    try:
+        parse_rule(text, datetime(2000, 1, 1))
+    except (ValueError, TypeError) as exc:
+        raise ValidationError(f"Regla de repetición no válida: {exc}")
+
+
+def occurrences(rule_text, dtstart, desde, hasta, duracion=None, until=None):
+    """
+    Inicios de las ocurrencias que se solapan con [desde, hasta), en orden.
+    Sin regla, la única ocurrencia es dtstart.
+    """
+    dtstart, desde, hasta = _as_datetime(dtstart), _as_datetime(desde), _as_datetime(hasta)
+    duracion = duracion or timedelta(0)
+    if not rule_text:
+        if dtstart < hasta and (dtstart >= desde or dtstart + duracion > desde):
+            yield dtstart
+        return
+
+    serie = rruleset()
+    serie.rrule(parse_rule(rule_text, dtstart, until, desde=desde - duracion))
+    # La fecha de inicio es siempre una ocurrencia (el set no la repite si la regla ya la da)
+    serie.rdate(dtstart)
+    for n, inicio in enumerate(serie.xafter(desde - duracion, inc=True)):
+        if inicio >= hasta or n >= MAX_OCURRENCIAS:
+            return
+        if inicio >= desde or inicio + duracion > desde:
+            yield inicio
+
+
+@lru_cache(maxsize=EXPAND_CACHE_SIZE)
+def expand(rule_text, dtstart, desde, hasta, duracion=None, until=None):
+    """Como occurrences(), como tupla y cacheado por ventana"""
+    return tuple(occurrences(rule_text, dtstart, desde, hasta, duracion, until))
+
+
+def describe(rule_text):
+    """Texto corto para las listas: 'Semanal', 'Mensual'..."""
+    nombres = {'YEARLY': 'Anual', 'MONTHLY': 'Mensual', 'WEEKLY': 'Semanal', 'DAILY': 'Diaria', 'HOURLY': 'Cada hora'}
+    for part in (rule_text or '').upper().replace('RRULE:', '').split(';'):
+        key, _, value = part.partition('=')
+        if key.strip() == 'FREQ':
+            return nombres.get(value.strip(), value.strip().capitalize())
+    return ''
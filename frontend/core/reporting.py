@@ -0,0 +1,168 @@
+"""
+Lecturas de informes y exportaciones contra una réplica
+
+Las exportaciones (Excel global, informe de contabilidad) leen tablas enteras.
+Si hay una base de datos de informes configurada, esas lecturas van allí y no
+compiten con las escrituras interactivas de la base de datos principal:
+
+- REPORTING_DATABASE_URL: réplica de lectura (p. ej. PostgreSQL en streaming).
+- REPORTING_SNAPSHOT=True: copia SQLite de la base de datos principal que se
+  refresca cada REPORTING_SNAPSHOT_MAX_AGE segundos (en segundo plano o con
+  `manage.py refresh_reporting_snapshot` desde cron).
+
+Uso:
+    with reporting_reads(request):
+        ...  # ORM y ApiClient leen de la réplica
+
+Lectura de lo propio: si el usuario ha escrito algo que la réplica aún no
+tiene, el bloque sigue leyendo de la principal. Las escrituras por la API las
+anota ApiClient; las del ORM (vistas de entidades y lugares, importaciones...)
+las anota ReportingRouter.db_for_write en la petición en curso, que fija
+ReportingMiddleware.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+REPORTING_DB_ALIAS = 'reporting'
+
+SESSION_LAST_WRITE_KEY = 'last_write_at'
+
+_active = ContextVar('reporting_reads', default=False)
+_current_request = ContextVar('reporting_request', default=None)
+_refresh_lock = threading.Lock()
+
+
+def is_configured():
+    return REPORTING_DB_ALIAS in settings.DATABASES
+
+
+def is_active():
+    return _active.get()
+
+
+def _snapshot_mode():
+    return getattr(settings, 'REPORTING_SNAPSHOT', False) and not getattr(settings, 'REPORTING_DATABASE_URL', None)
+
+
+def snapshot_age():
+    """Segundos desde el último refresco de la copia (None si no existe)"""
+    try:
+        return time.time() - os.path.getmtime(settings.REPORTING_SNAPSHOT_PATH)
+    except OSError:
+        return None
+
+
+def refresh_snapshot():
+    """
+    Copia la base de datos principal con la API de backup de SQLite (copia
+    consistente aunque haya escrituras) y la sustituye de forma atómica.
+    """
+    source = connections.settings[DEFAULT_DB_ALIAS]
+    if not source['ENGINE'].endswith('sqlite3'):
+        raise RuntimeError("REPORTING_SNAPSHOT solo está disponible con SQLite; usa REPORTING_DATABASE_URL")
+
+    target = settings.REPORTING_SNAPSHOT_PATH
+    tmp_path = f"{target}.tmp"
+    src = sqlite3.connect(str(source['NAME']))
+    dst = sqlite3.connect(tmp_path)
+    try:
+        # Por páginas, para no bloquear a los escritores durante toda la copia
+        src.backup(dst, pages=1024, sleep=0.005)
+    finally:
+        dst.close()
+        src.close()
+    # Las conexiones ya abiertas terminan su petición con el fichero anterior
+    os.replace(tmp_path, target)
+
+
+def _refresh_in_background():
+    if not _refresh_lock.acquire(blocking=False):
+        return
+
+    def refresh():
+        try:
+            refresh_snapshot()
+        except Exception:
+            logger.exception("No se pudo refrescar la copia de informes")
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=refresh, daemon=True, name='reporting-snapshot').start()
+
+
+def is_available():
+    if not is_configured():
+        return False
+    if not _snapshot_mode():
+        return True
+
+    age = snapshot_age()
+    if age is None or age > settings.REPORTING_SNAPSHOT_MAX_AGE:
+        _refresh_in_background()
+    return age is not None
+
+
+def mark_write(request):
+    """Anota la última escritura del usuario (para leer lo propio)"""
+    session = getattr(request, 'session', None)
+    if session is not None and is_configured():
+        session[SESSION_LAST_WRITE_KEY] = time.time()
+
+
+def start_request(request):
+    """Fija la petición en curso para mark_current_write(); devuelve el token para finish_request()"""
+    return _current_request.set(request)
+
+
+def finish_request(token):
+    _current_request.reset(token)
+
+
+def mark_current_write():
+    """mark_write() de la petición en curso (escrituras del ORM, sin la petición a mano)"""
+    request = _current_request.get()
+    if request is not None:
+        mark_write(request)
+
+
+def has_pending_writes(request):
+    """¿Ha escrito el usuario algo que la réplica quizá no tenga todavía?"""
+    session = getattr(request, 'session', None)
+    last_write = session.get(SESSION_LAST_WRITE_KEY) if session is not None else None
+    if not last_write:
+        return False
+    if _snapshot_mode():
+        age = snapshot_age()
+        return age is None or last_write > time.time() - age
+    return time.time() - last_write < settings.REPORTING_MAX_LAG
+
+
+@contextmanager
+def reporting_reads(request=None):
+    """Envía las lecturas del bloque a la réplica (si la hay y está al día para el usuario)"""
+    use_replica = is_available() and not (request is not None and has_pending_writes(request))
+    token = _active.set(use_replica)
+    try:
+        yield use_replica
+    finally:
+        _active.reset(token)
+
+
+def reporting_view(view_func):
+    """Decorador para vistas de exportación/informes: todas sus lecturas usan reporting_reads()"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with reporting_reads(request):
+            return view_func(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,110 @@
+"""
+Circuit breaker para las llamadas al backend.
+Tras varios fallos seguidos se abre y las peticiones fallan al instante
+en lugar de esperar el timeout; pasado un tiempo deja pasar una petición
+de prueba (semiabierto) y se cierra si va bien.
+"""
+import threading
+import time
+
+import requests
+
+from core import metrics
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    El backend se considera caído. Hereda de RequestException para que las
+    vistas la traten igual que cualquier error de conexión.
+    """
+
+
+class CircuitBreaker:
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._set_state(CLOSED)
+
+    def _set_state(self, state):
+        self._state = state
+        metrics.API_CIRCUIT_STATE.labels(circuit=self.name).set(
+            {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}[state]
+        )
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._set_state(HALF_OPEN)
+            return self._state
+
+    def before_request(self):
+        """Lanza CircuitOpenError si no se debe llamar al backend"""
+        state = self.state
+        with self._lock:
+            if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+                metrics.API_CIRCUIT_REJECTED.labels(circuit=self.name).inc()
+                raise CircuitOpenError(f"Backend no disponible (circuito '{self.name}' abierto)")
+            if state == HALF_OPEN:
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self._state != OPEN:
+                    metrics.API_CIRCUIT_OPENED.labels(circuit=self.name).inc()
+                self._set_state(OPEN)
+
+    def release_trial(self):
+        """
+        La petición terminó sin un resultado que cuente (error propio, URL mal
+        formada, cancelación): en semiabierto, la siguiente puede hacer la prueba.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+
+
+# Endpoints cuyos 5xx vienen de un servicio externo (Google Drive sin credenciales,
+# errores de su API), no de que el backend esté caído: no abren el circuito
+EXTERNAL_ENDPOINTS = ('drive/',)
+
+
+def is_external(endpoint):
+    return bool(endpoint) and endpoint.lstrip('/').startswith(EXTERNAL_ENDPOINTS)
+
+
+def is_backend_failure(exc=None, response=None, endpoint=None):
+    """
+    Errores que cuentan para el circuito: conexión, timeout o 5xx (los 4xx no,
+    ni los 5xx de EXTERNAL_ENDPOINTS)
+    """
+    if exc is not None:
+        return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+    return response is not None and response.status_code >= 500 and not is_external(endpoint)
@@ -0,0 +1,90 @@
+"""
+Routers de bases de datos:
+- TenantRouter: shards por asociación (TENANT_SHARDING, ver core.tenancy)
+- ReportingRouter: lecturas de informes a la réplica (ver core.reporting)
+"""
+from django.db import DEFAULT_DB_ALIAS
+
+from core import reporting
+from core.tenancy import TENANT_APPS, current_shard, is_shard, shard_of
+
+
+class TenantRouter:
+    """
+    - Modelos de las apps de asociación: shard de la asociación de la
+      instancia o, si no hay instancia, el de la petición en curso.
+    - Resto (usuarios, sesiones, asociaciones...): siempre 'default'.
+    """
+
+    def _shard_for(self, model, **hints):
+        if model._meta.app_label not in TENANT_APPS:
+            return DEFAULT_DB_ALIAS
+
+        instance = hints.get('instance')
+        if instance is not None:
+            if instance._meta.label == 'core.AsociacionVecinal':
+                # asociacion.socias.all(), Socia(asociacion=asociacion)...
+                return shard_of(instance)
+            if instance._state.db:
+                return instance._state.db
+            asociacion = getattr(instance, 'asociacion', None)
+            if asociacion is not None:
+                return shard_of(asociacion)
+
+        return current_shard() or DEFAULT_DB_ALIAS
+
+    def db_for_read(self, model, **hints):
+        return self._shard_for(model, **hints)
+
+    def db_for_write(self, model, **hints):
+        return self._shard_for(model, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las FK a la asociación cruzan de shard a catálogo (hay una copia en cada shard)
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not is_shard(db):
+            return True
+        return app_label in TENANT_APPS or app_label == 'core'
+
+
+class ReportingRouter:
+    """
+    Dentro de `reporting_reads()` las lecturas van a la base de datos de
+    informes. Las escrituras nunca, y cada escritura en un modelo de datos
+    marca la sesión para que el usuario lea lo propio. Va antes que
+    TenantRouter: los datos de una asociación separada en su shard se siguen
+    leyendo del shard.
+    """
+
+    # Tablas de infraestructura que no son datos de informes: siempre en la principal
+    EXCLUDED_APPS = ('django_cache', 'sessions')
+
+    def db_for_read(self, model, **hints):
+        if not reporting.is_active() or model._meta.app_label in self.EXCLUDED_APPS:
+            return None
+        if model._meta.app_label in TENANT_APPS and current_shard() not in (None, DEFAULT_DB_ALIAS):
+            return None
+        return reporting.REPORTING_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in self.EXCLUDED_APPS:
+            reporting.mark_current_write()
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == reporting.REPORTING_DB_ALIAS:
+            # Objeto leído de la réplica que se va a modificar
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        dbs = {DEFAULT_DB_ALIAS, reporting.REPORTING_DB_ALIAS}
+        if obj1._state.db in dbs and obj2._state.db in dbs:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica / copia se alimenta de la principal, no se migra
+        if db == reporting.REPORTING_DB_ALIAS:
+            return False
+        return None
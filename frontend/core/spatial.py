@@ -0,0 +1,82 @@
+"""
+Índice espacial de las coordenadas (lat/lon) de lugares y socias
+
+- SQLite: tabla virtual R*Tree `<tabla>_rtree` (id, min_lat, max_lat, min_lon,
+  max_lon) mantenida por triggers, así que también la actualizan las
+  escrituras del backend y las cargas con SQL directo (generate_data).
+- PostgreSQL: índice GiST sobre point(lon, lat), sin necesidad de PostGIS.
+
+El backend los usa para filtrar por rectángulo antes de calcular distancias
+(lugares o socias más cercanos y dentro de un radio). Las migraciones
+*_spatial_index los crean. En SQLite, una migración que altere la tabla la
+copia entera y se pierden los triggers: ensure_spatial_indexes (post_migrate)
+los vuelve a crear y reconstruye el índice.
+"""
+from django.db import connections
+
+SPATIAL_TABLES = ('lugares', 'socias_socia')
+
+_TRIGGERS = {
+    'ai': "AFTER INSERT ON {table} WHEN new.lat IS NOT NULL AND new.lon IS NOT NULL BEGIN "
+          "INSERT INTO {rtree} VALUES (new.id, new.lat, new.lat, new.lon, new.lon); END",
+    'au': "AFTER UPDATE OF id, lat, lon ON {table} BEGIN "
+          "DELETE FROM {rtree} WHERE id = old.id; "
+          "INSERT INTO {rtree} SELECT new.id, new.lat, new.lat, new.lon, new.lon "
+          "WHERE new.lat IS NOT NULL AND new.lon IS NOT NULL; END",
+    'ad': "AFTER DELETE ON {table} BEGIN DELETE FROM {rtree} WHERE id = old.id; END",
+}
+
+
+def rtree_name(table):
+    return f'{table}_rtree'
+
+
+def _trigger_name(table, suffix):
+    return f'{table}_rtree_{suffix}'
+
+
+def create_spatial_index(connection, table):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            rtree = rtree_name(table)
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {rtree} USING rtree(id, min_lat, max_lat, min_lon, max_lon)")
+            cursor.execute(f"DELETE FROM {rtree}")
+            cursor.execute(
+                f"INSERT INTO {rtree} SELECT id, lat, lat, lon, lon FROM {table} "
+                f"WHERE lat IS NOT NULL AND lon IS NOT NULL"
+            )
+            for suffix, body in _TRIGGERS.items():
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, suffix)} "
+                    + body.format(table=table, rtree=rtree)
+                )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_point_gist ON {table} USING gist (point(lon, lat))")
+
+
+def drop_spatial_index(connection, table):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for suffix in _TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {_trigger_name(table, suffix)}")
+            cursor.execute(f"DROP TABLE IF EXISTS {rtree_name(table)}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {table}_point_gist")
+
+
+def ensure_spatial_indexes(sender, using, **kwargs):
+    """post_migrate: vuelve a crear los triggers de SQLite si una migración rehízo la tabla"""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for table in SPATIAL_TABLES:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE (type = 'table' AND name = %s) OR (type = 'trigger' AND tbl_name = %s)",
+                [rtree_name(table), table],
+            )
+            names = {row[0] for row in cursor.fetchall()}
+            expected = {_trigger_name(table, suffix) for suffix in _TRIGGERS}
+            # Sin R*Tree, la migración que lo crea no se ha aplicado
+            if rtree_name(table) in names and not expected <= names:
+                create_spatial_index(connection, table)
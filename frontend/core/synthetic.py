@@ -0,0 +1,431 @@
+"""
+Generador de datos sintéticos a escala de producción
+
+Genera socias, lugares, personas, materiales, transacciones, actividades (con
+sus socias y personas participantes) y proyectos para una asociación, con
+claves ajenas coherentes entre sí. Las columnas se muestrean con numpy de una
+vez en lugar de fila a fila, y se cargan con SQL directo:
+
+- PostgreSQL: COPY ... FROM STDIN por bloques.
+- Otros motores: INSERT con executemany por bloques.
+
+No pasa por los modelos (ni save(), ni señales, ni auto_now): los valores de
+todas las columnas se calculan aquí. Las claves primarias se asignan a partir
+de la mayor existente, así que no debe ejecutarse con la aplicación escribiendo
+en la misma base de datos. Ver `manage.py generate_data`.
+"""
+import io
+import time
+from datetime import date, datetime, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import Max
+
+from core.tenancy import shard_of
+
+# Filas por sentencia INSERT / bloque de COPY
+CHUNK_SIZE = 50000
+
+# Filas de cada entidad por socia, las mismas proporciones que
+# scripts/generate_fake_data.py (100 socias, 200 transacciones...)
+RATIOS = {
+    'socias': 1,
+    'lugares': 0.15,
+    'personas': 0.3,
+    'materiales': 0.5,
+    'transacciones': 2,
+    'eventos': 0.4,
+    'proyectos': 0.1,
+}
+
+NOMBRES = np.array(['Ana', 'Carmen', 'Lucía', 'María', 'Pilar', 'Rosa', 'Elena', 'Marta', 'Laura', 'Isabel',
+                    'Josefa', 'Dolores', 'Teresa', 'Cristina', 'Paula', 'Sara', 'Raquel', 'Nuria', 'Inés', 'Julia'])
+APELLIDOS = np.array(['García', 'López', 'Martín', 'Sánchez', 'Pérez', 'Gómez', 'Ruiz', 'Díaz', 'Moreno',
+                      'Álvarez', 'Romero', 'Navarro', 'Torres', 'Domínguez', 'Vázquez', 'Ramos', 'Gil', 'Serrano'])
+CALLES = np.array(['Calle Mayor', 'Avenida de la Paz', 'Plaza del Sol', 'Calle Real', 'Paseo del Río',
+                   'Calle del Olmo', 'Avenida de España', 'Calle de la Iglesia', 'Ronda Sur', 'Calle Nueva'])
+CIUDADES = np.array(['Madrid', 'Getafe', 'Leganés', 'Alcorcón', 'Móstoles', 'Fuenlabrada', 'Parla', 'Coslada'])
+TIPOS_LUGAR = np.array(['Centro Cívico', 'Plaza', 'Parque', 'Sala', 'Auditorio', 'Polideportivo', 'Biblioteca'])
+TIPOS_MATERIAL = np.array(['Sillas', 'Mesas', 'Proyector', 'Altavoces', 'Micrófonos', 'Carpas', 'Cartulinas',
+                           'Pinturas', 'Ordenador', 'Impresora'])
+CONCEPTOS_GASTO = np.array(['Alquiler local', 'Material oficina', 'Fiesta de barrio', 'Reparaciones',
+                            'Transporte', 'Comida', 'Luz y agua', 'Imprenta', 'Seguro'])
+CONCEPTOS_INGRESO = np.array(['Cuota anual', 'Subvención', 'Donación', 'Lotería', 'Venta mercadillo'])
+CARGOS = np.array(['Técnica municipal', 'Presidenta', 'Voluntaria', 'Proveedora', 'Monitora', 'Vecina'])
+
+# Años de historia de la asociación
+YEARS = 5
+
+
+def sizes_for(socias):
+    """Filas por entidad para una asociación con `socias` socias"""
+    return {entity: max(1, int(socias * ratio)) for entity, ratio in RATIOS.items()}
+
+
+class Generator:
+    """
+    Genera y carga los datos de una asociación. `sizes` indica las filas de
+    cada entidad (claves de RATIOS); las actividades llevan de media
+    `participantes` socias y una quinta parte de personas.
+    """
+
+    # Ids de una entidad generada con 0 filas (--lugares 0...)
+    NO_IDS = np.array([], dtype=np.int64)
+
+    def __init__(self, asociacion, sizes, seed=0, participantes=8):
+        self.asociacion = asociacion
+        self.sizes = {entity: sizes.get(entity, 0) for entity in RATIOS}
+        self.participantes = participantes
+        self.rng = np.random.default_rng(seed)
+        self.using = shard_of(asociacion)
+        self.connection = connections[self.using]
+        self.today = np.datetime64(date.today(), 'D')
+        self.now = datetime.now(dt_timezone.utc).replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
+        self.loaded = {}
+
+    # --- Muestreo ---
+
+    def _choice(self, values, n, p=None):
+        if len(values) == 0:
+            # Entidad sin filas (NO_IDS): las FK que apuntan a ella quedan vacías
+            return np.full(n, None, dtype=object)
+        return self.rng.choice(values, n, p=p)
+
+    def _text(self, prefix, ints):
+        return np.char.add(prefix, np.asarray(ints).astype(str))
+
+    def _join(self, *parts):
+        result = parts[0]
+        for part in parts[1:]:
+            result = np.char.add(result, part)
+        return result
+
+    def _maybe(self, values, probability):
+        """Mantiene cada valor con la probabilidad dada; el resto queda a None (FK opcionales)"""
+        keep = (self.rng.random(len(values)) < probability).tolist()
+        return [value if k else None for value, k in zip(np.asarray(values).tolist(), keep)]
+
+    def _coordinates(self, n):
+        """Puntos repartidos por el barrio, alrededor de GEOAPIFY_BIAS (para el mapa)"""
+        lat = float(settings.GEOAPIFY_BIAS_LAT) + self.rng.normal(0, 0.015, n)
+        lon = float(settings.GEOAPIFY_BIAS_LON) + self.rng.normal(0, 0.02, n)
+        return lat.round(6), lon.round(6)
+
+    def _dates(self, n, days_back, days_forward=0):
+        offsets = self.rng.integers(-days_back, days_forward + 1, n)
+        return self.today + offsets.astype('timedelta64[D]')
+
+    def _zipf(self, values, n, a=1.2):
+        """Unos pocos valores muy frecuentes y una cola larga, como las entidades de un banco"""
+        weights = 1.0 / np.arange(1, len(values) + 1) ** a
+        return self._choice(values, n, p=weights / weights.sum())
+
+    def _ids(self, model, n):
+        start = (model._base_manager.using(self.using).aggregate(top=Max('pk'))['top'] or 0) + 1
+        return np.arange(start, start + n)
+
+    def _names(self, n):
+        nombres = self._choice(NOMBRES, n)
+        apellidos = self._join(self._choice(APELLIDOS, n), ' ', self._choice(APELLIDOS, n))
+        return nombres, apellidos
+
+    # --- Carga ---
+
+    def _db_value(self, field, value):
+        return field.get_db_prep_save(value, connection=self.connection)
+
+    def insert(self, model, columns):
+        """
+        Inserta las filas de `columns` ({attname: secuencia}) en la tabla del
+        modelo. Los campos que faltan reciben su valor por defecto (o la fecha
+        actual si son auto_now/auto_now_add); la clave primaria solo se omite
+        si no viene en `columns`.
+        """
+        n = len(next(iter(columns.values())))
+        fields, values = [], []
+        for field in model._meta.concrete_fields:
+            if field.attname in columns:
+                column = columns[field.attname]
+                values.append(column.tolist() if isinstance(column, np.ndarray) else column)
+            elif field.primary_key:
+                continue
+            elif getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                values.append([self.now if field.get_internal_type() == 'DateTimeField' else self.now[:10]] * n)
+            else:
+                values.append([self._db_value(field, field.get_default())] * n)
+            fields.append(field)
+
+        rows = list(zip(*values))
+        with self.connection.cursor() as cursor:
+            if self.connection.vendor == 'postgresql':
+                self._copy(cursor, model, fields, rows)
+            else:
+                quote = self.connection.ops.quote_name
+                sql = (f"INSERT INTO {quote(model._meta.db_table)} "
+                       f"({', '.join(quote(f.column) for f in fields)}) "
+                       f"VALUES ({', '.join(['%s'] * len(fields))})")
+                for start in range(0, n, CHUNK_SIZE):
+                    cursor.executemany(sql, rows[start:start + CHUNK_SIZE])
+        self.loaded[model._meta.label] = self.loaded.get(model._meta.label, 0) + n
+
+    def _copy(self, cursor, model, fields, rows):
+        quote = self.connection.ops.quote_name
+        sql = (f"COPY {quote(model._meta.db_table)} ({', '.join(quote(f.column) for f in fields)}) "
+               f"FROM STDIN")
+        for start in range(0, len(rows), CHUNK_SIZE):
+            buffer = io.StringIO()
+            for row in rows[start:start + CHUNK_SIZE]:
+                buffer.write('\t'.join(map(_copy_value, row)) + '\n')
+            buffer.seek(0)
+            # cursor.cursor: cursor de psycopg2 sin el envoltorio de Django
+            cursor.cursor.copy_expert(sql, buffer)
+
+    # --- Entidades ---
+
+    def socias(self):
+        from socias.models import Socia
+        from socias.numbering import advance_past
+
+        n = self.sizes['socias']
+        if n == 0:
+            return self.NO_IDS
+        ids = self._ids(Socia, n)
+        existing = Socia._base_manager.using(self.using).filter(
+            asociacion=self.asociacion).values_list('numero_socia', flat=True)
+        first = max((int(num) for num in existing if num.isdigit()), default=0) + 1
+        nombres, apellidos = self._names(n)
+        lat, lon = self._coordinates(n)
+        self.insert(Socia, {
+            'id': ids,
+            'asociacion_id': [self.asociacion.pk] * n,
+            'numero_socia': np.arange(first, first + n).astype(str),
+            'nombre': nombres,
+            'apellidos': apellidos,
+            'telefono': self._text('6', self.rng.integers(10**7, 10**8, n)),
+            'email': self._join('socia', ids.astype(str), '@example.org'),
+            'direccion': self._choice(CALLES, n),
+            'numero': self.rng.integers(1, 151, n).astype(str),
+            'piso': self.rng.integers(0, 11, n).astype(str),
+            'escalera': self._choice(np.array(['', 'A', 'B', 'Izda', 'Dcha']), n),
+            'provincia': ['Madrid'] * n,
+            'codigo_postal': np.char.zfill(self.rng.integers(28001, 28999, n).astype(str), 5),
+            'lat': lat,
+            'lon': lon,
+            'nacimiento': self._dates(n, 90 * 365, -18 * 365).astype(str),
+            'fecha_inscripcion': self._dates(n, YEARS * 365).astype(str),
+            'pagado': self.rng.random(n) < 0.8,
+        })
+        # Las próximas altas siguen detrás de los números generados
+        advance_past(self.asociacion.pk, [first + n - 1], using=self.using)
+        return ids
+
+    def lugares(self):
+        from eventos.models import Lugar
+
+        n = self.sizes['lugares']
+        if n == 0:
+            return self.NO_IDS
+        ids = self._ids(Lugar, n)
+        lat, lon = self._coordinates(n)
+        self.insert(Lugar, {
+            'id': ids,
+            'asociacion_id': [self.asociacion.pk] * n,
+            # (asociacion, nombre) es único: el id lo garantiza
+            'nombre': self._join(self._choice(TIPOS_LUGAR, n), ' ', ids.astype(str)),
+            'direccion': self._choice(CALLES, n),
+            'numero': self.rng.integers(1, 151, n).astype(str),
+            'cp': np.char.zfill(self.rng.integers(28001, 28999, n).astype(str), 5),
+            'ciudad': self._choice(CIUDADES, n),
+            'lat': lat,
+            'lon': lon,
+        })
+        return ids
+
+    def proyectos(self, socia_ids, lugar_ids):
+        from proyectos.models import Proyecto
+
+        n = self.sizes['proyectos']
+        if n == 0:
+            return self.NO_IDS
+        ids = self._ids(Proyecto, n)
+        inicio = self._dates(n, YEARS * 365)
+        final = inicio + self.rng.integers(30, 366, n).astype('timedelta64[D]')
+        self.insert(Proyecto, {
+            'id': ids,
+            'asociacion_id': [self.asociacion.pk] * n,
+            'nombre': self._text('Proyecto ', ids),
+            'responsable_id': self._maybe(self._choice(socia_ids, n), 0.9),
+            'lugar_fk_id': self._maybe(self._choice(lugar_ids, n), 0.7),
+            'descripcion': ['Proyecto generado'] * n,
+            'fecha_inicio': inicio.astype(str),
+            'fecha_final': self._maybe(final.astype(str), 0.8),
+            'recursivo': self.rng.random(n) < 0.1,
+            'fecha_creacion': [self.now] * n,
+            'fecha_modificacion': [self.now] * n,
+        })
+        return ids
+
+    def personas(self, proyecto_ids):
+        from entidades.models import Persona
+
+        n = self.sizes['personas']
+        if n == 0:
+            return self.NO_IDS
+        ids = self._ids(Persona, n)
+        nombres, apellidos = self._names(n)
+        self.insert(Persona, {
+            'id': ids,
+            'asociacion_id': [self.asociacion.pk] * n,
+            'nombre': nombres,
+            'apellidos': apellidos,
+            'cargo': self._choice(CARGOS, n),
+            'telefono': self._text('9', self.rng.integers(10**7, 10**8, n)),
+            'email': self._join('persona', ids.astype(str), '@example.org'),
+            'proyecto_id': self._maybe(self._choice(proyecto_ids, n), 0.3),
+        })
+        return ids
+
+    def materiales(self, socia_ids, persona_ids, lugar_ids):
+        from entidades.models import Material
+
+        n = self.sizes['materiales']
+        if n == 0:
+            return self.NO_IDS
+        ids = self._ids(Material, n)
+        precio = np.round(self.rng.lognormal(3.5, 1.0, n), 2)
+        # Encargada una socia o una persona externa, no las dos
+        por_socia = self.rng.random(n) < 0.5
+        self.insert(Material, {
+            'id': ids,
+            'asociacion_id': [self.asociacion.pk] * n,
+            'nombre': self._join(self._choice(TIPOS_MATERIAL, n), ' ', ids.astype(str)),
+            'uso': ['Uso general'] * n,
+            'precio': precio,
+            'lugar_id': self._maybe(self._choice(lugar_ids, n), 0.8),
+            'encargado_socia_id': [s if p else None for s, p in zip(self._choice(socia_ids, n).tolist(), por_socia.tolist())],
+            'encargado_persona_id': [e if not p else None for e, p in zip(self._choice(persona_ids, n).tolist(), por_socia.tolist())],
+        })
+        return ids
+
+    def eventos(self, socia_ids, persona_ids, lugar_ids, proyecto_ids):
+        from eventos.models import Evento
+
+        n = self.sizes['eventos']
+        if n == 0:
+            return self.NO_IDS
+        ids = self._ids(Evento, n)
+        dias = self._dates(n, YEARS * 365, 180).astype('datetime64[s]')
+        # Entre las 10:00 y las 20:00, en punto o y media
+        fechas = dias + (self.rng.integers(20, 41, n) * 1800).astype('timedelta64[s]')
+        segundos = (self.rng.integers(1, 9, n) * 1800).tolist()
+        if self.connection.features.has_native_duration_field:
+            duracion = [f"{s} seconds" for s in segundos]
+        else:
+            # SQLite guarda las duraciones en microsegundos
+            duracion = [s * 10**6 for s in segundos]
+        lugares = self._choice(lugar_ids, n)
+        self.insert(Evento, {
+            'id': ids,
+            'asociacion_id': [self.asociacion.pk] * n,
+            'responsable_id': self._maybe(self._choice(socia_ids, n), 0.95),
+            'proyecto_id': self._maybe(self._choice(proyecto_ids, n), 0.4),
+            'nombre': self._text('Actividad ', ids),
+            'descripcion': ['Actividad generada'] * n,
+            'lugar_id': self._maybe(lugares, 0.9),
+            'fecha': np.char.replace(fechas.astype(str), 'T', ' '),
+            'duracion': duracion,
+        })
+
+        # Participantes: Poisson por actividad, sin repetir socia en la misma actividad
+        self.participants(Evento.socias_involucradas.through, 'evento_id', 'socia_id', ids, socia_ids,
+                          self.participantes)
+        self.participants(Evento.personas_involucradas.through, 'evento_id', 'persona_id', ids, persona_ids,
+                          self.participantes / 5)
+        return ids
+
+    def participants(self, through, source, target, source_ids, target_ids, mean):
+        if len(source_ids) == 0 or len(target_ids) == 0:
+            return
+        counts = np.minimum(self.rng.poisson(mean, len(source_ids)), len(target_ids))
+        sources = np.repeat(source_ids, counts)
+        targets = self._choice(target_ids, len(sources))
+        pairs = np.unique(np.stack([sources, targets], axis=1), axis=0)
+        if len(pairs):
+            self.insert(through, {source: pairs[:, 0], target: pairs[:, 1]})
+
+    def transacciones(self, socia_ids, evento_ids, proyecto_ids):
+        from finanzas.models import Transaccion
+
+        n = self.sizes['transacciones']
+        if n == 0:
+            return self.NO_IDS
+        ids = self._ids(Transaccion, n)
+        gasto = self.rng.random(n) < 0.65
+        importe = np.round(self.rng.lognormal(4.0, 1.2, n), 2)
+        entidades = self._text('Entidad ', np.arange(1, max(2, n // 50) + 1))
+        concepto = np.where(gasto, self._choice(CONCEPTOS_GASTO, n), self._choice(CONCEPTOS_INGRESO, n))
+        self.insert(Transaccion, {
+            'id': ids,
+            'asociacion_id': [self.asociacion.pk] * n,
+            'cantidad': np.where(gasto, -importe, importe),
+            'concepto': concepto,
+            'descripcion': self._text('Movimiento ', ids),
+            'fecha_transaccion': self._dates(n, YEARS * 365).astype(str),
+            'evento_id': self._maybe(self._choice(evento_ids, n), 0.2),
+            'proyecto_id': self._maybe(self._choice(proyecto_ids, n), 0.3),
+            'socia_id': [s if not g and k else None for s, g, k in zip(
+                self._choice(socia_ids, n).tolist(), gasto.tolist(), (self.rng.random(n) < 0.5).tolist())],
+            'entidad': self._zipf(entidades, n),
+        })
+        return ids
+
+    def run(self):
+        """Genera todas las entidades en una transacción; devuelve {modelo: filas}"""
+        from entidades.models import Material, Persona
+        from eventos.models import Evento, Lugar
+        from finanzas.models import Transaccion
+        from proyectos.models import Proyecto
+        from socias.models import Socia
+
+        started = time.perf_counter()
+        with transaction.atomic(using=self.using):
+            socia_ids = self.socias()
+            lugar_ids = self.lugares()
+            proyecto_ids = self.proyectos(socia_ids, lugar_ids)
+            persona_ids = self.personas(proyecto_ids)
+            self.materiales(socia_ids, persona_ids, lugar_ids)
+            evento_ids = self.eventos(socia_ids, persona_ids, lugar_ids, proyecto_ids)
+            self.transacciones(socia_ids, evento_ids, proyecto_ids)
+
+            # Las claves se han asignado a mano: las secuencias de PostgreSQL siguen en el valor antiguo
+            models = [Socia, Lugar, Proyecto, Persona, Material, Evento, Transaccion,
+                      Evento.socias_involucradas.through, Evento.personas_involucradas.through]
+            with self.connection.cursor() as cursor:
+                for sql in self.connection.ops.sequence_reset_sql(no_style(), models):
+                    cursor.execute(sql)
+        self.elapsed = time.perf_counter() - started
+        return self.loaded
+
+
+def _copy_value(value):
+    """Valor en el formato de texto de COPY"""
+    if value is None:
+        return r'\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def generate(asociacion, sizes, seed=0, participantes=8):
+    """Atajo: genera y carga los datos; devuelve el Generator (loaded, elapsed)"""
+    from core.cache import RESOURCES, invalidate
+
+    generator = Generator(asociacion, sizes, seed=seed, participantes=participantes)
+    generator.run()
+    # Los listados cacheados de la asociación ya no son válidos
+    invalidate(asociacion.pk, *RESOURCES)
+    return generator
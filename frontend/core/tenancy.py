@@ -0,0 +1,189 @@
+"""
+Shards por asociación (TENANT_SHARDING)
+
+Con el modo activado, cada asociación separada con `manage.py split_tenant`
+guarda sus datos (socias, finanzas, eventos, proyectos, entidades) en su
+propia base de datos: un fichero SQLite en TENANT_SHARD_DIR o un esquema de
+PostgreSQL. La base de datos 'default' sigue siendo el catálogo compartido
+(usuarios, perfiles, sesiones, asociaciones) y guarda también los datos de
+las asociaciones que no se han separado.
+
+El shard de cada petición lo fija TenantMiddleware a partir de la asociación
+del usuario; TenantRouter (core.routers) lo usa para leer y escribir.
+"""
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Apps cuyos datos pertenecen a una asociación y viven en su shard
+TENANT_APPS = ('socias', 'finanzas', 'eventos', 'proyectos', 'entidades')
+
+SHARD_PREFIX = 'asociacion_'
+
+_current_shard = ContextVar('current_shard', default=None)
+
+
+def sharding_enabled():
+    return getattr(settings, 'TENANT_SHARDING', False)
+
+
+def shard_alias(asociacion_id):
+    return f"{SHARD_PREFIX}{asociacion_id}"
+
+
+def is_shard(alias):
+    return alias.startswith(SHARD_PREFIX)
+
+
+def _is_sqlite(conf):
+    return conf['ENGINE'].endswith('sqlite3')
+
+
+def shard_path(alias):
+    return Path(settings.TENANT_SHARD_DIR) / f"{alias}.sqlite3"
+
+
+def register_shard(alias):
+    """Da de alta la conexión del shard (si no existe ya) y devuelve su alias"""
+    if alias in connections.settings:
+        return alias
+
+    default = connections.settings[DEFAULT_DB_ALIAS]
+    conf = copy.deepcopy(default)
+    if _is_sqlite(default):
+        path = shard_path(alias)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conf['NAME'] = str(path)
+    else:
+        # Misma base de datos, un esquema por asociación
+        options = dict(default.get('OPTIONS', {}))
+        options['options'] = f"-c search_path={alias}"
+        conf['OPTIONS'] = options
+    connections.settings[alias] = conf
+    return alias
+
+
+def shard_of(asociacion):
+    """Alias de la base de datos con los datos de la asociación"""
+    if asociacion is None or not sharding_enabled() or not asociacion.db_shard:
+        return DEFAULT_DB_ALIAS
+    return register_shard(asociacion.db_shard)
+
+
+def current_shard():
+    return _current_shard.get()
+
+
+@contextmanager
+def use_shard(alias):
+    """Fija el shard de las consultas ORM dentro del bloque"""
+    token = _current_shard.set(alias)
+    try:
+        yield alias
+    finally:
+        _current_shard.reset(token)
+
+
+@contextmanager
+def use_asociacion(asociacion):
+    with use_shard(shard_of(asociacion)) as alias:
+        yield alias
+
+
+def create_shard_storage(alias):
+    """Crea el esquema en PostgreSQL (en SQLite el fichero se crea al conectar)"""
+    default = connections[DEFAULT_DB_ALIAS]
+    if default.vendor == 'postgresql':
+        with default.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{alias}"')
+
+
+def drop_shard_storage(alias):
+    conf = connections.settings[alias]
+    connections[alias].close()
+    if _is_sqlite(conf):
+        Path(conf['NAME']).unlink(missing_ok=True)
+    else:
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS "{alias}" CASCADE')
+    del connections.settings[alias]
+
+
+# --- Copia de datos entre bases de datos (split/merge) ---
+
+def tenant_models():
+    """
+    Modelos de las apps de asociación (incluidas las tablas intermedias M2M),
+    ordenados para que cada modelo vaya después de aquellos a los que apunta.
+    """
+    models = [
+        model
+        for label in TENANT_APPS
+        for model in apps.get_app_config(label).get_models(include_auto_created=True)
+    ]
+    pending = {model: {
+        field.related_model for field in model._meta.concrete_fields
+        if field.is_relation and field.related_model in models and field.related_model is not model
+    } for model in models}
+
+    ordered = []
+    while pending:
+        ready = [model for model, deps in pending.items() if not deps - set(ordered)]
+        if not ready:
+            raise RuntimeError(f"Dependencias circulares entre modelos: {sorted(m._meta.label for m in pending)}")
+        for model in ready:
+            ordered.append(model)
+            del pending[model]
+    return ordered
+
+
+def tenant_queryset(model, asociacion, using):
+    """Filas de `model` que pertenecen a la asociación en la base de datos `using`"""
+    manager = model._base_manager.db_manager(using)
+    field_names = {f.name for f in model._meta.concrete_fields}
+    if 'asociacion' in field_names:
+        return manager.filter(asociacion=asociacion.pk)
+
+    # Tabla intermedia M2M: se filtra por el extremo que tiene asociación
+    for field in model._meta.concrete_fields:
+        if field.is_relation and 'asociacion' in {f.name for f in field.related_model._meta.concrete_fields}:
+            return manager.filter(**{f"{field.name}__asociacion": asociacion.pk})
+    raise ValueError(f"{model._meta.label} no está ligado a una asociación")
+
+
+def copy_tenant_data(asociacion, source, target, keep_pks):
+    """
+    Copia los datos de la asociación de `source` a `target`.
+    Con keep_pks=False los registros reciben claves nuevas en el destino y las
+    claves ajenas entre modelos de la asociación se traducen.
+    Devuelve {etiqueta_modelo: filas copiadas}.
+    """
+    pk_maps = {}
+    copied = {}
+    for model in tenant_models():
+        pk_map = pk_maps[model] = {}
+        for obj in tenant_queryset(model, asociacion, source).iterator(chunk_size=2000):
+            old_pk = obj.pk
+            for field in model._meta.concrete_fields:
+                if field.is_relation and field.related_model in pk_maps:
+                    value = getattr(obj, field.attname)
+                    if value is not None:
+                        setattr(obj, field.attname, pk_maps[field.related_model][value])
+            if not keep_pks:
+                obj.pk = None
+            obj._state.adding = True
+            # raw=True, como loaddata: conserva created_at/updated_at y no toca relaciones
+            obj.save_base(raw=True, using=target, force_insert=True)
+            pk_map[old_pk] = obj.pk
+        copied[model._meta.label] = len(pk_map)
+    return copied
+
+
+def delete_tenant_data(asociacion, using):
+    for model in reversed(tenant_models()):
+        tenant_queryset(model, asociacion, using)._raw_delete(using)
@@ -1,3 +1,297 @@
-from django.test import TestCase
+import json
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+import requests
+from dateutil.rrule import rrulestr
+from django.core.cache import cache as django_cache
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from core import cache as api_cache, recurrence, resilience
+from core.api import ApiClient
+from core.geocoding import BatchGeocoder, LocalProvider, geocode_pending
+from core.models import AsociacionVecinal
+from eventos.models import Lugar
+from users.views_dashboard import _process_lugares_import
+
+
+class GeocodePendingTests(TestCase):
+    def setUp(self):
+        self.asociacion = AsociacionVecinal.objects.create(nombre="AV Pruebas", numero_registro="REG-GEO")
+        self.geocoder = BatchGeocoder(LocalProvider(known={
+            'Calle Mayor, 5': {'lat': 40.4, 'lon': -3.7, 'numero': '5', 'codigo_postal': '28013', 'ciudad': 'Madrid'},
+            'Calle Perdida': None,
+        }), rate_limit=0)
+
+    def test_import_saves_rows_and_defers_geocoding(self):
+        df = pd.DataFrame([{'nombre': 'Centro Cívico', 'direccion': 'Calle Mayor', 'numero': '5'}])
+
+        with mock.patch('users.views_dashboard.geocode_pending_in_background') as background:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(_process_lugares_import(df, self.asociacion), (1, []))
+
+        background.assert_called_once_with(self.asociacion, Lugar)
+        self.assertIsNone(Lugar.objects.get(nombre='Centro Cívico').lat)
+
+    def test_fills_coordinates_and_empty_address_fields(self):
+        Lugar.objects.create(asociacion=self.asociacion, nombre="Centro Cívico", direccion="Calle Mayor", numero="5")
+        Lugar.objects.create(asociacion=self.asociacion, nombre="Sin resultado", direccion="Calle Perdida")
+        Lugar.objects.create(asociacion=self.asociacion, nombre="Sin dirección")
+
+        self.assertEqual(geocode_pending(Lugar, self.asociacion, self.geocoder), (1, 2))
+
+        lugar = Lugar.objects.get(nombre="Centro Cívico")
+        self.assertEqual((lugar.lat, lugar.lon, lugar.cp, lugar.ciudad), (40.4, -3.7, '28013', 'Madrid'))
+        self.assertIsNone(Lugar.objects.get(nombre="Sin resultado").lat)
+
+
+class _InlineThread:
+    """threading.Thread que ejecuta el objetivo al llamar a start()"""
+
+    def __init__(self, target, **kwargs):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+def _response(status, data=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'' if data is None else json.dumps(data).encode()
+    return response
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('core.resilience.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.circuit = resilience.CircuitBreaker('pruebas', failure_threshold=3, reset_timeout=30)
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.circuit.before_request()
+            self.circuit.record_failure()
+        self.assertEqual(self.circuit.state, resilience.CLOSED)
+
+        self.circuit.before_request()
+        self.circuit.record_failure()
+        self.assertEqual(self.circuit.state, resilience.OPEN)
+        with self.assertRaises(resilience.CircuitOpenError):
+            self.circuit.before_request()
+
+    def test_success_resets_the_failure_count(self):
+        for _ in range(2):
+            self.circuit.record_failure()
+        self.circuit.record_success()
+        self.circuit.record_failure()
+        self.assertEqual(self.circuit.state, resilience.CLOSED)
+
+    def test_half_open_lets_a_single_trial_through(self):
+        for _ in range(3):
+            self.circuit.record_failure()
+        self.now += 30
+        self.assertEqual(self.circuit.state, resilience.HALF_OPEN)
+
+        self.circuit.before_request()
+        with self.assertRaises(resilience.CircuitOpenError):
+            self.circuit.before_request()
+
+        # La prueba terminó sin resultado que cuente: la siguiente puede probar
+        self.circuit.release_trial()
+        self.circuit.before_request()
+        self.circuit.record_success()
+        self.assertEqual(self.circuit.state, resilience.CLOSED)
+
+    def test_failed_trial_opens_again(self):
+        for _ in range(3):
+            self.circuit.record_failure()
+        self.now += 30
+        self.circuit.before_request()
+        self.circuit.record_failure()
+        self.assertEqual(self.circuit.state, resilience.OPEN)
+
+    def test_what_counts_as_a_backend_failure(self):
+        self.assertTrue(resilience.is_backend_failure(exc=requests.ConnectionError()))
+        self.assertTrue(resilience.is_backend_failure(exc=requests.Timeout()))
+        self.assertFalse(resilience.is_backend_failure(exc=requests.exceptions.InvalidURL()))
+        self.assertTrue(resilience.is_backend_failure(response=_response(503)))
+        self.assertFalse(resilience.is_backend_failure(response=_response(404)))
+        self.assertFalse(resilience.is_backend_failure(response=_response(500), endpoint='drive/auth/url'))
+
+
+class ApiClientResilienceTests(SimpleTestCase):
+    def setUp(self):
+        django_cache.clear()
+        self.addCleanup(django_cache.clear)
+        self.client_api = ApiClient(SimpleNamespace(authz=SimpleNamespace(asociacion_id=1)))
+        self.client_api.circuit = resilience.CircuitBreaker('pruebas-api', failure_threshold=2, reset_timeout=30)
+
+    def test_client_errors_do_not_open_the_circuit(self):
+        with mock.patch('requests.request', return_value=_response(404, {'detail': 'No existe'})):
+            for _ in range(3):
+                with self.assertRaises(requests.HTTPError):
+                    self.client_api.get('/socias/99')
+        self.assertEqual(self.client_api.circuit.state, resilience.CLOSED)
+
+    def test_server_errors_open_the_circuit(self):
+        with mock.patch('requests.request', return_value=_response(500)):
+            for _ in range(2):
+                with self.assertRaises(requests.HTTPError):
+                    self.client_api.get('/socias/')
+        self.assertEqual(self.client_api.circuit.state, resilience.OPEN)
+
+    def test_get_cached_serves_stale_data_and_refreshes_it(self):
+        with mock.patch('requests.request', return_value=_response(200, ['Ana'])):
+            self.assertEqual(self.client_api.get_cached('/socias/', timeout=60), ['Ana'])
+
+        with mock.patch('requests.request', return_value=_response(200, ['Ana', 'Rosa'])) as request, \
+                mock.patch('core.api.threading.Thread', _InlineThread), \
+                mock.patch('core.api.time.time', return_value=time.time() + 120):
+            # Caducada: devuelve la copia antigua y la refresca
+            self.assertEqual(self.client_api.get_cached('/socias/', timeout=60), ['Ana'])
+            self.assertEqual(request.call_count, 1)
+        with mock.patch('requests.request') as request:
+            self.assertEqual(self.client_api.get_cached('/socias/', timeout=60), ['Ana', 'Rosa'])
+            request.assert_not_called()
+
+    def test_get_cached_falls_back_to_the_last_good_copy(self):
+        with mock.patch('requests.request', return_value=_response(200, ['Ana'])):
+            self.client_api.get_cached('/socias/')
+        # Una escritura invalida la copia fresca, pero la última buena se conserva
+        self.client_api._invalidate('/socias/')
+
+        with mock.patch('requests.request', side_effect=requests.ConnectionError('caído')):
+            self.assertEqual(self.client_api.get_cached('/socias/'), ['Ana'])
+
+
+class RecurrenceTests(SimpleTestCase):
+    LUNES = datetime(2026, 5, 4, 10, 0)
+
+    def test_dtstart_is_an_occurrence_even_off_the_byday(self):
+        self.assertEqual(
+            recurrence.expand('FREQ=WEEKLY;BYDAY=TU', self.LUNES, datetime(2026, 5, 1), datetime(2026, 5, 13)),
+            (self.LUNES, datetime(2026, 5, 5, 10, 0), datetime(2026, 5, 12, 10, 0)),
+        )
+
+    def test_skip_ahead_keeps_the_interval_grid(self):
+        inicio = datetime(2019, 1, 7, 18, 30)
+        desde, hasta = datetime(2026, 5, 1), datetime(2026, 7, 1)
+        for regla in ('FREQ=WEEKLY;INTERVAL=2', 'FREQ=DAILY;INTERVAL=3', 'FREQ=HOURLY;INTERVAL=5'):
+            with self.subTest(regla=regla):
+                esperadas = rrulestr(regla, dtstart=inicio).between(desde, hasta, inc=True)
+                self.assertEqual(list(recurrence.occurrences(regla, inicio, desde, hasta)), esperadas)
+
+    def test_count_rules_are_not_skipped_ahead(self):
+        regla = 'FREQ=DAILY;COUNT=3'
+        inicio = datetime(2020, 1, 1, 9, 0)
+        self.assertEqual(recurrence.expand(regla, inicio, datetime(2026, 1, 1), datetime(2027, 1, 1)), ())
+        self.assertEqual(recurrence.expand(regla, inicio, datetime(2020, 1, 2), datetime(2020, 2, 1)),
+                         (datetime(2020, 1, 2, 9, 0), datetime(2020, 1, 3, 9, 0)))
+
+    def test_ongoing_occurrence_is_in_the_window(self):
+        self.assertEqual(
+            recurrence.expand('FREQ=DAILY', self.LUNES, datetime(2026, 5, 5, 11, 0), datetime(2026, 5, 5, 12, 0),
+                              timedelta(hours=2)),
+            (datetime(2026, 5, 5, 10, 0),),
+        )
+
+    def test_until_ends_a_proyecto_without_end_in_the_rule(self):
+        desde, hasta = datetime(2026, 5, 1), datetime(2026, 7, 1)
+        sesiones = recurrence.expand('FREQ=WEEKLY', date(2026, 5, 4), desde, hasta, until=date(2026, 5, 18))
+        self.assertEqual(sesiones, tuple(datetime(2026, 5, day) for day in (4, 11, 18)))
+        # El COUNT de la regla manda sobre la fecha final
+        sesiones = recurrence.expand('FREQ=WEEKLY;COUNT=2', date(2026, 5, 4), desde, hasta, until=date(2026, 6, 30))
+        self.assertEqual(len(sesiones), 2)
+
+    def test_occurrences_are_capped(self):
+        with mock.patch.object(recurrence, 'MAX_OCURRENCIAS', 5):
+            ocurrencias = list(recurrence.occurrences('FREQ=HOURLY', self.LUNES, self.LUNES, datetime(2027, 1, 1)))
+        self.assertEqual(len(ocurrencias), 5)
+
+    def test_validate_rrule(self):
+        for valida in ('', 'FREQ=WEEKLY;BYDAY=TU', 'RRULE:FREQ=MONTHLY;BYDAY=1SA;COUNT=10'):
+            recurrence.validate_rrule(valida)
+        for no_valida in ('DTSTART:20260504T100000\nRRULE:FREQ=DAILY', 'FREQ=MINUTELY', 'FREQ=WEEKLY;INTERVAL=0',
+                          'FREQ=WEEKLY;INTERVAL=dos', 'FREQ=CADA_LUNES'):
+            with self.subTest(regla=no_valida), self.assertRaises(ValidationError):
+                recurrence.validate_rrule(no_valida)
+
+
+class CacheGenerationTests(SimpleTestCase):
+    def setUp(self):
+        django_cache.clear()
+        self.addCleanup(django_cache.clear)
+        self.calls = []
+
+    def _cached(self, asociacion_id, resources, name='lista'):
+        def compute():
+            self.calls.append((asociacion_id, resources, name))
+            return len(self.calls)
+        return api_cache.get_or_set(asociacion_id, resources, name, compute)
+
+    def test_invalidating_a_resource_only_affects_that_asociacion(self):
+        for asociacion_id in (1, 2):
+            self._cached(asociacion_id, 'socias')
+            self._cached(asociacion_id, 'finanzas')
+        api_cache.invalidate(1, 'socias')
+
+        self.calls.clear()
+        for asociacion_id in (1, 2):
+            self._cached(asociacion_id, 'socias')
+            self._cached(asociacion_id, 'finanzas')
+        self.assertEqual(self.calls, [(1, 'socias', 'lista')])
+
+    def test_entries_over_several_resources_follow_any_of_them(self):
+        self._cached(1, ('socias', 'finanzas'), 'cuotas')
+        api_cache.invalidate_endpoint(1, '/adjuntos/3')
+
+        self.calls.clear()
+        self._cached(1, ('socias', 'finanzas'), 'cuotas')
+        self.assertEqual(len(self.calls), 1)
+
+    def test_deferred_invalidation_applies_once_on_exit(self):
+        self._cached(1, 'socias')
+        with mock.patch.object(api_cache.cache, 'incr', wraps=api_cache.cache.incr) as incr:
+            with api_cache.deferred_invalidation():
+                for _ in range(50):
+                    api_cache.invalidate(1, 'socias')
+                with api_cache.deferred_invalidation():
+                    api_cache.invalidate(1, 'socias')
+                # Dentro del bloque las entradas siguen valiendo
+                self.calls.clear()
+                self._cached(1, 'socias')
+                self.assertEqual(self.calls, [])
+        self.assertEqual(incr.call_count, 1)
+
+        self._cached(1, 'socias')
+        self.assertEqual(len(self.calls), 1)
+
+    def test_invalidates_decorator_only_after_a_post(self):
+        @api_cache.invalidates('socias')
+        def view(request):
+            return 'ok'
+
+        def request(method):
+            req = getattr(RequestFactory(), method)('/importar/')
+            req.authz = SimpleNamespace(asociacion_id=1)
+            return req
+
+        self._cached(1, 'socias')
+        self._cached(2, 'socias')
+        self.calls.clear()
+
+        view(request('get'))
+        self._cached(1, 'socias')
+        self.assertEqual(self.calls, [])
+
+        view(request('post'))
+        self._cached(1, 'socias')
+        self._cached(2, 'socias')
+        self.assertEqual(self.calls, [(1, 'socias', 'lista')])
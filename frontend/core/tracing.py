@@ -0,0 +1,212 @@
+"""
+Trazas distribuidas entre Django y el backend FastAPI
+
+Cada petición abre un span raíz (TracingMiddleware) y las llamadas del
+ApiClient abren spans hijos. El contexto viaja al backend con la cabecera
+W3C `traceparent` y el identificador de petición con `X-Request-ID`; el
+backend hace lo mismo con sus rutas, repositorios y llamadas a Drive, así
+que una página lenta se puede atribuir a un salto concreto.
+
+Destino de los spans (TRACING_EXPORTER):
+- none: no se guardan (X-Request-ID se propaga igualmente)
+- jsonl: una línea JSON por span en TRACING_FILE (compartido con el backend)
+- otlp: OTLP/HTTP JSON a TRACING_OTLP_ENDPOINT (Jaeger, Tempo, collector...)
+
+`python manage.py show_trace <request_id>` muestra el árbol de una traza.
+"""
+import atexit
+import json
+import logging
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = 'asonet-frontend'
+
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+# SpanKind de OTLP
+OTLP_KINDS = {'internal': 1, 'server': 2, 'client': 3}
+
+
+class Span:
+
+    def __init__(self, name, trace_id, parent_id=None, request_id=None, kind='internal', attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.request_id = request_id or trace_id
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    @property
+    def traceparent(self):
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            'service': SERVICE_NAME,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'request_id': self.request_id,
+            'name': self.name,
+            'kind': self.kind,
+            'start_ns': self.start_ns,
+            'duration_ms': round(self.duration_ms, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+_current = ContextVar('current_span', default=None)
+
+
+def current_span():
+    return _current.get()
+
+
+def parse_traceparent(header):
+    """(trace_id, parent_span_id) de una cabecera traceparent válida, o (None, None)"""
+    match = TRACEPARENT_RE.match((header or '').strip().lower())
+    return match.groups() if match else (None, None)
+
+
+@contextmanager
+def start_span(name, kind='internal', traceparent=None, request_id=None, **attributes):
+    """
+    Abre un span hijo del actual. Sin span actual empieza una traza nueva,
+    o continúa la de `traceparent` si viene de otro servicio.
+    """
+    parent = _current.get()
+    if parent is not None:
+        span = Span(name, parent.trace_id, parent.span_id, parent.request_id, kind, attributes)
+    else:
+        trace_id, parent_id = parse_traceparent(traceparent)
+        span = Span(name, trace_id or secrets.token_hex(16), parent_id, request_id, kind, attributes)
+
+    token = _current.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span.error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        _current.reset(token)
+        span.end_ns = time.time_ns()
+        exporter.export(span)
+
+
+def propagation_headers():
+    """Cabeceras para continuar la traza en el backend"""
+    span = _current.get()
+    if span is None:
+        return {}
+    return {'traceparent': span.traceparent, 'X-Request-ID': span.request_id}
+
+
+class SpanExporter:
+    """
+    Escribe los spans terminados fuera del camino de la petición: se encolan
+    y un hilo los vuelca cada segundo (o al llegar a `batch_size`).
+    """
+
+    def __init__(self, batch_size=100, interval=1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    @property
+    def kind(self):
+        return getattr(settings, 'TRACING_EXPORTER', 'none')
+
+    def export(self, span):
+        if self.kind == 'none':
+            return
+        with self._lock:
+            self._pending.append(span.to_dict())
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name='span-exporter')
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            if self.kind == 'otlp':
+                self._send_otlp(batch)
+            else:
+                self._write_jsonl(batch)
+        except (OSError, requests.RequestException) as e:
+            logger.warning("No se pudieron exportar %s spans: %s", len(batch), e)
+
+    def _write_jsonl(self, batch):
+        with open(settings.TRACING_FILE, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(span, default=str) + '\n' for span in batch))
+
+    def _send_otlp(self, batch):
+        requests.post(settings.TRACING_OTLP_ENDPOINT, json=otlp_payload(batch), timeout=5).raise_for_status()
+
+
+def _otlp_attributes(attributes):
+    return [{'key': key, 'value': {'stringValue': str(value)}} for key, value in attributes.items()]
+
+
+def otlp_payload(batch):
+    """Spans en el formato JSON de OTLP/HTTP (ExportTraceServiceRequest)"""
+    spans = []
+    for span in batch:
+        end_ns = span['start_ns'] + int(span['duration_ms'] * 1e6)
+        spans.append({
+            'traceId': span['trace_id'],
+            'spanId': span['span_id'],
+            'parentSpanId': span['parent_id'] or '',
+            'name': span['name'],
+            'kind': OTLP_KINDS[span['kind']],
+            'startTimeUnixNano': str(span['start_ns']),
+            'endTimeUnixNano': str(end_ns),
+            'attributes': _otlp_attributes({**span['attributes'], 'request_id': span['request_id']}),
+            'status': {'code': 2, 'message': span['error']} if span['error'] else {'code': 1},
+        })
+    return {'resourceSpans': [{
+        'resource': {'attributes': _otlp_attributes({'service.name': SERVICE_NAME})},
+        'scopeSpans': [{'scope': {'name': 'asonet'}, 'spans': spans}],
+    }]}
+
+
+exporter = SpanExporter()
+# Comandos de gestión y workers que terminan: no perder el último lote
+atexit.register(exporter.flush)
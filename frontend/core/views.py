@@ -1,3 +1,44 @@
+import requests
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 
-# Create your views here.
+from core import metrics
+from core.api import get_client
+from users.utils import association_required
+
+# Parámetros del widget de Geoapify que se reenvían (la clave la pone el backend)
+AUTOCOMPLETE_PARAMS = ('text', 'type', 'limit', 'lang', 'filter', 'bias')
+
+
+def metrics_view(request):
+    """Métricas Prometheus. Con METRICS_TOKEN exige `Authorization: Bearer <token>`"""
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse(status=401)
+    body, content_type = metrics.exposition()
+    return HttpResponse(body, content_type=content_type)
+
+
+@login_required
+@association_required
+def direcciones_autocompletar(request):
+    """
+    Proxy del autocompletado de direcciones (backend /direcciones/autocompletar).
+    El widget de Geoapify apunta aquí en vez de a la API: la clave no sale del
+    servidor, primero salen los lugares de la asociación y el backend comparte
+    caché y peticiones en curso entre usuarios.
+    """
+    params = {name: request.GET[name] for name in AUTOCOMPLETE_PARAMS if request.GET.get(name)}
+    if not params.get('text', '').strip():
+        return JsonResponse({'type': 'FeatureCollection', 'features': []})
+    params['asociacion_id'] = request.user.profile.asociacion.id
+    try:
+        data = get_client(request).get('/direcciones/autocompletar', params=params)
+    except requests.RequestException:
+        # El widget lo trata como "sin resultados"; queda el modo manual
+        return JsonResponse({'type': 'FeatureCollection', 'features': []})
+    response = JsonResponse(data)
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
@@ -4,6 +4,8 @@ from eventos.models import Lugar
 from socias.models import Socia
 from proyectos.models import Proyecto
 from finanzas.models import Transaccion
+from core.autocomplete import AutocompleteSelect, AutocompleteSelectMultiple
+from core.geocoding import geocode
 
 class EntidadForm(forms.ModelForm):
     class Meta:
@@ -28,12 +30,12 @@ class PersonaForm(forms.ModelForm):
             'apellidos': forms.TextInput(attrs={'class': 'form-control'}),
             'contacto': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Información de contacto adicional'}),
             'cargo': forms.TextInput(attrs={'class': 'form-control'}),
-            'entidad': forms.Select(attrs={'class': 'form-select'}),
+            'entidad': AutocompleteSelect('entidades', attrs={'class': 'form-select', 'placeholder': 'Buscar entidad...'}),
             'telefono': forms.TextInput(attrs={'class': 'form-control'}),
             'email': forms.EmailInput(attrs={'class': 'form-control'}),
             'observaciones': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'proyecto': forms.Select(attrs={'class': 'form-select'}),
-            'le_conoce': forms.SelectMultiple(attrs={'class': 'form-select', 'size': '5'}),
+            'proyecto': AutocompleteSelect('proyectos', attrs={'class': 'form-select', 'placeholder': 'Seleccionar proyecto...'}),
+            'le_conoce': AutocompleteSelectMultiple('socias', attrs={'class': 'form-select', 'placeholder': 'Buscar socias...'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -58,6 +60,19 @@ class LugarForm(forms.ModelForm):
             'descripcion': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
 
+    def save(self, commit=True):
+        lugar = super().save(commit=False)
+        if {'direccion', 'numero', 'cp', 'ciudad'} & set(self.changed_data):
+            # Otra dirección: las coordenadas antiguas ya no valen
+            lugar.lat = lugar.lon = None
+        # Coordenadas, código postal y ciudad que no vengan del autocompletado del navegador (con caché)
+        if lugar.falta_geocodificar:
+            lugar.completar_direccion(geocode(lugar.direccion_completa))
+        if commit:
+            lugar.save()
+            self.save_m2m()
+        return lugar
+
 class MaterialForm(forms.ModelForm):
     class Meta:
         model = Material
@@ -66,10 +81,10 @@ class MaterialForm(forms.ModelForm):
             'nombre': forms.TextInput(attrs={'class': 'form-control'}),
             'uso': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
             'precio': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
-            'transaccion_compra': forms.Select(attrs={'class': 'form-select'}),
-            'lugar': forms.Select(attrs={'class': 'form-select'}),
-            'encargado_persona': forms.Select(attrs={'class': 'form-select'}),
-            'encargado_socia': forms.Select(attrs={'class': 'form-select'}),
+            'transaccion_compra': AutocompleteSelect('transacciones', attrs={'class': 'form-select'}),
+            'lugar': AutocompleteSelect('lugares', attrs={'class': 'form-select'}),
+            'encargado_persona': AutocompleteSelect('personas', attrs={'class': 'form-select'}),
+            'encargado_socia': AutocompleteSelect('socias', attrs={'class': 'form-select'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# Debe coincidir con la expresión de búsqueda de core/autocomplete.py para que se use el índice
+INDEXES = {
+    'personas_nombre_tsv_idx': ('entidades_persona', "nombre || ' ' || apellidos"),
+    'materiales_nombre_tsv_idx': ('entidades_material', 'nombre'),
+    'entidades_nombre_tsv_idx': ('entidades_entidad', 'nombre'),
+}
+
+
+def crear_indices_busqueda(apps, schema_editor):
+    # Solo PostgreSQL tiene tsvector; en SQLite la búsqueda sigue siendo LIKE
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, (table, expression) in INDEXES.items():
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (to_tsvector('spanish', {expression}))"
+            )
+
+
+def borrar_indices_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entidades', '0002_persona_contacto_persona_le_conoce_persona_proyecto_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices_busqueda, borrar_indices_busqueda),
+    ]
@@ -5,6 +5,7 @@ from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from users.utils import is_association_admin
 from core.mixins import AssociationRequiredMixin, AssociationFilterMixin, AdminRequiredMixin, AutoAssignAssociationMixin
+from core import cache
 from .models import Entidad, Persona, Material
 from eventos.models import Lugar
 from .forms import EntidadForm, PersonaForm, LugarForm, MaterialForm
@@ -18,10 +19,16 @@ class EntidadesDashboardView(AssociationRequiredMixin, TemplateView):
         context['section'] = 'entidades'
         asociacion = self.request.user.profile.asociacion
 
-        context['total_entidades'] = Entidad.objects.filter(asociacion=asociacion).count()
-        context['total_personas'] = Persona.objects.filter(asociacion=asociacion).count()
-        context['total_lugares'] = Lugar.objects.filter(asociacion=asociacion).count()
-        context['total_materiales'] = Material.objects.filter(asociacion=asociacion).count()
+        # Los lugares pertenecen a la app eventos, así que el contador depende de ambos recursos
+        context.update(cache.get_or_set(
+            asociacion.id, ('entidades', 'eventos'), 'dashboard:counters',
+            lambda: {
+                'total_entidades': Entidad.objects.filter(asociacion=asociacion).count(),
+                'total_personas': Persona.objects.filter(asociacion=asociacion).count(),
+                'total_lugares': Lugar.objects.filter(asociacion=asociacion).count(),
+                'total_materiales': Material.objects.filter(asociacion=asociacion).count(),
+            }
+        ))
 
         # Últimos registros
         context['last_entidades'] = Entidad.objects.filter(asociacion=asociacion).order_by('-created_at')[:5]
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class EventosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'eventos'
+
+    def ready(self):
+        # Escrituras con el ORM (admin, importaciones): la agenda de reservas se actualiza sola
+        from .models import Evento
+        from .scheduling import evento_deleted, evento_saved, materiales_changed
+
+        post_save.connect(evento_saved, sender=Evento, dispatch_uid='scheduling_evento_save')
+        post_delete.connect(evento_deleted, sender=Evento, dispatch_uid='scheduling_evento_delete')
+        m2m_changed.connect(materiales_changed, sender=Evento.materiales_utilizados.through,
+                            dispatch_uid='scheduling_evento_materiales')
@@ -1,6 +1,8 @@
 from django import forms
 from .models import Evento, Lugar
+from .scheduling import get_agenda
 from entidades.models import Persona, Material
+from core.autocomplete import AutocompleteSelect, AutocompleteSelectMultiple
 from datetime import datetime, timedelta
 
 class EventoForm(forms.ModelForm):
@@ -47,20 +49,21 @@ class EventoForm(forms.ModelForm):
             'nombre', 'responsable', 'proyecto', 'descripcion',
             'lugar', 'lugar_nombre', 'lugar_direccion',
             'socias_involucradas', 'personas_involucradas', 'materiales_utilizados',
-            'observaciones'
+            'observaciones', 'recurrencia'
         ]
         widgets = {
             'nombre': forms.TextInput(attrs={'class': 'form-control'}),
-            'responsable': forms.Select(attrs={'class': 'form-control'}),
-            'proyecto': forms.Select(attrs={'class': 'form-control'}),
+            'responsable': AutocompleteSelect('socias', attrs={'class': 'form-control'}),
+            'proyecto': AutocompleteSelect('proyectos', attrs={'class': 'form-control'}),
             'descripcion': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'lugar': forms.Select(attrs={'class': 'form-control'}),
+            'lugar': AutocompleteSelect('lugares', attrs={'class': 'form-control', 'placeholder': 'Seleccionar lugar registrado...'}),
             'lugar_nombre': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Ej: Centro Cívico (Si no está en lista)'}),
             'lugar_direccion': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Dirección completa (Si no está en lista)'}),
             'observaciones': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'socias_involucradas': forms.SelectMultiple(attrs={'class': 'form-select'}),
-            'personas_involucradas': forms.SelectMultiple(attrs={'class': 'form-select'}),
-            'materiales_utilizados': forms.SelectMultiple(attrs={'class': 'form-select'}),
+            'recurrencia': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Ej: FREQ=WEEKLY;BYDAY=TU (vacío si no se repite)'}),
+            'socias_involucradas': AutocompleteSelectMultiple('socias', attrs={'class': 'form-select', 'placeholder': 'Seleccionar socias...'}),
+            'personas_involucradas': AutocompleteSelectMultiple('personas', attrs={'class': 'form-select', 'placeholder': 'Seleccionar personas externas...'}),
+            'materiales_utilizados': AutocompleteSelectMultiple('materiales', attrs={'class': 'form-select', 'placeholder': 'Seleccionar materiales...'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -139,8 +142,38 @@ class EventoForm(forms.ModelForm):
         else:
             cleaned_data['duracion'] = None
 
+        if self.asociacion and cleaned_data.get('fecha'):
+            self._check_reservas(cleaned_data)
+
         return cleaned_data
 
+    def _check_reservas(self, cleaned_data):
+        """El lugar y los materiales no pueden estar ya ocupados por otro evento a esa hora"""
+        lugar = cleaned_data.get('lugar')
+        materiales = {material.pk: material for material in cleaned_data.get('materiales_utilizados') or ()}
+        if not lugar and not materiales:
+            return
+
+        conflictos = get_agenda(self.asociacion).conflicts(
+            cleaned_data['fecha'], cleaned_data['duracion'],
+            lugar_id=lugar.pk if lugar else None,
+            material_ids=list(materiales),
+            exclude=self.instance.pk,
+            recurrencia=cleaned_data.get('recurrencia') or '',
+        )
+        if not conflictos:
+            return
+
+        nombres = dict(Evento.objects.filter(pk__in={c.evento_id for c in conflictos}).values_list('pk', 'nombre'))
+        for conflicto in conflictos:
+            horario = f"{conflicto.inicio:%d/%m/%Y %H:%M} - {conflicto.fin:%H:%M}"
+            evento = nombres.get(conflicto.evento_id, f"#{conflicto.evento_id}")
+            if conflicto.recurso == 'lugar':
+                self.add_error('lugar', f"{lugar} ya está reservado para «{evento}» ({horario}).")
+            else:
+                material = materiales[conflicto.recurso_id]
+                self.add_error('materiales_utilizados', f"{material} ya se usa en «{evento}» ({horario}).")
+
     def save(self, commit=True):
         instance = super().save(commit=False)
 
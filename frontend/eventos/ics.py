@@ -0,0 +1,184 @@
+"""
+Calendario iCalendar (RFC 5545) con los eventos de una asociación
+
+Los calendarios del móvil se suscriben a una URL y la consultan cada pocos
+minutos sin sesión, así que la URL lleva un token firmado con la asociación
+(feed_token) en lugar de pedir login. Con ?proyecto=<id> el calendario se
+limita a los eventos de ese proyecto.
+
+- feed_state(): una consulta de agregado (número de eventos y última
+  fecha_modificacion) que da el ETag y el Last-Modified. Un alta o una edición
+  mueve la fecha; una baja, el número. Si nada ha cambiado la vista responde
+  304 sin leer los eventos.
+- serialize(): genera el .ics evento a evento (iterator() de la consulta),
+  sin montar el calendario entero en memoria.
+
+Las fechas salen tal como se guardan (hora local, ver eventos.scheduling),
+como hora "flotante" y con X-WR-TIMEZONE, así que una repetición semanal
+conserva su hora con el cambio de horario.
+"""
+from collections import namedtuple
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Count, Max
+
+from core.models import AsociacionVecinal
+from core.tenancy import shard_of
+from .scheduling import intervalo
+
+FeedState = namedtuple('FeedState', 'asociacion proyecto using total ultima_modificacion')
+
+# Eventos que se leen de la base de datos por bloque al generar el calendario
+ICS_CHUNK_SIZE = 500
+
+# Límite de RFC 5545 para una línea, en octetos y sin el CRLF
+_MAX_LINE = 75
+
+
+def _signer():
+    return signing.Signer(salt=settings.ICS_TOKEN_SALT)
+
+
+def feed_token(asociacion):
+    return _signer().sign(str(getattr(asociacion, 'pk', asociacion)))
+
+
+def feed_state(token, proyecto_id=None):
+    """Lo que identifica una versión del calendario; None si el token o el proyecto no valen"""
+    try:
+        asociacion_id = int(_signer().unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+    asociacion = AsociacionVecinal.objects.filter(pk=asociacion_id, is_active=True).first()
+    if asociacion is None:
+        return None
+
+    from proyectos.models import Proyecto
+    from .models import Evento
+
+    using = shard_of(asociacion)
+    proyecto = None
+    if proyecto_id:
+        try:
+            proyecto = Proyecto.objects.using(using).filter(pk=int(proyecto_id), asociacion=asociacion).first()
+        except ValueError:
+            return None
+        if proyecto is None:
+            return None
+
+    eventos = Evento.objects.using(using).filter(asociacion=asociacion)
+    if proyecto is not None:
+        eventos = eventos.filter(proyecto=proyecto)
+    agregado = eventos.aggregate(total=Count('id'), ultima=Max('fecha_modificacion'))
+    return FeedState(asociacion, proyecto, using, agregado['total'], agregado['ultima'])
+
+
+def etag(state):
+    # Débil: el contenido también depende de los nombres de lugares y proyectos
+    ultima = int(state.ultima_modificacion.timestamp() * 1_000_000) if state.ultima_modificacion else 0
+    proyecto_id = state.proyecto.pk if state.proyecto else 0
+    return f'W/"{state.asociacion.pk}-{proyecto_id}-{state.total}-{ultima}"'
+
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '')
+    )
+
+
+def _fold(line):
+    """Parte las líneas de más de 75 octetos sin cortar caracteres UTF-8"""
+    if len(line.encode('utf-8')) <= _MAX_LINE:
+        return line + '\r\n'
+    partes, actual, tam, limite = [], [], 0, _MAX_LINE
+    for char in line:
+        octetos = len(char.encode('utf-8'))
+        if tam + octetos > limite:
+            partes.append(''.join(actual))
+            # Las continuaciones empiezan con un espacio, que también cuenta
+            actual, tam, limite = [], 0, _MAX_LINE - 1
+        actual.append(char)
+        tam += octetos
+    partes.append(''.join(actual))
+    return '\r\n '.join(partes) + '\r\n'
+
+
+def _local(value):
+    return value.strftime('%Y%m%dT%H%M%S')
+
+
+def _utc(value):
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc)
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def _location(evento):
+    if evento['lugar__nombre']:
+        partes = (evento['lugar__nombre'], evento['lugar__direccion'])
+    else:
+        partes = (evento['lugar_nombre'], evento['lugar_direccion'])
+    return ', '.join(parte for parte in partes if parte)
+
+
+def _vevent(evento, host, dtstamp):
+    inicio, fin = intervalo(evento['fecha'], evento['duracion'])
+    modificado = _utc(evento['fecha_modificacion']) if evento['fecha_modificacion'] else dtstamp
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:evento-{evento['id']}@{host}",
+        f'DTSTAMP:{modificado}',
+        f'LAST-MODIFIED:{modificado}',
+        f'DTSTART:{_local(inicio)}',
+        f'DTEND:{_local(fin)}',
+    ]
+    regla = (evento['recurrencia'] or '').strip()
+    if regla:
+        if regla.upper().startswith('RRULE:'):
+            regla = regla[len('RRULE:'):]
+        lines.append(f'RRULE:{regla}')
+    lines.append(f"SUMMARY:{_escape(evento['nombre'])}")
+    if evento['descripcion']:
+        lines.append(f"DESCRIPTION:{_escape(evento['descripcion'])}")
+    location = _location(evento)
+    if location:
+        lines.append(f'LOCATION:{_escape(location)}')
+    if evento['proyecto__nombre']:
+        lines.append(f"CATEGORIES:{_escape(evento['proyecto__nombre'])}")
+    lines.append('END:VEVENT')
+    return ''.join(_fold(line) for line in lines)
+
+
+def serialize(state, host):
+    """Genera el calendario por trozos (uno por evento) para una StreamingHttpResponse"""
+    from .models import Evento
+
+    nombre = state.asociacion.nombre
+    if state.proyecto is not None:
+        nombre = f"{nombre} · {state.proyecto.nombre}"
+    dtstamp = _utc(state.ultima_modificacion) if state.ultima_modificacion else '19700101T000000Z'
+
+    yield ''.join(_fold(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//AsoNet//Actividades//ES',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(nombre)}',
+        f'X-WR-TIMEZONE:{settings.TIME_ZONE}',
+    ))
+
+    eventos = Evento.objects.using(state.using).filter(asociacion=state.asociacion)
+    if state.proyecto is not None:
+        eventos = eventos.filter(proyecto=state.proyecto)
+    campos = (
+        'id', 'nombre', 'descripcion', 'fecha', 'duracion', 'recurrencia', 'fecha_modificacion',
+        'lugar_nombre', 'lugar_direccion', 'lugar__nombre', 'lugar__direccion', 'proyecto__nombre',
+    )
+    for evento in eventos.order_by('fecha', 'id').values(*campos).iterator(chunk_size=ICS_CHUNK_SIZE):
+        yield _vevent(evento, host, dtstamp)
+
+    yield _fold('END:VCALENDAR')
@@ -7,10 +7,12 @@ def asignar_responsables_eventos(apps, schema_editor):
     """Asignar responsables a eventos existentes"""
     Evento = apps.get_model('eventos', 'Evento')
     Socia = apps.get_model('socias', 'Socia')
+    # La base de datos que se está migrando (puede ser un shard de asociación)
+    db_alias = schema_editor.connection.alias
 
     # Para cada evento sin responsable, asignar la primera socia de su asociación
-    for evento in Evento.objects.filter(responsable__isnull=True):
-        primera_socia = Socia.objects.filter(asociacion=evento.asociacion).first()
+    for evento in Evento.objects.using(db_alias).filter(responsable__isnull=True):
+        primera_socia = Socia.objects.using(db_alias).filter(asociacion_id=evento.asociacion_id).first()
         if primera_socia:
             evento.responsable = primera_socia
             evento.save()
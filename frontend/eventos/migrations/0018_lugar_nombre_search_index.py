@@ -0,0 +1,27 @@
+from django.db import migrations
+
+# Debe coincidir con la expresión que usa el backend (DB_SEARCH_CONFIG) para que se use el índice
+INDEX_SQL = "CREATE INDEX IF NOT EXISTS lugares_nombre_tsv_idx ON lugares USING gin (to_tsvector('spanish', nombre))"
+DROP_SQL = "DROP INDEX IF EXISTS lugares_nombre_tsv_idx"
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    # Solo PostgreSQL tiene tsvector; en SQLite la búsqueda sigue siendo LIKE
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(INDEX_SQL)
+
+
+def borrar_indice_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0017_evento_lugar_evento_materiales_utilizados_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_busqueda, borrar_indice_busqueda),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:19
+
+import core.recurrence
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0021_lugar_spatial_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='recurrencia',
+            field=models.CharField(blank=True, db_default='', default='', help_text='Regla de repetición (RRULE), ej: FREQ=WEEKLY;BYDAY=TU. Vacío si no se repite', max_length=500, validators=[core.recurrence.validate_rrule]),
+        ),
+    ]
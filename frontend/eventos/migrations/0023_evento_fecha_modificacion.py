@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:26
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0022_evento_recurrencia'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.functions import Now
+from core.geocoding import address_query
 from core.models import AsociacionVecinal
+from core.recurrence import validate_rrule
 
 
 class Evento(models.Model):
@@ -56,6 +59,15 @@ class Evento(models.Model):
         blank=True,
         help_text="Duración del evento (ej: 2:30:00 para 2h 30min)"
     )
+    # Repetición (core.recurrence): regla RRULE sin DTSTART; vacío = una sola vez
+    recurrencia = models.CharField(
+        max_length=500,
+        blank=True,
+        default='',
+        db_default='',
+        validators=[validate_rrule],
+        help_text="Regla de repetición (RRULE), ej: FREQ=WEEKLY;BYDAY=TU. Vacío si no se repite"
+    )
 
     # Colaboradores y evaluación
     colaboradores = models.TextField(
@@ -91,6 +103,9 @@ class Evento(models.Model):
         help_text="Observaciones y comentarios sobre el evento"
     )
 
+    # Última escritura (Django o backend, en UTC): ETag/Last-Modified del calendario .ics
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_default=Now())
+
     class Meta:
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
@@ -121,11 +136,34 @@ class Lugar(models.Model):
     ciudad = models.CharField(max_length=100, blank=True)
     pais = models.CharField(max_length=100, blank=True, default="España")
 
+    # Coordenadas (core.geocoding) para el mapa del barrio
+    lat = models.FloatField(null=True, blank=True)
+    lon = models.FloatField(null=True, blank=True)
+
     class Meta:
         verbose_name = "Lugar"
         verbose_name_plural = "Lugares"
         db_table = "lugares"
         unique_together = ['asociacion', 'nombre']
+        indexes = [models.Index(fields=['asociacion', 'lat', 'lon'], name='lugares_asoc_latlon_idx')]
 
     def __str__(self):
         return self.nombre
+
+    @property
+    def direccion_completa(self):
+        return address_query(self.direccion, self.numero, self.cp, self.ciudad)
+
+    @property
+    def falta_geocodificar(self):
+        return bool(self.direccion) and not (self.cp and self.ciudad and self.lat is not None)
+
+    def completar_direccion(self, resultado):
+        """Rellena los campos de dirección vacíos con un resultado de core.geocoding"""
+        if not resultado:
+            return
+        self.numero = self.numero or resultado['numero']
+        self.cp = self.cp or resultado['codigo_postal']
+        self.ciudad = self.ciudad or resultado['ciudad']
+        if self.lat is None:
+            self.lat, self.lon = resultado['lat'], resultado['lon']
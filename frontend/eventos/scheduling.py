@@ -0,0 +1,307 @@
+"""
+Reservas de lugares y materiales: solapes entre eventos y huecos libres
+
+Un evento ocupa su lugar (FK) y sus materiales desde `fecha` hasta
+`fecha + duracion` (EVENTO_DURACION_POR_DEFECTO minutos si no tiene).
+
+- IntervalIndex: los intervalos de un recurso ordenados por inicio, más la
+  duración máxima. Los que pueden solapar con [inicio, fin) empiezan en
+  (inicio - duración máxima, fin), así que salen con dos bisect: O(log n + k),
+  con k los candidatos de esa ventana (casi siempre 0 o 1).
+- Agenda: un índice por lugar y otro por material de una asociación. Se
+  construye desde la tabla de eventos la primera vez que se pide (dos
+  consultas) y después se actualiza por incrementos: las vistas de eventos
+  llaman a registrar()/olvidar() tras escribir en el backend, y las señales
+  cubren las escrituras con el ORM (admin, importaciones). Como otros procesos
+  también escriben, se vuelve a construir cada SCHEDULING_INDEX_TTL segundos.
+- Los eventos con `recurrencia` no entran en los índices (su serie puede no
+  tener fin): se guardan aparte y en cada consulta se expanden solo en la
+  ventana consultada (core.recurrence.expand). Si el evento que se valida se
+  repite, se comprueban sus ocurrencias de los próximos
+  SCHEDULING_RECURRENCE_HORIZON_DAYS días.
+
+    from eventos.scheduling import get_agenda
+    agenda = get_agenda(asociacion)
+    agenda.conflicts(fecha, duracion, lugar_id=3, material_ids=[1, 2], exclude=evento.pk)
+    agenda.free_slots(lugar_id, desde, hasta, duracion_minima=timedelta(hours=2))
+
+Las fechas se comparan tal como se guardan: el backend escribe la hora local
+sin zona y el ORM la lee como UTC, así que las fechas con zona se pasan a UTC
+y se les quita la zona (igual que hace la base de datos al guardarlas).
+"""
+import bisect
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+
+from core.recurrence import expand
+
+Conflicto = namedtuple('Conflicto', 'recurso recurso_id evento_id inicio fin')
+
+_agendas = {}
+_agendas_lock = threading.Lock()
+
+
+def _naive(value):
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def intervalo(fecha, duracion):
+    """[inicio, fin) que ocupa un evento"""
+    inicio = _naive(fecha)
+    if not duracion:
+        duracion = timedelta(minutes=settings.EVENTO_DURACION_POR_DEFECTO)
+    return inicio, inicio + duracion
+
+
+def _repeticiones(recurrencia, inicio, fin, desde, hasta):
+    """[inicio, fin) de las ocurrencias de una serie que solapan con [desde, hasta)"""
+    duracion = fin - inicio
+    try:
+        inicios = expand(recurrencia, inicio, desde, hasta, duracion)
+    except ValueError:
+        # Regla guardada antes de validarse (o por otro cliente): solo cuenta la fecha del evento
+        inicios = expand('', inicio, desde, hasta, duracion)
+    return [(start, start + duracion) for start in inicios]
+
+
+def _unir(intervalos, desde, hasta):
+    """Intervalos ordenados por inicio, recortados a [desde, hasta) y unidos los que se tocan"""
+    tramos = []
+    for start, end in intervalos:
+        start, end = max(start, desde), min(end, hasta)
+        if tramos and start <= tramos[-1][1]:
+            tramos[-1] = (tramos[-1][0], max(tramos[-1][1], end))
+        else:
+            tramos.append((start, end))
+    return tramos
+
+
+class IntervalIndex:
+    """Intervalos [inicio, fin) de un recurso, ordenados por inicio"""
+
+    def __init__(self):
+        self._keys = []        # (inicio, evento_id), ordenadas
+        self._ends = []        # fin de cada clave, en el mismo orden
+        self._max_duracion = timedelta(0)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, evento_id, inicio, fin):
+        pos = bisect.bisect_left(self._keys, (inicio, evento_id))
+        self._keys.insert(pos, (inicio, evento_id))
+        self._ends.insert(pos, fin)
+        # No se reduce al borrar: solo ensancha la ventana de búsqueda
+        self._max_duracion = max(self._max_duracion, fin - inicio)
+
+    def remove(self, evento_id, inicio):
+        pos = bisect.bisect_left(self._keys, (inicio, evento_id))
+        if pos < len(self._keys) and self._keys[pos] == (inicio, evento_id):
+            del self._keys[pos]
+            del self._ends[pos]
+
+    def overlapping(self, inicio, fin, exclude=None):
+        """(evento_id, inicio, fin) de los intervalos que solapan con [inicio, fin)"""
+        # Claves con inicio en (inicio - max_duracion, fin): las únicas que pueden solapar
+        lo = bisect.bisect_right(self._keys, (inicio - self._max_duracion, float('inf')))
+        hi = bisect.bisect_left(self._keys, (fin, -1))
+        return [
+            (evento_id, start, self._ends[pos])
+            for pos, (start, evento_id) in enumerate(self._keys[lo:hi], lo)
+            if self._ends[pos] > inicio and evento_id != exclude
+        ]
+
+    def busy(self, desde, hasta):
+        """Tramos ocupados dentro de [desde, hasta), ya unidos y recortados"""
+        return _unir([(start, end) for _, start, end in self.overlapping(desde, hasta)], desde, hasta)
+
+
+class Agenda:
+    """Índices de ocupación de los lugares y materiales de una asociación"""
+
+    def __init__(self, asociacion_id):
+        self.asociacion_id = asociacion_id
+        self.lugares = {}
+        self.materiales = {}
+        # evento_id -> (inicio, fin, lugar_id, material_ids), para actualizar por incrementos
+        self.eventos = {}
+        # evento_id -> (inicio, fin, lugar_id, material_ids, recurrencia) de la primera ocurrencia
+        self.recurrentes = {}
+        self.built_at = time.monotonic()
+        self._lock = threading.RLock()
+
+    def load(self):
+        from .models import Evento
+
+        eventos = Evento.objects.filter(asociacion_id=self.asociacion_id)
+        materiales = {}
+        through = Evento.materiales_utilizados.through.objects.filter(evento__asociacion_id=self.asociacion_id)
+        for evento_id, material_id in through.values_list('evento_id', 'material_id'):
+            materiales.setdefault(evento_id, []).append(material_id)
+
+        with self._lock:
+            filas = eventos.values_list('id', 'fecha', 'duracion', 'lugar_id', 'recurrencia')
+            for evento_id, fecha, duracion, lugar_id, recurrencia in filas:
+                if lugar_id or evento_id in materiales:
+                    self._put(evento_id, *intervalo(fecha, duracion), lugar_id, materiales.get(evento_id, ()),
+                              recurrencia)
+        return self
+
+    @property
+    def expired(self):
+        return time.monotonic() - self.built_at > settings.SCHEDULING_INDEX_TTL
+
+    def put(self, evento_id, fecha, duracion, lugar_id, material_ids=None, recurrencia=''):
+        """Añade o actualiza un evento. material_ids=None conserva los que tuviera"""
+        with self._lock:
+            previo = self.discard(evento_id)
+            if material_ids is None:
+                material_ids = previo[3] if previo else ()
+            if lugar_id or material_ids:
+                self._put(evento_id, *intervalo(fecha, duracion), lugar_id, material_ids, recurrencia)
+
+    def discard(self, evento_id):
+        with self._lock:
+            previo = self.eventos.pop(evento_id, None)
+            if previo:
+                inicio, _, lugar_id, material_ids = previo
+                if lugar_id:
+                    self.lugares[lugar_id].remove(evento_id, inicio)
+                for material_id in material_ids:
+                    self.materiales[material_id].remove(evento_id, inicio)
+            else:
+                previo = self.recurrentes.pop(evento_id, None)
+            return previo
+
+    def _put(self, evento_id, inicio, fin, lugar_id, material_ids, recurrencia=''):
+        material_ids = tuple(sorted(set(material_ids)))
+        if recurrencia:
+            self.recurrentes[evento_id] = (inicio, fin, lugar_id, material_ids, recurrencia)
+            return
+        self.eventos[evento_id] = (inicio, fin, lugar_id, material_ids)
+        if lugar_id:
+            self.lugares.setdefault(lugar_id, IntervalIndex()).add(evento_id, inicio, fin)
+        for material_id in material_ids:
+            self.materiales.setdefault(material_id, IntervalIndex()).add(evento_id, inicio, fin)
+
+    def _recurrentes_de(self, recurso, recurso_id, exclude=None):
+        """(evento_id, inicio, fin, recurrencia) de las series que usan el lugar o material"""
+        for evento_id, (inicio, fin, lugar_id, material_ids, recurrencia) in self.recurrentes.items():
+            usa = lugar_id == recurso_id if recurso == 'lugar' else recurso_id in material_ids
+            if usa and evento_id != exclude:
+                yield evento_id, inicio, fin, recurrencia
+
+    def conflicts(self, fecha, duracion, lugar_id=None, material_ids=(), exclude=None, recurrencia=''):
+        """
+        Eventos que ya ocupan el lugar o alguno de los materiales en ese horario
+        (el primer choque de cada evento y recurso)
+        """
+        inicio, fin = intervalo(fecha, duracion)
+        if recurrencia:
+            horizonte = inicio + timedelta(days=settings.SCHEDULING_RECURRENCE_HORIZON_DAYS)
+            franjas = _repeticiones(recurrencia, inicio, fin, inicio, horizonte)
+        else:
+            franjas = [(inicio, fin)]
+        # Misma duración y en orden: la franja que más tarde acaba es la última
+        desde, hasta = franjas[0][0], franjas[-1][1]
+        inicios = [start for start, _ in franjas]
+
+        recursos = [('lugar', self.lugares, lugar_id)] if lugar_id else []
+        recursos += [('material', self.materiales, material_id) for material_id in material_ids]
+        conflictos = {}
+        with self._lock:
+            for recurso, indices, recurso_id in recursos:
+                ocupados = []
+                index = indices.get(recurso_id)
+                if index:
+                    for franja_inicio, franja_fin in franjas:
+                        ocupados += index.overlapping(franja_inicio, franja_fin, exclude=exclude)
+                for evento_id, r_inicio, r_fin, regla in self._recurrentes_de(recurso, recurso_id, exclude):
+                    for start, end in _repeticiones(regla, r_inicio, r_fin, desde, hasta):
+                        # La franja que empieza justo antes de `end` es la que más tarde acaba de las candidatas
+                        pos = bisect.bisect_left(inicios, end)
+                        if pos and franjas[pos - 1][1] > start:
+                            ocupados.append((evento_id, start, end))
+                            break
+                for evento_id, start, end in ocupados:
+                    conflictos.setdefault((recurso, recurso_id, evento_id),
+                                          Conflicto(recurso, recurso_id, evento_id, start, end))
+        return list(conflictos.values())
+
+    def free_slots(self, lugar_id, desde, hasta, duracion_minima=None):
+        """Huecos [inicio, fin) del lugar entre desde y hasta, de al menos duracion_minima"""
+        desde, hasta = _naive(desde), _naive(hasta)
+        duracion_minima = duracion_minima or timedelta(0)
+        with self._lock:
+            index = self.lugares.get(lugar_id)
+            intervalos = [(start, end) for _, start, end in index.overlapping(desde, hasta)] if index else []
+            for _, inicio, fin, regla in self._recurrentes_de('lugar', lugar_id):
+                intervalos += _repeticiones(regla, inicio, fin, desde, hasta)
+        ocupados = _unir(sorted(intervalos), desde, hasta)
+        huecos = []
+        cursor = desde
+        for start, end in ocupados + [(hasta, hasta)]:
+            if start - cursor >= duracion_minima and start > cursor:
+                huecos.append((cursor, start))
+            cursor = max(cursor, end)
+        return huecos
+
+
+def get_agenda(asociacion):
+    asociacion_id = getattr(asociacion, 'pk', asociacion)
+    with _agendas_lock:
+        agenda = _agendas.get(asociacion_id)
+        if agenda is None or agenda.expired:
+            agenda = Agenda(asociacion_id).load()
+            _agendas[asociacion_id] = agenda
+    return agenda
+
+
+def _loaded_agenda(asociacion_id):
+    """La agenda ya construida de la asociación; si no la hay, la primera consulta leerá la tabla"""
+    agenda = _agendas.get(asociacion_id)
+    return agenda if agenda is not None and not agenda.expired else None
+
+
+def registrar(evento):
+    """Actualiza la agenda tras crear o editar un evento (lee sus materiales)"""
+    agenda = _loaded_agenda(evento.asociacion_id)
+    if agenda is not None:
+        material_ids = list(evento.materiales_utilizados.values_list('id', flat=True)) if evento.pk else []
+        agenda.put(evento.pk, evento.fecha, evento.duracion, evento.lugar_id, material_ids, evento.recurrencia)
+
+
+def olvidar(asociacion_id, evento_id):
+    agenda = _loaded_agenda(asociacion_id)
+    if agenda is not None:
+        agenda.discard(evento_id)
+
+
+def clear_agendas():
+    with _agendas_lock:
+        _agendas.clear()
+
+
+def evento_saved(sender, instance, **kwargs):
+    registrar(instance)
+
+
+def evento_deleted(sender, instance, **kwargs):
+    olvidar(instance.asociacion_id, instance.pk)
+
+
+def materiales_changed(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # Desde el material (material.eventos.add(...)): se reconstruye la próxima vez
+        with _agendas_lock:
+            _agendas.pop(instance.asociacion_id, None)
+    else:
+        registrar(instance)
@@ -1,3 +1,212 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from core.models import AsociacionVecinal
+from entidades.models import Material
+from proyectos.models import Proyecto
+from . import ics
+from .forms import EventoForm
+from .models import Evento, Lugar
+from .scheduling import Agenda, IntervalIndex, clear_agendas
+
+HORA = timedelta(hours=1)
+MEDIA_HORA = timedelta(minutes=30)
+LUNES = datetime(2026, 5, 4, 10, 0)
+
+
+class IntervalIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = IntervalIndex()
+        self.index.add(1, LUNES, LUNES + HORA)
+
+    def test_touching_intervals_do_not_overlap(self):
+        self.assertEqual(self.index.overlapping(LUNES + HORA, LUNES + 2 * HORA), [])
+        self.assertEqual(self.index.overlapping(LUNES - HORA, LUNES), [])
+        self.assertEqual(self.index.overlapping(LUNES + HORA - timedelta(minutes=1), LUNES + 2 * HORA),
+                         [(1, LUNES, LUNES + HORA)])
+
+    def test_exclude_skips_the_event_being_edited(self):
+        self.assertEqual(self.index.overlapping(LUNES, LUNES + HORA, exclude=1), [])
+
+    def test_removing_the_longest_interval_keeps_finding_the_others(self):
+        # Un evento de un día entero ensancha la ventana de búsqueda; al quitarlo, la ventana
+        # no se estrecha, pero ni él sale ya ni se pierde el de una hora que empieza antes
+        self.index.add(2, LUNES - 3 * HORA, LUNES + 21 * HORA)
+        self.index.remove(2, LUNES - 3 * HORA)
+
+        self.assertEqual(self.index.overlapping(LUNES + MEDIA_HORA, LUNES + 2 * HORA),
+                         [(1, LUNES, LUNES + HORA)])
+        self.assertEqual(self.index.overlapping(LUNES + 5 * HORA, LUNES + 6 * HORA), [])
+        self.assertEqual(len(self.index), 1)
+
+
+class FreeSlotsTests(SimpleTestCase):
+    def setUp(self):
+        self.agenda = Agenda(1)
+        self.agenda.put(1, LUNES, HORA, lugar_id=7)
+        self.agenda.put(2, LUNES + 3 * HORA, HORA, lugar_id=7)
+
+    def test_busy_intervals_at_the_edges_leave_no_slot(self):
+        # Rango que empieza y acaba dentro de una reserva
+        desde, hasta = LUNES + MEDIA_HORA, LUNES + 3 * HORA + MEDIA_HORA
+        self.assertEqual(self.agenda.free_slots(7, desde, hasta), [(LUNES + HORA, LUNES + 3 * HORA)])
+
+    def test_free_edges_and_minimum_duration(self):
+        desde, hasta = LUNES - HORA, LUNES + 5 * HORA
+        self.assertEqual(self.agenda.free_slots(7, desde, hasta), [
+            (LUNES - HORA, LUNES), (LUNES + HORA, LUNES + 3 * HORA), (LUNES + 4 * HORA, LUNES + 5 * HORA),
+        ])
+        self.assertEqual(self.agenda.free_slots(7, desde, hasta, duracion_minima=2 * HORA),
+                         [(LUNES + HORA, LUNES + 3 * HORA)])
+
+    def test_unknown_lugar_is_free_all_the_range(self):
+        self.assertEqual(self.agenda.free_slots(8, LUNES, LUNES + HORA), [(LUNES, LUNES + HORA)])
+
+    def test_recurring_evento_blocks_each_occurrence(self):
+        agenda = Agenda(1)
+        agenda.put(3, LUNES, HORA, lugar_id=7, recurrencia='FREQ=DAILY')
+        siguiente = LUNES + timedelta(days=2)
+        self.assertEqual(agenda.free_slots(7, siguiente - HORA, siguiente + 2 * HORA),
+                         [(siguiente - HORA, siguiente), (siguiente + HORA, siguiente + 2 * HORA)])
+
+
+class EventoFormReservasTests(TestCase):
+    def setUp(self):
+        clear_agendas()
+        self.addCleanup(clear_agendas)
+        self.asociacion = AsociacionVecinal.objects.create(nombre="AV Pruebas", numero_registro="REG-AGENDA")
+        self.lugar = Lugar.objects.create(asociacion=self.asociacion, nombre="Centro Cívico")
+        self.material = Material.objects.create(asociacion=self.asociacion, nombre="Proyector")
+        # Hora local sin zona, como la guarda el backend (el ORM la lee como UTC)
+        evento = Evento.objects.create(asociacion=self.asociacion, nombre="Asamblea", lugar=self.lugar,
+                                       fecha=LUNES.replace(tzinfo=dt_timezone.utc), duracion=2 * HORA)
+        evento.materiales_utilizados.add(self.material)
+
+    def _form(self, hora, **data):
+        return EventoForm({
+            'nombre': "Taller", 'fecha_dia': '2026-05-04', 'hora': hora, 'minutos': '00',
+            'duracion_cantidad': 1, 'duracion_unidad': 'hours', **data,
+        }, asociacion=self.asociacion)
+
+    def test_rejects_a_double_booked_lugar_or_material(self):
+        form = self._form('11', lugar=self.lugar.pk)
+        self.assertFalse(form.is_valid())
+        self.assertIn("Asamblea", form.errors['lugar'][0])
+
+        form = self._form('11', materiales_utilizados=[self.material.pk])
+        self.assertFalse(form.is_valid())
+        self.assertIn("Asamblea", form.errors['materiales_utilizados'][0])
+
+    def test_accepts_the_slot_right_after(self):
+        form = self._form('12', lugar=self.lugar.pk, materiales_utilizados=[self.material.pk])
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_checks_every_occurrence_of_a_weekly_evento(self):
+        Evento.objects.create(asociacion=self.asociacion, nombre="Yoga", lugar=self.lugar,
+                              fecha=(LUNES + 7 * HORA).replace(tzinfo=dt_timezone.utc), duracion=HORA,
+                              recurrencia='FREQ=WEEKLY')
+
+        # Tres semanas después, a la misma hora
+        form = self._form('17', fecha_dia='2026-05-25', lugar=self.lugar.pk)
+        self.assertFalse(form.is_valid())
+        self.assertIn("Yoga", form.errors['lugar'][0])
+
+        form = self._form('18', fecha_dia='2026-05-25', lugar=self.lugar.pk)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_a_weekly_evento_is_checked_against_its_later_occurrences(self):
+        # La asamblea es el lunes 4; una serie semanal que empieza el 27 de abril choca en su segunda sesión
+        form = self._form('10', fecha_dia='2026-04-27', lugar=self.lugar.pk, recurrencia='FREQ=WEEKLY')
+        self.assertFalse(form.is_valid())
+        self.assertIn("04/05/2026", form.errors['lugar'][0])
+
+        form = self._form('10', fecha_dia='2026-04-27', lugar=self.lugar.pk, recurrencia='FREQ=WEEKLY;COUNT=1')
+        self.assertTrue(form.is_valid(), form.errors)
+
+
+class CalendarioIcsTests(TestCase):
+    def setUp(self):
+        self.asociacion = AsociacionVecinal.objects.create(nombre="AV Pruebas", numero_registro="REG-ICS")
+        self.evento = Evento.objects.create(asociacion=self.asociacion, nombre="Asamblea",
+                                            fecha=LUNES.replace(tzinfo=dt_timezone.utc), duracion=2 * HORA)
+        Evento.objects.create(asociacion=self.asociacion, nombre="Yoga",
+                              fecha=(LUNES + 7 * HORA).replace(tzinfo=dt_timezone.utc), duracion=HORA,
+                              recurrencia='FREQ=WEEKLY')
+        self.url = reverse('eventos:calendario_ics', args=[ics.feed_token(self.asociacion)])
+
+    def _get(self, url=None, **extra):
+        return self.client.get(url or self.url, **extra)
+
+    def test_serves_the_calendar(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.getvalue().decode()
+        self.assertIn('SUMMARY:Asamblea\r\n', body)
+        self.assertIn('DTSTART:20260504T100000\r\n', body)
+        self.assertIn('RRULE:FREQ=WEEKLY\r\n', body)
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+
+    def test_bad_or_tampered_token_is_not_found(self):
+        token = ics.feed_token(self.asociacion)
+        otra = AsociacionVecinal.objects.create(nombre="AV Otra", numero_registro="REG-ICS-2")
+        manipulado = f"{otra.pk}:{token.partition(':')[2]}"
+        for token in ('no-vale', manipulado):
+            with self.subTest(token=token):
+                url = reverse('eventos:calendario_ics', args=[token])
+                self.assertEqual(self._get(url).status_code, 404)
+
+    def test_proyecto_of_another_asociacion_is_not_found(self):
+        otra = AsociacionVecinal.objects.create(nombre="AV Otra", numero_registro="REG-ICS-2")
+        ajeno = Proyecto.objects.create(asociacion=otra, nombre="Huerto", fecha_inicio=date(2026, 5, 1))
+        propio = Proyecto.objects.create(asociacion=self.asociacion, nombre="Fiestas", fecha_inicio=date(2026, 5, 1))
+        Evento.objects.filter(pk=self.evento.pk).update(proyecto=propio)
+
+        self.assertEqual(self._get(f'{self.url}?proyecto={ajeno.pk}').status_code, 404)
+        self.assertEqual(self._get(f'{self.url}?proyecto=huerto').status_code, 404)
+        response = self._get(f'{self.url}?proyecto={propio.pk}')
+        self.assertEqual(response.status_code, 200)
+        body = response.getvalue().decode()
+        self.assertIn('Asamblea', body)
+        self.assertNotIn('Yoga', body)
+
+    def test_not_modified_with_matching_validators(self):
+        response = self._get()
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self._get(HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH='W/"otro"').status_code, 200)
+        self.assertEqual(self._get(HTTP_IF_MODIFIED_SINCE=http_date(0)).status_code, 200)
+
+    def test_etag_changes_on_edit_and_delete(self):
+        antes = self._get()['ETag']
+
+        self.evento.nombre = "Asamblea general"
+        self.evento.save()
+        editado = self._get(HTTP_IF_NONE_MATCH=antes)
+        self.assertEqual(editado.status_code, 200)
+        self.assertNotEqual(editado['ETag'], antes)
+
+        # Borrar un evento que no es el último modificado solo cambia el número de eventos
+        Evento.objects.exclude(pk=self.evento.pk).delete()
+        borrado = self._get(HTTP_IF_NONE_MATCH=editado['ETag'])
+        self.assertEqual(borrado.status_code, 200)
+        self.assertNotEqual(borrado['ETag'], editado['ETag'])
+
+
+class FoldTests(SimpleTestCase):
+    def test_short_lines_are_left_alone(self):
+        self.assertEqual(ics._fold('SUMMARY:Asamblea'), 'SUMMARY:Asamblea\r\n')
+
+    def test_long_lines_split_at_75_octets_without_breaking_characters(self):
+        line = 'DESCRIPTION:' + 'ñ' * 100
+        folded = ics._fold(line)
+
+        partes = folded[:-2].split('\r\n')
+        self.assertTrue(all(len(parte.encode('utf-8')) <= 75 for parte in partes))
+        self.assertTrue(all(parte.startswith(' ') for parte in partes[1:]))
+        # Deshacer el plegado devuelve la línea original
+        self.assertEqual(''.join([partes[0]] + [parte[1:] for parte in partes[1:]]), line)
+        self.assertEqual(len(partes[0].encode('utf-8')), 74)
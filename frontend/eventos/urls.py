@@ -9,6 +9,8 @@ app_name = 'eventos'
 urlpatterns = [
     # Lista de eventos/actividades
     path('', views.list_eventos, name='list'),
+    path('calendario/', views.calendario, name='calendario'),
+    path('calendario/<str:token>/actividades.ics', views.calendario_ics, name='calendario_ics'),
 
     # CRUD para admins
     path('crear/', views.create_evento, name='create'),
@@ -17,7 +19,10 @@ urlpatterns = [
 
     # Mapas (funcionalidad separada)
     path('mapas/', views.mapas, name='mapas'),
+    path('mapas/geo/', views.mapas_geo, name='mapas_geo'),
 
     # API Proxy
     path('api/lugares/buscar/', views.search_lugares, name='search_lugares'),
+    path('api/lugares/sugeridos/', views.lugares_sugeridos, name='lugares_sugeridos'),
+    path('api/lugares/<int:pk>/huecos/', views.huecos_lugar, name='huecos_lugar'),
 ]
\ No newline at end of file
@@ -5,13 +5,67 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+from django.utils.dateparse import parse_duration
 from users.utils import association_required, is_association_admin
 from .forms import EventoForm
-from .models import Evento
+from .models import Evento, Lugar
+from . import ics, scheduling
 from core.api import get_client
+from core import cache
+from core.recurrence import describe, expand
+from datetime import date, datetime, time, timedelta
 import requests
 
+# Rango máximo de la consulta de huecos libres de un lugar
+MAX_HUECOS_DIAS = 92
+
+# El calendario también pide los eventos que empezaron hasta una semana antes
+# de la primera casilla: pueden seguir en curso al empezar la vista
+CALENDARIO_MARGEN = timedelta(days=7)
+
+
+def _guardar_reservas(evento_id, materiales):
+    """
+    El backend no conoce los materiales: se guardan con el ORM y se actualiza
+    la agenda de reservas (eventos.scheduling) con el evento ya escrito.
+    """
+    evento = Evento.objects.filter(pk=evento_id).first()
+    if evento is not None:
+        evento.materiales_utilizados.set(materiales)
+        scheduling.registrar(evento)
+
+
+def _ocurrencias(evento_data, desde, hasta):
+    """Inicios de un evento de la API (y de sus repeticiones) dentro de [desde, hasta)"""
+    try:
+        fecha = datetime.fromisoformat(evento_data['fecha'])
+    except (KeyError, TypeError, ValueError):
+        return ()
+    # El backend serializa la duración en ISO 8601 ('PT1H30M')
+    duracion = evento_data.get('duracion')
+    if isinstance(duracion, (int, float)):
+        duracion = timedelta(seconds=duracion)
+    elif isinstance(duracion, str):
+        duracion = parse_duration(duracion)
+    try:
+        return expand(evento_data.get('recurrencia') or '', fecha, desde, hasta, duracion)
+    except ValueError:
+        # Regla guardada antes de validarse (o por otro cliente): se muestra solo la fecha del evento
+        return expand('', fecha, desde, hasta, duracion)
+
+
+def _ventana_anual(year):
+    try:
+        inicio = datetime(int(year), 1, 1)
+    except ValueError:
+        return None
+    return inicio, inicio.replace(year=inicio.year + 1)
+
 @login_required
 @association_required
 def list_eventos(request):
@@ -25,9 +79,13 @@ def list_eventos(request):
     order = request.GET.get('order', 'fecha')
     page_number = request.GET.get('page', 1)
 
-    # Obtener eventos de la API
+    # Obtener eventos de la API: con un año, solo los de ese año y los que se repiten
+    params = {'asociacion_id': asociacion_id}
+    ventana = _ventana_anual(year) if year else None
+    if ventana:
+        params.update(desde=ventana[0].isoformat(), hasta=ventana[1].isoformat())
     try:
-        eventos_data = client.get("/eventos/", params={'asociacion_id': asociacion_id}) or []
+        eventos_data = client.get_cached("/eventos/", params=params) or []
     except requests.RequestException as e:
         messages.error(request, f"Error al conectar con el servidor: {str(e)}")
         eventos_data = []
@@ -45,12 +103,16 @@ def list_eventos(request):
                     search_lower in e.get('colaboradores', '').lower()):
                 continue
 
-        # Filtro año
-        if year:
+        # Filtro año: un evento que se repite aparece si alguna repetición cae en el año
+        if ventana:
+            if not _ocurrencias(e, *ventana):
+                continue
+        elif year:
             fecha_str = e.get('fecha')
             if fecha_str and not fecha_str.startswith(year):
                 continue
 
+        e['repeticion'] = describe(e.get('recurrencia'))
         filtered_eventos.append(e)
 
     # Ordenamiento
@@ -77,8 +139,17 @@ def list_eventos(request):
     # Estadísticas
     total_eventos = len(eventos_data)
 
-    # Años disponibles
-    years = sorted(list(set(e.get('fecha')[:4] for e in eventos_data if e.get('fecha'))), reverse=True)
+    # Años disponibles (de todos los eventos, no solo los del año filtrado)
+    def _years():
+        todos = eventos_data
+        if ventana:
+            try:
+                todos = client.get_cached("/eventos/", params={'asociacion_id': asociacion_id}) or []
+            except requests.RequestException:
+                todos = eventos_data
+        return sorted(list(set(e.get('fecha')[:4] for e in todos if e.get('fecha'))), reverse=True)
+
+    years = cache.get_or_set(asociacion_id, 'eventos', 'facets:years', _years) if eventos_data else []
 
     context = {
         'section': 'actividades',
@@ -114,13 +185,15 @@ def create_evento(request):
                 "descripcion": data['descripcion'],
                 "lugar_nombre": data['lugar_nombre'],
                 "lugar_direccion": data['lugar_direccion'],
+                "lugar_id": data['lugar'].id if data.get('lugar') else None,
                 "fecha": data['fecha'].isoformat() if data['fecha'] else None,
                 "duracion": str(data['duracion']) if data['duracion'] else None,
                 "colaboradores": data['colaboradores'],
                 "observaciones": data['observaciones'],
                 "asociacion_id": request.user.profile.asociacion.id,
                 "responsable_id": data['responsable'].id if data['responsable'] else None,
-                "proyecto_id": data['proyecto'].id if data.get('proyecto') else None
+                "proyecto_id": data['proyecto'].id if data.get('proyecto') else None,
+                "recurrencia": data['recurrencia']
             }
 
             # Ajuste para duracion
@@ -129,7 +202,8 @@ def create_evento(request):
 
             client = get_client(request)
             try:
-                client.post("/eventos/", data=payload)
+                creado = client.post("/eventos/", data=payload)
+                _guardar_reservas(creado['id'], data['materiales_utilizados'])
                 messages.success(request, f"Evento {data['nombre']} creado exitosamente.")
                 return redirect('eventos:list')
             except requests.RequestException as e:
@@ -188,8 +262,10 @@ def update_evento(request, pk):
         descripcion=evento_data['descripcion'],
         lugar_nombre=evento_data.get('lugar_nombre'),
         lugar_direccion=evento_data.get('lugar_direccion'),
+        lugar_id=evento_data.get('lugar_id'),
         colaboradores=evento_data['colaboradores'],
         observaciones=evento_data['observaciones'],
+        recurrencia=evento_data.get('recurrencia') or '',
         asociacion_id=evento_data['asociacion_id'],
         responsable=responsable_obj,
         proyecto=proyecto_obj
@@ -214,16 +290,19 @@ def update_evento(request, pk):
                 "descripcion": data['descripcion'],
                 "lugar_nombre": data['lugar_nombre'],
                 "lugar_direccion": data['lugar_direccion'],
+                "lugar_id": data['lugar'].id if data.get('lugar') else None,
                 "fecha": data['fecha'].isoformat() if data['fecha'] else None,
                 "duracion": data['duracion'].total_seconds() if data['duracion'] else None,
                 "colaboradores": data['colaboradores'],
                 "observaciones": data['observaciones'],
                 "responsable_id": data['responsable'].id if data['responsable'] else None,
-                "proyecto_id": data['proyecto'].id if data.get('proyecto') else None
+                "proyecto_id": data['proyecto'].id if data.get('proyecto') else None,
+                "recurrencia": data['recurrencia']
             }
 
             try:
                 client.put(f"/eventos/{pk}", data=payload)
+                _guardar_reservas(pk, data['materiales_utilizados'])
                 messages.success(request, f"Evento {data['nombre']} actualizado.")
                 return redirect('eventos:list')
             except requests.RequestException as e:
@@ -260,6 +339,7 @@ def delete_evento(request, pk):
     if request.method == 'POST':
         try:
             client.delete(f"/eventos/{pk}")
+            scheduling.olvidar(request.user.profile.asociacion.id, pk)
             messages.success(request, "Evento eliminado.")
             return redirect('eventos:list')
         except requests.RequestException as e:
@@ -276,15 +356,175 @@ def delete_evento(request, pk):
     }
     return render(request, 'actividades/delete.html', context)
 
+@login_required
+@association_required
+def calendario(request):
+    """
+    Calendario mensual: eventos y sesiones de proyectos con sus repeticiones.
+    Al backend solo se le piden las semanas visibles; las repeticiones se
+    expanden aquí (core.recurrence) sin generar la serie completa.
+    """
+    asociacion_id = request.user.profile.asociacion.id
+    client = get_client(request)
+
+    try:
+        mes = datetime.strptime(request.GET.get('mes', ''), '%Y-%m').date()
+    except ValueError:
+        mes = date.today().replace(day=1)
+    siguiente = (mes.replace(day=28) + timedelta(days=4)).replace(day=1)
+    anterior = (mes - timedelta(days=1)).replace(day=1)
+
+    # Rejilla de semanas completas, de lunes a domingo
+    primer_dia = mes - timedelta(days=mes.weekday())
+    fin = siguiente + timedelta(days=(7 - siguiente.weekday()) % 7)
+    desde, hasta = datetime.combine(primer_dia, time.min), datetime.combine(fin, time.min)
+
+    try:
+        eventos_data = client.get_cached("/eventos/", params={
+            'asociacion_id': asociacion_id,
+            'desde': (desde - CALENDARIO_MARGEN).isoformat(),
+            'hasta': hasta.isoformat(),
+        }) or []
+        proyectos_data = client.get_cached("/proyectos/", params={
+            'asociacion_id': asociacion_id,
+            'desde': primer_dia.isoformat(),
+            'hasta': fin.isoformat(),
+        }) or []
+    except requests.RequestException as e:
+        messages.error(request, f"Error al conectar con el servidor: {str(e)}")
+        eventos_data, proyectos_data = [], []
+
+    por_dia = {}
+    for e in eventos_data:
+        for inicio in _ocurrencias(e, desde, hasta):
+            # Un evento que empezó antes de la vista se muestra en la primera casilla
+            por_dia.setdefault(max(inicio, desde).date(), []).append({
+                'tipo': 'evento',
+                'id': e['id'],
+                'nombre': e['nombre'],
+                'inicio': inicio,
+                'repeticion': describe(e.get('recurrencia')),
+            })
+    for p in proyectos_data:
+        if not p.get('recurrencia'):
+            continue
+        try:
+            fecha_inicio = date.fromisoformat(p['fecha_inicio'])
+            fecha_final = date.fromisoformat(p['fecha_final']) if p.get('fecha_final') else None
+            sesiones = expand(p['recurrencia'], fecha_inicio, desde, hasta, until=fecha_final)
+        except (KeyError, TypeError, ValueError):
+            continue
+        for inicio in sesiones:
+            por_dia.setdefault(inicio.date(), []).append({
+                'tipo': 'proyecto',
+                'id': p['id'],
+                'nombre': p['nombre'],
+                'inicio': inicio,
+                'repeticion': describe(p['recurrencia']),
+            })
+
+    semanas = []
+    dia = primer_dia
+    while dia < fin:
+        semana = []
+        for _ in range(7):
+            entradas = sorted(por_dia.get(dia, []), key=lambda entrada: entrada['inicio'])
+            semana.append({'fecha': dia, 'del_mes': dia.month == mes.month, 'entradas': entradas})
+            dia += timedelta(days=1)
+        semanas.append(semana)
+
+    context = {
+        'section': 'actividades',
+        'asociacion': request.user.profile.asociacion,
+        'is_admin': is_association_admin(request.user),
+        'mes': mes,
+        'mes_anterior': anterior.strftime('%Y-%m'),
+        'mes_siguiente': siguiente.strftime('%Y-%m'),
+        'hoy': date.today(),
+        'semanas': semanas,
+        'dias_semana': ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom'],
+        'ics_url': request.build_absolute_uri(
+            reverse('eventos:calendario_ics', args=[ics.feed_token(asociacion_id)])
+        ),
+    }
+    return render(request, 'actividades/calendario.html', context)
+
+def _ics_state(request, token):
+    # condition() pide el ETag y el Last-Modified por separado: una sola consulta por petición
+    if not hasattr(request, '_ics_state'):
+        request._ics_state = ics.feed_state(token, request.GET.get('proyecto'))
+    return request._ics_state
+
+
+def _ics_etag(request, token):
+    state = _ics_state(request, token)
+    return ics.etag(state) if state else None
+
+
+def _ics_last_modified(request, token):
+    state = _ics_state(request, token)
+    return state.ultima_modificacion if state else None
+
+
+@require_safe
+@cache_control(private=True, max_age=settings.ICS_MAX_AGE)
+@condition(etag_func=_ics_etag, last_modified_func=_ics_last_modified)
+def calendario_ics(request, token):
+    """
+    Calendario .ics para suscribirse desde el móvil. Sin sesión: el token de la
+    URL identifica la asociación. Si no ha cambiado nada desde la última
+    consulta (If-None-Match / If-Modified-Since), condition() responde 304.
+    """
+    state = _ics_state(request, token)
+    if state is None:
+        raise Http404("Calendario no encontrado")
+    response = StreamingHttpResponse(
+        ics.serialize(state, request.get_host()),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'inline; filename="actividades.ics"'
+    return response
+
 @association_required
 def mapas(request):
     """Vista de mapas del barrio"""
     context = {
         'section': 'mapas',
         'asociacion': request.user.profile.asociacion,
+        'is_admin': is_association_admin(request.user),
     }
     return render(request, 'mapas/viewer.html', context)
 
+# Capas del mapa; la de socias (domicilios) solo para administradoras
+MAP_LAYERS = ('lugares', 'eventos', 'socias')
+
+@login_required
+@association_required
+def mapas_geo(request):
+    """Proxy del GeoJSON del mapa (backend /geo): puntos y clusters de la asociación en el bbox"""
+    layers = [layer for layer in request.GET.get('layers', '').split(',') if layer in MAP_LAYERS]
+    if 'socias' in layers and not is_association_admin(request.user):
+        layers.remove('socias')
+    if not layers:
+        return JsonResponse({'type': 'FeatureCollection', 'features': []})
+
+    params = {
+        'asociacion_id': request.user.profile.asociacion.id,
+        'bbox': request.GET.get('bbox', ''),
+        'zoom': request.GET.get('zoom', ''),
+        'layers': ','.join(layers),
+    }
+    try:
+        data = get_client(request).get('/geo', params=params)
+    except requests.RequestException as e:
+        error = getattr(e, 'api_error', None) or {}
+        status = 400 if getattr(e.response, 'status_code', None) in (400, 422) else 502
+        return JsonResponse({'error': error.get('detail', 'No se pudo cargar el mapa')}, status=status)
+    response = JsonResponse(data)
+    # Mismo tiempo que la caché de teselas del backend
+    response['Cache-Control'] = 'private, max-age=60'
+    return response
+
 @login_required
 @association_required
 def search_lugares(request):
@@ -301,3 +541,41 @@ def search_lugares(request):
         return JsonResponse(lugares or [], safe=False)
     except requests.RequestException:
         return JsonResponse([], safe=False)
+
+@login_required
+@association_required
+def lugares_sugeridos(request):
+    """Proxy: lugares más cercanos, de media, a las socias participantes (backend /geo/lugares-sugeridos)"""
+    socias = [socia_id for socia_id in request.GET.getlist('socias') if socia_id.isdigit()]
+    if not socias:
+        return JsonResponse([], safe=False)
+
+    client = get_client(request)
+    params = {'asociacion_id': request.user.profile.asociacion.id, 'socias': socias, 'k': 5}
+    try:
+        lugares = client.get("/geo/lugares-sugeridos", params=params)
+        return JsonResponse(lugares or [], safe=False)
+    except requests.RequestException:
+        return JsonResponse([], safe=False)
+
+@login_required
+@association_required
+def huecos_lugar(request, pk):
+    """Huecos libres de un lugar entre ?desde= y ?hasta= (ISO), de al menos ?minutos="""
+    asociacion = request.user.profile.asociacion
+    try:
+        desde = datetime.fromisoformat(request.GET['desde'])
+        hasta = datetime.fromisoformat(request.GET['hasta'])
+        minutos = int(request.GET.get('minutos', 0))
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Indica desde y hasta en formato ISO (2025-03-01T10:00)'}, status=400)
+    if not desde < hasta <= desde + timedelta(days=MAX_HUECOS_DIAS):
+        return JsonResponse({'error': f'El rango debe ser positivo y de como mucho {MAX_HUECOS_DIAS} días'}, status=400)
+    if not Lugar.objects.filter(pk=pk, asociacion=asociacion).exists():
+        return JsonResponse({'error': 'Lugar no encontrado'}, status=404)
+
+    huecos = scheduling.get_agenda(asociacion).free_slots(pk, desde, hasta, timedelta(minutes=max(minutos, 0)))
+    return JsonResponse({
+        'lugar_id': pk,
+        'huecos': [{'inicio': inicio.isoformat(), 'fin': fin.isoformat()} for inicio, fin in huecos],
+    })
@@ -1,5 +1,9 @@
 from django import forms
 from .models import Transaccion
+from eventos.models import Evento
+from proyectos.models import Proyecto
+from socias.models import Socia
+from core.autocomplete import AutocompleteSelect
 
 class TransaccionForm(forms.ModelForm):
     class Meta:
@@ -16,7 +20,15 @@ class TransaccionForm(forms.ModelForm):
             'cantidad': forms.NumberInput(attrs={'step': '0.01', 'class': 'form-control'}),
             'concepto': forms.TextInput(attrs={'class': 'form-control'}),
             'entidad': forms.TextInput(attrs={'class': 'form-control'}),
-            'evento': forms.Select(attrs={'class': 'form-select'}),
-            'proyecto': forms.Select(attrs={'class': 'form-select'}),
-            'socia': forms.Select(attrs={'class': 'form-select'}),
+            'evento': AutocompleteSelect('eventos', attrs={'class': 'form-select'}),
+            'proyecto': AutocompleteSelect('proyectos', attrs={'class': 'form-select'}),
+            'socia': AutocompleteSelect('socias', attrs={'class': 'form-select'}),
         }
+
+    def __init__(self, *args, **kwargs):
+        self.asociacion = kwargs.pop('asociacion', None)
+        super().__init__(*args, **kwargs)
+        if self.asociacion:
+            self.fields['evento'].queryset = Evento.objects.filter(asociacion=self.asociacion)
+            self.fields['proyecto'].queryset = Proyecto.objects.filter(asociacion=self.asociacion)
+            self.fields['socia'].queryset = Socia.objects.filter(asociacion=self.asociacion)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finanzas', '0003_transaccion_proyecto_transaccion_socia'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaccion',
+            name='adjunto_sha256',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -63,6 +63,9 @@ class Transaccion(models.Model):
     drive_file_link = models.URLField(blank=True, null=True)
     drive_file_name = models.CharField(max_length=255, blank=True, null=True)
 
+    # Almacén local de adjuntos (clave SHA-256, deduplicado)
+    adjunto_sha256 = models.CharField(max_length=64, blank=True, null=True)
+
     # Metadatos
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -16,9 +16,28 @@ import requests
 
 from users.utils import is_association_admin, association_required
 from core.api import get_client
+from core import cache
+from core.reporting import reporting_view
+from .charts import parse_transacciones, filter_transacciones, build_chart_data
 from .forms import TransaccionForm
 from .models import Transaccion # Import needed for Form but not for querying
 
+def _read_comprobante(request):
+    """Lee el comprobante subido una sola vez (se reutiliza para el almacén y Drive)"""
+    uploaded_file = request.FILES.get('comprobante')
+    if not uploaded_file:
+        return None
+    return (uploaded_file.name, uploaded_file.read(), uploaded_file.content_type)
+
+def _store_adjunto(request, client, comprobante):
+    """Guarda el comprobante en el almacén de adjuntos y devuelve su SHA-256"""
+    try:
+        response = client.post('adjuntos/', files={'file': comprobante})
+        return response.get('sha256') if response else None
+    except requests.RequestException as e:
+        messages.warning(request, f"No se pudo generar la vista previa del comprobante: {str(e)}")
+        return None
+
 @login_required
 @association_required
 def list_transacciones(request):
@@ -35,47 +54,14 @@ def list_transacciones(request):
     page_number = request.GET.get('page', 1)
 
     try:
-        transacciones_data = client.get(f"finanzas/?asociacion_id={asociacion_id}") or []
+        transacciones_data = client.get_cached(f"finanzas/?asociacion_id={asociacion_id}") or []
     except requests.RequestException as e:
         messages.error(request, f"Error al conectar con el servidor: {str(e)}")
         transacciones_data = []
 
-    # Procesar datos (convertir fechas, números)
-    processed_transacciones = []
-    for t in transacciones_data:
-        try:
-            t['fecha_transaccion'] = datetime.strptime(t['fecha_transaccion'], '%Y-%m-%d').date()
-            t['cantidad'] = float(t['cantidad'])
-            processed_transacciones.append(t)
-        except (ValueError, TypeError):
-            continue
-
-    # Filtrado en memoria
-    filtered_transacciones = []
-    for t in processed_transacciones:
-        # Búsqueda
-        if search:
-            search_lower = search.lower()
-            if not (search_lower in t['concepto'].lower() or
-                    (t['descripcion'] and search_lower in t['descripcion'].lower()) or
-                    (t['entidad'] and search_lower in t['entidad'].lower())):
-                continue
-
-        # Tipo
-        if tipo == 'ingreso' and t['cantidad'] < 0:
-            continue
-        if tipo == 'gasto' and t['cantidad'] > 0:
-            continue
-
-        # Entidad
-        if entidad and entidad.lower() not in (t.get('entidad') or '').lower():
-            continue
-
-        # Año
-        if year and t['fecha_transaccion'].year != int(year):
-            continue
-
-        filtered_transacciones.append(t)
+    # Procesar datos (convertir fechas, números) y filtrar en memoria
+    processed_transacciones = parse_transacciones(transacciones_data)
+    filtered_transacciones = filter_transacciones(processed_transacciones, search, tipo, entidad, year)
 
     # Ordenamiento
     reverse = sort.startswith('-')
@@ -95,57 +81,16 @@ def list_transacciones(request):
     gastos_filtrados = sum(abs(t['cantidad']) for t in filtered_transacciones if t['cantidad'] < 0)
 
     # Listas para filtros
-    years_disponibles = sorted(list(set(t['fecha_transaccion'].year for t in processed_transacciones)), reverse=True)
-    entidades_disponibles = sorted(list(set(t['entidad'] for t in processed_transacciones if t.get('entidad'))))
-
-    # Gráficas
-    # Agrupar datos para gráficas (usando filtered_transacciones para reflejar filtros)
-    # Solo consideramos gastos para las gráficas de análisis de gastos
-    gastos_para_graficas = [t for t in filtered_transacciones if t['cantidad'] < 0]
-
-    # 1. Evolución Mensual
-    monthly_data = {}
-    for t in gastos_para_graficas:
-        month_key = t['fecha_transaccion'].strftime('%Y-%m')
-        monthly_data[month_key] = monthly_data.get(month_key, 0) + abs(t['cantidad'])
-
-    monthly_labels = sorted(monthly_data.keys())
-    monthly_values = [monthly_data[k] for k in monthly_labels]
-
-    # 2. Por Proyecto
-    project_data = {}
-    for t in gastos_para_graficas:
-        # Usamos ID como label temporalmente, idealmente sería el nombre
-        project_key = f"Proyecto {t['proyecto_id']}" if t['proyecto_id'] else "Sin Proyecto"
-        project_data[project_key] = project_data.get(project_key, 0) + abs(t['cantidad'])
-
-    project_labels = list(project_data.keys())
-    project_values = [project_data[k] for k in project_labels]
-
-    # 3. Por Entidad
-    entity_data = {}
-    for t in gastos_para_graficas:
-        entity_key = t['entidad'] or "Sin Entidad"
-        entity_data[entity_key] = entity_data.get(entity_key, 0) + abs(t['cantidad'])
-
-    entity_labels = list(entity_data.keys())
-    entity_values = [entity_data[k] for k in entity_labels]
-
-    # 4. Por Año (Nuevo)
-    annual_data = {}
-    for t in gastos_para_graficas:
-        year_key = str(t['fecha_transaccion'].year)
-        annual_data[year_key] = annual_data.get(year_key, 0) + abs(t['cantidad'])
-
-    annual_labels = sorted(annual_data.keys())
-    annual_values = [annual_data[k] for k in annual_labels]
-
-    chart_data = json.dumps({
-        'monthly': {'labels': monthly_labels, 'data': monthly_values},
-        'project': {'labels': project_labels, 'data': project_values},
-        'entity': {'labels': entity_labels, 'data': entity_values},
-        'annual': {'labels': annual_labels, 'data': annual_values}
-    })
+    years_disponibles, entidades_disponibles = cache.get_or_set(
+        asociacion_id, 'finanzas', 'facets:years_entidades',
+        lambda: (
+            sorted(list(set(t['fecha_transaccion'].year for t in processed_transacciones)), reverse=True),
+            sorted(list(set(t['entidad'] for t in processed_transacciones if t.get('entidad')))),
+        )
+    ) if processed_transacciones else ([], [])
+
+    # Gráficas (reflejan los filtros)
+    chart_data = json.dumps(build_chart_data(filtered_transacciones))
 
     context = {
         'section': 'contabilidad',
@@ -197,14 +142,18 @@ def create_transaccion(request):
             }
 
             client = get_client(request)
+            comprobante = _read_comprobante(request)
             try:
-                # 1. Crear transacción
+                # 1. Guardar comprobante en el almacén local (deduplicado)
+                if comprobante:
+                    payload['adjunto_sha256'] = _store_adjunto(request, client, comprobante)
+
+                # 2. Crear transacción
                 response = client.post("finanzas/", data=payload)
 
-                # 2. Subir archivo si existe
-                if 'comprobante' in request.FILES and response and 'id' in response:
-                    uploaded_file = request.FILES['comprobante']
-                    files = {'file': (uploaded_file.name, uploaded_file.read(), uploaded_file.content_type)}
+                # 3. Subir archivo a Drive si existe
+                if comprobante and response and 'id' in response:
+                    files = {'file': comprobante}
                     file_data = {
                         'asociacion_id': request.user.profile.asociacion.id,
                         'transaction_id': response['id']
@@ -253,6 +202,7 @@ def update_transaccion(request, pk):
         drive_file_id=t_data.get('drive_file_id'),
         drive_file_name=t_data.get('drive_file_name'),
         drive_file_link=t_data.get('drive_file_link'),
+        adjunto_sha256=t_data.get('adjunto_sha256'),
         asociacion_id=t_data['asociacion_id']
     )
     # Fechas
@@ -285,13 +235,16 @@ def update_transaccion(request, pk):
                 "socia_id": data['socia'].id if data['socia'] else None,
             }
 
+            comprobante = _read_comprobante(request)
             try:
+                if comprobante:
+                    payload['adjunto_sha256'] = _store_adjunto(request, client, comprobante)
+
                 client.put(f"finanzas/{pk}", data=payload)
 
-                # Subir archivo si existe
-                if 'comprobante' in request.FILES:
-                    uploaded_file = request.FILES['comprobante']
-                    files = {'file': (uploaded_file.name, uploaded_file.read(), uploaded_file.content_type)}
+                # Subir archivo a Drive si existe
+                if comprobante:
+                    files = {'file': comprobante}
                     file_data = {
                         'asociacion_id': request.user.profile.asociacion.id,
                         'transaction_id': pk
@@ -349,6 +302,7 @@ def delete_transaccion(request, pk):
 
 @login_required
 @association_required
+@reporting_view
 def download_report(request):
     """Descargar informe de transacciones en Excel"""
     asociacion_id = request.user.profile.asociacion.id
@@ -3,6 +3,7 @@ from .models import Proyecto
 from socias.models import Socia
 from entidades.models import Persona, Material
 from eventos.models import Lugar
+from core.autocomplete import AutocompleteSelect, AutocompleteSelectMultiple
 
 class ProyectoForm(forms.ModelForm):
     class Meta:
@@ -11,19 +12,20 @@ class ProyectoForm(forms.ModelForm):
             'nombre', 'responsable', 'descripcion',
             'socias_involucradas', 'personas_involucradas',
             'materiales_necesarios', 'lugar_fk',
-            'fecha_inicio', 'fecha_final', 'recursivo'
+            'fecha_inicio', 'fecha_final', 'recursivo', 'recurrencia'
         ]
         widgets = {
             'fecha_inicio': forms.DateInput(format='%Y-%m-%d', attrs={'type': 'date', 'class': 'form-control'}),
             'fecha_final': forms.DateInput(format='%Y-%m-%d', attrs={'type': 'date', 'class': 'form-control'}),
             'descripcion': forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
             'nombre': forms.TextInput(attrs={'class': 'form-control'}),
-            'responsable': forms.Select(attrs={'class': 'form-select'}),
-            'lugar_fk': forms.Select(attrs={'class': 'form-select'}),
+            'responsable': AutocompleteSelect('socias', attrs={'class': 'form-select'}),
+            'lugar_fk': AutocompleteSelect('lugares', attrs={'class': 'form-select', 'placeholder': 'Seleccionar lugar...'}),
             'recursivo': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
-            'socias_involucradas': forms.SelectMultiple(attrs={'class': 'form-select'}),
-            'personas_involucradas': forms.SelectMultiple(attrs={'class': 'form-select'}),
-            'materiales_necesarios': forms.SelectMultiple(attrs={'class': 'form-select'}),
+            'recurrencia': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Ej: FREQ=MONTHLY;BYDAY=1SA'}),
+            'socias_involucradas': AutocompleteSelectMultiple('socias', attrs={'class': 'form-select', 'placeholder': 'Seleccionar socias...'}),
+            'personas_involucradas': AutocompleteSelectMultiple('personas', attrs={'class': 'form-select', 'placeholder': 'Seleccionar personas externas...'}),
+            'materiales_necesarios': AutocompleteSelectMultiple('materiales', attrs={'class': 'form-select', 'placeholder': 'Seleccionar materiales...'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -36,3 +38,9 @@ class ProyectoForm(forms.ModelForm):
             self.fields['materiales_necesarios'].queryset = Material.objects.filter(asociacion=self.asociacion)
             self.fields['lugar_fk'].queryset = Lugar.objects.filter(asociacion=self.asociacion)
 
+    def clean(self):
+        cleaned_data = super().clean()
+        # Un proyecto con regla de repetición es recursivo
+        if cleaned_data.get('recurrencia'):
+            cleaned_data['recursivo'] = True
+        return cleaned_data
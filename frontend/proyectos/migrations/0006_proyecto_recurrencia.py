@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:19
+
+import core.recurrence
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0005_proyecto_nombre_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proyecto',
+            name='recurrencia',
+            field=models.CharField(blank=True, db_default='', default='', help_text='Regla de repetición (RRULE), ej: FREQ=WEEKLY;BYDAY=MO,WE. Vacío si no tiene calendario fijo', max_length=500, validators=[core.recurrence.validate_rrule]),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from core.models import AsociacionVecinal
+from core.recurrence import expand, validate_rrule
 
 
 class Proyecto(models.Model):
@@ -91,6 +92,16 @@ class Proyecto(models.Model):
         default=False,
         help_text="¿Es un proyecto que se repite periódicamente?"
     )
+    # Calendario de sesiones (core.recurrence): regla RRULE desde fecha_inicio
+    # hasta fecha_final; vacío = sin calendario fijo
+    recurrencia = models.CharField(
+        max_length=500,
+        blank=True,
+        default='',
+        db_default='',
+        validators=[validate_rrule],
+        help_text="Regla de repetición (RRULE), ej: FREQ=WEEKLY;BYDAY=MO,WE. Vacío si no tiene calendario fijo"
+    )
 
     # Metadatos
     fecha_creacion = models.DateTimeField(auto_now_add=True)
@@ -137,3 +148,9 @@ class Proyecto(models.Model):
     def get_absolute_url(self):
         from django.urls import reverse
         return reverse('proyectos:detail', kwargs={'pk': self.pk})
+
+    def ocurrencias(self, desde, hasta):
+        """Sesiones del proyecto en [desde, hasta); sin regla, ninguna"""
+        if not self.recurrencia:
+            return ()
+        return expand(self.recurrencia, self.fecha_inicio, desde, hasta, until=self.fecha_final)
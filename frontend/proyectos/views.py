@@ -12,6 +12,8 @@ import requests
 
 from users.utils import is_association_admin, association_required
 from core.api import get_client
+from core.recurrence import describe
+from eventos.ics import feed_token
 from .forms import ProyectoForm
 from .models import Proyecto # Import needed for Form
 
@@ -28,7 +30,7 @@ def list_proyectos(request):
     page_number = request.GET.get('page', 1)
 
     try:
-        proyectos_data = client.get(f"proyectos/?asociacion_id={asociacion_id}") or []
+        proyectos_data = client.get_cached(f"proyectos/?asociacion_id={asociacion_id}") or []
     except requests.RequestException as e:
         messages.error(request, f"Error al conectar con el servidor: {str(e)}")
         proyectos_data = []
@@ -42,6 +44,7 @@ def list_proyectos(request):
             p['fecha_inicio'] = datetime.strptime(p['fecha_inicio'], '%Y-%m-%d').date()
             if p.get('fecha_final'):
                 p['fecha_final'] = datetime.strptime(p['fecha_final'], '%Y-%m-%d').date()
+            p['repeticion'] = describe(p.get('recurrencia'))
 
             # Calculate state
             if today < p['fecha_inicio']:
@@ -111,7 +114,8 @@ def list_proyectos(request):
         'proyectos_recursivos': recursivos,
         'filtered_count': len(filtered_proyectos),
         'estados': [('pendiente', 'Pendiente'), ('en_curso', 'En Curso'), ('finalizado', 'Finalizado')],
-        'recursivo_choices': [('si', 'Sí'), ('no', 'No')]
+        'recursivo_choices': [('si', 'Sí'), ('no', 'No')],
+        'ics_token': feed_token(asociacion_id),
     }
 
     return render(request, 'proyectos/list.html', context)
@@ -136,6 +140,7 @@ def create_proyecto(request):
                 "fecha_inicio": data['fecha_inicio'].isoformat(),
                 "fecha_final": data['fecha_final'].isoformat() if data['fecha_final'] else None,
                 "recursivo": data['recursivo'],
+                "recurrencia": data['recurrencia'],
             }
 
             client = get_client(request)
@@ -194,7 +199,8 @@ def update_proyecto(request, pk):
                 "lugar_fk_id": data['lugar_fk'].id if data['lugar_fk'] else None,
                 "fecha_inicio": data['fecha_inicio'].isoformat(),
                 "fecha_final": data['fecha_final'].isoformat() if data['fecha_final'] else None,
-                "recursivo": data['recursivo']
+                "recursivo": data['recursivo'],
+                "recurrencia": data['recurrencia']
             }
 
             client = get_client(request)
@@ -2,9 +2,9 @@
 Formularios personalizados para la app socias
 """
 from django import forms
-from django.db.models import Max
 from datetime import date
 from .models import Socia
+from .numbering import advance_past, next_numero, peek_next_numero, release_numero
 
 
 class SociaForm(forms.ModelForm):
@@ -52,8 +52,9 @@ class SociaForm(forms.ModelForm):
             today = date.today()
             default_birth_date = date(today.year - 18, today.month, today.day)
             self.fields['nacimiento'].initial = default_birth_date
+            self.fields['numero_socia'].required = False
 
-        # Si es creación (no hay instance), auto-asignar el número
+        # Si es creación (no hay instance), mostrar el número que se asignará
         if not self.instance.pk and self.asociacion:
             self.fields['numero_socia'].initial = self._get_next_numero()
             self.fields['numero_socia'].widget.attrs.update({
@@ -68,48 +69,17 @@ class SociaForm(forms.ModelForm):
             })
 
     def _get_next_numero(self):
-        """Calcula el siguiente número de socia disponible para la asociación"""
+        """Número que recibirá la socia (solo informativo: se asigna al guardar)"""
         if not self.asociacion:
             return "1"
+        return peek_next_numero(self.asociacion.pk)
 
-        # Buscar el número más alto en la asociación
-        max_numero = Socia.objects.filter(
-            asociacion=self.asociacion
-        ).aggregate(
-            max_num=Max('numero_socia')
-        )['max_num']
-
-        if max_numero:
-            try:
-                # Intentar convertir a entero y sumar 1
-                return str(int(max_numero) + 1)
-            except ValueError:
-                # Si no es un número, buscar el siguiente entero disponible
-                return self._find_next_available_number()
-        else:
-            # Primera socia de la asociación
-            return "1"
-
-    def _find_next_available_number(self):
-        """Encuentra el siguiente número entero disponible"""
-        if not self.asociacion:
-            return "1"
-
-        existing_numbers = set()
-        socias = Socia.objects.filter(asociacion=self.asociacion)
-
-        for socia in socias:
-            try:
-                existing_numbers.add(int(socia.numero_socia))
-            except ValueError:
-                continue  # Ignorar números no enteros
-
-        # Encontrar el primer número disponible empezando desde 1
-        numero = 1
-        while numero in existing_numbers:
-            numero += 1
-
-        return str(numero)
+    def clean_numero_socia(self):
+        # En el alta el número lo asigna la secuencia al guardar: el que se
+        # mostró en el formulario puede haberlo cogido otra alta mientras tanto
+        if not self.instance.pk:
+            return ''
+        return self.cleaned_data['numero_socia']
 
     def save(self, commit=True):
         """Guardar la socia asignando automáticamente la asociación y el número"""
@@ -119,10 +89,18 @@ class SociaForm(forms.ModelForm):
             instance.asociacion = self.asociacion
 
         # Si es creación y no tiene número, asignarlo
+        explicito = bool(instance.pk and instance.numero_socia)
+        numero_anterior = self.initial.get('numero_socia') if instance.pk else None
         if not instance.pk and not instance.numero_socia:
-            instance.numero_socia = self._get_next_numero()
+            instance.numero_socia = next_numero(instance.asociacion_id)
 
         if commit:
             instance.save()
+            # Número escrito a mano: la secuencia no debe volver a darlo
+            if explicito:
+                advance_past(instance.asociacion_id, [instance.numero_socia])
+                # Renumerada: el número anterior queda libre, como tras una baja
+                if numero_anterior and numero_anterior != instance.numero_socia:
+                    release_numero(instance.asociacion_id, numero_anterior)
 
         return instance
\ No newline at end of file
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_sequences(apps, schema_editor):
+    """Una secuencia por asociación con socias, a continuación del mayor número entero"""
+    Socia = apps.get_model('socias', 'Socia')
+    SociaSequence = apps.get_model('socias', 'SociaSequence')
+    db = schema_editor.connection.alias
+
+    ultimos = {}
+    for asociacion_id, numero in Socia.objects.using(db).values_list('asociacion_id', 'numero_socia').iterator():
+        if numero.isdigit():
+            ultimos[asociacion_id] = max(ultimos.get(asociacion_id, 0), int(numero))
+        else:
+            ultimos.setdefault(asociacion_id, 0)
+    SociaSequence.objects.using(db).bulk_create(
+        SociaSequence(asociacion_id=asociacion_id, siguiente=ultimo + 1)
+        for asociacion_id, ultimo in ultimos.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_asociacionvecinal_db_shard'),
+        ('socias', '0004_socia_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SociaSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('siguiente', models.PositiveIntegerField(default=1)),
+                ('asociacion', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='secuencia_socias', to='core.asociacionvecinal')),
+            ],
+            options={
+                'verbose_name': 'Secuencia de números de socia',
+                'verbose_name_plural': 'Secuencias de números de socia',
+            },
+        ),
+        migrations.CreateModel(
+            name='NumeroSociaLibre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('numero', models.PositiveIntegerField()),
+                ('asociacion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='numeros_socia_libres', to='core.asociacionvecinal')),
+            ],
+            options={
+                'verbose_name': 'Número de socia libre',
+                'verbose_name_plural': 'Números de socia libres',
+                'ordering': ['numero'],
+                'unique_together': {('asociacion', 'numero')},
+            },
+        ),
+        migrations.RunPython(create_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Debe coincidir con la expresión de búsqueda de core/autocomplete.py para que se use el índice
+INDEXES = {
+    'socias_nombre_tsv_idx': ('socias_socia', "nombre || ' ' || apellidos"),
+}
+
+
+def crear_indices_busqueda(apps, schema_editor):
+    # Solo PostgreSQL tiene tsvector; en SQLite la búsqueda sigue siendo LIKE
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, (table, expression) in INDEXES.items():
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (to_tsvector('spanish', {expression}))"
+            )
+
+
+def borrar_indices_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socias', '0005_socia_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices_busqueda, borrar_indices_busqueda),
+    ]
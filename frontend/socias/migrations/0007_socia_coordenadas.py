@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_geocodecache'),
+        ('socias', '0006_socia_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='socia',
+            name='lat',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='socia',
+            name='lon',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='socia',
+            index=models.Index(fields=['asociacion', 'lat', 'lon'], name='socias_asoc_latlon_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from core.spatial import create_spatial_index, drop_spatial_index
+
+
+def crear_indice_espacial(apps, schema_editor):
+    # R*Tree en SQLite, GiST en PostgreSQL (ver core/spatial.py)
+    create_spatial_index(schema_editor.connection, 'socias_socia')
+
+
+def borrar_indice_espacial(apps, schema_editor):
+    drop_spatial_index(schema_editor.connection, 'socias_socia')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socias', '0007_socia_coordenadas'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_espacial, borrar_indice_espacial),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from core.geocoding import address_query
 from core.models import AsociacionVecinal
 
 
@@ -26,6 +27,10 @@ class Socia(models.Model):
     codigo_postal = models.CharField(max_length=10, blank=True)
     pais = models.CharField(max_length=100, default='España')
 
+    # Coordenadas del domicilio (manage.py geocodificar) para el mapa del barrio
+    lat = models.FloatField(null=True, blank=True)
+    lon = models.FloatField(null=True, blank=True)
+
     # Fechas
     nacimiento = models.DateField(null=True, blank=True)
     fecha_inscripcion = models.DateField(auto_now_add=True)
@@ -43,6 +48,7 @@ class Socia(models.Model):
         verbose_name_plural = "Socias"
         ordering = ['numero_socia']
         unique_together = ['asociacion', 'numero_socia']
+        indexes = [models.Index(fields=['asociacion', 'lat', 'lon'], name='socias_asoc_latlon_idx')]
 
     def __str__(self):
         return f"{self.numero_socia} - {self.nombre} {self.apellidos}"
@@ -50,3 +56,51 @@ class Socia(models.Model):
     def get_absolute_url(self):
         from django.urls import reverse
         return reverse('socias:detail', kwargs={'pk': self.pk})
+
+    @property
+    def direccion_completa(self):
+        return address_query(self.direccion, self.numero, self.codigo_postal, self.provincia)
+
+
+class SociaSequence(models.Model):
+    """
+    Siguiente número de socia de cada asociación. Se incrementa con un único
+    UPDATE atómico (ver socias.numbering), así que dos altas simultáneas
+    nunca reciben el mismo número.
+    """
+    asociacion = models.OneToOneField(
+        AsociacionVecinal,
+        on_delete=models.CASCADE,
+        related_name='secuencia_socias'
+    )
+    siguiente = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        verbose_name = "Secuencia de números de socia"
+        verbose_name_plural = "Secuencias de números de socia"
+
+    def __str__(self):
+        return f"{self.asociacion}: {self.siguiente}"
+
+
+class NumeroSociaLibre(models.Model):
+    """
+    Números de socias dadas de baja, disponibles para reutilizar cuando
+    SOCIA_REUSE_NUMBERS está activo. El índice único (asociacion, numero)
+    permite sacar el menor libre sin recorrer la tabla.
+    """
+    asociacion = models.ForeignKey(
+        AsociacionVecinal,
+        on_delete=models.CASCADE,
+        related_name='numeros_socia_libres'
+    )
+    numero = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = "Número de socia libre"
+        verbose_name_plural = "Números de socia libres"
+        unique_together = ['asociacion', 'numero']
+        ordering = ['numero']
+
+    def __str__(self):
+        return f"{self.asociacion}: {self.numero}"
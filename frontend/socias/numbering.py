@@ -0,0 +1,121 @@
+"""
+Números de socia: asignación atómica por asociación
+
+Cada asociación tiene una fila en SociaSequence con el siguiente número. Se
+reserva con un único `UPDATE ... RETURNING`, de modo que dos altas (o dos
+importaciones) simultáneas reciben números distintos sin bloquear la tabla de
+socias ni recorrerla. La fila se crea la primera vez a partir del mayor número
+entero existente (la migración 0005 ya la crea para las asociaciones con
+socias).
+
+Con SOCIA_REUSE_NUMBERS=True los números de las bajas se guardan en
+NumeroSociaLibre y se reutilizan empezando por el menor.
+
+El backend FastAPI hace lo mismo sobre las mismas tablas
+(app/infrastructure/persistence/socia_numbering.py).
+"""
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Value
+from django.db.models.functions import Greatest
+
+from .models import NumeroSociaLibre, Socia, SociaSequence
+
+
+def _db(using):
+    return using or router.db_for_write(SociaSequence)
+
+
+def _ultimo_numero(asociacion_id, using):
+    """Mayor número entero en uso (los no numéricos se ignoran)"""
+    numeros = Socia.objects.using(using).filter(asociacion_id=asociacion_id).values_list('numero_socia', flat=True)
+    return max((int(numero) for numero in numeros.iterator() if numero.isdigit()), default=0)
+
+
+def _ensure_sequence(asociacion_id, using):
+    if not SociaSequence.objects.using(using).filter(asociacion_id=asociacion_id).exists():
+        # ignore_conflicts: si otra petición la crea a la vez, gana la primera
+        SociaSequence.objects.using(using).bulk_create(
+            [SociaSequence(asociacion_id=asociacion_id, siguiente=_ultimo_numero(asociacion_id, using) + 1)],
+            ignore_conflicts=True,
+        )
+
+
+def reserve_numbers(asociacion_id, count=1, using=None):
+    """Reserva `count` números consecutivos y los devuelve como range"""
+    using = _db(using)
+    _ensure_sequence(asociacion_id, using)
+    connection = connections[using]
+    table = connection.ops.quote_name(SociaSequence._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET siguiente = siguiente + %s WHERE asociacion_id = %s RETURNING siguiente",
+            [count, asociacion_id],
+        )
+        siguiente = cursor.fetchone()[0]
+    return range(siguiente - count, siguiente)
+
+
+def _pop_free_number(asociacion_id, using):
+    connection = connections[using]
+    table = connection.ops.quote_name(NumeroSociaLibre._meta.db_table)
+    with connection.cursor() as cursor:
+        # Si otra petición se lleva el mismo número, el DELETE no devuelve nada
+        cursor.execute(
+            f"DELETE FROM {table} WHERE id = ("
+            f"SELECT id FROM {table} WHERE asociacion_id = %s ORDER BY numero LIMIT 1"
+            f") RETURNING numero",
+            [asociacion_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def next_numero(asociacion_id, using=None):
+    """Número para una socia nueva (un hueco libre si se reutilizan, si no el siguiente)"""
+    using = _db(using)
+    if settings.SOCIA_REUSE_NUMBERS:
+        numero = _pop_free_number(asociacion_id, using)
+        if numero is not None:
+            return str(numero)
+    return str(reserve_numbers(asociacion_id, 1, using)[0])
+
+
+def peek_next_numero(asociacion_id, using=None):
+    """Número que recibiría la próxima socia, sin reservarlo (para mostrarlo en el formulario)"""
+    using = _db(using)
+    if settings.SOCIA_REUSE_NUMBERS:
+        libre = NumeroSociaLibre.objects.using(using).filter(asociacion_id=asociacion_id).first()
+        if libre:
+            return str(libre.numero)
+    secuencia = SociaSequence.objects.using(using).filter(asociacion_id=asociacion_id).first()
+    return str(secuencia.siguiente if secuencia else _ultimo_numero(asociacion_id, using) + 1)
+
+
+def advance_past(asociacion_id, numeros, using=None):
+    """
+    Tras guardar socias con números explícitos (importaciones), mueve la
+    secuencia detrás del mayor y los quita de la lista de libres.
+    """
+    using = _db(using)
+    enteros = [int(numero) for numero in numeros if str(numero).isdigit()]
+    if not enteros:
+        return
+    _ensure_sequence(asociacion_id, using)
+    with transaction.atomic(using=using):
+        SociaSequence.objects.using(using).filter(asociacion_id=asociacion_id).update(
+            siguiente=Greatest('siguiente', Value(max(enteros) + 1))
+        )
+        libres = NumeroSociaLibre.objects.using(using).filter(asociacion_id=asociacion_id)
+        for start in range(0, len(enteros), 500):
+            libres.filter(numero__in=enteros[start:start + 500]).delete()
+
+
+def release_numero(asociacion_id, numero, using=None):
+    """Deja libre el número de una socia dada de baja (solo con SOCIA_REUSE_NUMBERS)"""
+    if not settings.SOCIA_REUSE_NUMBERS or not str(numero).isdigit():
+        return
+    NumeroSociaLibre.objects.using(_db(using)).bulk_create(
+        [NumeroSociaLibre(asociacion_id=asociacion_id, numero=int(numero))],
+        ignore_conflicts=True,
+    )
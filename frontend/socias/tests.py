@@ -1,3 +1,82 @@
-from django.test import TestCase
+import pandas as pd
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from core.models import AsociacionVecinal
+from users.views_dashboard import _process_socias_import
+from .forms import SociaForm
+from .models import NumeroSociaLibre, Socia
+from .numbering import next_numero, release_numero, reserve_numbers
+
+
+class NumberingTests(TestCase):
+    def setUp(self):
+        self.asociacion = AsociacionVecinal.objects.create(nombre="AV Pruebas", numero_registro="REG-NUM")
+
+    def _socia(self, numero, **kwargs):
+        return Socia.objects.create(asociacion=self.asociacion, numero_socia=numero, nombre="Ana",
+                                    apellidos="Ruiz", **kwargs)
+
+    def test_sequence_starts_after_highest_numeric_number(self):
+        # "9" > "10" como texto: la secuencia compara números y se salta "S001"
+        for numero in ('9', '10', 'S001'):
+            self._socia(numero)
+
+        self.assertEqual(next_numero(self.asociacion.pk), '11')
+        self.assertEqual(list(reserve_numbers(self.asociacion.pk, 3)), [12, 13, 14])
+        self.assertEqual(next_numero(self.asociacion.pk), '15')
+
+    @override_settings(SOCIA_REUSE_NUMBERS=True)
+    def test_released_numbers_are_reused_lowest_first(self):
+        reserve_numbers(self.asociacion.pk, 5)
+        release_numero(self.asociacion.pk, '4')
+        release_numero(self.asociacion.pk, '2')
+        release_numero(self.asociacion.pk, 'S001')
+
+        self.assertEqual([next_numero(self.asociacion.pk) for _ in range(3)], ['2', '4', '6'])
+
+    def test_released_numbers_are_not_kept_by_default(self):
+        release_numero(self.asociacion.pk, '4')
+        self.assertFalse(NumeroSociaLibre.objects.exists())
+
+    @override_settings(SOCIA_REUSE_NUMBERS=True)
+    def test_renumbering_in_the_form_frees_the_old_number(self):
+        socia = self._socia(next_numero(self.asociacion.pk))
+        data = {'numero_socia': '8', 'nombre': socia.nombre, 'apellidos': socia.apellidos, 'pais': 'España'}
+
+        form = SociaForm(data, instance=socia, asociacion=self.asociacion)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        self.assertEqual(next_numero(self.asociacion.pk), '1')
+        self.assertEqual(next_numero(self.asociacion.pk), '9')
+
+
+class SociasImportTests(TestCase):
+    def setUp(self):
+        self.asociacion = AsociacionVecinal.objects.create(nombre="AV Pruebas", numero_registro="REG-IMP")
+
+    def _numeros(self):
+        return dict(Socia.objects.filter(asociacion=self.asociacion).values_list('nombre', 'numero_socia'))
+
+    def test_rows_without_number_go_after_the_explicit_ones(self):
+        # Columna numérica con huecos: pandas la lee como float (12.0)
+        df = pd.DataFrame([
+            {'nombre': 'Ana', 'apellidos': 'Ruiz', 'numero_socia': 12},
+            {'nombre': 'Rosa', 'apellidos': 'Pérez', 'numero_socia': None},
+            {'nombre': 'Luz', 'apellidos': 'Gil', 'numero_socia': None},
+        ])
+
+        guardadas, errores = _process_socias_import(df, self.asociacion)
+
+        self.assertEqual((guardadas, errores), (3, []))
+        self.assertEqual(self._numeros(), {'Ana': '12', 'Rosa': '13', 'Luz': '14'})
+        self.assertEqual(next_numero(self.asociacion.pk), '15')
+
+    def test_reserved_numbers_already_in_use_are_skipped(self):
+        next_numero(self.asociacion.pk)
+        # Escrito a mano sin pasar por la secuencia, que sigue en el 2
+        Socia.objects.create(asociacion=self.asociacion, numero_socia='3', nombre="Eva", apellidos="Sanz")
+        df = pd.DataFrame([{'nombre': 'Rosa', 'apellidos': 'Pérez'}, {'nombre': 'Luz', 'apellidos': 'Gil'}])
+
+        self.assertEqual(_process_socias_import(df, self.asociacion), (2, []))
+        self.assertEqual(self._numeros(), {'Eva': '3', 'Rosa': '2', 'Luz': '4'})
@@ -9,6 +9,7 @@ from users.utils import association_required, is_association_admin
 from .forms import SociaForm
 from .models import Socia
 from core.api import get_client
+from core import cache
 import requests
 
 @login_required
@@ -34,7 +35,7 @@ def list_socias(request):
     }
 
     try:
-        socias_data = client.get("/socias/", params=params) or []
+        socias_data = client.get_cached("/socias/", params=params) or []
     except requests.RequestException as e:
         messages.error(request, f"Error al conectar con el servidor: {str(e)}")
         socias_data = []
@@ -89,7 +90,11 @@ def list_socias(request):
     socias_pendientes = total_socias - socias_pagadas
 
     # Provincias disponibles
-    provincias_disponibles = sorted(list(set(s.get('provincia') for s in socias_data if s.get('provincia'))))
+    # (si la API ha fallado no se cachea la lista vacía)
+    provincias_disponibles = cache.get_or_set(
+        asociacion_id, 'socias', 'facets:provincias',
+        lambda: sorted(list(set(s.get('provincia') for s in socias_data if s.get('provincia'))))
+    ) if socias_data else []
 
     context = {
         'section': 'socias',
@@ -122,7 +127,8 @@ def create_socia(request):
         if form.is_valid():
             data = form.cleaned_data
             payload = {
-                "numero_socia": data['numero_socia'],
+                # Sin número: el backend lo asigna de la secuencia de la asociación
+                "numero_socia": None,
                 "nombre": data['nombre'],
                 "apellidos": data['apellidos'],
                 "telefono": data['telefono'],
@@ -142,8 +148,8 @@ def create_socia(request):
 
             client = get_client(request)
             try:
-                client.post("/socias/", data=payload)
-                messages.success(request, f"Socia {data['nombre']} creada exitosamente.")
+                socia = client.post("/socias/", data=payload)
+                messages.success(request, f"Socia {data['nombre']} creada exitosamente con el número {socia['numero_socia']}.")
                 return redirect('socias:list')
             except requests.RequestException as e:
                 detail = getattr(e, 'api_error', {}).get('detail', str(e))
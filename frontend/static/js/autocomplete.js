@@ -0,0 +1,53 @@
+/**
+ * Selectores con autocompletado (core/autocomplete.py)
+ * Requires Tom Select
+ *
+ * Los <select data-autocomplete="url"> solo traen las opciones seleccionadas;
+ * el resto se pide a la URL por páginas según se escribe o se baja la lista.
+ */
+
+function initAutocomplete(selectEl) {
+    if (selectEl.tomselect) return selectEl.tomselect;
+
+    const url = selectEl.dataset.autocomplete;
+    const plugins = ['virtual_scroll'];
+    if (selectEl.multiple) plugins.push('remove_button');
+
+    return new TomSelect(selectEl, {
+        plugins: plugins,
+        create: false,
+        maxOptions: null,
+        allowEmptyOption: !selectEl.multiple,
+        preload: 'focus',
+        // Sin texto también se carga la primera página
+        shouldLoad: () => true,
+        // El orden y el filtrado los decide el servidor
+        score: () => () => 1,
+        firstUrl: query => url + '?' + new URLSearchParams({q: query, page: 1}),
+        load: function(query, callback) {
+            const pageUrl = this.getUrl(query);
+            fetch(pageUrl, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+                .then(response => response.json())
+                .then(data => {
+                    if (data.more) {
+                        const next = new URL(pageUrl, window.location.origin);
+                        next.searchParams.set('page', Number(next.searchParams.get('page')) + 1);
+                        this.setNextUrl(query, next.pathname + next.search);
+                    }
+                    callback(data.results);
+                })
+                .catch(err => {
+                    console.error(err);
+                    callback();
+                });
+        }
+    });
+}
+
+window.initAutocompletes = function(container) {
+    (container || document).querySelectorAll('select[data-autocomplete]').forEach(initAutocomplete);
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    window.initAutocompletes();
+});
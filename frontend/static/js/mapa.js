@@ -0,0 +1,111 @@
+/**
+ * Mapa del barrio (eventos/templates/mapas/viewer.html)
+ * Requires Leaflet
+ *
+ * No se descargan todos los puntos: en cada movimiento se pide al servidor el
+ * GeoJSON del área visible para el zoom actual (eventos:mapas_geo -> backend
+ * /v1/geo). Hasta cierto zoom llega agrupado en clusters por celdas, así que
+ * el número de marcadores no depende del número de socias o lugares.
+ */
+
+const MAP_COLORS = {lugares: '#0d6efd', eventos: '#dc3545', socias: '#198754'};
+const MAP_MAX_LAT = 85.0511;
+
+function clusterIcon(feature) {
+    const count = feature.properties.point_count;
+    const size = Math.round(28 + Math.min(4, Math.log10(count)) * 8);
+    return L.divIcon({
+        html: '<span>' + (count >= 1000 ? Math.round(count / 1000) + 'k' : count) + '</span>',
+        className: 'map-cluster map-cluster-' + feature.properties.layer,
+        iconSize: [size, size]
+    });
+}
+
+function popupContent(feature) {
+    // textContent: los nombres vienen de los datos de la asociación
+    const el = document.createElement('div');
+    el.textContent = feature.properties.nombre || '';
+    return el;
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('mapa-barrio');
+    if (!container) return;
+
+    const map = L.map(container, {preferCanvas: true}).setView(
+        [parseFloat(container.dataset.lat), parseFloat(container.dataset.lon)], 14
+    );
+    L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+        maxZoom: 19,
+        attribution: '&copy; OpenStreetMap'
+    }).addTo(map);
+
+    const layer = L.layerGroup().addTo(map);
+    const status = document.getElementById('mapa-estado');
+    const checkboxes = document.querySelectorAll('#mapa-capas input[type=checkbox]');
+    let pending = null;
+    let timer = null;
+
+    function render(data) {
+        layer.clearLayers();
+        let total = 0;
+        data.features.forEach(feature => {
+            const [lon, lat] = feature.geometry.coordinates;
+            const props = feature.properties;
+            if (props.cluster) {
+                total += props.point_count;
+                L.marker([lat, lon], {icon: clusterIcon(feature)})
+                    .on('click', () => map.setView([lat, lon], Math.min(map.getZoom() + 2, 19)))
+                    .addTo(layer);
+            } else {
+                total += 1;
+                L.circleMarker([lat, lon], {
+                    radius: 6,
+                    color: '#fff',
+                    weight: 1,
+                    fillColor: MAP_COLORS[props.layer],
+                    fillOpacity: 0.9
+                }).bindPopup(popupContent(feature)).addTo(layer);
+            }
+        });
+        status.textContent = total + ' puntos en el área';
+    }
+
+    function load() {
+        const layers = Array.from(checkboxes).filter(cb => cb.checked).map(cb => cb.value);
+        const bounds = map.getBounds();
+        const bbox = [
+            Math.max(-180, bounds.getWest()), Math.max(-MAP_MAX_LAT, bounds.getSouth()),
+            Math.min(180, bounds.getEast()), Math.min(MAP_MAX_LAT, bounds.getNorth())
+        ].map(v => v.toFixed(5)).join(',');
+        const params = new URLSearchParams({bbox: bbox, zoom: Math.round(map.getZoom()), layers: layers.join(',')});
+
+        // Solo cuenta la última vista: la anterior se cancela
+        if (pending) pending.abort();
+        pending = new AbortController();
+        status.textContent = 'Cargando...';
+        fetch(container.dataset.geoUrl + '?' + params, {
+            headers: {'X-Requested-With': 'XMLHttpRequest'},
+            signal: pending.signal
+        })
+            .then(response => response.json().then(data => {
+                if (!response.ok) throw new Error(data.error || response.statusText);
+                return data;
+            }))
+            .then(render)
+            .catch(err => {
+                if (err.name === 'AbortError') return;
+                console.error(err);
+                status.textContent = err.message;
+            });
+    }
+
+    function scheduleLoad() {
+        clearTimeout(timer);
+        timer = setTimeout(load, 200);
+    }
+
+    map.on('moveend', scheduleLoad);
+    checkboxes.forEach(cb => cb.addEventListener('change', scheduleLoad));
+    load();
+});
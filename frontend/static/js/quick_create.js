@@ -38,6 +38,7 @@ window.openQuickCreate = function(url, title, targetSelectId) {
             .then(response => response.text())
             .then(html => {
                 modalBody.innerHTML = html;
+                if (window.initAutocompletes) window.initAutocompletes(modalBody);
                 // Re-bind form submission
                 const form = modalBody.querySelector('form');
                 if (form) {
@@ -82,6 +83,7 @@ function handleQuickCreateSubmit(e) {
             const modalBody = document.getElementById('quickCreateBody');
             if (modalBody) {
                 modalBody.innerHTML = data.html;
+                if (window.initAutocompletes) window.initAutocompletes(modalBody);
                 const newForm = modalBody.querySelector('form');
                 if (newForm) {
                     newForm.addEventListener('submit', handleQuickCreateSubmit);
@@ -0,0 +1,25 @@
+"""
+Backend de autenticación del proyecto
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend que carga el usuario junto con su perfil y asociación
+    en una sola consulta (select_related), para que las comprobaciones
+    de permisos de cada petición no disparen consultas adicionales.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = (
+                UserModel._default_manager
+                .select_related('profile__asociacion')
+                .get(pk=user_id)
+            )
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
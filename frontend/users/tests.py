@@ -1,3 +1,24 @@
-from django.test import TestCase
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, TestCase
 
-# Create your tests here.
+
+class SessionBackendTests(TestCase):
+    def test_sessions_from_the_old_model_backend_stay_logged_in(self):
+        user = User.objects.create_user('ana', password='secreta-123')
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+
+        request = RequestFactory().get('/')
+        request.session = SessionStore(session.session_key)
+
+        self.assertEqual(get_user(request), user)
+
+    def test_new_logins_use_the_profile_backend(self):
+        User.objects.create_user('ana', password='secreta-123')
+        self.assertTrue(self.client.login(username='ana', password='secreta-123'))
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'users.backends.ProfileModelBackend')
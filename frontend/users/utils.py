@@ -1,12 +1,46 @@
 """
 Utilidades y decoradores compartidos para las vistas
 """
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.views import redirect_to_login
 from django.shortcuts import redirect
 from django.contrib import messages
 from functools import wraps
 
 
+class AuthorizationContext:
+    """
+    Perfil, asociación y permisos del usuario calculados una sola vez.
+    Se guarda en el propio objeto usuario, que vive lo que dura la petición.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.is_authenticated = user.is_authenticated
+        self.is_superuser = user.is_superuser
+        self.profile = getattr(user, 'profile', None) if self.is_authenticated else None
+        self.asociacion = self.profile.asociacion if self.profile else None
+        self.role = self.profile.role if self.profile else None
+        self.is_admin = self.role == 'admin'
+        self.has_association = self.asociacion is not None
+        self.can_manage_users = self.is_superuser or self.is_admin
+
+    @property
+    def asociacion_id(self):
+        return self.profile.asociacion_id if self.profile else None
+
+
+def get_authorization(user):
+    """Devuelve (y memoiza en el usuario) el contexto de autorización"""
+    authz = getattr(user, '_authorization_context', None)
+    if authz is None:
+        authz = AuthorizationContext(user)
+        # AnonymousUser también admite atributos, así que se memoiza igual
+        user._authorization_context = authz
+    return authz
+
+
 def is_superuser(user):
     """Verifica si el usuario es superusuario"""
     return user.is_superuser
@@ -14,21 +48,36 @@ def is_superuser(user):
 
 def is_association_admin(user):
     """Verifica si el usuario es administrador de asociación"""
-    return user.is_authenticated and hasattr(user, 'profile') and user.profile.is_association_admin()
+    authz = get_authorization(user)
+    return authz.is_authenticated and authz.is_admin
 
 
 def can_manage_users(user):
     """Verifica si el usuario puede gestionar otros usuarios"""
-    return user.is_superuser or (hasattr(user, 'profile') and user.profile.can_manage_users())
+    return get_authorization(user).can_manage_users
 
 
 def has_association(user):
     """Verifica si el usuario tiene una asociación asignada"""
-    return user.is_authenticated and hasattr(user, 'profile') and user.profile.asociacion
+    return get_authorization(user).asociacion
 
 
 def association_required(view_func):
     """Decorador que requiere que el usuario tenga una asociación asignada"""
+    if iscoroutinefunction(view_func):
+        # Vistas async: la comprobación (y la carga del usuario) se hace en un hilo,
+        # y queda memoizada en request.user para el resto de la petición
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            authz = await sync_to_async(get_authorization)(request.user)
+            if not authz.is_authenticated:
+                return redirect_to_login(request.get_full_path())
+            if not authz.has_association:
+                messages.error(request, 'No tienes una asociación asignada. Contacta con el administrador.')
+                return redirect('users:home')
+            return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
     @wraps(view_func)
     @login_required
     def wrapper(request, *args, **kwargs):
@@ -41,6 +90,15 @@ def association_required(view_func):
 
 def admin_required(view_func):
     """Decorador que requiere permisos de administrador de asociación"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        @association_required
+        async def async_wrapper(request, *args, **kwargs):
+            if not await sync_to_async(is_association_admin)(request.user):
+                return redirect_to_login(request.get_full_path())
+            return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
     @wraps(view_func)
     @association_required
     @user_passes_test(is_association_admin)
@@ -3,18 +3,30 @@ Vistas para el dashboard principal
 """
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, router, transaction
 from django.http import HttpResponse
 from .utils import association_required
 from core.api import get_client
+from core.api_async import run_concurrently
+from core.cache import invalidates, RESOURCES
+from core.geocoding import geocode_pending_in_background
+from core.metrics import counts_import, exported_rows
+from core.reporting import reporting_view
 from dateutil import parser
 import csv
 import io
 from socias.models import Socia
+from socias.numbering import advance_past, reserve_numbers
 from finanzas.models import Transaccion
 from eventos.models import Evento, Lugar
 from proyectos.models import Proyecto
 from entidades.models import Persona, Material
 
+# Las exportaciones recorren las tablas con .iterator(): en PostgreSQL usa un
+# cursor del lado del servidor y no carga toda la asociación en memoria
+EXPORT_CHUNK_SIZE = 2000
+
 
 @association_required
 def dashboard(request):
@@ -35,29 +47,44 @@ def backend_management(request):
     active_tab = request.GET.get('tab', 'database')
 
     # Contexto para Drive
-    client = get_client(request)
     is_connected = False
     folder_link = None
+    folder_name = None
     auth_url = None
     folders = []
     files = []
 
     try:
+        client = get_client(request)
+
         # Verificar conexión
-        config_status = client.get(f'drive/config/{asociacion.id}')
-        is_connected = config_status.get('is_connected', False)
-        folder_link = config_status.get('folder_link')
+        try:
+            config_status = client.get(f'drive/config/{asociacion.id}')
+            is_connected = config_status.get('is_connected', False)
+            folder_link = config_status.get('folder_link')
+            folder_name = config_status.get('folder_name')
+        except Exception:
+            pass
 
         if not is_connected:
-            response = client.get('drive/auth/url')
-            auth_url = response.get('url')
+            try:
+                auth_url = client.get('drive/auth/url').get('url')
+            except Exception:
+                pass
         else:
-            # Obtener carpetas para configuración
-            folders = client.get('drive/folders', params={'asociacion_id': asociacion.id})
-
-            # Obtener archivos si hay carpeta configurada
+            # Carpetas y archivos no dependen entre sí: se piden en paralelo
+            calls = [lambda api: api.get('drive/folders', params={'asociacion_id': asociacion.id})]
             if asociacion.drive_folder_id:
-                files = client.get('drive/files', params={'asociacion_id': asociacion.id})
+                calls.append(lambda api: api.get('drive/files', params={'asociacion_id': asociacion.id}))
+            folders_response, *files_response = run_concurrently(request, *calls)
+
+            # Carpetas para configuración
+            if not isinstance(folders_response, Exception):
+                folders = folders_response
+
+            # Archivos si hay carpeta configurada
+            if files_response and not isinstance(files_response[0], Exception):
+                files = files_response[0]
                 for f in files:
                     if f.get('createdTime'):
                         try:
@@ -74,6 +101,7 @@ def backend_management(request):
         'is_connected': is_connected,
         'auth_url': auth_url,
         'folder_link': folder_link,
+        'folder_name': folder_name,
         'folders': folders,
         'files': files
     })
@@ -161,6 +189,7 @@ def drive_select_folder(request):
 
 
 @association_required
+@reporting_view
 def export_socias(request):
     """Exportar socias a CSV o Excel"""
     asociacion = request.user.profile.asociacion
@@ -182,7 +211,7 @@ def export_socias(request):
         writer.writerow(headers)
 
         if not is_template:
-            for socia in socias:
+            for socia in exported_rows('socias', socias.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                 writer.writerow([
                     socia.numero_socia, socia.nombre, socia.apellidos, socia.telefono, socia.email, socia.direccion,
                     socia.numero, socia.piso, socia.escalera, socia.codigo_postal, socia.provincia, socia.pais,
@@ -205,7 +234,7 @@ def export_socias(request):
             ws.append(headers)
 
             if not is_template:
-                for socia in socias:
+                for socia in exported_rows('socias', socias.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                     ws.append([
                         socia.numero_socia, socia.nombre, socia.apellidos, socia.telefono, socia.email, socia.direccion,
                         socia.numero, socia.piso, socia.escalera, socia.codigo_postal, socia.provincia, socia.pais,
@@ -226,6 +255,7 @@ def export_socias(request):
 
 
 @association_required
+@invalidates('socias')
 def import_socias(request):
     """Importar socias desde CSV o Excel"""
     if request.method == 'POST' and request.FILES.get('file'):
@@ -243,9 +273,12 @@ def import_socias(request):
                 messages.error(request, 'Formato no soportado. Usa CSV o Excel.')
                 return redirect('users:backend_management')
 
-            count, errors = _process_socias_import(df, asociacion)
+            count, errores = _process_socias_import(df, asociacion)
 
-            messages.success(request, f'Importación completada: {count} socias procesadas. {errors} errores.')
+            if errores:
+                messages.warning(request, f'Importación completada: {count} socias procesadas. {_resumen_errores(errores)}.')
+            else:
+                messages.success(request, f'Importación completada: {count} socias procesadas. 0 errores.')
 
         except ImportError:
             messages.error(request, "Librería pandas no instalada.")
@@ -256,6 +289,7 @@ def import_socias(request):
 
 
 @association_required
+@invalidates('socias')
 def delete_all_socias(request):
     """Eliminar todas las socias"""
     if request.method == 'POST':
@@ -291,6 +325,7 @@ def drive_callback(request):
 
 
 @association_required
+@reporting_view
 def export_global_excel(request):
     """Exportar TODOS los datos a un solo Excel con múltiples hojas"""
     asociacion = request.user.profile.asociacion
@@ -307,7 +342,7 @@ def export_global_excel(request):
                    'nacimiento', 'pagado', 'descripcion']
         ws_socias.append(headers_socias)
 
-        for socia in Socia.objects.filter(asociacion=asociacion):
+        for socia in exported_rows('socias', Socia.objects.filter(asociacion=asociacion).iterator(chunk_size=EXPORT_CHUNK_SIZE)):
             ws_socias.append([
                 socia.numero_socia, socia.nombre, socia.apellidos, socia.telefono, socia.email, socia.direccion,
                 socia.numero, socia.piso, socia.escalera, socia.codigo_postal, socia.provincia, socia.pais,
@@ -319,7 +354,7 @@ def export_global_excel(request):
         headers_lugares = ['nombre', 'direccion', 'descripcion', 'numero', 'cp', 'ciudad', 'pais']
         ws_lugares.append(headers_lugares)
 
-        for lugar in Lugar.objects.filter(asociacion=asociacion):
+        for lugar in exported_rows('lugares', Lugar.objects.filter(asociacion=asociacion).iterator(chunk_size=EXPORT_CHUNK_SIZE)):
             ws_lugares.append([
                 lugar.nombre, lugar.direccion, lugar.descripcion,
                 lugar.numero, lugar.cp, lugar.ciudad, lugar.pais
@@ -330,7 +365,7 @@ def export_global_excel(request):
         headers_personas = ['nombre', 'apellidos', 'contacto', 'cargo', 'telefono', 'email', 'observaciones', 'proyecto_nombre']
         ws_personas.append(headers_personas)
 
-        for persona in Persona.objects.filter(asociacion=asociacion):
+        for persona in exported_rows('personas', Persona.objects.filter(asociacion=asociacion).select_related('proyecto').iterator(chunk_size=EXPORT_CHUNK_SIZE)):
             ws_personas.append([
                 persona.nombre, persona.apellidos, persona.contacto, persona.cargo,
                 persona.telefono, persona.email, persona.observaciones,
@@ -342,7 +377,9 @@ def export_global_excel(request):
         headers_materiales = ['nombre', 'uso', 'precio', 'lugar_nombre', 'encargado_persona_nombre', 'encargado_socia_numero']
         ws_materiales.append(headers_materiales)
 
-        for material in Material.objects.filter(asociacion=asociacion):
+        materiales = (Material.objects.filter(asociacion=asociacion)
+                      .select_related('lugar', 'encargado_socia', 'encargado_persona'))
+        for material in exported_rows('materiales', materiales.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
             ws_materiales.append([
                 material.nombre, material.uso, material.precio,
                 material.lugar.nombre if material.lugar else '',
@@ -355,7 +392,7 @@ def export_global_excel(request):
         headers_finanzas = ['fecha_transaccion', 'cantidad', 'concepto', 'descripcion', 'entidad', 'fecha_vencimiento']
         ws_finanzas.append(headers_finanzas)
 
-        for trans in Transaccion.objects.filter(asociacion=asociacion):
+        for trans in exported_rows('finanzas', Transaccion.objects.filter(asociacion=asociacion).iterator(chunk_size=EXPORT_CHUNK_SIZE)):
             ws_finanzas.append([
                 trans.fecha_transaccion, trans.cantidad, trans.concepto, trans.descripcion,
                 trans.entidad, trans.fecha_vencimiento
@@ -367,7 +404,7 @@ def export_global_excel(request):
                            'descripcion', 'duracion', 'colaboradores', 'observaciones']
         ws_eventos.append(headers_eventos)
 
-        for evento in Evento.objects.filter(asociacion=asociacion):
+        for evento in exported_rows('eventos', Evento.objects.filter(asociacion=asociacion).select_related('lugar', 'responsable').iterator(chunk_size=EXPORT_CHUNK_SIZE)):
             # Excel no soporta timezones
             fecha_naive = evento.fecha.replace(tzinfo=None) if evento.fecha else None
 
@@ -388,7 +425,7 @@ def export_global_excel(request):
                              'descripcion', 'materiales', 'involucrados', 'recursivo']
         ws_proyectos.append(headers_proyectos)
 
-        for proy in Proyecto.objects.filter(asociacion=asociacion):
+        for proy in exported_rows('proyectos', Proyecto.objects.filter(asociacion=asociacion).select_related('lugar_fk', 'responsable').iterator(chunk_size=EXPORT_CHUNK_SIZE)):
             # Obtener lugar (FK o texto)
             lugar_str = str(proy.lugar_fk) if proy.lugar_fk else proy.lugar
 
@@ -413,6 +450,7 @@ def export_global_excel(request):
 
 
 @association_required
+@invalidates(*RESOURCES)
 def import_global_excel(request):
     """Importar TODOS los datos desde un solo Excel"""
     if request.method == 'POST' and request.FILES.get('file'):
@@ -433,13 +471,13 @@ def import_global_excel(request):
 
             # 1. Procesar Socias (Prioridad alta por dependencias)
             if 'Socias' in xls:
-                count, errors = _process_socias_import(xls['Socias'], asociacion)
-                results.append(f"Socias: {count} importadas, {errors} errores.")
+                count, errores = _process_socias_import(xls['Socias'], asociacion)
+                results.append(f"Socias: {count} importadas, {_resumen_errores(errores)}.")
 
             # 2. Procesar Lugares
             if 'Lugares' in xls:
-                count = _process_lugares_import(xls['Lugares'], asociacion)
-                results.append(f"Lugares: {count} importados.")
+                count, errores = _process_lugares_import(xls['Lugares'], asociacion)
+                results.append(f"Lugares: {count} importados, {_resumen_errores(errores)}.")
 
             # 3. Procesar Personas
             if 'Personas' in xls:
@@ -481,67 +519,196 @@ def import_global_excel(request):
 
 # --- HELPERS DE IMPORTACIÓN ---
 
+# Filas por sentencia INSERT ... ON CONFLICT en las importaciones
+IMPORT_BATCH_SIZE = 500
+
+SOCIA_IMPORT_FIELDS = ['nombre', 'apellidos', 'telefono', 'email', 'direccion', 'numero', 'piso',
+                       'escalera', 'codigo_postal', 'provincia', 'pais', 'pagado', 'descripcion']
+
+LUGAR_IMPORT_FIELDS = ['direccion', 'descripcion', 'numero', 'cp', 'ciudad', 'pais', 'lat', 'lon']
+
+# Errores de fila que se enseñan tras una importación; el resto solo se cuentan
+IMPORT_ERRORES_MOSTRADOS = 5
+
+
+def _fila_valida(obj, fila, errores, exclude=()):
+    """
+    Valida una fila con las reglas del modelo (longitudes, tipos, obligatorios)
+    antes de meterla en un lote: una fila mala no debe tumbar el INSERT de las demás.
+    Los campos vacíos no se validan: la importación siempre los ha admitido.
+    """
+    vacios = [f.name for f in obj._meta.concrete_fields if getattr(obj, f.attname) in ('', None)]
+    try:
+        obj.full_clean(exclude=['asociacion', *exclude, *vacios], validate_unique=False, validate_constraints=False)
+    except ValidationError as e:
+        detalle = '; '.join(f"{campo}: {' '.join(mensajes)}" for campo, mensajes in e.message_dict.items())
+        errores.append(f"fila {fila}: {detalle}")
+        return False
+    return True
+
+
+def _bulk_create(model, objs, errores, describir=str, **kwargs):
+    """
+    bulk_create por lotes de IMPORT_BATCH_SIZE. Si un lote falla en la base de
+    datos, se repite fila a fila para que las válidas entren igualmente y la
+    que falla quede en `errores`. Devuelve cuántas filas se guardaron.
+    """
+    objs = list(objs)
+    using = router.db_for_write(model)
+    guardadas = 0
+    for inicio in range(0, len(objs), IMPORT_BATCH_SIZE):
+        lote = objs[inicio:inicio + IMPORT_BATCH_SIZE]
+        try:
+            with transaction.atomic(using=using):
+                model.objects.using(using).bulk_create(lote, **kwargs)
+            guardadas += len(lote)
+            continue
+        except DatabaseError:
+            pass
+        for obj in lote:
+            try:
+                with transaction.atomic(using=using):
+                    model.objects.using(using).bulk_create([obj], **kwargs)
+                guardadas += 1
+            except DatabaseError as e:
+                errores.append(f"{describir(obj)}: {e}")
+    return guardadas
+
+
+def _resumen_errores(errores):
+    """'2 errores (fila 4: ...; fila 9: ...)' para los mensajes de la importación"""
+    if not errores:
+        return "0 errores"
+    detalle = '; '.join(errores[:IMPORT_ERRORES_MOSTRADOS])
+    if len(errores) > IMPORT_ERRORES_MOSTRADOS:
+        detalle += f"; y {len(errores) - IMPORT_ERRORES_MOSTRADOS} más"
+    return f"{len(errores)} errores ({detalle})"
+
+
+@counts_import('socias')
 def _process_socias_import(df, asociacion):
     import pandas as pd
     df.columns = df.columns.str.lower()
-    count = 0
-    errors = 0
-    for _, row in df.iterrows():
+    errores = []
+    # Una fila por número de socia (la última gana), como hacía update_or_create
+    socias = {}
+    # Filas sin número: se numeran al final con una sola reserva de la secuencia
+    sin_numero = []
+    for index, row in df.iterrows():
+        # Número de fila en la hoja: la cabecera es la 1
+        fila = index + 2
         try:
-            if pd.isna(row.get('numero_socia')) or pd.isna(row.get('nombre')): continue
+            if pd.isna(row.get('nombre')): continue
 
             def get_val(col):
                 val = row.get(col)
                 return str(val) if not pd.isna(val) else ''
 
-            Socia.objects.update_or_create(
+            socia = Socia(
                 asociacion=asociacion,
-                numero_socia=str(row['numero_socia']),
-                defaults={
-                    'nombre': get_val('nombre'),
-                    'apellidos': get_val('apellidos'),
-                    'telefono': get_val('telefono'),
-                    'email': get_val('email'),
-                    'direccion': get_val('direccion'),
-                    'numero': get_val('numero'),
-                    'piso': get_val('piso'),
-                    'escalera': get_val('escalera'),
-                    'codigo_postal': get_val('codigo_postal'),
-                    'provincia': get_val('provincia'),
-                    'pais': get_val('pais') or 'España',
-                    'pagado': str(row.get('pagado', '')).lower() in ['true', '1', 'si', 'yes'],
-                    'descripcion': get_val('descripcion')
-                }
+                nombre=get_val('nombre'),
+                apellidos=get_val('apellidos'),
+                telefono=get_val('telefono'),
+                email=get_val('email'),
+                direccion=get_val('direccion'),
+                numero=get_val('numero'),
+                piso=get_val('piso'),
+                escalera=get_val('escalera'),
+                codigo_postal=get_val('codigo_postal'),
+                provincia=get_val('provincia'),
+                pais=get_val('pais') or 'España',
+                pagado=str(row.get('pagado', '')).lower() in ['true', '1', 'si', 'yes'],
+                descripcion=get_val('descripcion'),
             )
-            count += 1
-        except Exception:
-            errors += 1
-    return count, errors
-
+            numero = row.get('numero_socia')
+            # Una columna numérica con huecos llega como float (12.0)
+            if isinstance(numero, float) and numero.is_integer():
+                numero = int(numero)
+            numero = '' if pd.isna(numero) else str(numero).strip()
+            if numero:
+                socia.numero_socia = numero
+                if _fila_valida(socia, fila, errores):
+                    socias[numero] = socia
+            elif _fila_valida(socia, fila, errores, exclude=['numero_socia']):
+                sin_numero.append(socia)
+        except Exception as e:
+            errores.append(f"fila {fila}: {e}")
+
+    with transaction.atomic(using=router.db_for_write(Socia)):
+        # Primero los números explícitos, para que la reserva empiece detrás de ellos
+        advance_past(asociacion.pk, socias.keys())
+        nuevas = []
+        while sin_numero:
+            # Un número reservado que ya tiene socia (escrito a mano antes de que
+            # la secuencia lo supiera) se salta: las altas nunca pisan a nadie
+            numeros = [str(numero) for numero in reserve_numbers(asociacion.pk, len(sin_numero))]
+            ocupados = set(Socia.objects.filter(
+                asociacion=asociacion, numero_socia__in=numeros).values_list('numero_socia', flat=True))
+            libres = [numero for numero in numeros if numero not in ocupados]
+            for socia, numero in zip(sin_numero, libres):
+                socia.numero_socia = numero
+                nuevas.append(socia)
+            sin_numero = sin_numero[len(libres):]
+
+        describir = lambda socia: f"socia {socia.numero_socia}"
+        # INSERT ... ON CONFLICT (asociacion, numero_socia) DO UPDATE, por lotes
+        guardadas = _bulk_create(
+            Socia, socias.values(), errores,
+            describir=describir,
+            update_conflicts=True,
+            unique_fields=['asociacion', 'numero_socia'],
+            update_fields=SOCIA_IMPORT_FIELDS + ['updated_at'],
+        )
+        # Las numeradas por la secuencia son altas: INSERT sin ON CONFLICT
+        guardadas += _bulk_create(Socia, nuevas, errores, describir=describir)
+    return guardadas, errores
+
+@counts_import('lugares')
 def _process_lugares_import(df, asociacion):
     import pandas as pd
     df.columns = df.columns.str.lower()
-    count = 0
-    for _, row in df.iterrows():
+    errores = []
+    lugares = {}
+    for index, row in df.iterrows():
+        fila = index + 2
         try:
             if pd.isna(row.get('nombre')): continue
 
-            Lugar.objects.update_or_create(
+            def get_val(col):
+                val = row.get(col)
+                return str(val) if not pd.isna(val) else ''
+
+            nombre = str(row['nombre'])
+            lugar = Lugar(
                 asociacion=asociacion,
-                nombre=str(row['nombre']),
-                defaults={
-                    'direccion': str(row.get('direccion', '')),
-                    'descripcion': str(row.get('descripcion', '')),
-                    'numero': str(row.get('numero', '')),
-                    'cp': str(row.get('cp', '')),
-                    'ciudad': str(row.get('ciudad', '')),
-                    'pais': str(row.get('pais', 'España'))
-                }
+                nombre=nombre,
+                direccion=get_val('direccion'),
+                descripcion=get_val('descripcion'),
+                numero=get_val('numero'),
+                cp=get_val('cp'),
+                ciudad=get_val('ciudad'),
+                pais=get_val('pais') or 'España'
             )
-            count += 1
-        except Exception: pass
-    return count
-
+            if _fila_valida(lugar, fila, errores):
+                lugares[nombre] = lugar
+        except Exception as e:
+            errores.append(f"fila {fila}: {e}")
+
+    # Se guardan sin coordenadas (lat/lon a NULL también en los que ya existían,
+    # por si ha cambiado la dirección); la geocodificación va en segundo plano
+    guardados = _bulk_create(
+        Lugar, lugares.values(), errores,
+        describir=lambda lugar: f"lugar «{lugar.nombre}»",
+        update_conflicts=True,
+        unique_fields=['asociacion', 'nombre'],
+        update_fields=LUGAR_IMPORT_FIELDS,
+    )
+    if guardados:
+        transaction.on_commit(lambda: geocode_pending_in_background(asociacion, Lugar),
+                              using=router.db_for_write(Lugar))
+    return guardados, errores
+
+@counts_import('personas')
 def _process_personas_import(df, asociacion):
     import pandas as pd
     df.columns = df.columns.str.lower()
@@ -572,6 +739,7 @@ def _process_personas_import(df, asociacion):
         except Exception: pass
     return count
 
+@counts_import('materiales')
 def _process_materiales_import(df, asociacion):
     import pandas as pd
     df.columns = df.columns.str.lower()
@@ -612,6 +780,7 @@ def _process_materiales_import(df, asociacion):
         except Exception: pass
     return count
 
+@counts_import('finanzas')
 def _process_finanzas_import(df, asociacion):
     import pandas as pd
     df.columns = df.columns.str.lower()
@@ -633,6 +802,7 @@ def _process_finanzas_import(df, asociacion):
         except Exception: pass
     return count
 
+@counts_import('eventos')
 def _process_eventos_import(df, asociacion):
     import pandas as pd
     df.columns = df.columns.str.lower()
@@ -673,6 +843,7 @@ def _process_eventos_import(df, asociacion):
         except Exception: pass
     return count
 
+@counts_import('proyectos')
 def _process_proyectos_import(df, asociacion):
     import pandas as pd
     df.columns = df.columns.str.lower()
@@ -714,6 +885,7 @@ def _process_proyectos_import(df, asociacion):
 # --- GESTIÓN FINANZAS ---
 
 @association_required
+@reporting_view
 def export_finanzas(request):
     asociacion = request.user.profile.asociacion
     fmt = request.GET.get('format', 'csv')
@@ -729,7 +901,7 @@ def export_finanzas(request):
         writer = csv.writer(response)
         writer.writerow(headers)
         if not is_template:
-            for obj in queryset:
+            for obj in exported_rows('finanzas', queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                 writer.writerow([obj.fecha_transaccion, obj.cantidad, obj.concepto, obj.descripcion, obj.entidad, obj.fecha_vencimiento])
         return response
 
@@ -741,7 +913,7 @@ def export_finanzas(request):
             ws.title = "Contabilidad"
             ws.append(headers)
             if not is_template:
-                for obj in queryset:
+                for obj in exported_rows('finanzas', queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                     ws.append([obj.fecha_transaccion, obj.cantidad, obj.concepto, obj.descripcion, obj.entidad, obj.fecha_vencimiento])
 
             response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
@@ -756,6 +928,7 @@ def export_finanzas(request):
     return redirect('users:backend_management')
 
 @association_required
+@invalidates('finanzas')
 def import_finanzas(request):
     if request.method == 'POST' and request.FILES.get('file'):
         uploaded_file = request.FILES['file']
@@ -777,6 +950,7 @@ def import_finanzas(request):
     return redirect('users:backend_management')
 
 @association_required
+@invalidates('finanzas')
 def delete_all_finanzas(request):
     if request.method == 'POST':
         count = Transaccion.objects.filter(asociacion=request.user.profile.asociacion).delete()[0]
@@ -787,12 +961,13 @@ def delete_all_finanzas(request):
 # --- GESTIÓN ACTIVIDADES ---
 
 @association_required
+@reporting_view
 def export_eventos(request):
     asociacion = request.user.profile.asociacion
     fmt = request.GET.get('format', 'csv')
     is_template = request.GET.get('template') == 'true'
 
-    queryset = Evento.objects.filter(asociacion=asociacion)
+    queryset = Evento.objects.filter(asociacion=asociacion).select_related('lugar', 'responsable')
     headers = ['nombre', 'fecha', 'lugar', 'responsable_numero_socia', 'descripcion', 'duracion', 'colaboradores', 'observaciones']
 
     if fmt == 'csv':
@@ -802,7 +977,7 @@ def export_eventos(request):
         writer = csv.writer(response)
         writer.writerow(headers)
         if not is_template:
-            for obj in queryset:
+            for obj in exported_rows('eventos', queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                 writer.writerow([
                     obj.nombre, obj.fecha, obj.lugar,
                     obj.responsable.numero_socia if obj.responsable else '',
@@ -818,7 +993,7 @@ def export_eventos(request):
             ws.title = "Actividades"
             ws.append(headers)
             if not is_template:
-                for obj in queryset:
+                for obj in exported_rows('eventos', queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                     # Excel no soporta timezones
                     fecha_naive = obj.fecha.replace(tzinfo=None) if obj.fecha else None
                     # Obtener nombre del lugar (FK o texto)
@@ -842,6 +1017,7 @@ def export_eventos(request):
     return redirect('users:backend_management')
 
 @association_required
+@invalidates('eventos')
 def import_eventos(request):
     if request.method == 'POST' and request.FILES.get('file'):
         uploaded_file = request.FILES['file']
@@ -863,6 +1039,7 @@ def import_eventos(request):
     return redirect('users:backend_management')
 
 @association_required
+@invalidates('eventos')
 def delete_all_eventos(request):
     if request.method == 'POST':
         count = Evento.objects.filter(asociacion=request.user.profile.asociacion).delete()[0]
@@ -873,12 +1050,13 @@ def delete_all_eventos(request):
 # --- GESTIÓN PROYECTOS ---
 
 @association_required
+@reporting_view
 def export_proyectos(request):
     asociacion = request.user.profile.asociacion
     fmt = request.GET.get('format', 'csv')
     is_template = request.GET.get('template') == 'true'
 
-    queryset = Proyecto.objects.filter(asociacion=asociacion)
+    queryset = Proyecto.objects.filter(asociacion=asociacion).select_related('lugar_fk', 'responsable')
     headers = ['nombre', 'responsable', 'fecha_inicio', 'fecha_final', 'lugar', 'descripcion', 'materiales', 'involucrados', 'recursivo']
 
     if fmt == 'csv':
@@ -888,7 +1066,7 @@ def export_proyectos(request):
         writer = csv.writer(response)
         writer.writerow(headers)
         if not is_template:
-            for obj in queryset:
+            for obj in exported_rows('proyectos', queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                 writer.writerow([
                     obj.nombre, obj.responsable, obj.fecha_inicio, obj.fecha_final, obj.lugar,
                     obj.descripcion, obj.materiales, obj.involucrados, obj.recursivo
@@ -903,7 +1081,7 @@ def export_proyectos(request):
             ws.title = "Proyectos"
             ws.append(headers)
             if not is_template:
-                for obj in queryset:
+                for obj in exported_rows('proyectos', queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
                     # Obtener lugar (FK o texto)
                     lugar_str = str(obj.lugar_fk) if obj.lugar_fk else obj.lugar
 
@@ -926,6 +1104,7 @@ def export_proyectos(request):
     return redirect('users:backend_management')
 
 @association_required
+@invalidates('proyectos')
 def import_proyectos(request):
     if request.method == 'POST' and request.FILES.get('file'):
         uploaded_file = request.FILES['file']
@@ -947,6 +1126,7 @@ def import_proyectos(request):
     return redirect('users:backend_management')
 
 @association_required
+@invalidates('proyectos')
 def delete_all_proyectos(request):
     if request.method == 'POST':
         count = Proyecto.objects.filter(asociacion=request.user.profile.asociacion).delete()[0]
@@ -7,16 +7,18 @@ from django.contrib import messages
 from .utils import admin_required
 from .forms import SimpleUserForm, EditUserForm
 from core.api import get_client
+from core.api_async import AsyncApiClient
 import requests
 
 @admin_required
-def usuarios_web(request):
-    """Vista de gestión de usuarios web - solo para admins"""
-    asociacion_id = request.user.profile.asociacion.id
-    client = get_client(request)
+async def usuarios_web(request):
+    """Vista de gestión de usuarios web - solo para admins (async)"""
+    # El decorador ya ha cargado perfil y asociación sin bloquear el loop
+    asociacion = request.authz.asociacion
+    client = AsyncApiClient(request)
 
     try:
-        usuarios = client.get("/users/", params={"asociacion_id": asociacion_id})
+        usuarios = await client.get("/users/", params={"asociacion_id": asociacion.id})
     except requests.RequestException as e:
         messages.error(request, f"Error al conectar con el backend: {str(e)}")
         usuarios = []
@@ -24,7 +26,7 @@ def usuarios_web(request):
     context = {
         'section': 'usuarios_web',
         'usuarios': usuarios,
-        'asociacion': request.user.profile.asociacion,
+        'asociacion': asociacion,
     }
     return render(request, 'usuarios_web/list.html', context)
 
@@ -1,10 +1,11 @@
+import argparse
 import pandas as pd
 import os
-import math
-import requests
-import time
+import sys
+from pathlib import Path
 
-API_KEY = "ebbcd2121ac241dcbb9339a1843d1727"
+FRONTEND_DIR = Path(__file__).resolve().parents[1] / 'frontend'
+RAW_DIR = '/home/abueno/workspaces/alvarobueno/avl-propuesta/gestor-asociaciones/.raw_data/socias'
 
 def clean_float_to_int_str(val):
     if pd.isna(val):
@@ -19,59 +20,56 @@ def clean_str(val):
         return ""
     return str(val).strip()
 
+def setup_django():
+    """La geocodificación (core.geocoding) y su caché viven en la app Django"""
+    sys.path.insert(0, str(FRONTEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asonet_django.settings')
+    import django
+    django.setup()
+
+def normalize_addresses(rows):
+    """
+    rows: [(direccion, numero, cp, provincia)] -> [(direccion, cp, provincia)]
+    ((None, None, None) si no se encuentra). Todas las direcciones van en un
+    lote concurrente y con caché: repetir la conversión no gasta peticiones.
+    """
+    from core.geocoding import address_query, geocode_many
+
+    queries = [address_query(d, n, cp, p) if d else '' for d, n, cp, p in rows]
+    results = geocode_many([q for q in queries if q])
+
+    # 2. Sin resultado: segundo intento en 28011 Madrid
+    fallbacks = {
+        i: address_query(d, n, '28011 Madrid')
+        for i, (d, n, cp, p) in enumerate(rows)
+        if queries[i] and not results.get(queries[i]) and str(cp) != "28011"
+    }
+    if fallbacks:
+        results.update(geocode_many(list(fallbacks.values())))
+
+    normalized = []
+    for i, (direccion, numero, cp, provincia) in enumerate(rows):
+        result = results.get(queries[i]) if queries[i] else None
+        if not result and i in fallbacks:
+            result = results.get(fallbacks[i])
+        if result:
+            normalized.append((result['direccion'] or direccion, result['codigo_postal'] or cp, result['ciudad'] or provincia))
+        else:
+            normalized.append((None, None, None))
+    return normalized
+
 def normalize_address_geoapify(direccion, numero, cp, provincia):
-    if not direccion:
-        return None, None, None
-
-    def call_api(search_text):
-        url = "https://api.geoapify.com/v1/geocode/search"
-        params = {
-            'text': search_text,
-            'apiKey': API_KEY,
-            'limit': 1,
-            'country': 'Spain'
-        }
-        try:
-            resp = requests.get(url, params=params, timeout=5)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data['features']:
-                    props = data['features'][0]['properties']
-                    # Confidence threshold
-                    if props.get('rank', {}).get('confidence', 0) > 0.8:
-                        return props
-        except Exception as e:
-            print(f"API Error: {e}")
-        return None
-
-    # 1. Try with original data
-    search_query = f"{direccion}"
-    if numero: search_query += f", {numero}"
-    if cp: search_query += f", {cp}"
-    if provincia: search_query += f", {provincia}"
-
-    result = call_api(search_query)
-
-    # 2. If not found, try with 28011 Madrid fallback
-    if not result:
-        if str(cp) != "28011":
-            # print(f"  Retrying '{direccion}' in 28011...")
-            fallback_query = f"{direccion}"
-            if numero: fallback_query += f", {numero}"
-            fallback_query += ", 28011 Madrid"
-            result = call_api(fallback_query)
-
-    if result:
-        new_direccion = result.get('street') or result.get('name') or direccion
-        new_cp = result.get('postcode') or cp
-        new_provincia = result.get('city') or result.get('state') or provincia
-        return new_direccion, new_cp, new_provincia
-
-    return None, None, None
+    return normalize_addresses([(direccion, numero, cp, provincia)])[0]
 
 def main():
-    input_path = '/home/abueno/workspaces/alvarobueno/avl-propuesta/gestor-asociaciones/.raw_data/socias/LISTA SOCIOS diciembre-2024.ods'
-    output_path = '/home/abueno/workspaces/alvarobueno/avl-propuesta/gestor-asociaciones/.raw_data/socias/socias_import_ready.csv'
+    arg_parser = argparse.ArgumentParser(description="Convierte la lista de socias (.ods) al CSV de importación")
+    arg_parser.add_argument('--input', default=os.path.join(RAW_DIR, 'LISTA SOCIOS diciembre-2024.ods'))
+    arg_parser.add_argument('--output', default=os.path.join(RAW_DIR, 'socias_import_ready.csv'))
+    arg_parser.add_argument('--geocode', action='store_true',
+                            help="normalizar con Geoapify las direcciones que no estén ya en el CSV de salida")
+    args = arg_parser.parse_args()
+    input_path = args.input
+    output_path = args.output
 
     # 1. Load existing CSV to cache addresses (avoid re-using Geoapify tokens)
     address_cache = {}
@@ -106,6 +104,8 @@ def main():
 
     # Prepare output list
     output_data = []
+    # Índices de output_data con la dirección sin normalizar
+    pending_geocode = []
     total_rows = len(df)
     print(f"Processing {total_rows} rows...")
 
@@ -172,7 +172,9 @@ def main():
 
             codigo_postal = clean_float_to_int_str(row.get('C. P. '))
             provincia = clean_str(row.get('CIUDAD'))
-            # Skip Geoapify normalization as requested
+            # Geoapify solo con --geocode, en un lote al final
+            if direccion:
+                pending_geocode.append(len(output_data))
 
         # Extra info for description
         extras = []
@@ -217,6 +219,17 @@ def main():
         }
         output_data.append(entry)
 
+    if args.geocode and pending_geocode:
+        print(f"Geocoding {len(pending_geocode)} addresses...")
+        setup_django()
+        rows = [
+            (output_data[i]['direccion'], output_data[i]['numero'], output_data[i]['codigo_postal'], output_data[i]['provincia'])
+            for i in pending_geocode
+        ]
+        for i, (direccion, cp, provincia) in zip(pending_geocode, normalize_addresses(rows)):
+            if direccion:
+                output_data[i].update(direccion=direccion, codigo_postal=cp, provincia=provincia)
+
     # Create DataFrame
     out_df = pd.DataFrame(output_data)
 